@@ -12,6 +12,12 @@ class ProductIcon {
   final IconTier tier;
   final String emoji;           // Emoji character fallback: '🍎', '🥕', etc
   final String? assetPath;      // SVG asset path: 'assets/product_icons/flat/apple.svg'
+  final String? atlasPath;      // Sprite sheet containing this icon (scripts/build_icon_atlas.py)
+  final List<int>? atlasRect;   // [x, y, width, height, offsetX, offsetY, cellSize] in sheet pixels
+  final double? intrinsicWidth;   // Source image size, known without decoding
+  final double? intrinsicHeight;
+  final int? placeholderColor;  // Dominant color (ARGB) to paint before the image loads
+  final String? placeholder;    // Base64 8x8 PNG thumbnail
   final bool isAnimated;        // Future: for Lottie animations
   final int displayOrder;
   final List<String> tags;      // Search tags
@@ -24,6 +30,12 @@ class ProductIcon {
     required this.tier,
     required this.emoji,
     this.assetPath,              // Optional: use SVG if provided, emoji if null
+    this.atlasPath,
+    this.atlasRect,
+    this.intrinsicWidth,
+    this.intrinsicHeight,
+    this.placeholderColor,
+    this.placeholder,
     this.isAnimated = false,
     this.displayOrder = 0,
     this.tags = const [],
@@ -32,6 +44,9 @@ class ProductIcon {
   /// Check if this icon uses SVG asset
   bool get hasSvgAsset => assetPath != null && assetPath!.isNotEmpty;
 
+  /// Check if this icon is packed into a sprite sheet
+  bool get hasAtlas => atlasPath != null && atlasRect != null;
+
   /// Check if this icon matches search query
   bool matchesSearch(String query, {bool isVietnamese = false}) {
     final lowerQuery = query.toLowerCase();
@@ -4,6 +4,8 @@ Script to add assetPath to all premium icons in product_icons.dart
 Maps icon IDs to their corresponding PNG files
 """
 
+from instrumentation import run_script
+
 # Mapping: icon_id -> PNG file name (without .png extension)
 ICON_MAPPINGS = {
     # Fruits
@@ -123,4 +125,4 @@ def main():
     print(f"✅ Updated {len(ICON_MAPPINGS)} premium icons with assetPath")
 
 if __name__ == '__main__':
-    main()
+    run_script('add_asset_paths', main)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Asset Cache for Fresh Keeper
+Content hashing and JSON cache files shared by the icon asset stages
+
+build_icon_variants, optimize_icon_assets, icon_metadata and icon_sync
+skip files whose content hash they have already processed. The hash and
+the cache file handling live here so every stage agrees on both.
+
+Usage:
+  from asset_cache import file_sha256, load_cache, save_cache
+  cache = load_cache(CACHE_PATH, {'version': CACHE_VERSION})
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def file_sha256(path: Path) -> str:
+    """Hash file contents for cache lookups"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_cache(cache_path: Path, version: Optional[Dict] = None) -> Dict:
+    """
+    The JSON cache at cache_path, or an empty one
+    version: fields the cache must carry (e.g. {'settings': key}); a cache
+    written with other values is stale and replaced by an empty cache
+    holding just these fields
+    """
+    version = version or {}
+    if cache_path.exists():
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if all(cache.get(key) == value for key, value in version.items()):
+            return cache
+    return dict(version)
+
+
+def save_cache(cache_path: Path, cache: Dict):
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
@@ -0,0 +1,213 @@
+"""
+Shared fixtures and options for the pipeline benchmarks
+
+Catalogs are generated once per size with generate_synthetic_catalog.py
+and kept in scripts/benchmarks/.catalogs/ between runs (a 1M catalog
+takes over a minute to write). Every stage records its median time and
+peak traced memory; results are merged into results.json and compared
+against baseline.json when it exists.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import pytest
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent
+REPO_ROOT = SCRIPTS_DIR.parent
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from generate_synthetic_catalog import CatalogGenerator, load_seed_products, write_catalog  # noqa: E402
+from scaling_report import format_report  # noqa: E402
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Sizes run unless --bench-sizes / BENCH_SIZES says otherwise
+DEFAULT_SIZES = '1k,10k'
+
+CATALOG_DIR = BENCH_DIR / '.catalogs'
+RESULTS_PATH = BENCH_DIR / 'results.json'
+BASELINE_PATH = BENCH_DIR / 'baseline.json'
+
+CATALOG_SEED = 0
+
+# Allowed slowdown / memory growth over the baseline before a stage fails
+DEFAULT_THRESHOLD = 0.25
+
+# Regressions smaller than these are timer / allocator noise
+MIN_TIME_DELTA = 0.005
+MIN_MEMORY_DELTA_MB = 1.0
+
+# Timed rounds per stage; large catalogs get a single round
+ROUNDS = {'1k': 5, '10k': 3, '100k': 1, '1m': 1}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('pipeline benchmarks')
+    group.addoption('--bench-sizes', default=os.environ.get('BENCH_SIZES', DEFAULT_SIZES),
+                    help=f"Comma-separated catalog sizes from {', '.join(SIZES)} (default: {DEFAULT_SIZES})")
+    group.addoption('--bench-threshold', type=float, default=DEFAULT_THRESHOLD,
+                    help='Fail a stage slower or hungrier than baseline by more than this fraction')
+    group.addoption('--bench-baseline', type=Path, default=BASELINE_PATH,
+                    help='Baseline JSON to compare against')
+    group.addoption('--bench-save-baseline', action='store_true',
+                    help='Write this run as the new baseline instead of comparing')
+
+
+def pytest_generate_tests(metafunc):
+    if 'size' in metafunc.fixturenames:
+        sizes = [s.strip().lower() for s in metafunc.config.getoption('bench_sizes').split(',') if s.strip()]
+        unknown = [s for s in sizes if s not in SIZES]
+        if unknown:
+            raise pytest.UsageError(f"Unknown --bench-sizes {unknown}; choose from {', '.join(SIZES)}")
+        metafunc.parametrize('size', sizes)
+
+
+def pytest_configure(config):
+    config._bench_results = {}
+
+
+def load_json(path: Path) -> Dict:
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_json(data: Dict, path: Path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    current = getattr(config, '_bench_results', None)
+    if not current:
+        return
+
+    # Merge so runs over different sizes build one scaling curve
+    results = load_json(RESULTS_PATH)
+    for stage, by_size in current.items():
+        results.setdefault(stage, {}).update(by_size)
+    save_json(results, RESULTS_PATH)
+
+    if config.getoption('bench_save_baseline'):
+        baseline_path = config.getoption('bench_baseline')
+        baseline = load_json(baseline_path)
+        for stage, by_size in current.items():
+            baseline.setdefault(stage, {}).update(by_size)
+        save_json(baseline, baseline_path)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not getattr(config, '_bench_results', None):
+        return
+    terminalreporter.write_sep('=', 'pipeline scaling')
+    for line in format_report(load_json(RESULTS_PATH)):
+        terminalreporter.write_line(line)
+    if config.getoption('bench_save_baseline'):
+        terminalreporter.write_line(f"💾 Baseline saved to: {config.getoption('bench_baseline')}")
+
+
+@pytest.fixture(scope='session')
+def seed_products():
+    return load_seed_products([REPO_ROOT / path for path in
+                               (Path('assets/data/products_sample.json'),
+                                Path('assets/data/products_sample_backup.json'))])
+
+
+@pytest.fixture(scope='session')
+def catalog_path(seed_products):
+    """Return a function giving the path of the cached catalog for a size"""
+
+    def get(size: str) -> Path:
+        path = CATALOG_DIR / f'catalog_{size}_seed{CATALOG_SEED}.json'
+        if not path.exists():
+            generator = CatalogGenerator(seed_products, seed=CATALOG_SEED)
+            temp_path = path.with_name(path.name + '.tmp')
+            write_catalog(generator.generate(SIZES[size]), SIZES[size], temp_path)
+            os.replace(temp_path, path)
+        return path
+
+    return get
+
+
+def peak_memory_mb(fn: Callable, *args) -> float:
+    """Peak Python heap allocated while fn runs, in MB"""
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+class StageRunner:
+    """Times one stage with pytest-benchmark and checks it against the baseline"""
+
+    def __init__(self, benchmark, config):
+        self.benchmark = benchmark
+        self.config = config
+        self.baseline = load_json(config.getoption('bench_baseline'))
+
+    def __call__(self, stage: str, size: str, fn: Callable, setup: Optional[Callable] = None):
+        """
+        Run fn(*setup()) once under tracemalloc for peak memory, then time it
+        setup (untimed) returns the arguments for each round
+        """
+        setup = setup or (lambda: ())
+        quiet = contextlib.redirect_stdout(io.StringIO())
+
+        with quiet:
+            peak_mb = peak_memory_mb(fn, *setup())
+
+        def run(*args):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return fn(*args)
+
+        start = time.perf_counter()
+        self.benchmark.pedantic(run, setup=lambda: (setup(), {}), rounds=ROUNDS[size])
+        stats = getattr(self.benchmark, 'stats', None)
+        # --benchmark-disable leaves no stats; fall back to the wall clock
+        seconds = stats.stats.median if stats else time.perf_counter() - start
+
+        self.benchmark.extra_info.update({'peak_mb': round(peak_mb, 2), 'products': SIZES[size]})
+        result = {'products': SIZES[size], 'seconds': round(seconds, 6), 'peak_mb': round(peak_mb, 2)}
+        self.config._bench_results.setdefault(stage, {})[size] = result
+
+        if not self.config.getoption('bench_save_baseline'):
+            self.check(stage, size, result)
+        return result
+
+    def check(self, stage: str, size: str, result: Dict):
+        base = self.baseline.get(stage, {}).get(size)
+        if not base:
+            return
+        threshold = self.config.getoption('bench_threshold')
+        failures = []
+        if result['seconds'] - base['seconds'] > MIN_TIME_DELTA \
+                and result['seconds'] > base['seconds'] * (1 + threshold):
+            failures.append(f"time {base['seconds']:.3f}s → {result['seconds']:.3f}s")
+        if result['peak_mb'] - base['peak_mb'] > MIN_MEMORY_DELTA_MB \
+                and result['peak_mb'] > base['peak_mb'] * (1 + threshold):
+            failures.append(f"peak memory {base['peak_mb']:.1f}MB → {result['peak_mb']:.1f}MB")
+        if failures:
+            pytest.fail(f"{stage} @ {size} regressed more than {threshold:.0%}: {'; '.join(failures)}",
+                        pytrace=False)
+
+
+@pytest.fixture
+def run_stage(benchmark, request):
+    return StageRunner(benchmark, request.config)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Scaling Report for the Fresh Keeper pipeline benchmarks
+Shows how each stage's time and peak memory grow with catalog size
+
+For every stage the report fits time ≈ c · n^k on a log-log scale. k ≈ 1
+is linear; a stage with k noticeably above 1 (or a jump between two
+consecutive sizes) gets slower per product as the catalog grows and is
+flagged as super-linear.
+
+Usage:
+  python3 scripts/benchmarks/scaling_report.py
+  python3 scripts/benchmarks/scaling_report.py scripts/benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RESULTS_PATH = Path(__file__).resolve().parent / 'results.json'
+
+# Fitted exponents above this are reported as super-linear
+SUPERLINEAR_EXPONENT = 1.25
+
+# Stages faster than this at every size are dominated by fixed costs
+MIN_SECONDS = 0.01
+
+
+def fit_exponent(points: List[tuple]) -> Optional[float]:
+    """Least-squares slope of log(value) over log(products)"""
+    points = [(n, v) for n, v in points if n > 0 and v > 0]
+    if len(points) < 2:
+        return None
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(v) for _, v in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def format_size(products: int) -> str:
+    if products >= 1_000_000:
+        return f'{products // 1_000_000}M'
+    if products >= 1000:
+        return f'{products // 1000}k'
+    return str(products)
+
+
+def format_report(results: Dict) -> List[str]:
+    """Report lines for {stage: {size: {products, seconds, peak_mb}}}"""
+    lines = []
+    flagged = []
+    for stage in sorted(results):
+        rows = sorted(results[stage].values(), key=lambda r: r['products'])
+        time_exponent = fit_exponent([(r['products'], r['seconds']) for r in rows])
+        memory_exponent = fit_exponent([(r['products'], r['peak_mb']) for r in rows])
+
+        cells = '  '.join(f"{format_size(r['products'])}: {r['seconds']:.3f}s/{r['peak_mb']:.0f}MB"
+                          for r in rows)
+        exponents = ''
+        if time_exponent is not None:
+            exponents = f'  time ~n^{time_exponent:.2f}'
+            # Stages allocating too little to round above 0MB have no memory curve
+            if memory_exponent is not None:
+                exponents += f', memory ~n^{memory_exponent:.2f}'
+
+        # Per-step exponents catch a curve that only bends at the large end
+        steps = [fit_exponent([(a['products'], a['seconds']), (b['products'], b['seconds'])])
+                 for a, b in zip(rows, rows[1:])]
+        worst_step = max((s for s in steps if s is not None), default=None)
+        significant = any(r['seconds'] >= MIN_SECONDS for r in rows)
+        superlinear = significant and any(
+            e is not None and e > SUPERLINEAR_EXPONENT for e in (time_exponent, worst_step))
+
+        marker = '⚠️ ' if superlinear else '  '
+        lines.append(f'{marker}{stage:22} {cells}{exponents}')
+        if superlinear:
+            flagged.append(stage)
+
+    if flagged:
+        lines.append(f"⚠️  Super-linear (time exponent > {SUPERLINEAR_EXPONENT}): {', '.join(flagged)}")
+    elif results:
+        lines.append('✅ All stages scale linearly or better')
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the pipeline scaling curves')
+    parser.add_argument('results', type=Path, nargs='?', default=RESULTS_PATH)
+    args = parser.parse_args()
+
+    if not args.results.exists():
+        print(f"❌ Results not found: {args.results} (run pytest scripts/benchmarks first)")
+        return
+
+    with open(args.results, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+
+    print("📈 Fresh Keeper Pipeline Scaling")
+    print("=" * 50)
+    for line in format_report(results):
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
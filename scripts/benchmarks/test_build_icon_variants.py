@@ -0,0 +1,49 @@
+"""
+Icon variant builder checks
+Variants land in the 2.0x/3.0x folders next to their source, keep the
+source's aspect ratio and are re-rendered only when the source changes
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_build_icon_variants.py
+"""
+
+import contextlib
+import io
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from build_icon_variants import build_variants  # noqa: E402
+
+
+def build(source_dir, cache_path, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return build_variants(source_dir, cache_path=cache_path, workers=1, **options)
+
+
+def test_variants_next_to_source(tmp_path):
+    source_dir = tmp_path / '3d'
+    source_dir.mkdir()
+    Image.new('RGBA', (256, 256), (200, 30, 30, 255)).save(source_dir / 'apple_red.png')
+    Image.new('RGBA', (256, 128), (30, 200, 30, 255)).save(source_dir / 'cucumber.png')
+    source = (source_dir / 'apple_red.png').read_bytes()
+    cache_path = tmp_path / 'cache.json'
+
+    results = build(source_dir, cache_path)
+    assert (source_dir / 'apple_red.png').read_bytes() == source
+    for density, pixels in (('2.0x', 96), ('3.0x', 144)):
+        with Image.open(source_dir / density / 'apple_red.png') as image:
+            assert image.size == (pixels, pixels)
+        # Fitted inside the box, not stretched to a square
+        with Image.open(source_dir / density / 'cucumber.png') as image:
+            assert image.size == (pixels, pixels // 2)
+        assert results['cucumber.png']['variants'][density]['size'] == [pixels, pixels // 2]
+
+    # Variant folders are not picked up as sources; nothing changed, nothing rendered
+    mtime = (source_dir / '2.0x' / 'apple_red.png').stat().st_mtime_ns
+    assert sorted(build(source_dir, cache_path)) == ['apple_red.png', 'cucumber.png']
+    assert (source_dir / '2.0x' / 'apple_red.png').stat().st_mtime_ns == mtime
+
+    with pytest.raises(ValueError):
+        build(source_dir, cache_path, densities=[1.0, 2.0])
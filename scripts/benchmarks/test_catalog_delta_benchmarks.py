@@ -0,0 +1,68 @@
+"""
+Catalog delta benchmarks
+Times diff/apply between a synthetic catalog and an edited copy, and
+checks base + delta is byte-identical to the target at every size
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_catalog_delta_benchmarks.py
+  python3 -m pytest scripts/benchmarks/test_catalog_delta_benchmarks.py --bench-sizes 100k
+"""
+
+import pytest
+
+from catalog_codec import load_json
+from catalog_delta import apply_delta, build_chain, diff_catalogs, verify
+
+# Every n-th product is edited / dropped; one new product per INSERT_EVERY
+UPDATE_EVERY = 50
+DELETE_EVERY = 97
+INSERT_EVERY = 200
+
+
+def edited_copy(data):
+    """A next catalog version: a few products changed, removed and added"""
+    products = []
+    for i, product in enumerate(data['products']):
+        if i % DELETE_EVERY == 3:
+            continue
+        if i % UPDATE_EVERY == 1:
+            product = dict(product, shelf_life_refrigerated=(product.get('shelf_life_refrigerated') or 0) + 1)
+            product.pop('storage_tips', None)
+        products.append(product)
+        if i % INSERT_EVERY == 7:
+            products.append(dict(product, id=f"{product['id']}_new"))
+    return {'version': f"{data.get('version')}.1", 'last_updated': data.get('last_updated'),
+            'total_products': len(products), 'products': products}
+
+
+@pytest.fixture
+def versions(catalog_path, size):
+    base = load_json(catalog_path(size))
+    return base, edited_copy(base)
+
+
+def test_catalog_diff(run_stage, size, versions):
+    base, target = versions
+    run_stage('catalog_diff', size, diff_catalogs, lambda: (base, target))
+
+
+def test_catalog_apply(run_stage, size, versions):
+    base, target = versions
+    delta = diff_catalogs(base, target)
+    run_stage('catalog_apply', size, apply_delta, lambda: (base, delta))
+
+
+def test_delta_round_trip(size, versions):
+    base, target = versions
+    delta = diff_catalogs(base, target)
+    assert verify(base, delta, target) == []
+    assert len(delta['updated']) + len(delta['inserted']) + len(delta['deleted']) < len(base['products']) // 10
+
+
+def test_chain_from_any_version(size, versions):
+    base, middle = versions
+    target = edited_copy(middle)
+    chain = build_chain([base, middle, target])
+    assert verify(base, chain, target) == []
+    assert verify(middle, chain, target) == []
+    assert verify(target, chain, target) == []
@@ -0,0 +1,75 @@
+"""
+Catalog shard benchmarks
+Times loading one category shard, all shards (serial and threaded) and
+the monolithic catalog, and checks that joined shards give back the catalog
+and that rewriting one shard leaves the other files alone
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_catalog_shards_benchmarks.py
+  python3 -m pytest scripts/benchmarks/test_catalog_shards_benchmarks.py --bench-sizes 100k
+"""
+
+import contextlib
+import io
+
+import pytest
+
+from catalog_codec import dumps_json, load_json
+from catalog_shards import (BUNDLE_NAME, MANIFEST_NAME, load_catalog, load_shards, read_manifest,
+                            rewrite_shard, verify_shards, write_bundle, write_manifest, write_shards)
+
+# Shard read by the single-category stage
+CATEGORY = 'dairy'
+
+WORKERS = 4
+
+
+@pytest.fixture
+def shard_dir(catalog_path, size, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        write_shards(load_json(catalog_path(size)), tmp_path / 'shards')
+    return tmp_path / 'shards'
+
+
+def test_load_one_shard(run_stage, size, shard_dir):
+    run_stage('shards_load_one', size, load_shards, lambda: (shard_dir, [CATEGORY]))
+
+
+@pytest.mark.parametrize('workers', [1, WORKERS])
+def test_load_all_shards(run_stage, size, shard_dir, workers):
+    stage = 'shards_load_all' if workers == 1 else 'shards_load_all_threaded'
+    run_stage(stage, size, load_catalog, lambda: (shard_dir, workers))
+
+
+def test_load_monolithic(run_stage, catalog_path, size):
+    path = catalog_path(size)
+    run_stage('shards_load_monolithic', size, load_json, lambda: (path,))
+
+
+def test_shards_round_trip(catalog_path, size, shard_dir):
+    assert verify_shards(shard_dir) == []
+    expected = dumps_json(load_json(catalog_path(size)))
+    assert dumps_json(load_catalog(shard_dir, workers=WORKERS)) == expected
+    assert dumps_json(load_catalog(shard_dir, from_bundle=True)) == expected
+
+
+def test_rewrite_touches_one_shard(size, shard_dir):
+    if size != '1k':
+        pytest.skip('file-level check, size independent')
+    before = {path.name: path.read_bytes() for path in shard_dir.iterdir()}
+    products = load_shards(shard_dir, [CATEGORY])[CATEGORY]
+    rewrite_shard(shard_dir, CATEGORY, products[:-1])
+    changed = {path.name for path in shard_dir.iterdir() if path.read_bytes() != before[path.name]}
+    assert changed == {f'{CATEGORY}.json', MANIFEST_NAME}
+
+    # The stale shard is read from its own file until the bundle is rebuilt
+    assert verify_shards(shard_dir) == []
+    expected = dumps_json(load_catalog(shard_dir))
+    assert dumps_json(load_catalog(shard_dir, from_bundle=True)) == expected
+    manifest = read_manifest(shard_dir)
+    assert 'offset' not in manifest['shards'][CATEGORY]
+    write_bundle(shard_dir, manifest)
+    write_manifest(shard_dir, manifest, recount=False)
+    assert (shard_dir / BUNDLE_NAME).read_bytes() != before[BUNDLE_NAME]
+    assert verify_shards(shard_dir) == []
+    assert dumps_json(load_catalog(shard_dir, from_bundle=True)) == expected
@@ -0,0 +1,102 @@
+"""
+Codec benchmarks for Fresh Keeper
+Decode/encode throughput of each installed catalog_codec backend, on the
+real products_sample_backup.json and on the synthetic catalogs
+
+Stages are named decode_<backend> / encode_<backend> (and _backup for the
+real file); MB/s is kept in the pytest-benchmark extra_info. The
+canonical-output tests check every backend writes exactly the bytes of
+json.dump(ensure_ascii=False, indent=2).
+
+Requires: pip install pytest pytest-benchmark msgspec orjson
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_codec_benchmarks.py
+  python3 -m pytest scripts/benchmarks/test_codec_benchmarks.py --bench-sizes 100k -k decode
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from catalog_codec import available_backends, decode_catalog, dumps_json, get_codec, iter_encoded
+
+BACKUP_CATALOG = Path(__file__).resolve().parents[2] / 'assets/data/products_sample_backup.json'
+
+BACKENDS = available_backends()
+
+# Floats json.dumps spells differently from orjson/msgspec, and documents
+# the fast backends can't encode themselves
+EDGE_CASES = [
+    {'tiny': 1e-05, 'huge': 1e16, 'list': [1.5e300, -2.5e-10, 0.0001, 0.00012, 1e-7, -1.5e-05, 1e15]},
+    {'text': 'ends like a float 1e16', 'nested': {'empty': [], 'obj': {}}},
+    {'big_int': 2 ** 70},
+    {1: 'int key'},
+    [1, 2.5, None, True, 'x'],
+    3e20,
+]
+
+
+def canonical_bytes(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def record_throughput(benchmark, result, megabytes: float):
+    if result['seconds']:
+        benchmark.extra_info['mb_per_s'] = round(megabytes / result['seconds'], 1)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_decode(run_stage, benchmark, catalog_path, size, backend):
+    raw = catalog_path(size).read_bytes()
+    result = run_stage(f'decode_{backend}', size, get_codec(backend).decode, lambda: (raw,))
+    record_throughput(benchmark, result, len(raw) / 1024 / 1024)
+
+
+def test_decode_typed(run_stage, benchmark, catalog_path, size):
+    pytest.importorskip('msgspec')
+    raw = catalog_path(size).read_bytes()
+    result = run_stage('decode_msgspec_typed', size, decode_catalog, lambda: (raw,))
+    record_throughput(benchmark, result, len(raw) / 1024 / 1024)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_encode(run_stage, benchmark, catalog_path, size, backend):
+    raw = catalog_path(size).read_bytes()
+    data = json.loads(raw)
+    result = run_stage(f'encode_{backend}', size, dumps_json, lambda: (data, backend))
+    record_throughput(benchmark, result, len(raw) / 1024 / 1024)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_backup_catalog(run_stage, benchmark, backend):
+    raw = BACKUP_CATALOG.read_bytes()
+    data = json.loads(raw)
+    result = run_stage(f'decode_{backend}_backup', '1k', get_codec(backend).decode, lambda: (raw,))
+    record_throughput(benchmark, result, len(raw) / 1024 / 1024)
+    assert get_codec(backend).decode(raw) == data
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_canonical_output(catalog_path, size, backend):
+    data = json.loads(catalog_path(size).read_bytes())
+    assert dumps_json(data, backend) == canonical_bytes(data)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_canonical_backup(backend):
+    data = json.loads(BACKUP_CATALOG.read_bytes())
+    assert dumps_json(data, backend) == canonical_bytes(data)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('obj', EDGE_CASES)
+def test_canonical_edge_cases(backend, obj):
+    # Small chunks so the list splicing is exercised too
+    document = {'products': [obj] * 5, 'value': obj}
+    for candidate in (obj, document):
+        expected = canonical_bytes(candidate)
+        encoded = b''.join(iter_encoded(candidate, get_codec(backend), chunk_size=2))
+        assert encoded == expected
+        assert get_codec(backend).decode(encoded) == json.loads(expected)
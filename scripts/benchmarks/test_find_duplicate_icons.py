@@ -0,0 +1,67 @@
+"""
+Near-duplicate icon search checks
+BKTree queries and find_clusters against a brute-force Hamming scan over
+random 64-bit hashes with planted near-duplicates
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_find_duplicate_icons.py
+"""
+
+import random
+
+import pytest
+
+from find_duplicate_icons import HASHERS, BKTree, find_clusters, hamming
+
+
+def random_hashes(seed, count):
+    """Random 64-bit hashes; every fifth one is a copy of an earlier hash with a few bits flipped"""
+    rng = random.Random(seed)
+    hashes = {}
+    for i in range(count):
+        if i % 5 == 4:
+            value = hashes[f'icon_{rng.randrange(i):04d}']
+            for _ in range(rng.randint(0, 8)):
+                value ^= 1 << rng.randrange(64)
+        else:
+            value = rng.getrandbits(64)
+        hashes[f'icon_{i:04d}'] = value
+    return hashes
+
+
+@pytest.mark.parametrize('seed, radius', [(0, 0), (1, 4), (2, 6), (3, 12)])
+def test_query_matches_brute_force(seed, radius):
+    hashes = random_hashes(seed, 500)
+    tree = BKTree()
+    for key in sorted(hashes):
+        tree.add(hashes[key], key)
+    for key, value in sorted(hashes.items())[::7]:
+        expected = sorted((other, hamming(value, other_value)) for other, other_value in hashes.items()
+                          if hamming(value, other_value) <= radius)
+        assert sorted(tree.query(value, radius)) == expected
+
+
+def test_clusters_match_brute_force():
+    hashes = random_hashes(4, 400)
+    clusters, pairs, comparisons = find_clusters(hashes, 6)
+
+    keys = sorted(hashes)
+    expected_pairs = {(a, b): hamming(hashes[a], hashes[b])
+                      for i, a in enumerate(keys) for b in keys[i + 1:]
+                      if hamming(hashes[a], hashes[b]) <= 6}
+    assert pairs == expected_pairs and pairs
+    # Every brute-force pair ends up in the same cluster
+    cluster_of = {key: index for index, cluster in enumerate(clusters) for key in cluster}
+    for a, b in expected_pairs:
+        assert cluster_of[a] == cluster_of[b]
+    assert comparisons < len(keys) ** 2
+
+
+def test_empty_tree():
+    assert list(BKTree().query(0, 64)) == []
+
+
+@pytest.mark.parametrize('hasher', sorted(HASHERS))
+def test_no_icons(hasher):
+    pytest.importorskip('numpy')
+    assert HASHERS[hasher]([]) == []
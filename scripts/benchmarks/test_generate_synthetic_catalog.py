@@ -0,0 +1,22 @@
+"""
+Synthetic catalog checks
+Generated products and their near-duplicates stay self-consistent
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_generate_synthetic_catalog.py
+"""
+
+import re
+
+from generate_synthetic_catalog import CatalogGenerator, load_seed_products
+
+
+def test_storage_tips_match_shelf_life():
+    generator = CatalogGenerator(load_seed_products(), duplicate_rate=0.5)
+    products = list(generator.generate(500))
+    # Duplicates are '<original id>_<copy number>' with a re-drawn shelf life
+    ids = {product['id'] for product in products}
+    assert any(product['id'].rsplit('_', 1)[0] in ids for product in products)
+    for product in products:
+        for days in re.findall(r'(\d+) ngày', product['storage_tips']):
+            assert int(days) == product['shelf_life_refrigerated'], product['id']
@@ -0,0 +1,76 @@
+"""
+Hot/cold split benchmarks
+Startup parse time and retained memory of the hot index against the full
+catalog, cold detail lookups, and the byte-identical join
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_hot_cold_benchmarks.py
+  python3 -m pytest scripts/benchmarks/test_hot_cold_benchmarks.py --bench-sizes 100k
+"""
+
+import contextlib
+import gc
+import io
+import tracemalloc
+
+import pytest
+
+from catalog_codec import dumps_json, load_json
+from catalog_hot_cold import ColdStore, HotIndex, build, join
+from conftest import SIZES
+
+# The hot index must keep at most this share of the full catalog's memory
+MAX_RETAINED_RATIO = 0.6
+
+# Products opened per detail-lookup round
+LOOKUPS = 1000
+
+
+@pytest.fixture
+def hot_cold_dir(catalog_path, size, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        build(load_json(catalog_path(size)), tmp_path / 'hot_cold')
+    return tmp_path / 'hot_cold'
+
+
+def retained_mb(load, *args) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        data = load(*args)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del data
+    return current / 1024 / 1024
+
+
+def open_details(index, count):
+    with ColdStore(index) as cold:
+        step = max(1, len(index) // count)
+        return [cold.product(hot) for hot in index.products[::step]]
+
+
+def test_full_catalog_load(run_stage, catalog_path, size):
+    path = catalog_path(size)
+    run_stage('startup_full_catalog', size, load_json, lambda: (path,))
+
+
+def test_hot_index_load(run_stage, size, hot_cold_dir):
+    run_stage('startup_hot_index', size, HotIndex, lambda: (hot_cold_dir,))
+
+
+def test_cold_lookups(run_stage, size, hot_cold_dir):
+    index = HotIndex(hot_cold_dir)
+    run_stage('cold_lookups', size, open_details, lambda: (index, LOOKUPS))
+
+
+def test_hot_index_retains_less_memory(catalog_path, size, hot_cold_dir):
+    full = retained_mb(load_json, catalog_path(size))
+    hot = retained_mb(HotIndex, hot_cold_dir)
+    print(f"\n{SIZES[size]} products: full catalog {full:.1f} MB, hot index {hot:.1f} MB ({hot / full:.0%})")
+    assert hot <= full * MAX_RETAINED_RATIO
+
+
+def test_join_round_trip(catalog_path, size, hot_cold_dir):
+    assert dumps_json(join(hot_cold_dir)) == dumps_json(load_json(catalog_path(size)))
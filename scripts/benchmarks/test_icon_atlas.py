@@ -0,0 +1,57 @@
+"""
+Icon atlas packer checks
+Random sprite sets through pack_sprites: every sprite is placed once,
+inside its sheet, with padding and no two rectangles overlapping
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_icon_atlas.py
+"""
+
+import random
+
+import pytest
+
+from build_icon_atlas import PADDING, pack_sprites
+
+
+def random_sprites(seed, count, max_side):
+    rng = random.Random(seed)
+    return [{'id': f'icon_{i:03d}', 'width': rng.randint(1, max_side), 'height': rng.randint(1, max_side)}
+            for i in range(count)]
+
+
+def overlaps(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+@pytest.mark.parametrize('seed, count, max_side, max_size', [
+    (0, 40, 96, 2048),
+    (1, 200, 96, 2048),
+    (2, 150, 200, 512),    # spills over several sheets
+    (3, 60, 30, 128),
+])
+def test_rectangles_do_not_overlap(seed, count, max_side, max_size):
+    sprites = random_sprites(seed, count, max_side)
+    sizes = {sprite['id']: (sprite['width'], sprite['height']) for sprite in sprites}
+    sheets = pack_sprites(sprites, max_size=max_size)
+
+    placed = [icon_id for sheet in sheets for icon_id in sheet['placements']]
+    assert sorted(placed) == sorted(sizes)
+    for sheet in sheets:
+        # Padded rectangles, as the packer reserves them
+        rects = [(x, y, sizes[icon_id][0] + PADDING, sizes[icon_id][1] + PADDING)
+                 for icon_id, (x, y) in sheet['placements'].items()]
+        for x, y, width, height in rects:
+            assert x >= 0 and y >= 0
+            assert x + width - PADDING <= sheet['width'] <= max_size
+            assert y + height - PADDING <= sheet['height'] <= max_size
+        for i, a in enumerate(rects):
+            for b in rects[i + 1:]:
+                assert not overlaps(a, b), (a, b)
+    if max_size == 512:
+        assert len(sheets) > 1
+
+
+def test_oversized_sprite_is_rejected():
+    with pytest.raises(ValueError, match='does not fit'):
+        pack_sprites([{'id': 'huge', 'width': 300, 'height': 10}], max_size=256)
@@ -0,0 +1,89 @@
+"""
+Icon matcher checks
+Known-good and known-bad product → icon pairs for the TF-IDF matcher,
+including names whose n-grams resemble an icon their head word rules out,
+and the ambiguity check of map_product_icons
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_icon_matcher.py
+"""
+
+import json
+
+import pytest
+
+from icon_matcher import CONFIDENCE_THRESHOLD, fold_text, word_stem
+from map_product_icons import get_matcher, map_product_icons
+
+# name_en → icon it must match with confidence
+KNOWN_GOOD = {
+    'Pineapple': 'pineapple',
+    'Green Apple': 'apple_green',
+    'Strawberries': 'strawberry',
+    'Cherry Tomatoes': 'tomato',
+    'Mustard Greens': 'leafy_greens',
+    'Custard Apple': 'apple_red',
+    'Egg Custard': 'custard',
+    'Vanilla Pudding': 'custard',
+    'Sweet Corn': 'corn',
+    'Yellow Bell Pepper': 'bell_pepper_yellow',
+    'Beef Steak': 'steak',
+    'Chicken Drumstick': 'drumstick',
+    # Cuts: the head word is in no keyword, so the spelled-out keyword counts
+    'Pork Belly': 'pork',
+    'Chicken Breast': 'chicken',
+    'Coconut Water': 'coconut',
+}
+
+# name_en → icon it must not be matched to with confidence
+KNOWN_BAD = {
+    'Mustard Greens': 'custard',
+    'Custard Apple': 'custard',
+    'Yellow Pitaya': 'bell_pepper_yellow',
+    'Honeydew': 'honey',
+    'Mustard': 'custard',
+    'Cherry Tomatoes': 'cherries',
+    'Sweet Corn': 'candy',
+}
+
+
+def best_matches(name, top_k=2):
+    return get_matcher().match([{'name_en': name}], top_k=top_k)[0]
+
+
+def best_match(name):
+    return best_matches(name, top_k=1)[0]
+
+
+@pytest.mark.parametrize('name, icon_id', sorted(KNOWN_GOOD.items()))
+def test_known_good(name, icon_id):
+    best, score = best_match(name)
+    assert best == icon_id and score >= CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize('name, icon_id', sorted(KNOWN_BAD.items()))
+def test_known_bad(name, icon_id):
+    best, score = best_match(name)
+    assert best != icon_id or score < CONFIDENCE_THRESHOLD
+
+
+def test_folding():
+    assert fold_text('Cải bẹ xanh (Đà Lạt)') == 'cai be xanh da lat'
+    assert word_stem('strawberries') == word_stem('strawberry')
+    assert word_stem('tomatoes') == word_stem('tomato')
+    assert word_stem('chilli') == word_stem('chili')
+    assert word_stem('glass') != word_stem('gla')
+
+
+def test_own_name_is_not_ambiguous(tmp_path, capsys):
+    catalog = tmp_path / 'catalog.json'
+    catalog.write_text(json.dumps({'products': [
+        {'id': 'milk_1', 'name_vi': 'Sữa tươi', 'name_en': 'Milk', 'category': 'dairy'},
+        {'id': 'milk_2', 'name_vi': 'Sữa tươi', 'name_en': 'Fresh Milk', 'category': 'dairy'},
+    ]}), encoding='utf-8')
+    # 'Milk' ties baby_bottle's 'milk' keyword up to TIE_BREAK
+    assert [icon for icon, _ in best_matches('Milk')] == ['milk', 'baby_bottle']
+    report = tmp_path / 'review.json'
+    map_product_icons(catalog, report_path=report)
+    capsys.readouterr()
+    assert 'milk_1' not in [item['id'] for item in json.loads(report.read_text(encoding='utf-8'))]
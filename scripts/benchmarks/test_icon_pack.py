@@ -0,0 +1,70 @@
+"""
+Icon pack checks
+Round-tripping icon files through build_pack / IconPack and verify_pack
+catching corrupted, moved or edited bytes
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_icon_pack.py
+"""
+
+import random
+
+import pytest
+
+from icon_pack import ALIGNMENT, IconPack, build_pack, collect_icons, index_path_for, verify_pack
+
+
+@pytest.fixture
+def icon_root(tmp_path):
+    """A flat and a 3d folder of random icon files, plus a file that isn't an icon"""
+    rng = random.Random(0)
+    root = tmp_path / 'icons'
+    for icon_type, suffix in (('flat', '.svg'), ('3d', '.png')):
+        (root / icon_type).mkdir(parents=True)
+        for i in range(12):
+            data = bytes(rng.randrange(256) for _ in range(rng.randint(0, 300)))
+            (root / icon_type / f'icon_{i:02d}{suffix}').write_bytes(data)
+    (root / 'flat' / 'README.txt').write_text('not an icon')
+    return root
+
+
+@pytest.fixture
+def pack_path(icon_root, tmp_path):
+    path = tmp_path / 'icons.pack'
+    build_pack(collect_icons(icon_root), path)
+    return path
+
+
+def test_round_trip(icon_root, pack_path):
+    icons = collect_icons(icon_root)
+    assert len(icons) == 24
+    with IconPack(pack_path) as pack:
+        assert len(pack) == 24 and 'flat/README' not in pack
+        for icon_id, source in icons:
+            view = pack.get(icon_id)
+            assert bytes(view) == source.read_bytes()
+            assert pack.entries[icon_id]['offset'] % ALIGNMENT == 0
+            view.release()
+        assert pack.format('flat/icon_00') == 'svg' and pack.format('3d/icon_00') == 'png'
+    assert verify_pack(pack_path) == []
+
+
+def test_verify_catches_corrupted_byte(pack_path):
+    with IconPack(pack_path) as pack:
+        icon_id, entry = next((i, e) for i, e in pack.entries.items() if e['length'])
+    blob = bytearray(pack_path.read_bytes())
+    blob[entry['offset']] ^= 0xff
+    pack_path.write_bytes(bytes(blob))
+
+    problems = verify_pack(pack_path, check_sources=False)
+    assert problems == [f'{icon_id}: content hash mismatch']
+
+
+def test_verify_catches_changed_source_and_truncation(icon_root, pack_path):
+    (icon_root / 'flat' / 'icon_03.svg').write_bytes(b'<svg/>')
+    assert verify_pack(pack_path) == [f"flat/icon_03: source {icon_root / 'flat' / 'icon_03.svg'} "
+                                      f"changed since packing"]
+    pack_path.write_bytes(pack_path.read_bytes()[:-1])
+    problems = verify_pack(pack_path, check_sources=False)
+    assert problems[0].startswith('blob is') and problems[-1].endswith('runs past end of blob')
+    assert index_path_for(pack_path).exists()
@@ -0,0 +1,110 @@
+"""
+Icon sync checks
+Collision reporting, the dry-run plan and incremental re-planning of
+icon_organizer.py --sync on small download trees
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_icon_sync.py
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from icon_organizer import find_mapping_conflicts, sync_icons, target_filename
+from icon_sync import STATE_PATH, apply_plan, load_state, plan_tree
+
+
+def write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def target_3d(path):
+    return target_filename(path, '3d')
+
+
+@pytest.fixture
+def trees(tmp_path):
+    """A 3d download tree (apple, banana, bread) and an empty asset folder"""
+    source, dest = tmp_path / 'downloads', tmp_path / 'assets'
+    write(source / 'tao.png', b'apple')
+    write(source / 'fruits' / 'chuoi.png', b'banana')
+    write(source / 'banh_mi.png', b'bread')
+    write(source / 'notes.txt', b'not an icon')
+    dest.mkdir()
+    return source, dest
+
+
+def test_kem_maps_to_two_names():
+    # The later 'kem' entry wins; the earlier one is reported as dead
+    assert find_mapping_conflicts()['kem'] == ['cream', 'ice_cream']
+    assert target_3d(Path('kem.png')) == 'ice_cream.png'
+
+
+def test_kem_collision(trees):
+    source, dest = trees
+    write(source / 'kem.png', b'scoop')
+    write(source / 'frozen' / 'ice_cream.png', b'cone')
+    state = load_state(source / 'state.json')
+    plan = plan_tree(source, dest, target_3d, state)
+    assert plan['collisions'] == {'ice_cream.png': ['frozen/ice_cream.png', 'kem.png']}
+    assert [target for _, target, _ in plan['copy']] == ['apple.png', 'banana.png', 'bread.png']
+    apply_plan(plan, state)
+    assert not (dest / 'ice_cream.png').exists()
+
+    # Recorded collisions are re-checked even though nothing changed
+    plan = plan_tree(source, dest, target_3d, state)
+    assert not plan['skipped'] and plan['checked'] == 1 and plan['collisions']
+
+    # Identical content is merged instead
+    write(source / 'frozen' / 'ice_cream.png', b'scoop')
+    plan = plan_tree(source, dest, target_3d, state)
+    assert not plan['collisions']
+    assert plan['duplicates'] == {'ice_cream.png': ['frozen/ice_cream.png', 'kem.png']}
+    assert plan['copy'] == [(Path('frozen/ice_cream.png'), 'ice_cream.png', 'add')]
+
+
+def test_dry_run_plan(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    write(Path('scripts/downloads/3d/tao.png'), b'apple')
+    write(Path('scripts/downloads/3d/kem.png'), b'scoop')
+    write(Path('scripts/downloads/3d/ice_cream.png'), b'cone')
+    write(Path('scripts/downloads/flat/chuoi.svg'), b'<svg/>')
+
+    assert sync_icons(dry_run=True) is False
+    out = capsys.readouterr().out
+    assert 'Would copy (add): tao.png -> apple.png' in out
+    assert 'Would copy (add): chuoi.svg -> banana.svg' in out
+    assert 'Collision on ice_cream.png: ice_cream.png, kem.png' in out
+    assert not Path('assets/product_icons').exists() and not STATE_PATH.exists()
+
+
+def test_unchanged_tree_is_skipped(trees):
+    source, dest = trees
+    state = load_state(source / 'state.json')
+    plan = plan_tree(source, dest, target_3d, state)
+    assert plan['checked'] == 3 and len(plan['copy']) == 3
+    apply_plan(plan, state)
+    assert (dest / 'banana.png').read_bytes() == b'banana'
+
+    plan = plan_tree(source, dest, target_3d, state)
+    assert plan['skipped'] and plan['hashed'] == 0 and plan['checked'] == 0
+    assert not plan['copy'] and len(plan['targets']) == 3
+
+    # Only the targets touched by a change are planned
+    write(source / 'tao.png', b'green apple')
+    os.utime(source / 'tao.png', ns=(0, 0))
+    (dest / 'bread.png').unlink()
+    plan = plan_tree(source, dest, target_3d, state)
+    assert plan['checked'] == 2 and plan['changed_sources'] == 1
+    assert plan['copy'] == [(Path('tao.png'), 'apple.png', 'update'),
+                            (Path('banh_mi.png'), 'bread.png', 'add')]
+    apply_plan(plan, state)
+    assert plan_tree(source, dest, target_3d, state)['skipped']
+
+    # A removed source drops its target
+    (source / 'fruits' / 'chuoi.png').unlink()
+    plan = plan_tree(source, dest, target_3d, state)
+    assert plan['checked'] == 1 and not plan['copy'] and 'banana.png' not in plan['targets']
@@ -0,0 +1,90 @@
+"""
+Fluent icon importer checks
+Indexing, name resolution and the copy-only-what-changed sync against
+the tiny mirror in fixtures/fluent_mirror
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_import_fluent_icons.py
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from import_fluent_icons import import_icons, index_mirror, resolve_icons
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+SOURCES = {
+    'apple_red': 'Red apple',
+    'fried_egg': 'Fried egg',
+    'thumbs_up': 'thumbs_up',
+    'banana': 'Banana',
+    'dragon_fruit': 'Dragon fruit',
+}
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    """A writable copy of the fixture mirror"""
+    return Path(shutil.copytree(FIXTURES / 'fluent_mirror', tmp_path / 'mirror'))
+
+
+def test_index_mirror(mirror):
+    index = index_mirror(mirror)
+    # Folder names and CLDR names both reach the same files
+    assert sorted(index) == ['banana', 'cooking', 'fried egg', 'red apple', 'thumbs up']
+    assert index['fried egg'] is index['cooking']
+    assert index['cooking']['flat'].name == 'cooking_flat.svg'
+    assert index['cooking']['3d'].name == 'cooking_3d.png'
+    # Skin-tone emoji use the Default tone; no *_flat.svg there, so its only file
+    assert index['thumbs up']['flat'].parts[-3:] == ('Default', 'Flat', 'thumbs_up_flat_default.svg')
+    assert list(index['banana']) == ['flat']
+
+
+def test_resolve_icons(mirror, tmp_path):
+    output_dir = tmp_path / 'out'
+    pairs, missing = resolve_icons(index_mirror(mirror), SOURCES, output_dir)
+    destinations = {destination.relative_to(output_dir).as_posix(): source.name
+                    for source, destination in pairs}
+    assert destinations == {
+        'flat/apple_red.svg': 'red_apple_flat.svg',
+        '3d/apple_red.png': 'red_apple_3d.png',
+        'flat/fried_egg.svg': 'cooking_flat.svg',
+        '3d/fried_egg.png': 'cooking_3d.png',
+        'flat/thumbs_up.svg': 'thumbs_up_flat_default.svg',
+        '3d/thumbs_up.png': 'thumbs_up_3d_default.png',
+        'flat/banana.svg': 'banana_flat.svg',
+    }
+    assert missing == ['banana (3d: Banana)', 'dragon_fruit (flat: Dragon fruit)',
+                       'dragon_fruit (3d: Dragon fruit)']
+
+
+def test_copies_only_missing_or_changed(mirror, tmp_path):
+    output_dir = tmp_path / 'out'
+    first = import_icons(mirror, output_dir, SOURCES, workers=2)
+    assert first['indexed'] == 5
+    assert len(first['copied']) == 7 and not first['unchanged']
+    for source, destination in resolve_icons(index_mirror(mirror), SOURCES, output_dir)[0]:
+        assert destination.read_bytes() == source.read_bytes()
+    assert not list(output_dir.rglob('*.tmp'))
+
+    second = import_icons(mirror, output_dir, SOURCES, workers=2)
+    assert second['copied'] == [] and len(second['unchanged']) == 7
+
+    # One destination deleted, one edited locally (same size), one source updated upstream
+    (output_dir / 'flat' / 'banana.svg').unlink()
+    edited = output_dir / '3d' / 'apple_red.png'
+    edited.write_bytes(edited.read_bytes().upper())
+    (mirror / 'assets' / 'Cooking' / '3D' / 'cooking_3d.png').write_bytes(b'new cooking 3d')
+    expected = sorted([output_dir / 'flat' / 'banana.svg', edited, output_dir / '3d' / 'fried_egg.png'])
+
+    planned = import_icons(mirror, output_dir, SOURCES, workers=2, dry_run=True)
+    assert sorted(planned['copied']) == expected
+    assert not (output_dir / 'flat' / 'banana.svg').exists()
+
+    third = import_icons(mirror, output_dir, SOURCES, workers=2)
+    assert sorted(third['copied']) == expected
+    assert (output_dir / '3d' / 'fried_egg.png').read_bytes() == b'new cooking 3d'
+    assert import_icons(mirror, output_dir, SOURCES, workers=2)['copied'] == []
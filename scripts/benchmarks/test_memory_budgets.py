@@ -0,0 +1,197 @@
+"""
+Memory budgets for the Fresh Keeper pipeline
+Fails when an entry point's peak traced memory outgrows its budget
+
+Each entry point runs against the synthetic catalog for --bench-sizes
+under instrumentation's --trace-memory, which gives the tracemalloc peak
+of the whole run and of every stage it marks (load, score, save, ...).
+Budgets are `fixed MB + MB per 1k products`; streaming stages have no
+per-product term, so they must stay flat however large the catalog is.
+
+When a budget is exceeded the entry point is re-run with a watcher that
+snapshots the heap near the peak, and the top allocation sites are part
+of the failure message.
+
+Requires: pip install pytest pytest-benchmark numpy scipy
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_memory_budgets.py
+  python3 -m pytest scripts/benchmarks/test_memory_budgets.py --bench-sizes 100k
+"""
+
+import contextlib
+import io
+import json
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import pytest
+
+from conftest import SIZES
+from deduplicate_products import deduplicate_products
+from deduplicate_products_v2 import deduplicate_products as deduplicate_products_v2
+from expand_database import expand_database
+from expand_database_v2 import expand_database_v2
+from generate_icon_config import generate_config
+from generate_synthetic_catalog import CatalogGenerator, write_catalog
+from instrumentation import instrumented
+from map_product_icons import get_matcher, map_product_icons
+from massive_expansion import massive_expand
+
+MB = 1024 * 1024
+
+# (fixed MB, MB per 1k products). The catalog costs ~5 MB per 1k products
+# as nested dicts; catalog_codec encodes it CHUNK_SIZE products at a time,
+# which adds a fixed ~1 MB of buffers on top.
+LOAD_BUDGET = (2, 6.0)
+SAVE_BUDGET = (3, 4.0)
+FILE_STAGE_BUDGETS = {'total': LOAD_BUDGET, 'load': LOAD_BUDGET, 'save': SAVE_BUDGET}
+
+BUDGETS = {
+    'dedupe': FILE_STAGE_BUDGETS,
+    'dedupe_v2': FILE_STAGE_BUDGETS,
+    'expand': FILE_STAGE_BUDGETS,
+    'expand_v2': FILE_STAGE_BUDGETS,
+    'massive_expand': FILE_STAGE_BUDGETS,
+    # Scoring works in CHUNK_SIZE batches on top of the loaded catalog
+    'icon_mapping': {'total': (40, 6.0), 'load': LOAD_BUDGET,
+                     'score': (40, 4.5), 'save': SAVE_BUDGET},
+    'dart_codegen': {'total': (2, 6.0), 'load': (2, 2.0), 'save': (2, 6.0)},
+    # Streams products to disk: must not grow with the catalog
+    'synthetic_catalog': {'total': (4, 0.0)},
+}
+
+# Allocation sites listed when a budget fails, and frames kept per site
+TOP_SITES = 10
+TRACE_FRAMES = 8
+
+
+def budget_mb(budget: Tuple[float, float], products: int) -> float:
+    fixed, per_1k = budget
+    return fixed + per_1k * products / 1000
+
+
+def traced_run(name: str, fn: Callable, report_path: Path) -> Dict:
+    """Run fn under --trace-memory instrumentation and return the run report"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        with instrumented(name, trace_memory=True, report_path=report_path):
+            fn()
+    with open(report_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def allocation_sites(fn: Callable, near_mb: float, limit: int = TOP_SITES) -> List[str]:
+    """
+    Top allocation sites in a heap snapshot taken as traced memory
+    reaches near_mb (or its highest point, if the peak is inside C code
+    the watcher can't interrupt)
+    """
+    snapshots = []
+    best = [0]
+    done = threading.Event()
+
+    def watch():
+        while not done.is_set():
+            current = tracemalloc.get_traced_memory()[0]
+            if current >= near_mb * MB * 0.9:
+                snapshots.append(tracemalloc.take_snapshot())
+                return
+            # Keep a fallback snapshot every time memory grows by a quarter
+            if current > best[0] * 1.25:
+                best[0] = current
+                snapshots[:] = [tracemalloc.take_snapshot()]
+            time.sleep(0.001)
+
+    tracemalloc.start(TRACE_FRAMES)
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+    finally:
+        done.set()
+        watcher.join()
+        tracemalloc.stop()
+
+    if not snapshots:
+        return []
+    snapshot = snapshots[-1].filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+    ])
+    lines = []
+    for stat in snapshot.statistics('traceback')[:limit]:
+        # Innermost frame, plus the closest frame in our own scripts
+        frames = list(stat.traceback)
+        ours = next((f for f in reversed(frames) if '/scripts/' in f.filename), frames[-1])
+        site = f'{Path(frames[-1].filename).name}:{frames[-1].lineno}'
+        if ours is not frames[-1]:
+            site += f' ← {Path(ours.filename).name}:{ours.lineno}'
+        lines.append(f'{stat.size / MB:8.1f} MB  {stat.count:>9} blocks  {site}')
+    return lines
+
+
+def check_budgets(stage: str, size: str, fn: Callable, tmp_path: Path):
+    products = SIZES[size]
+    report = traced_run(stage, fn, tmp_path / 'run.json')
+    peaks = {'total': report['peak_mb']}
+    peaks.update({name: entry['peak_mb'] for name, entry in report['stages'].items()})
+
+    over = []
+    for name, budget in BUDGETS[stage].items():
+        limit = budget_mb(budget, products)
+        if name not in peaks:
+            over.append(f'{name}: stage not recorded')
+        elif peaks[name] > limit:
+            over.append(f'{name}: {peaks[name]:.1f} MB > budget {limit:.1f} MB')
+    if over:
+        sites = allocation_sites(fn, max(peaks.values()))
+        pytest.fail(f"{stage} @ {size} over memory budget:\n  " + '\n  '.join(over)
+                    + '\nTop allocation sites near the peak:\n  ' + '\n  '.join(sites),
+                    pytrace=False)
+
+
+@pytest.mark.parametrize('stage, entry_point', [
+    ('dedupe', deduplicate_products),
+    ('dedupe_v2', deduplicate_products_v2),
+    ('expand', expand_database),
+    ('expand_v2', expand_database_v2),
+    ('massive_expand', massive_expand),
+    ('icon_mapping', map_product_icons),
+])
+def test_file_stage_budget(catalog_path, size, tmp_path, stage, entry_point):
+    path = catalog_path(size)
+    get_matcher()
+    check_budgets(stage, size, lambda: entry_point(path, tmp_path / 'out.json'), tmp_path)
+
+
+def test_dart_codegen_budget(catalog_path, size, tmp_path, monkeypatch):
+    with open(catalog_path(size), 'r', encoding='utf-8') as f:
+        products = json.load(f)['products']
+    manifest = {'flat': {}, '3d': {}}
+    for index, product in enumerate(products):
+        icon_type = 'flat' if index % 2 else '3d'
+        manifest[icon_type][product['id']] = {
+            'filename': f"{product['id']}.png",
+            'path': f"assets/product_icons/{icon_type}/{product['id']}.png",
+            'category': product.get('category', 'other'),
+        }
+    del products
+    (tmp_path / 'scripts').mkdir()
+    with open(tmp_path / 'scripts/icon_manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    del manifest
+    monkeypatch.chdir(tmp_path)
+
+    check_budgets('dart_codegen', size, generate_config, tmp_path)
+
+
+def test_synthetic_catalog_budget(seed_products, size, tmp_path):
+    count = SIZES[size]
+    generator = CatalogGenerator(seed_products)
+    check_budgets('synthetic_catalog', size,
+                  lambda: write_catalog(generator.generate(count), count, tmp_path / 'catalog.json'),
+                  tmp_path)
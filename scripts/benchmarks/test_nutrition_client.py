@@ -0,0 +1,136 @@
+"""
+Async nutrition client benchmarks
+Enriching the catalog through NutritionClient against the local replay
+server (with simulated network latency), plus connection reuse, bounded
+concurrency, rate limiting, retries and cache checks
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_nutrition_client.py
+  python3 -m pytest scripts/benchmarks/test_nutrition_client.py --bench-sizes 10k
+"""
+
+import asyncio
+import copy
+import time
+
+import pytest
+
+from catalog_codec import load_json
+from nutrition_client import NutritionClient, ResponseCache, enrich_catalog, usda_values
+from nutrition_replay_server import ReplayServer
+
+# Per-response delay of the replay server, standing in for the network
+LATENCY = 0.005
+
+CONCURRENCY = 32
+
+# Products enriched by the connection / concurrency checks
+CHECKED = 1_000
+
+
+@pytest.fixture(scope='module')
+def server():
+    with ReplayServer(latency=LATENCY).running() as running:
+        yield running
+
+
+@pytest.fixture
+def catalog(catalog_path, size):
+    return load_json(catalog_path(size))
+
+
+def client_for(server, **options):
+    options.setdefault('concurrency', CONCURRENCY)
+    options.setdefault('rate', 0)
+    return NutritionClient(usda_url=server.usda_url, off_url=server.url, **options)
+
+
+def enrich(server, data, **options):
+    async def run():
+        async with client_for(server, **options) as client:
+            return await enrich_catalog(data, client, overwrite_all=True), client
+    return asyncio.run(run())
+
+
+def test_enrich_through_client(run_stage, size, server, catalog):
+    run_stage('nutrition_client_enrich', size, enrich, lambda: (server, copy.deepcopy(catalog)))
+
+
+def test_pool_concurrency_and_coverage(size, server, catalog):
+    catalog['products'] = catalog['products'][:CHECKED]
+    server.reset_stats()
+    start = time.perf_counter()
+    counts, client = enrich(server, catalog, concurrency=8)
+    elapsed = time.perf_counter() - start
+    # Only the fixture's empty "durian" search finds nothing
+    assert counts['enriched'] + counts['not_found'] == len(catalog['products'])
+    assert counts['enriched'] >= len(catalog['products']) * 0.99
+    assert counts['failed'] == 0
+    # Every product is one request, over at most `concurrency` kept-alive connections
+    assert server.requests == len(catalog['products'])
+    assert client.connections <= 8 and server.connections <= 8
+    assert server.max_in_flight <= 8
+    # A serial client would wait LATENCY per product
+    assert elapsed < len(catalog['products']) * LATENCY / 2
+    assert catalog['products'][0]['nutrition_data']['calories'] == 48
+
+
+def test_cache_serves_reruns(server, tmp_path):
+    data = {'products': [{'id': f'p{i}', 'name_en': f'Product {i}', 'nutrition_data': None} for i in range(20)]}
+    cache = ResponseCache(tmp_path / 'cache')
+    first, _ = enrich(server, copy.deepcopy(data), cache=cache)
+    server.reset_stats()
+    second, client = enrich(server, copy.deepcopy(data), cache=cache)
+    assert first['enriched'] == second['enriched'] == 20
+    assert server.requests == 0
+    assert client.stats['cache_hits'] == 20
+
+
+def test_retries_injected_failures(server):
+    data = {'products': [{'id': f'p{i}', 'name_en': f'Retry {i}', 'nutrition_data': None} for i in range(30)]}
+    server.fail_every = 4
+    server.reset_stats()
+    try:
+        counts, client = enrich(server, data, backoff=0.001)
+    finally:
+        server.fail_every = 0
+    assert counts['enriched'] == 30
+    assert client.stats['retries'] >= 30 // 4
+    assert client.stats['failures'] == 0
+
+
+def test_token_bucket_limits_rate(server):
+    data = {'products': [{'id': f'p{i}', 'name_en': f'Rate {i}', 'nutrition_data': None} for i in range(30)]}
+    start = time.perf_counter()
+    counts, _ = enrich(server, data, rate=200, burst=10)
+    # 10 at once, then 20 more at 200/s
+    assert time.perf_counter() - start >= 20 / 200 * 0.9
+    assert counts['enriched'] == 30
+
+
+def test_search_and_barcode_fixtures(server):
+    async def run():
+        async with client_for(server) as client:
+            return await asyncio.gather(client.search_usda('Watermelon'), client.search_off('Hao Hao'),
+                                        client.product_by_barcode('8934563138165'),
+                                        client.product_by_barcode('0000000000000'),
+                                        client.search_usda('durian'))
+    usda, off, product, missing, empty = asyncio.run(run())
+    assert usda[0]['fdcId'] == 167765
+    assert off[0]['code'] == '8934563138165'
+    assert product['product_name'] == 'Mì Hảo Hảo tôm chua cay'
+    assert missing is None
+    assert empty == []
+
+
+def test_usda_values_units():
+    food = {'foodNutrients': [
+        {'nutrientName': 'Energy', 'unitName': 'kJ', 'value': 127},
+        {'nutrientName': 'Energy', 'unitName': 'KCAL', 'value': 30},
+        {'nutrientName': 'Vitamin A, RAE', 'unitName': 'UG', 'value': 28},
+        {'nutrientName': 'Vitamin A, IU', 'unitName': 'IU', 'value': 569},
+    ]}
+    # The catalog and the app keep vitamin A in IU, never RAE µg
+    assert usda_values(food) == {(None, 'calories'): 30.0, ('vitamins', 'vitamin_a'): 569.0}
+    food['foodNutrients'][-1]['unitName'] = 'UG'
+    assert ('vitamins', 'vitamin_a') not in usda_values(food)
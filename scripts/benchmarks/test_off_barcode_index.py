@@ -0,0 +1,132 @@
+"""
+Offline barcode index benchmarks
+Building the barcode table from a gzipped Open Food Facts style dump and
+looking barcodes up in it, plus mapping / filter checks on the fixture
+dumps in fixtures/
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_off_barcode_index.py
+  python3 -m pytest scripts/benchmarks/test_off_barcode_index.py --bench-sizes 100k
+"""
+
+import contextlib
+import gzip
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from catalog_codec import load_json
+from conftest import SIZES
+from off_barcode_index import BarcodeIndex, build
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+LOOKUPS = 1000
+
+# Small runs so the benchmark dumps spill and merge several runs
+RUN_SIZE = 2_000
+
+
+def barcode(i: int) -> str:
+    # Vietnamese EAN-13s for even products, foreign ones for odd
+    return f"{893 if i % 2 == 0 else 500}{i * 7919 % 10 ** 9:09d}0"
+
+
+@pytest.fixture
+def dump_path(catalog_path, size, tmp_path):
+    """The synthetic catalog written as a gzipped OFF JSONL dump"""
+    products = load_json(catalog_path(size))['products']
+    path = tmp_path / 'off.jsonl.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for i, product in enumerate(products):
+            nutrition = product.get('nutrition_data') or {}
+            f.write(json.dumps({
+                'code': barcode(i),
+                'product_name': product['name_vi'],
+                'product_name_en': product['name_en'],
+                'categories': product['category'],
+                'countries_tags': ['en:vietnam'] if i % 4 == 0 else ['en:france'],
+                'nutriments': {'energy-kcal_100g': nutrition.get('calories')},
+            }, ensure_ascii=False) + '\n')
+    return path
+
+
+@pytest.fixture
+def table_path(dump_path, tmp_path):
+    path = tmp_path / 'off_barcodes.bin'
+    with contextlib.redirect_stdout(io.StringIO()):
+        build(dump_path, path, run_size=RUN_SIZE)
+    return path
+
+
+def build_table(dump, output):
+    return build(dump, output, run_size=RUN_SIZE)
+
+
+def lookups(path, count):
+    with BarcodeIndex(path) as index:
+        return sum(index.lookup(barcode(i)) is not None for i in range(count))
+
+
+def test_build_barcode_table(run_stage, size, dump_path, tmp_path):
+    run_stage('off_index_build', size, build_table, lambda: (dump_path, tmp_path / 'bench.bin'))
+
+
+def test_barcode_lookups(run_stage, size, table_path):
+    count = min(LOOKUPS, SIZES[size])
+    run_stage('off_index_lookups', size, lookups, lambda: (table_path, count))
+
+
+def test_table_keeps_vietnamese_market(size, table_path):
+    with BarcodeIndex(table_path) as index:
+        assert len(index) == (SIZES[size] + 1) // 2
+        assert index.lookup(barcode(0))['barcode'] == barcode(0)
+        assert index.lookup(barcode(1)) is None
+
+
+def build_fixture(name, tmp_path, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        counts = build(FIXTURES / name, tmp_path / 'fixture.bin', **options)
+    return counts, BarcodeIndex(tmp_path / 'fixture.bin')
+
+
+def test_jsonl_fixture_mapping(tmp_path):
+    counts, index = build_fixture('off_sample.jsonl', tmp_path, run_size=2)
+    with index:
+        assert counts == {'read': 9, 'kept': 5, 'duplicates': 1, 'skipped': 3}
+        noodles = index.lookup('8934563138165')
+        assert noodles['name_vi'] == 'Mì Hảo Hảo tôm chua cay'
+        assert noodles['name_en'] == 'Hao Hao shrimp noodles'
+        assert noodles['category'] == 'dry_food'
+        assert noodles['shelf_life_refrigerated'] == 30
+        assert noodles['health_warnings'] == ['en:gluten', 'en:crustaceans']
+        assert noodles['nutrition_data']['minerals'] == {'sodium': 1.4}
+
+        milk = index.lookup('8934673573016')
+        assert milk['category'] == 'dairy'
+        assert milk['nutrition_data']['calories'] == 75.0
+        assert milk['nutrition_data']['vitamins'] == {'vitamin_d': 1.2e-06}
+        # No allergens_tags: an empty list, like the catalog's templates
+        assert milk['health_warnings'] == []
+
+        # EAN-8 and the same code zero-padded to GTIN-14 find one product
+        assert index.lookup('89340012')['category'] == 'eggs'
+        assert index.lookup('00000089340012')['category'] == 'eggs'
+        assert index.lookup('8936036021103')['category'] == 'frozen'
+        assert index.lookup('3017620422003')['category'] == 'other'
+        for missing in ('5449000000996', '8935049510017', '893abc', ''):
+            assert index.lookup(missing) is None
+
+
+def test_csv_fixture_mapping(tmp_path):
+    counts, index = build_fixture('off_sample.csv', tmp_path, all_countries=True)
+    with index:
+        assert counts == {'read': 4, 'kept': 3, 'duplicates': 1, 'skipped': 0}
+        assert index.lookup('8934822101114')['name_vi'] == 'Rau muống'
+        assert index.lookup('8934822101114')['category'] == 'vegetables'
+        noodles = index.lookup('8934563138165')
+        assert noodles['health_warnings'] == ['en:gluten', 'en:crustaceans']
+        assert noodles['nutrition_data']['fat'] == 20.0
+        assert index.lookup('5449000000996')['name_en'] == 'Coca-Cola'
@@ -0,0 +1,46 @@
+"""
+Icon asset optimizer checks
+Lossless PNG re-encoding: smaller or equal output, identical pixels,
+and PNGs that aren't 8 bits per channel left untouched
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_optimize_icon_assets.py
+"""
+
+import io
+import struct
+import zlib
+
+import pytest
+
+np = pytest.importorskip('numpy')
+Image = pytest.importorskip('PIL.Image')
+
+from optimize_icon_assets import PNG_SIGNATURE, optimize_png, png_chunk  # noqa: E402
+
+
+def rgba16_png(width, height):
+    """A 16-bit RGBA PNG, which Pillow can only decode at 8 bits per channel"""
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 1 << 16, size=(height, width, 4), dtype=np.uint16).astype('>u2')
+    raw = b''.join(b'\0' + row.tobytes() for row in pixels)
+    header = struct.pack('>IIBBBBB', width, height, 16, 6, 0, 0, 0)
+    return (PNG_SIGNATURE + png_chunk(b'IHDR', header) + png_chunk(b'IDAT', zlib.compress(raw, 1))
+            + png_chunk(b'IEND', b''))
+
+
+def test_sixteen_bit_png_is_left_alone():
+    data = rgba16_png(16, 16)
+    assert Image.open(io.BytesIO(data)).mode == 'RGBA'
+    assert optimize_png(data) == data
+
+
+@pytest.mark.parametrize('mode, color', [('RGBA', (10, 20, 30, 128)), ('RGB', (10, 20, 30)), ('P', 3)])
+def test_eight_bit_png_keeps_pixels(mode, color):
+    image = Image.new(mode, (32, 32), color)
+    image.paste(Image.new(mode, (8, 8)), (4, 4))
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    optimized = optimize_png(buffer.getvalue())
+    assert np.array_equal(np.asarray(Image.open(io.BytesIO(optimized)).convert('RGBA')),
+                          np.asarray(image.convert('RGBA')))
@@ -0,0 +1,111 @@
+"""
+Pipeline benchmarks for Fresh Keeper
+Times every data/icon pipeline stage on synthetic catalogs of 1k–1M products
+
+Each test runs one stage on the catalog for its size, records the median
+time and peak traced memory, and fails when the stage regressed past
+--bench-threshold against baseline.json. 1k and 10k run by default;
+100k and 1M are opt-in because they take minutes.
+
+Requires: pip install pytest pytest-benchmark numpy scipy
+
+Usage:
+  python3 -m pytest scripts/benchmarks
+  python3 -m pytest scripts/benchmarks --bench-sizes 1k,10k,100k,1m
+  python3 -m pytest scripts/benchmarks --bench-save-baseline
+  python3 -m pytest scripts/benchmarks -k icon_match --bench-threshold 0.1
+"""
+
+import json
+
+import pytest
+
+from conftest import SIZES
+from deduplicate_products import deduplicate_products
+from deduplicate_products_v2 import deduplicate_products as deduplicate_products_v2
+from expand_database import expand_database
+from expand_database_v2 import expand_database_v2
+from generate_icon_config import generate_config
+from icon_organizer import generate_manifest
+from map_product_icons import get_matcher, map_product_icons
+from massive_expansion import massive_expand
+
+# Icon trees beyond this many files aren't realistic and take long to create
+MAX_ICON_FILES = 100_000
+
+
+def load_catalog(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_catalog(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def test_catalog_load(run_stage, catalog_path, size):
+    path = catalog_path(size)
+    run_stage('catalog_load', size, load_catalog, lambda: (path,))
+
+
+def test_catalog_save(run_stage, catalog_path, size, tmp_path):
+    data = load_catalog(catalog_path(size))
+    run_stage('catalog_save', size, save_catalog, lambda: (data, tmp_path / 'catalog.json'))
+
+
+@pytest.mark.parametrize('stage, fn', [
+    ('dedupe', deduplicate_products),
+    ('dedupe_v2', deduplicate_products_v2),
+    ('expand', expand_database),
+    ('expand_v2', expand_database_v2),
+    ('massive_expand', massive_expand),
+])
+def test_file_stage(run_stage, catalog_path, size, tmp_path, stage, fn):
+    path = catalog_path(size)
+    run_stage(stage, size, fn, lambda: (path, tmp_path / 'out.json'))
+
+
+def test_icon_match(run_stage, catalog_path, size):
+    products = load_catalog(catalog_path(size))['products']
+    matcher = get_matcher()
+    run_stage('icon_match', size, matcher.match, lambda: (products,))
+
+
+def test_icon_mapping(run_stage, catalog_path, size, tmp_path):
+    path = catalog_path(size)
+    get_matcher()
+    run_stage('icon_mapping', size, map_product_icons, lambda: (path, tmp_path / 'mapped.json'))
+
+
+def test_manifest(run_stage, catalog_path, size, tmp_path, monkeypatch):
+    if SIZES[size] > MAX_ICON_FILES:
+        pytest.skip(f'icon trees are capped at {MAX_ICON_FILES} files')
+    products = load_catalog(catalog_path(size))['products']
+    for index, product in enumerate(products):
+        icon_dir = tmp_path / 'assets/product_icons' / ('flat' if index % 2 else '3d')
+        icon_dir.mkdir(parents=True, exist_ok=True)
+        (icon_dir / f"{product['id']}.png").touch()
+    (tmp_path / 'scripts').mkdir()
+    monkeypatch.chdir(tmp_path)
+
+    run_stage('manifest', size, generate_manifest, lambda: (False,))
+
+
+def test_dart_codegen(run_stage, catalog_path, size, tmp_path, monkeypatch):
+    products = load_catalog(catalog_path(size))['products']
+    manifest = {'flat': {}, '3d': {}}
+    for index, product in enumerate(products):
+        icon_type = 'flat' if index % 2 else '3d'
+        extension = 'svg' if icon_type == 'flat' else 'png'
+        manifest[icon_type][product['id']] = {
+            'filename': f"{product['id']}.{extension}",
+            'path': f"assets/product_icons/{icon_type}/{product['id']}.{extension}",
+            'category': product.get('category', 'other'),
+        }
+    (tmp_path / 'scripts').mkdir()
+    with open(tmp_path / 'scripts/icon_manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    monkeypatch.chdir(tmp_path)
+
+    run_stage('dart_codegen', size, generate_config)
@@ -0,0 +1,89 @@
+"""
+ProductRecord vs dict benchmarks
+Compares load/save time, retained memory and loop throughput of the
+__slots__ ProductRecord against plain product dicts
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_product_record_benchmarks.py
+  python3 -m pytest scripts/benchmarks/test_product_record_benchmarks.py --bench-sizes 100k
+"""
+
+import gc
+import json
+import tracemalloc
+
+import pytest
+
+from conftest import SIZES
+from product_record import dump_catalog, load_catalog
+
+# Records must keep at most this share of the dict catalog's memory
+MAX_RETAINED_RATIO = 0.7
+
+
+def load_dicts(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def group_dicts(products):
+    """The dedupe scripts' grouping loop over dicts"""
+    grouped = {}
+    for product in products:
+        grouped.setdefault(product['name_vi'], []).append(
+            (product.get('shelf_life_refrigerated', 0), product.get('category', '')))
+    return grouped
+
+
+def group_records(products):
+    """The same loop over ProductRecords"""
+    grouped = {}
+    for product in products:
+        grouped.setdefault(product.name_vi, []).append(
+            (product.shelf_life_refrigerated, product.category))
+    return grouped
+
+
+def retained_mb(load, path) -> float:
+    """Traced memory still held by the loaded catalog"""
+    # Load once untraced so imports, interning and codec caches aren't counted
+    load(path)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        data = load(path)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del data
+    return current / 1024 / 1024
+
+
+def test_record_load(run_stage, catalog_path, size):
+    path = catalog_path(size)
+    run_stage('catalog_load_records', size, load_catalog, lambda: (path,))
+
+
+def test_record_save(run_stage, catalog_path, size, tmp_path):
+    data = load_catalog(catalog_path(size))
+    run_stage('catalog_save_records', size, dump_catalog, lambda: (data, tmp_path / 'catalog.json'))
+
+
+@pytest.mark.parametrize('representation', ['dict', 'records'])
+def test_group_loop(run_stage, catalog_path, size, representation):
+    path = catalog_path(size)
+    if representation == 'dict':
+        products = load_dicts(path)['products']
+        run_stage('group_loop_dict', size, group_dicts, lambda: (products,))
+    else:
+        products = load_catalog(path)['products']
+        run_stage('group_loop_records', size, group_records, lambda: (products,))
+
+
+def test_records_retain_less_memory(catalog_path, size):
+    path = catalog_path(size)
+    as_dicts = retained_mb(load_dicts, path)
+    as_records = retained_mb(load_catalog, path)
+    print(f"\n{SIZES[size]} products: dicts {as_dicts:.1f} MB, records {as_records:.1f} MB "
+          f"({as_records / as_dicts:.0%})")
+    assert as_records <= as_dicts * MAX_RETAINED_RATIO
@@ -0,0 +1,143 @@
+"""
+Query advisor benchmarks
+Proposing and applying indexes for every sqflite call in lib/ against the
+harness database, plus extraction checks on the app's sources and on
+Dart edge cases
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_query_advisor.py
+  python3 -m pytest scripts/benchmarks/test_query_advisor.py --bench-sizes 100k
+"""
+
+from datetime import date
+
+import pytest
+
+from catalog_codec import load_json
+from conftest import REPO_ROOT, SIZES
+from query_advisor import advise, extract, extract_calls
+from sqlite_harness import build_database
+
+LIB = REPO_ROOT / 'lib'
+TODAY = date(2026, 1, 15)
+
+CONSTANTS = {'tableUserProducts': 'user_products', 'searchSuggestionLimit': 10}
+
+DART = r'''
+class InventoryDao {
+  Future<List<Map<String, dynamic>>> byLocation(String location) async {
+    final db = await database;
+    return db.query(
+      AppConstants.tableUserProducts,
+      columns: ['id', 'name'],
+      // where: 'ignored = ?',
+      where: 'location = ? AND status = ?', // trailing comment, with (parens)
+      whereArgs: [location, 'active'],
+      orderBy: 'name ASC',
+      limit: AppConstants.searchSuggestionLimit,
+    );
+  }
+
+  Future<void> stats() async {
+    await db.rawQuery(
+      r'SELECT location, COUNT(*) FROM user_products '
+      "WHERE status = 'active' GROUP BY location",
+    );
+    await db.rawQuery('SELECT * FROM ${AppConstants.tableUserProducts} WHERE name = ?', ['Táo, "đỏ"']);
+    await db.rawQuery('SELECT * FROM $table');
+    await currentUser?.delete();
+  }
+}
+'''
+
+
+@pytest.fixture(scope='module')
+def sites():
+    return extract(LIB)
+
+
+@pytest.fixture(scope='module')
+def templates():
+    return load_json(REPO_ROOT / 'assets' / 'data' / 'products_sample.json')['products']
+
+
+def build(templates, size):
+    return build_database(':memory:', templates, SIZES[size], TODAY)
+
+
+def run_advise(conn, sites):
+    report = advise(conn, sites, TODAY, repeat=1)
+    conn.close()
+    return report
+
+
+def test_advise_and_apply(run_stage, size, templates, sites):
+    run_stage('query_advisor', size, run_advise, lambda: (build(templates, size), extract(LIB)))
+
+
+def test_proposals_remove_sorts(size, templates):
+    conn = build(templates, size)
+    report = advise(conn, extract(LIB), TODAY, repeat=1)
+    conn.close()
+    proposals = {proposal['name']: proposal for proposal in report['proposals']}
+    category = proposals['idx_user_products_status_category_expiry_date']
+    assert category['columns'] == ['status', 'category', 'expiry_date']
+    assert 'ProductLocalDataSource.getProductsByCategory' in category['serves']
+    # getCountByCategory's (status, category) is a prefix, so it's merged in
+    assert 'ProductLocalDataSource.getCountByCategory' in category['serves']
+    assert 'ProductLocalDataSource.getExpiringSoonCount' in \
+        proposals['idx_user_products_status_expiry_date']['serves']
+    redundant = [name for proposal in report['proposals'] for name in proposal['redundant']]
+    assert redundant == ['idx_user_products_status']
+
+    by_owner = {entry['owner']: entry for entry in report['sites']}
+    for owner in ('getAllProducts', 'getProductsByCategory', 'getExpiringSoon', 'getRecentProducts'):
+        entry = by_owner[f'ProductLocalDataSource.{owner}']
+        assert entry['before']['temp_sort'] and not entry['after']['temp_sort']
+        assert entry['before']['rows'] == entry['after']['rows']
+    assert by_owner['ProductLocalDataSource.getCountByCategory']['after']['plan'][0].startswith(
+        'SEARCH user_products USING COVERING INDEX')
+    assert report['size_after'] > report['size_before']
+
+
+def test_tiny_tables_and_like_are_noted(templates):
+    conn = build(templates, '1k')
+    report = advise(conn, extract(LIB), TODAY, repeat=1, min_rows=0, apply=False)
+    conn.close()
+    assert 'FTS' in report['notes']['ProductLocalDataSource.searchTemplates']
+    assert 'after' not in report['sites'][0]
+    conn = build(templates, '1k')
+    report = advise(conn, extract(LIB), TODAY, repeat=1, apply=False)
+    conn.close()
+    assert 'rows' in report['notes']['ProductLocalDataSource.getAllCategories']
+
+
+def test_extract_app_sources(sites):
+    by_owner = {}
+    for site in sites:
+        by_owner.setdefault(site.owner, site)
+    assert len(sites) >= 30
+    assert not [site for site in sites if site.unresolved]
+    assert by_owner['ProductLocalDataSource.getProductsByCategory'].sql == \
+        'SELECT * FROM user_products WHERE category = ? AND status = ? ORDER BY expiry_date ASC'
+    assert by_owner['ProductLocalDataSource.getRecentProducts'].sql.endswith('ORDER BY created_at DESC LIMIT 5')
+    assert by_owner['ProductLocalDataSource.getExpiringSoonCount'].sql == \
+        'SELECT COUNT(*) as count FROM user_products WHERE expiry_date >= ? AND expiry_date < ? AND status = ?'
+    assert by_owner['ProductLocalDataSource.getAllProducts'].args[0] == 'active'
+    reorder = by_owner['ShoppingListProvider._reorderItems']
+    assert reorder.batch and reorder.sql == 'UPDATE shopping_list SET sort_order = ? WHERE id = ?'
+    assert not [site for site in sites if 'auth_service' in site.file]
+
+
+def test_extract_dart_edge_cases():
+    sites = extract_calls(DART, 'inventory_dao.dart', CONSTANTS)
+    assert len(sites) == 4
+    query, grouped, named, dynamic = sites
+    assert query.owner == 'InventoryDao.byLocation'
+    assert query.sql == ('SELECT id, name FROM user_products WHERE location = ? AND status = ? '
+                         'ORDER BY name ASC LIMIT 10')
+    assert query.args[1] == 'active'
+    assert grouped.owner == 'InventoryDao.stats'
+    assert grouped.group_by == 'location' and grouped.where == "status = 'active'"
+    assert named.table == 'user_products' and named.args == ['Táo, "đỏ"']
+    assert dynamic.unresolved and dynamic.sql is None
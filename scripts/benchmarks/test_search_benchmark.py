@@ -0,0 +1,94 @@
+"""
+Template search benchmarks
+The query mix against product_templates built from each catalog size,
+once per strategy (LIKE, FTS5 unicode61, FTS5 trigram, folded key
+column, folded word index), plus result and plan checks
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_search_benchmark.py
+  python3 -m pytest scripts/benchmarks/test_search_benchmark.py --bench-sizes 100k
+"""
+
+import sqlite3
+
+import pytest
+
+from catalog_codec import load_json
+from search_benchmark import STRATEGIES, STRATEGIES_BY_NAME, benchmark, fold, load_templates, query_mix
+
+QUERIES = 100
+
+
+@pytest.fixture
+def products(catalog_path, size):
+    return load_json(catalog_path(size))['products']
+
+
+@pytest.fixture(scope='module')
+def databases():
+    """Return a function giving a templates database with every strategy built, once per size"""
+    built = {}
+
+    def get(size, products):
+        if size not in built:
+            conn = sqlite3.connect(':memory:')
+            load_templates(conn, products)
+            for strategy in STRATEGIES:
+                strategy.build(conn)
+            built[size] = conn
+        return built[size]
+
+    yield get
+    for conn in built.values():
+        conn.close()
+
+
+def run_queries(conn, strategy, queries):
+    for _, query in queries:
+        strategy.search(conn, query)
+
+
+@pytest.mark.parametrize('name', [strategy.name for strategy in STRATEGIES])
+def test_search_strategy(run_stage, size, products, databases, name):
+    conn = databases(size, products)
+    queries = query_mix(products, QUERIES)
+    run_stage(f'search_{name}', size, run_queries, lambda: (conn, STRATEGIES_BY_NAME[name], queries))
+
+
+def test_strategies_agree_on_folded_queries(size, products, databases):
+    conn = databases(size, products)
+    product = products[0]
+    words = fold(product['name_vi']).split()
+    for name in ('fts5_unicode61', 'folded_like', 'folded_prefix'):
+        strategy = STRATEGIES_BY_NAME[name]
+        assert strategy.search(conn, ' '.join(words)), name
+        assert strategy.search(conn, product['name_vi'].lower()), name
+        assert not strategy.search(conn, 'zq123x'), name
+        assert len(strategy.search(conn, words[0][0])) <= 10
+    # The app's LIKE has no diacritic folding: accented names only
+    assert STRATEGIES_BY_NAME['like'].search(conn, product['name_vi'])
+
+
+def test_indexes_replace_scans(size, products, databases):
+    conn = databases(size, products)
+    plan = ' '.join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT DISTINCT template FROM template_words WHERE word >= 'ca' AND word < 'ca{'"))
+    assert 'SEARCH template_words USING PRIMARY KEY' in plan
+    plan = ' '.join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM product_search WHERE product_search MATCH 'xoai*'"))
+    assert 'VIRTUAL TABLE INDEX' in plan
+
+
+def test_report_fields(products):
+    products = products[:500]
+    results = benchmark(products, query_mix(products, 40), repeat=1)
+    assert results['_sqlite']['version'] == sqlite3.sqlite_version
+    for strategy in STRATEGIES:
+        result = results[strategy.name]
+        assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms'] <= result['max_ms']
+        assert 0 <= result['found'] <= 1
+    assert results['like']['index_bytes'] == 0
+    assert results['fts5_unicode61']['index_bytes'] > 0
+    # Folded strategies find everything the folded-substring reference does
+    assert results['folded_like']['found'] == 1
+    assert results['folded_like']['false_hits'] == 0
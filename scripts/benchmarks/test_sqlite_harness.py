@@ -0,0 +1,99 @@
+"""
+SQLite query benchmarks
+Every query the app issues, replayed against its v16 schema with a
+synthetic inventory of one user product per catalog product, plus
+schema and query plan checks
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_sqlite_harness.py
+  python3 -m pytest scripts/benchmarks/test_sqlite_harness.py --bench-sizes 100k,1m
+"""
+
+from datetime import date
+
+import pytest
+
+from catalog_codec import load_json
+from conftest import REPO_ROOT, SIZES
+from sqlite_harness import APP_QUERIES, QUERIES_BY_NAME, build_database, explain, run_query, time_batch
+
+TODAY = date(2026, 1, 15)
+
+
+@pytest.fixture(scope='module')
+def templates():
+    return load_json(REPO_ROOT / 'assets' / 'data' / 'products_sample.json')['products']
+
+
+@pytest.fixture(scope='module')
+def databases(templates):
+    """Return a function giving the in-memory database for a size, built once"""
+    built = {}
+
+    def get(size: str):
+        if size not in built:
+            built[size] = build_database(':memory:', templates, SIZES[size], TODAY)
+        return built[size]
+
+    yield get
+    for conn in built.values():
+        conn.close()
+
+
+@pytest.mark.parametrize('name', [query.name for query in APP_QUERIES])
+def test_app_query(run_stage, size, databases, name):
+    conn = databases(size)
+    query = QUERIES_BY_NAME[name]
+    params = query.params(TODAY, conn)
+    if query.batch:
+        run_stage(f'sqlite_{name}', size, time_batch, lambda: (conn, query.sql, params, 1))
+    else:
+        run_stage(f'sqlite_{name}', size, lambda: conn.execute(query.sql, params).fetchall())
+
+
+def test_schema_and_population(size, databases, templates):
+    conn = databases(size)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_user_products_expiry', 'idx_user_products_category', 'idx_user_products_status',
+            'idx_product_templates_name_vi', 'idx_product_templates_name_en', 'idx_product_templates_category',
+            'idx_custom_templates_name_vi', 'idx_custom_templates_name_en',
+            'idx_shopping_list_sort_order'} <= indexes
+    assert conn.execute('SELECT COUNT(*) FROM user_products').fetchone()[0] == SIZES[size]
+    assert conn.execute('SELECT COUNT(*) FROM product_templates').fetchone()[0] == len(templates)
+    assert conn.execute('SELECT COUNT(*) FROM categories').fetchone()[0] == 9
+    statuses = dict(conn.execute('SELECT status, COUNT(*) FROM user_products GROUP BY status'))
+    assert set(statuses) == {'active', 'used', 'expired'}
+    # Dart toIso8601String, so string comparison orders dates
+    assert conn.execute('SELECT expiry_date FROM user_products LIMIT 1').fetchone()[0][10:] == 'T00:00:00.000'
+
+
+def test_query_results_and_plans(size, databases):
+    conn = databases(size)
+    results = {result['name']: result for result in (run_query(conn, query, TODAY, repeat=1)
+                                                     for query in APP_QUERIES)}
+    assert all(result['plan'] for result in results.values())
+    assert results['product_by_id']['rows'] == 1
+    assert 0 < results['recent_products']['rows'] <= 5
+    assert 0 < results['expiring_soon']['rows'] < results['all_products']['rows']
+    assert results['search_templates']['rows'] <= 10
+
+    # Point lookups and the status filter are indexed
+    assert results['product_by_id']['index_used'] and not results['product_by_id']['full_scan']
+    assert results['total_count']['index_used']
+    assert results['reorder_shopping_list']['index_used']
+    # Leading-wildcard LIKE can't use name indexes
+    assert results['search_templates']['full_scan']
+    assert results['search_custom_templates']['full_scan']
+    # Sorting by expiry after filtering on status needs a temp B-tree
+    assert results['all_products']['temp_sort']
+
+
+def test_batch_writes_roll_back(databases):
+    conn = databases('1k')
+    before = conn.execute('SELECT id, sort_order FROM shopping_list ORDER BY id').fetchall()
+    query = QUERIES_BY_NAME['reorder_shopping_list']
+    reversed_order = [(len(before) - i, item_id) for i, (_, item_id) in enumerate(query.params(TODAY, conn))]
+    _, rows = time_batch(conn, query.sql, reversed_order, repeat=2)
+    assert rows == len(before)
+    assert conn.execute('SELECT id, sort_order FROM shopping_list ORDER BY id').fetchall() == before
+    assert explain(conn, 'SELECT * FROM categories ORDER BY sort_order', [])['full_scan']
@@ -0,0 +1,137 @@
+"""
+USDA enrichment benchmarks
+Joining the catalog against a synthetic FoodData Central export in one
+streamed pass per table, plus match / coverage checks on the small export
+in fixtures/fdc_sample
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_usda_enrich.py
+  python3 -m pytest scripts/benchmarks/test_usda_enrich.py --bench-sizes 100k
+"""
+
+import copy
+import csv
+import shutil
+from pathlib import Path
+
+import pytest
+
+from catalog_codec import load_json
+from conftest import SIZES
+from usda_enrich import FdcExport, enrich, is_raw, nutrient_ids
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+FIRST_FDC_ID = 100_000
+
+# Nutrient rows written per synthetic food: (nutrient id, amount)
+NUTRIENTS = [('1003', 1.5), ('1004', 0.3), ('1005', 12.0), ('1079', 2.0), ('1087', 20.0)]
+
+
+@pytest.fixture
+def catalog(catalog_path, size):
+    return load_json(catalog_path(size))
+
+
+@pytest.fixture
+def export_dir(catalog, tmp_path):
+    """An FDC-shaped export: every other product as '<name>, raw', plus as many unrelated foods"""
+    directory = tmp_path / 'fdc'
+    directory.mkdir()
+    shutil.copy(FIXTURES / 'fdc_sample' / 'nutrient.csv', directory)
+    with open(directory / 'food.csv', 'w', newline='', encoding='utf-8') as foods, \
+            open(directory / 'food_nutrient.csv', 'w', newline='', encoding='utf-8') as nutrients:
+        food_writer, nutrient_writer = csv.writer(foods), csv.writer(nutrients)
+        food_writer.writerow(['fdc_id', 'data_type', 'description', 'food_category_id', 'publication_date'])
+        nutrient_writer.writerow(['id', 'fdc_id', 'nutrient_id', 'amount'])
+        row_id = 0
+        for i, product in enumerate(catalog['products']):
+            fdc_id = FIRST_FDC_ID + i
+            description = f"{product['name_en']}, raw" if i % 2 == 0 else f"Xyzzy{i}, dried"
+            food_writer.writerow([fdc_id, 'sr_legacy_food', description, '9', '2019-04-01'])
+            for nutrient_id, value in [('1008', i % 500)] + NUTRIENTS:
+                row_id += 1
+                nutrient_writer.writerow([row_id, fdc_id, nutrient_id, value])
+    return directory
+
+
+def run_enrich(data, directory):
+    with FdcExport(directory) as export:
+        return enrich(data, export, overwrite_all=True)
+
+
+def test_enrich_catalog(run_stage, size, catalog, export_dir):
+    run_stage('usda_enrich', size, run_enrich, lambda: (copy.deepcopy(catalog), export_dir))
+
+
+def test_enrich_coverage(size, catalog, export_dir):
+    report = run_enrich(catalog, export_dir)
+    assert report['enriched'] >= SIZES[size] // 2
+    first = catalog['products'][0]['nutrition_data']
+    assert first['calories'] == 0
+    assert first['carbohydrates'] == 12
+    assert first['minerals'] == {'calcium': 20}
+
+
+def fixture_catalog():
+    template = {'serving_size': '100g', 'calories': 50, 'protein': 0.5, 'carbohydrates': 13, 'fat': 0.2,
+                'fiber': 2, 'sugar': 10, 'vitamins': {'vitamin_c': 15}, 'minerals': {'potassium': 150}}
+    names = ['Watermelon', 'Apple', 'Fuji Apple', 'Ground Beef', 'Chicken Wings', 'Almond', 'Durian']
+    products = [{'id': name.lower().replace(' ', '_'), 'name_en': name, 'aliases': [name.lower()],
+                 'category': 'meat' if name in ('Ground Beef', 'Chicken Wings') else 'fruits',
+                 'nutrition_data': copy.deepcopy(template)} for name in names]
+    products.append({'id': 'watermelon_juice', 'name_en': 'Watermelon', 'aliases': [], 'category': 'beverages',
+                     'nutrition_data': dict(template, calories=46)})
+    return {'version': '1.0', 'products': products}
+
+
+def test_fixture_matches():
+    data = fixture_catalog()
+    with FdcExport(FIXTURES / 'fdc_sample') as export:
+        report = enrich(data, export)
+    products = {product['id']: product['nutrition_data'] for product in data['products']}
+
+    matched = {entry['id']: entry for entry in report['enriched_products']}
+    assert sorted(matched) == ['apple', 'fuji_apple', 'watermelon']
+    assert matched['watermelon']['fdc_id'] == '167765'
+    assert matched['watermelon']['confidence'] == 1.0
+    assert matched['apple']['fdc_id'] == '171688'
+    assert matched['fuji_apple']['fdc_id'] == '1750340'
+
+    # kcal, never kJ; USDA vitamins / minerals replace the template's
+    assert products['watermelon']['calories'] == 30
+    assert products['watermelon']['vitamins'] == {'vitamin_c': 8.1, 'vitamin_a': 569}
+    assert products['watermelon']['minerals'] == {'potassium': 112}
+    # Macros USDA lacks keep the template value
+    assert products['apple']['sugar'] == 10.39
+    assert products['apple']['fat'] == 0.2
+    # Foundation foods carry Atwater energy instead of 1008
+    assert products['fuji_apple']['calories'] == 63
+
+    # Its own nutrition isn't a template, so the second watermelon is left alone
+    assert products['watermelon_juice']['calories'] == 46
+    assert {entry['id'] for entry in report['low_confidence']} == {'ground_beef', 'chicken_wings', 'almond'}
+    assert report['unmatched'] == ['durian']
+    assert report['by_category']['fruits'] == {'products': 5, 'targets': 5, 'enriched': 3}
+
+
+def test_nutrient_units(tmp_path):
+    # Vitamin A is kept in IU like the catalog (carrots ~16700 IU), never as RAE µg
+    with FdcExport(FIXTURES / 'fdc_sample') as export:
+        ids = nutrient_ids(export)
+    assert ids['1104'] == ('vitamins', 'vitamin_a', 0)
+    assert '1106' not in ids and '1062' not in ids
+
+    export_dir = shutil.copytree(FIXTURES / 'fdc_sample', tmp_path / 'fdc')
+    nutrients = (export_dir / 'nutrient.csv').read_text(encoding='utf-8')
+    (export_dir / 'nutrient.csv').write_text(nutrients.replace('"Vitamin A, IU","IU"', '"Vitamin A, IU","UG"'),
+                                             encoding='utf-8')
+    with FdcExport(export_dir) as export:
+        assert '1104' not in nutrient_ids(export)
+
+
+def test_raw_is_a_word():
+    assert is_raw('Watermelon, raw') and is_raw('Apples, fuji, with skin, RAW')
+    assert not is_raw('Strawberries, frozen, unsweetened')
+    assert not is_raw('Crawfish, mixed species, farmed, cooked, moist heat')
+    assert not is_raw('Nuts, almonds, oil roasted, with salt added')
@@ -0,0 +1,82 @@
+"""
+Compressed catalog pack benchmarks
+Random-access lookups and full scans of the zlib-dictionary pack against
+gzip of the whole JSON, plus size and round-trip checks
+
+Usage:
+  python3 -m pytest scripts/benchmarks/test_zpack_benchmarks.py
+  python3 -m pytest scripts/benchmarks/test_zpack_benchmarks.py --bench-sizes 100k
+"""
+
+import contextlib
+import gzip
+import io
+
+import pytest
+
+from catalog_codec import dumps_json, get_codec, load_json
+from catalog_zpack import LEVEL, ZPack, build, compare
+
+LOOKUPS = 200
+
+
+@pytest.fixture
+def catalog(catalog_path, size):
+    return load_json(catalog_path(size))
+
+
+@pytest.fixture
+def pack_path(catalog, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        build(catalog, tmp_path / 'catalog.zpack')
+    return tmp_path / 'catalog.zpack'
+
+
+def lookups(path, count):
+    with ZPack(path) as pack:
+        step = max(1, len(pack) // count)
+        return [pack.record(i) for i in range(0, len(pack), step)][:count]
+
+
+def scan(path):
+    with ZPack(path) as pack:
+        return sum(1 for _ in pack)
+
+
+def gunzip_catalog(data):
+    return get_codec().decode(gzip.decompress(data))
+
+
+def test_zpack_lookups(run_stage, size, pack_path):
+    run_stage('zpack_lookups', size, lookups, lambda: (pack_path, LOOKUPS))
+
+
+def test_zpack_scan(run_stage, size, pack_path):
+    run_stage('zpack_scan', size, scan, lambda: (pack_path,))
+
+
+def test_gzip_scan(run_stage, size, catalog):
+    compressed = gzip.compress(dumps_json(catalog), LEVEL)
+    run_stage('gzip_scan', size, gunzip_catalog, lambda: (compressed,))
+
+
+def test_dictionary_pays_off(size, catalog, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        with_dict = build(catalog, tmp_path / 'dict.zpack')['total']
+        without = build(catalog, tmp_path / 'plain.zpack', zdict=b'')['total']
+    assert with_dict < without
+
+
+def test_zpack_round_trip(size, catalog, pack_path):
+    with ZPack(pack_path) as pack:
+        assert dumps_json(pack.catalog()) == dumps_json(catalog)
+        last = catalog['products'][-1]
+        assert pack.record(len(pack) - 1) == last
+        assert pack.get(catalog['products'][0]['id']) == catalog['products'][0]
+
+
+def test_compare_empty_catalog(tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = compare({'version': '1.0', 'products': []}, tmp_path)
+    assert [row['format'] for row in rows][0] == 'gzip -9 (whole JSON)'
+    assert all(row['bytes'] > 0 for row in rows)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Icon Atlas Builder for Fresh Keeper
+Packs the flat and 3D icons into per-category sprite sheets
+
+The icon picker shows hundreds of icons and each one is a separate asset
+load and decode. This script rasterizes every icon in the manifest at the
+picker cell size, trims the transparent border, and packs each
+(tier, category) group into as few sheets as possible with a MaxRects
+bin packer. Opening the picker then costs one decode per sheet.
+
+Output:
+  assets/product_icons/atlas/flat_fruits_0.png   ← sprite sheets
+  assets/product_icons/atlas/atlas.json          ← id → sheet + rect table
+
+The coordinate table is read by generate_icon_config.py, which emits
+atlasPath/atlasRect next to assetPath. Output is deterministic: the same
+icons always produce byte-identical sheets and table.
+
+Requires: pip install pillow resvg-py
+
+Usage:
+  1. Run icon_organizer.py first to create manifest
+  2. Run: python3 scripts/build_icon_atlas.py
+  3. Run: python3 scripts/generate_icon_config.py
+"""
+
+import argparse
+import io
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from instrumentation import add_count, run_script, stage
+
+MANIFEST_PATH = Path('scripts/icon_manifest.json')
+OUTPUT_DIR = Path('assets/product_icons/atlas')
+TABLE_NAME = 'atlas.json'
+
+# Icon picker draws icons at 32dp; rasterize for 3.0x screens
+CELL_SIZE = 96
+
+# Transparent gap between sprites so linear filtering never bleeds
+PADDING = 2
+
+# Largest sheet we allow; 2048 is safe on every GPU Flutter targets
+MAX_SHEET_SIZE = 2048
+
+# Manifest key → tier name used in the Dart config
+TIERS = {'flat': 'free', '3d': 'premium'}
+
+
+def rasterize_icon(path: Path, size: int):
+    """Render an SVG or PNG icon to an RGBA image of size x size"""
+    from PIL import Image
+
+    if path.suffix.lower() == '.svg':
+        import resvg_py
+        png = resvg_py.svg_to_bytes(svg_path=str(path), width=size, height=size)
+        image = Image.open(io.BytesIO(bytes(png)))
+    else:
+        image = Image.open(path)
+    image = image.convert('RGBA')
+    if image.size != (size, size):
+        image = image.resize((size, size), Image.LANCZOS)
+    return image
+
+
+class MaxRectsBin:
+    """
+    MaxRects bin packer (best short side fit)
+    Keeps the list of maximal free rectangles and places each sprite in
+    the one that leaves the smallest leftover on its short side
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.free_rects: List[Tuple[int, int, int, int]] = [(0, 0, width, height)]
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free_rects:
+            if width <= fw and height <= fh:
+                leftover_w = fw - width
+                leftover_h = fh - height
+                score = (min(leftover_w, leftover_h), max(leftover_w, leftover_h), fy, fx)
+                if best_score is None or score < best_score:
+                    best_score = score
+                    best = (fx, fy)
+        if best is None:
+            return None
+
+        self._split(best[0], best[1], width, height)
+        return best
+
+    def _split(self, x: int, y: int, width: int, height: int):
+        new_free = []
+        for fx, fy, fw, fh in self.free_rects:
+            # Keep free rects the placed sprite doesn't touch
+            if x >= fx + fw or x + width <= fx or y >= fy + fh or y + height <= fy:
+                new_free.append((fx, fy, fw, fh))
+                continue
+            # Otherwise keep the up-to-four slabs around the sprite
+            if x > fx:
+                new_free.append((fx, fy, x - fx, fh))
+            if x + width < fx + fw:
+                new_free.append((x + width, fy, fx + fw - x - width, fh))
+            if y > fy:
+                new_free.append((fx, fy, fw, y - fy))
+            if y + height < fy + fh:
+                new_free.append((fx, y + height, fw, fy + fh - y - height))
+
+        # Drop rects fully contained in another one
+        pruned = []
+        for i, a in enumerate(new_free):
+            contained = False
+            for j, b in enumerate(new_free):
+                if i != j and a[0] >= b[0] and a[1] >= b[1] \
+                        and a[0] + a[2] <= b[0] + b[2] and a[1] + a[3] <= b[1] + b[3] \
+                        and (a != b or i > j):
+                    contained = True
+                    break
+            if not contained:
+                pruned.append(a)
+        self.free_rects = pruned
+
+
+def candidate_sizes(max_size: int) -> List[Tuple[int, int]]:
+    """Power-of-two sheet sizes from smallest to largest area"""
+    sizes = []
+    side = 64
+    while side <= max_size:
+        sizes.append((side, side))
+        if side * 2 <= max_size:
+            sizes.append((side * 2, side))
+        side *= 2
+    return sorted(sizes, key=lambda s: (s[0] * s[1], s[1]))
+
+
+def pack_sprites(sprites: List[Dict], max_size: int = MAX_SHEET_SIZE,
+                 padding: int = PADDING) -> List[Dict]:
+    """
+    Pack sprites (dicts with id/width/height) into sheets
+    Tries the smallest sheet that holds everything, otherwise fills
+    max-size sheets one after another
+    Returns sheets as {'width', 'height', 'placements': {id: (x, y)}}
+    """
+    # Tallest first, ties broken by id so packing is deterministic
+    ordered = sorted(sprites, key=lambda s: (-s['height'], -s['width'], s['id']))
+    total_area = sum((s['width'] + padding) * (s['height'] + padding) for s in ordered)
+
+    for width, height in candidate_sizes(max_size):
+        if width * height < total_area:
+            continue
+        sheet = _fill_bin(ordered, width, height, padding)
+        if len(sheet['placements']) == len(ordered):
+            return [sheet]
+
+    sheets = []
+    remaining = ordered
+    while remaining:
+        sheet = _fill_bin(remaining, max_size, max_size, padding)
+        if not sheet['placements']:
+            raise ValueError(f"Sprite {remaining[0]['id']} does not fit in a {max_size}px sheet")
+        sheets.append(sheet)
+        remaining = [s for s in remaining if s['id'] not in sheet['placements']]
+    return sheets
+
+
+def _fill_bin(sprites: List[Dict], width: int, height: int, padding: int) -> Dict:
+    packer = MaxRectsBin(width, height)
+    placements = {}
+    used_area = 0
+    used_width = used_height = 0
+    for sprite in sprites:
+        position = packer.insert(sprite['width'] + padding, sprite['height'] + padding)
+        if position is not None:
+            placements[sprite['id']] = position
+            used_area += sprite['width'] * sprite['height']
+            used_width = max(used_width, position[0] + sprite['width'])
+            used_height = max(used_height, position[1] + sprite['height'])
+    # Crop the sheet to what was actually used; Flutter doesn't need power-of-two
+    return {'width': used_width, 'height': used_height,
+            'placements': placements, 'used_area': used_area}
+
+
+def load_group_sprites(icons: Dict, cell_size: int) -> List[Dict]:
+    """Rasterize and trim every icon of one (tier, category) group"""
+    sprites = []
+    for icon_id, icon_data in sorted(icons.items()):
+        image = rasterize_icon(Path(icon_data['path']), cell_size)
+        bbox = image.getchannel('A').getbbox() or (0, 0, 1, 1)
+        sprites.append({
+            'id': icon_id,
+            'image': image.crop(bbox),
+            'offset': (bbox[0], bbox[1]),
+            'width': bbox[2] - bbox[0],
+            'height': bbox[3] - bbox[1],
+        })
+    return sprites
+
+
+def build_atlas(manifest_path: Path = MANIFEST_PATH,
+                output_dir: Path = OUTPUT_DIR,
+                cell_size: int = CELL_SIZE,
+                max_size: int = MAX_SHEET_SIZE,
+                padding: int = PADDING) -> Optional[Dict]:
+    """Build all sheets plus the coordinate table and return the table"""
+    from PIL import Image
+
+    if not manifest_path.exists():
+        print("❌ Manifest not found. Run icon_organizer.py first!")
+        return None
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    table = {'cell_size': cell_size, 'sheets': {}, 'icons': {}}
+
+    for icon_type in TIERS:
+        groups: Dict[str, Dict] = {}
+        for icon_id, icon_data in manifest.get(icon_type, {}).items():
+            groups.setdefault(icon_data['category'], {})[icon_id] = icon_data
+        table['icons'][icon_type] = {}
+
+        for category in sorted(groups):
+            sprites = load_group_sprites(groups[category], cell_size)
+            by_id = {s['id']: s for s in sprites}
+
+            for index, sheet in enumerate(pack_sprites(sprites, max_size, padding)):
+                sheet_name = f'{icon_type}_{category}_{index}'
+                sheet_path = output_dir / f'{sheet_name}.png'
+                canvas = Image.new('RGBA', (sheet['width'], sheet['height']), (0, 0, 0, 0))
+
+                for icon_id, (x, y) in sorted(sheet['placements'].items()):
+                    sprite = by_id[icon_id]
+                    canvas.paste(sprite['image'], (x, y))
+                    table['icons'][icon_type][icon_id] = {
+                        'sheet': sheet_name,
+                        'rect': [x, y, sprite['width'], sprite['height']],
+                        'offset': list(sprite['offset']),
+                    }
+
+                canvas.save(sheet_path, format='PNG', optimize=True)
+                table['sheets'][sheet_name] = {
+                    'path': str(sheet_path),
+                    'size': [sheet['width'], sheet['height']],
+                    'icons': len(sheet['placements']),
+                    'used_area': sheet['used_area'],
+                }
+
+    table_path = output_dir / TABLE_NAME
+    with open(table_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+    print(f"🗺️  Generated atlas table: {table_path}")
+    return table
+
+
+def print_report(table: Dict):
+    """Print packing efficiency per sheet and decode counts"""
+    print(f"\n📊 Packing report (cell {table['cell_size']}px)")
+    total_area = 0
+    total_used = 0
+    for name, sheet in sorted(table['sheets'].items()):
+        area = sheet['size'][0] * sheet['size'][1]
+        total_area += area
+        total_used += sheet['used_area']
+        print(f"   {name:28} {sheet['size'][0]:>4}x{sheet['size'][1]:<4} "
+              f"{sheet['icons']:>3} icons  {sheet['used_area'] / area:6.1%} filled")
+
+    for icon_type, tier in TIERS.items():
+        icon_count = len(table['icons'].get(icon_type, {}))
+        sheet_count = sum(1 for name in table['sheets'] if name.startswith(f'{icon_type}_'))
+        print(f"   {tier.capitalize()} tab: {sheet_count} decodes instead of {icon_count}")
+
+    if total_area:
+        print(f"   Overall efficiency: {total_used / total_area:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack icons into per-category sprite sheets')
+    parser.add_argument('--manifest', type=Path, default=MANIFEST_PATH)
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR)
+    parser.add_argument('--cell-size', type=int, default=CELL_SIZE)
+    parser.add_argument('--max-size', type=int, default=MAX_SHEET_SIZE)
+    args = parser.parse_args()
+
+    print("🎨 Fresh Keeper Icon Atlas Builder")
+    print("=" * 50)
+
+    with stage('build'):
+        table = build_atlas(args.manifest, args.output, args.cell_size, args.max_size)
+    if table:
+        add_count('icons', sum(len(icons) for icons in table['icons'].values()))
+        add_count('sheets', len(table['sheets']))
+        print_report(table)
+        print("\n✅ Done! Next: python3 scripts/generate_icon_config.py")
+
+
+if __name__ == '__main__':
+    run_script('build_icon_atlas', main)
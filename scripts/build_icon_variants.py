@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Icon Variant Builder for Fresh Keeper
+Builds Flutter resolution-aware variants of the 3D icons
+
+The 3D icons are 256x256 PNGs but ProductIconWidget never draws them
+bigger than 48dp, so every tile decodes a full-size image. This stage
+downscales each icon to the logical size actually used and writes the
+2.0x/3.0x variants next to it, where Flutter resolves them for the
+assetPath the app already uses (assets/product_icons/3d/ in pubspec.yaml
+covers its N.0x subfolders):
+
+  assets/product_icons/3d/apple_red.png        (1.0x, the 256px source)
+  assets/product_icons/3d/2.0x/apple_red.png   (2.0x,  96px)
+  assets/product_icons/3d/3.0x/apple_red.png   (3.0x, 144px)
+
+The source stays the main asset, so it is never overwritten. Non-square
+sources are fitted inside the box, keeping their aspect ratio.
+
+Icons are rendered in parallel over a process pool. A cache keyed by
+the source content hash skips icons that have not changed.
+
+Requires: pip install pillow
+
+Usage:
+  python3 scripts/build_icon_variants.py
+  python3 scripts/build_icon_variants.py --logical-size 48 --workers 4
+  python3 scripts/build_icon_variants.py --force
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from asset_cache import file_sha256, load_cache, save_cache
+from instrumentation import add_count, run_script, stage
+
+SOURCE_DIR = Path('assets/product_icons/3d')
+CACHE_PATH = Path('scripts/icon_variant_cache.json')
+
+# Largest size ProductIconWidget is drawn at (product detail header)
+LOGICAL_SIZE = 48
+
+# Device pixel ratios rendered; the source itself is the 1.0x main asset
+DENSITIES = (2.0, 3.0)
+
+# Decoded images are RGBA, 4 bytes per pixel
+BYTES_PER_PIXEL = 4
+
+
+def variant_path(output_dir: Path, filename: str, density: float) -> Path:
+    """Flutter variant location: base asset for 1.0x, `N.0x/` subfolder otherwise"""
+    if density == 1.0:
+        return output_dir / filename
+    return output_dir / f'{density:.1f}x' / filename
+
+
+def render_variants(source: str, output_dir: str, logical_size: int,
+                    densities: List[float]) -> Dict:
+    """
+    Render every density variant of one icon (runs in a worker process)
+    Returns the source/variant sizes needed for the report
+    """
+    from PIL import Image
+
+    source_path = Path(source)
+    with Image.open(source_path) as image:
+        image = image.convert('RGBA')
+        source_width, source_height = image.size
+
+        variants = {}
+        for density in densities:
+            pixels = round(logical_size * density)
+            dest = variant_path(Path(output_dir), source_path.name, density)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+
+            # Fit inside pixels x pixels, keeping the aspect ratio; thumbnail
+            # never upscales past the source resolution
+            resized = image.copy()
+            resized.thumbnail((pixels, pixels), Image.LANCZOS)
+            resized.save(dest, format='PNG', optimize=True)
+            variants[f'{density:.1f}x'] = {
+                'path': str(dest),
+                'size': list(resized.size),
+                'bytes': dest.stat().st_size,
+            }
+
+    return {
+        'source_bytes': source_path.stat().st_size,
+        'source_pixels': [source_width, source_height],
+        'variants': variants,
+    }
+
+
+def is_cached(entry: Optional[Dict], source_hash: str, config_key: str,
+              expected_paths: List[Path]) -> bool:
+    """Cache hit only if the source, the size config and all outputs are unchanged"""
+    if not entry:
+        return False
+    if entry.get('source_sha256') != source_hash or entry.get('config') != config_key:
+        return False
+    paths = [Path(v['path']) for v in entry['result']['variants'].values()]
+    return paths == expected_paths and all(path.exists() for path in paths)
+
+
+def build_variants(source_dir: Path = SOURCE_DIR,
+                   output_dir: Optional[Path] = None,
+                   cache_path: Path = CACHE_PATH,
+                   logical_size: int = LOGICAL_SIZE,
+                   densities: List[float] = DENSITIES,
+                   workers: Optional[int] = None,
+                   force: bool = False) -> Dict:
+    """
+    Build all variants and return the per-icon results keyed by filename
+    output_dir defaults to source_dir, next to the main assets
+    """
+    if not source_dir.exists():
+        print(f"❌ Source directory not found: {source_dir}")
+        return {}
+    output_dir = output_dir or source_dir
+    if 1.0 in densities and output_dir.resolve() == source_dir.resolve():
+        raise ValueError("A 1.0x variant would overwrite its source; use another output directory")
+
+    sources = sorted(p for p in source_dir.iterdir() if p.suffix.lower() == '.png')
+    cache = {} if force else load_cache(cache_path)
+    config_key = f"{logical_size}@{','.join(f'{d:.1f}' for d in densities)}"
+
+    results = {}
+    pending = {}
+    for source in sources:
+        source_hash = file_sha256(source)
+        entry = cache.get(source.name)
+        expected = [variant_path(output_dir, source.name, density) for density in densities]
+        if is_cached(entry, source_hash, config_key, expected):
+            results[source.name] = entry['result']
+        else:
+            pending[source.name] = (source, source_hash)
+
+    print(f"🖼️  {len(sources)} icons, {len(results)} cached, {len(pending)} to render")
+    add_count('icons_cached', len(results))
+    add_count('icons_rendered', len(pending))
+
+    if pending:
+        with stage('render'), ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {
+                name: pool.submit(render_variants, str(source), str(output_dir),
+                                  logical_size, list(densities))
+                for name, (source, _) in pending.items()
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                    cache[name] = {
+                        'source_sha256': pending[name][1],
+                        'config': config_key,
+                        'result': results[name],
+                    }
+                except Exception as e:
+                    print(f"❌ Error rendering {name}: {e}")
+
+    # Drop cache entries for icons that no longer exist
+    for name in list(cache):
+        if name not in results:
+            del cache[name]
+    save_cache(cache_path, cache)
+
+    return results
+
+
+def print_report(results: Dict, densities: List[float] = DENSITIES):
+    """Print bytes and decoded-memory savings per density"""
+    if not results:
+        return
+
+    count = len(results)
+    source_bytes = sum(r['source_bytes'] for r in results.values())
+    source_decoded = sum(r['source_pixels'][0] * r['source_pixels'][1] * BYTES_PER_PIXEL
+                         for r in results.values())
+    bundle_bytes = 0
+
+    print(f"\n📊 Variant report ({count} icons)")
+    print(f"   Source: {source_bytes / 1024:.1f} KB on disk, "
+          f"{source_decoded / 1024 / 1024:.1f} MB decoded")
+
+    for density in densities:
+        key = f'{density:.1f}x'
+        variant_bytes = sum(r['variants'][key]['bytes'] for r in results.values())
+        decoded = sum(width * height * BYTES_PER_PIXEL
+                      for width, height in (r['variants'][key]['size'] for r in results.values()))
+        bundle_bytes += variant_bytes
+        print(f"   {key}: {variant_bytes / 1024:.1f} KB on disk "
+              f"(saves {(source_bytes - variant_bytes) / 1024:.1f} KB), "
+              f"{decoded / 1024 / 1024:.1f} MB decoded "
+              f"(saves {(source_decoded - decoded) / 1024 / 1024:.1f} MB)")
+
+    # The sources stay in the bundle as the 1.0x assets
+    print(f"   All variants together: {bundle_bytes / 1024:.1f} KB added to the app bundle")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build resolution-aware 3D icon variants')
+    parser.add_argument('--source', type=Path, default=SOURCE_DIR)
+    parser.add_argument('--output', type=Path, default=None,
+                        help='Defaults to --source, where Flutter resolves the variants')
+    parser.add_argument('--cache', type=Path, default=CACHE_PATH)
+    parser.add_argument('--logical-size', type=int, default=LOGICAL_SIZE,
+                        help='Logical (1.0x) icon size in dp')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='Ignore the cache')
+    args = parser.parse_args()
+
+    print("🎨 Fresh Keeper Icon Variant Builder")
+    print("=" * 50)
+
+    results = build_variants(args.source, args.output, args.cache,
+                             args.logical_size, DENSITIES, args.workers, args.force)
+    print_report(results)
+
+    print(f"\n✅ Variants written to: {args.output or args.source}")
+
+
+if __name__ == '__main__':
+    run_script('build_icon_variants', main)
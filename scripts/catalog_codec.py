@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Catalog Codec for Fresh Keeper
+Pluggable JSON decode/encode with msgspec or orjson, falling back to json
+
+Parsing and writing products_sample.json with the stdlib json module
+(indent=2) dominates the data scripts at scale. This module picks the
+fastest installed backend:
+
+  msgspec  decode to dicts, or to typed Catalog/Product structs
+           straight from bytes (decode_catalog)
+  orjson   decode/encode
+  json     always available
+
+Canonical mode (the default) writes exactly the bytes of
+json.dump(obj, f, ensure_ascii=False, indent=2), whatever the backend:
+  - orjson/msgspec spell floats like 1e-05 / 1e+16 differently, so those
+    tokens are rewritten with Python's repr
+  - anything a backend can't encode the same way (ints over 64 bits,
+    non-string keys) falls back to json for that document
+NaN / Infinity aren't JSON: json.dump writes bare NaN, the fast
+backends write null. Keep them out of catalogs.
+Top-level lists are written in chunks, so records are turned into dicts
+a few thousand at a time and the whole document never sits in memory
+as one bytes object.
+
+Set FRESH_KEEPER_JSON_BACKEND=json|orjson|msgspec to force a backend.
+
+Requires (optional): pip install msgspec orjson
+
+Usage:
+  from catalog_codec import load_json, dump_json
+  data = load_json('assets/data/products_sample.json')
+  dump_json(data, 'out.json')                  # same bytes as json.dump(indent=2)
+  python3 scripts/catalog_codec.py assets/data/products_sample_backup.json
+"""
+
+import gc
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BACKENDS = ('msgspec', 'orjson', 'json')
+
+BACKEND_ENV = 'FRESH_KEEPER_JSON_BACKEND'
+
+# Items of a top-level list encoded per call
+CHUNK_SIZE = 500
+
+# Floats Python writes in exponent form, as orjson/msgspec write them:
+# '1e16' / '1.5e300' / '1e-7', or positional '0.00001'. In indent=2 output
+# every scalar ends its line, so anchoring on ",?\n" never hits a string
+FLOAT_FIX_RE = re.compile(rb'(?:(?<=[ \[])|^)(-?(?:\d+(?:\.\d+)?e[+-]?\d+|0\.0000\d*[1-9]\d*))(?=,?\n|,?$)')
+
+NATIVE_TYPES = (dict, list, str, int, float, bool, type(None))
+
+
+
+@contextmanager
+def paused_gc():
+    """Decoding allocates millions of containers; the cyclic GC only slows it down"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def python_float_repr(match) -> bytes:
+    return repr(float(match.group(1))).encode('ascii')
+
+
+# With every digit read as 0, an exponent float always contains b'0e'
+ALL_DIGITS_ZERO = bytes.maketrans(b'123456789', b'000000000')
+
+# orjson reads ints beyond 64 bits as floats; documents with digit runs
+# this long go to json instead
+LONG_DIGIT_RUN = b'0' * 20
+
+
+def fix_floats(data: bytes) -> bytes:
+    """Respell float tokens the way json.dumps does"""
+    # The regex costs ~10x the encode itself; two byte scans rule it out
+    # for nearly every catalog
+    if b'0.0000' not in data and b'0e' not in data.translate(ALL_DIGITS_ZERO):
+        return data
+    return FLOAT_FIX_RE.sub(python_float_repr, data)
+
+
+class JsonCodec:
+    """stdlib json; the reference for canonical output"""
+    name = 'json'
+
+    def decode(self, data: bytes) -> Any:
+        with paused_gc():
+            return json.loads(data)
+
+    def encode(self, obj: Any, default: Optional[Callable] = None, canonical: bool = True) -> bytes:
+        if canonical:
+            return json.dumps(obj, ensure_ascii=False, indent=2, default=default).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=default).encode('utf-8')
+
+
+class OrjsonCodec:
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def decode(self, data: bytes) -> Any:
+        if LONG_DIGIT_RUN in data.translate(ALL_DIGITS_ZERO):
+            return JsonCodec().decode(data)
+        with paused_gc():
+            try:
+                return self.orjson.loads(data)
+            except self.orjson.JSONDecodeError:
+                # NaN / Infinity literals are Python-only JSON
+                return json.loads(data)
+
+    def encode(self, obj: Any, default: Optional[Callable] = None, canonical: bool = True) -> bytes:
+        # Send dataclasses (ProductRecord) through default instead of orjson's own encoding
+        option = self.orjson.OPT_PASSTHROUGH_DATACLASS
+        if canonical:
+            option |= self.orjson.OPT_INDENT_2
+        try:
+            data = self.orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # Ints over 64 bits, non-string keys
+            return JsonCodec().encode(obj, default, canonical)
+        return fix_floats(data) if canonical else data
+
+
+class MsgspecCodec:
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+        self.msgspec = msgspec
+        self.decoder = msgspec.json.Decoder()
+
+    def decode(self, data: bytes) -> Any:
+        with paused_gc():
+            try:
+                return self.decoder.decode(data)
+            except self.msgspec.DecodeError:
+                return json.loads(data)
+
+    def encode(self, obj: Any, default: Optional[Callable] = None, canonical: bool = True) -> bytes:
+        try:
+            data = self.msgspec.json.encode(obj, enc_hook=default)
+        except (TypeError, OverflowError):
+            return JsonCodec().encode(obj, default, canonical)
+        if not canonical:
+            return data
+        data = self.msgspec.json.format(data, indent=2)
+        return fix_floats(data)
+
+
+CODECS = {'msgspec': MsgspecCodec, 'orjson': OrjsonCodec, 'json': JsonCodec}
+
+_codecs: Dict[str, Any] = {}
+
+
+def available_backends() -> List[str]:
+    names = []
+    for name in BACKENDS:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec(name: Optional[str] = None):
+    """Codec by name, or the fastest installed one ($FRESH_KEEPER_JSON_BACKEND wins)"""
+    name = name or os.environ.get(BACKEND_ENV)
+    if name:
+        if name not in CODECS:
+            raise ValueError(f"Unknown JSON backend '{name}' (choose from {', '.join(BACKENDS)})")
+        if name not in _codecs:
+            _codecs[name] = CODECS[name]()
+        return _codecs[name]
+    for candidate in BACKENDS:
+        try:
+            return get_codec(candidate)
+        except ImportError:
+            continue
+    raise ImportError('no JSON backend')  # json is always there; kept for type checkers
+
+
+def load_json(path, backend: Optional[str] = None) -> Any:
+    with open(path, 'rb') as f:
+        return get_codec(backend).decode(f.read())
+
+
+def to_native(item, default: Optional[Callable]):
+    if default is not None and not isinstance(item, NATIVE_TYPES):
+        return default(item)
+    return item
+
+
+def iter_encoded(obj: Any, codec, default: Optional[Callable] = None, canonical: bool = True,
+                 chunk_size: int = CHUNK_SIZE):
+    """
+    Encoded pieces of obj; a top-level dict's list values are encoded
+    chunk by chunk and spliced in at the right indentation
+    """
+    if type(obj) is not dict or not obj or not all(type(key) is str for key in obj):
+        yield codec.encode(to_native(obj, default), default, canonical)
+        return
+
+    newline, pad, separator = (b'\n', b'  ', b': ') if canonical else (b'', b'', b':')
+    yield b'{'
+    for index, (key, value) in enumerate(obj.items()):
+        yield (b',' if index else b'') + newline + pad
+        yield json.dumps(key, ensure_ascii=False).encode('utf-8')
+        yield separator
+        if type(value) is list and len(value) > chunk_size:
+            yield b'['
+            for start in range(0, len(value), chunk_size):
+                chunk = [to_native(item, default) for item in value[start:start + chunk_size]]
+                encoded = codec.encode(chunk, default, canonical)
+                del chunk
+                # Drop the chunk's own '[\n  ' and '\n]'; re-indent its items one level
+                body = encoded[4:-2] if canonical else encoded[1:-1]
+                del encoded
+                yield (b',' + newline if start else newline) + pad * 2
+                yield body.replace(b'\n', b'\n' + pad) if canonical else body
+            yield newline + pad + b']'
+        else:
+            encoded = codec.encode(to_native(value, default), default, canonical)
+            yield encoded.replace(b'\n', b'\n' + pad) if canonical else encoded
+    yield newline + b'}'
+
+
+def dump_json(obj: Any, path, backend: Optional[str] = None, default: Optional[Callable] = None,
+              canonical: bool = True):
+    """Write obj; canonical output equals json.dump(obj, f, ensure_ascii=False, indent=2)"""
+    codec = get_codec(backend)
+    with open(path, 'wb') as f:
+        for piece in iter_encoded(obj, codec, default, canonical):
+            f.write(piece)
+
+
+def dumps_json(obj: Any, backend: Optional[str] = None, default: Optional[Callable] = None,
+               canonical: bool = True) -> bytes:
+    return b''.join(iter_encoded(obj, get_codec(backend), default, canonical))
+
+
+def dumps_compact(value: Any) -> bytes:
+    """Compact UTF-8 JSON from the stdlib encoder, so the bytes never depend on the backend"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+_catalog_decoder = None
+
+
+def decode_catalog(data: bytes):
+    """
+    Typed decode with msgspec: a Catalog struct whose products are Product
+    structs (read-only consumers; unknown keys are dropped)
+    """
+    global _catalog_decoder
+    if _catalog_decoder is None:
+        _catalog_decoder = _build_catalog_decoder()
+    with paused_gc():
+        return _catalog_decoder.decode(data)
+
+
+def _build_catalog_decoder():
+    from typing import Dict as DictType, List as ListType, Optional as Opt
+
+    import msgspec
+
+    class Nutrition(msgspec.Struct, gc=False):
+        serving_size: Opt[str] = None
+        calories: Opt[float] = None
+        protein: Opt[float] = None
+        carbohydrates: Opt[float] = None
+        fat: Opt[float] = None
+        fiber: Opt[float] = None
+        sugar: Opt[float] = None
+        vitamins: DictType[str, float] = {}
+        minerals: DictType[str, float] = {}
+
+    class Product(msgspec.Struct, gc=False, rename={'icon_id': 'iconId'}):
+        id: str
+        name_vi: str
+        category: str
+        name_en: str = ''
+        aliases: ListType[str] = []
+        shelf_life_refrigerated: Opt[int] = None
+        shelf_life_frozen: Opt[int] = None
+        nutrition_data: Opt[Nutrition] = None
+        health_benefits: ListType[str] = []
+        health_warnings: ListType[str] = []
+        storage_tips: str = ''
+        icon_id: Opt[str] = None
+
+    class Catalog(msgspec.Struct):
+        version: str = ''
+        last_updated: str = ''
+        total_products: int = 0
+        products: ListType[Product] = []
+
+    return msgspec.json.Decoder(Catalog)
+
+
+def main():
+    """Decode/encode each file with every backend and check canonical output"""
+    for arg in sys.argv[1:]:
+        path = Path(arg)
+        raw = path.read_bytes()
+        expected = json.dumps(json.loads(raw), ensure_ascii=False, indent=2).encode('utf-8')
+        print(f"📄 {path} ({len(raw) / 1024 / 1024:.1f} MB)")
+        for name in available_backends():
+            start = time.perf_counter()
+            data = get_codec(name).decode(raw)
+            decoded = time.perf_counter() - start
+            start = time.perf_counter()
+            encoded = dumps_json(data, name)
+            encoded_time = time.perf_counter() - start
+            same = '✅ identical' if encoded == expected else '❌ differs'
+            print(f"   {name:8} decode {decoded:6.3f}s  encode {encoded_time:6.3f}s  {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Catalog Delta for Fresh Keeper
+Diffs two versions of products_sample.json into a compact delta
+
+Every catalog change so far shipped a whole new products_sample.json, and
+DatabaseService's upgrade path wiped product_templates and reloaded all
+of it. A delta lists only what changed between two versions, matched by
+product id with one content hash per product (linear in catalog size):
+
+  inserted  full products that are new in the target
+  updated   {"id", "set": {field: value}, "unset": [fields]} per changed
+            product, top-level fields only (nutrition_data as a whole)
+  deleted   ids that are gone
+
+plus the target's header (version, last_updated, ...). `order` and a
+product's `keys` are only present when applying the delta would otherwise
+give a different product order or key order. The backup catalog repeats a
+few ids; the n-th repeat of an id is referred to as {"id": ..., "dup": n}.
+
+`from.hash` / `to.hash` identify the exact catalogs, so a chain of deltas
+(v3 → v5 → v6 ...) can be applied from whatever version a device has.
+`verify` applies a delta or chain to the base and checks the result is
+byte-identical to the target.
+
+Usage:
+  python3 scripts/catalog_delta.py diff old.json new.json -o delta.json
+  python3 scripts/catalog_delta.py chain v3.json v5.json v6.json -o chain.json
+  python3 scripts/catalog_delta.py apply old.json delta.json -o new.json
+  python3 scripts/catalog_delta.py verify old.json chain.json new.json
+"""
+
+import argparse
+import hashlib
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from catalog_codec import dump_json, dumps_compact, dumps_json, load_json
+from instrumentation import add_count, run_script, stage
+
+DELTA_FORMAT = 'fresh_keeper.catalog_delta/1'
+CHAIN_FORMAT = 'fresh_keeper.catalog_delta_chain/1'
+
+HASH_BYTES = 16
+
+# (id, n): the n-th product with this id, counting from 0
+Key = Tuple[str, int]
+
+
+def record_hash(product: Dict[str, Any]) -> bytes:
+    """Content hash of one product; key order counts, so equal hash means equal bytes"""
+    return hashlib.blake2b(dumps_compact(product), digest_size=HASH_BYTES).digest()
+
+
+def header_of(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in data.items() if key != 'products'}
+
+
+def catalog_hash(data: Dict[str, Any], hashes: Optional[List[bytes]] = None) -> str:
+    """Hash of the header plus every product hash, in order"""
+    digest = hashlib.blake2b(digest_size=HASH_BYTES)
+    digest.update(dumps_compact(list(data)))
+    digest.update(dumps_compact(header_of(data)))
+    for product_digest in hashes if hashes is not None else map(record_hash, data['products']):
+        digest.update(product_digest)
+    return digest.hexdigest()
+
+
+def product_keys(products: List[Dict[str, Any]]) -> List[Key]:
+    seen: Dict[str, int] = {}
+    keys = []
+    for product in products:
+        n = seen.get(product['id'], 0)
+        seen[product['id']] = n + 1
+        keys.append((product['id'], n))
+    return keys
+
+
+def ref(key: Key):
+    product_id, n = key
+    return product_id if n == 0 else {'id': product_id, 'dup': n}
+
+
+def key_of(reference) -> Key:
+    if isinstance(reference, str):
+        return reference, 0
+    return reference['id'], reference.get('dup', 0)
+
+
+def field_changes(base: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    """set / unset / keys entry turning base into target"""
+    changes: Dict[str, Any] = {}
+    updates = {key: value for key, value in target.items()
+               if key not in base or dumps_compact(base[key]) != dumps_compact(value)}
+    removed = [key for key in base if key not in target]
+    if updates:
+        changes['set'] = updates
+    if removed:
+        changes['unset'] = removed
+    result = dict(base, **updates)
+    for key in removed:
+        del result[key]
+    if list(result) != list(target):
+        changes['keys'] = list(target)
+    return changes
+
+
+def diff_catalogs(base: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta turning base into target"""
+    base_products = base['products']
+    target_products = target['products']
+    with stage('hash'):
+        base_hashes = [record_hash(p) for p in base_products]
+        target_hashes = [record_hash(p) for p in target_products]
+    base_keys = product_keys(base_products)
+    target_keys = product_keys(target_products)
+    base_index = {key: i for i, key in enumerate(base_keys)}
+    target_index = {key: i for i, key in enumerate(target_keys)}
+
+    with stage('diff'):
+        inserted, updated = [], []
+        for i, key in enumerate(target_keys):
+            j = base_index.get(key)
+            if j is None:
+                inserted.append(target_products[i])
+            elif base_hashes[j] != target_hashes[i]:
+                entry = {'id': key[0]}
+                if key[1]:
+                    entry['dup'] = key[1]
+                entry.update(field_changes(base_products[j], target_products[i]))
+                updated.append(entry)
+        deleted = [ref(key) for key in base_keys if key not in target_index]
+
+    delta = {
+        'format': DELTA_FORMAT,
+        'from': {'version': base.get('version'), 'hash': catalog_hash(base, base_hashes)},
+        'to': {'version': target.get('version'), 'hash': catalog_hash(target, target_hashes),
+               'total_products': len(target_products)},
+        'keys': list(target),
+        'header': header_of(target),
+        'inserted': inserted,
+        'updated': updated,
+        'deleted': deleted,
+    }
+    # Survivors keep their base order and inserts are appended; spell out
+    # the order only when the target differs from that
+    kept = [key for key in base_keys if key in target_index]
+    if kept + [key for key in target_keys if key not in base_index] != target_keys:
+        delta['order'] = [ref(key) for key in target_keys]
+    return delta
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """The target catalog; base is left untouched"""
+    if delta.get('format') != DELTA_FORMAT:
+        raise ValueError(f"Not a catalog delta: format {delta.get('format')!r}")
+    base_products = base['products']
+    base_keys = product_keys(base_products)
+    products: Dict[Key, Dict[str, Any]] = dict(zip(base_keys, base_products))
+
+    for reference in delta['deleted']:
+        products.pop(key_of(reference), None)
+    for entry in delta['updated']:
+        key = key_of(entry)
+        if key not in products:
+            raise ValueError(f"Delta updates {key[0]!r}, which the base catalog doesn't have")
+        product = dict(products[key], **entry.get('set', {}))
+        for field in entry.get('unset', ()):
+            product.pop(field, None)
+        if 'keys' in entry:
+            product = {field: product[field] for field in entry['keys']}
+        products[key] = product
+
+    counts: Dict[str, int] = {}
+    for key in base_keys:
+        counts[key[0]] = counts.get(key[0], 0) + 1
+    for product in delta['inserted']:
+        n = counts.get(product['id'], 0)
+        counts[product['id']] = n + 1
+        products[(product['id'], n)] = product
+
+    if 'order' in delta:
+        ordered = [products[key_of(reference)] for reference in delta['order']]
+    else:
+        ordered = list(products.values())
+
+    header = delta['header']
+    return {key: ordered if key == 'products' else header[key] for key in delta['keys']}
+
+
+def build_chain(catalogs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Deltas between consecutive catalog versions, oldest first"""
+    return {
+        'format': CHAIN_FORMAT,
+        'deltas': [diff_catalogs(base, target) for base, target in zip(catalogs, catalogs[1:])],
+    }
+
+
+def apply_chain(data: Dict[str, Any], chain: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply every delta from data's version to the end of the chain"""
+    if chain.get('format') != CHAIN_FORMAT:
+        raise ValueError(f"Not a catalog delta chain: format {chain.get('format')!r}")
+    deltas = chain['deltas']
+    current = catalog_hash(data)
+    if deltas and current == deltas[-1]['to']['hash']:
+        return data
+    start = next((i for i, delta in enumerate(deltas) if delta['from']['hash'] == current), None)
+    if start is None:
+        raise ValueError(f'Catalog {current} is not a version in this chain')
+    for delta in deltas[start:]:
+        data = apply_delta(data, delta)
+        if catalog_hash(data) != delta['to']['hash']:
+            raise ValueError(f"Applying the delta to {delta['to']['version']} gave a different catalog")
+    return data
+
+
+def load_delta(path) -> Dict[str, Any]:
+    delta = load_json(path)
+    if delta.get('format') not in (DELTA_FORMAT, CHAIN_FORMAT):
+        raise ValueError(f"{path} is neither a catalog delta nor a delta chain")
+    return delta
+
+
+def apply_any(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    if delta['format'] == CHAIN_FORMAT:
+        return apply_chain(base, delta)
+    if catalog_hash(base) != delta['from']['hash']:
+        raise ValueError(f"Delta is for catalog {delta['from']['hash']}, not this base")
+    return apply_delta(base, delta)
+
+
+def verify(base: Dict[str, Any], delta: Dict[str, Any], target: Dict[str, Any]) -> List[str]:
+    """Problems found applying delta (or a chain) to base; empty if it gives target exactly"""
+    try:
+        result = apply_any(base, delta)
+    except (KeyError, ValueError) as e:
+        return [f'Cannot apply: {e}']
+    problems = []
+    if dumps_json(result) != dumps_json(target):
+        problems.append('base + delta is not byte-identical to the target')
+    last = delta['deltas'][-1] if delta['format'] == CHAIN_FORMAT and delta['deltas'] else delta
+    if last.get('to', {}).get('hash') not in (None, catalog_hash(target)):
+        problems.append('delta was built for a different target')
+    return problems
+
+
+def print_summary(delta: Dict[str, Any], delta_path: Path, target_path: Optional[Path] = None):
+    fields: Dict[str, int] = {}
+    for entry in delta['updated']:
+        for field in list(entry.get('set', {})) + entry.get('unset', []):
+            fields[field] = fields.get(field, 0) + 1
+    print(f"📊 {delta['from']['version']} → {delta['to']['version']}: "
+          f"{delta['to']['total_products']} products")
+    print(f"   ➕ inserted: {len(delta['inserted'])}")
+    print(f"   ✏️  updated:  {len(delta['updated'])}")
+    for field, count in sorted(fields.items(), key=lambda item: -item[1]):
+        print(f"      - {field}: {count}")
+    print(f"   🗑️  deleted:  {len(delta['deleted'])}")
+    if 'order' in delta:
+        print("   🔀 product order changed")
+    size = delta_path.stat().st_size
+    full = f" (full catalog {target_path.stat().st_size / 1024:.1f} KB)" if target_path else ''
+    print(f"💾 Delta: {delta_path} {size / 1024:.1f} KB{full}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff catalog versions into deltas and apply them')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    diff_cmd = commands.add_parser('diff', help='Delta from one catalog version to another')
+    diff_cmd.add_argument('base', type=Path)
+    diff_cmd.add_argument('target', type=Path)
+    diff_cmd.add_argument('-o', '--output', type=Path, required=True)
+
+    chain_cmd = commands.add_parser('chain', help='Ordered deltas between consecutive versions')
+    chain_cmd.add_argument('catalogs', type=Path, nargs='+', help='Catalog versions, oldest first')
+    chain_cmd.add_argument('-o', '--output', type=Path, required=True)
+
+    apply_cmd = commands.add_parser('apply', help='Apply a delta or chain to a catalog')
+    apply_cmd.add_argument('base', type=Path)
+    apply_cmd.add_argument('delta', type=Path)
+    apply_cmd.add_argument('-o', '--output', type=Path, required=True)
+
+    verify_cmd = commands.add_parser('verify', help='Check base + delta (or chain) == target')
+    verify_cmd.add_argument('base', type=Path)
+    verify_cmd.add_argument('delta', type=Path)
+    verify_cmd.add_argument('target', type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == 'diff':
+        with stage('load'):
+            base, target = load_json(args.base), load_json(args.target)
+        delta = diff_catalogs(base, target)
+        with stage('save'):
+            dump_json(delta, args.output)
+        add_count('changes', len(delta['inserted']) + len(delta['updated']) + len(delta['deleted']))
+        print_summary(delta, args.output, args.target)
+
+    elif args.command == 'chain':
+        if len(args.catalogs) < 2:
+            parser.error('chain needs at least two catalog versions')
+        with stage('load'):
+            catalogs = [load_json(path) for path in args.catalogs]
+        chain = build_chain(catalogs)
+        with stage('save'):
+            dump_json(chain, args.output)
+        for delta in chain['deltas']:
+            print(f"🔗 {delta['from']['version']} → {delta['to']['version']}: "
+                  f"+{len(delta['inserted'])} ~{len(delta['updated'])} -{len(delta['deleted'])}")
+        print(f"💾 Chain of {len(chain['deltas'])} deltas: {args.output} "
+              f"({args.output.stat().st_size / 1024:.1f} KB)")
+
+    elif args.command == 'apply':
+        with stage('load'):
+            base, delta = load_json(args.base), load_delta(args.delta)
+        try:
+            with stage('apply'):
+                result = apply_any(base, delta)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        with stage('save'):
+            dump_json(result, args.output)
+        print(f"✅ Wrote {args.output}: {len(result['products'])} products")
+
+    elif args.command == 'verify':
+        with stage('load'):
+            base, delta, target = load_json(args.base), load_delta(args.delta), load_json(args.target)
+        with stage('verify'):
+            problems = verify(base, delta, target)
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+            sys.exit(1)
+        print(f"✅ {args.base} + {args.delta} == {args.target}")
+
+
+if __name__ == '__main__':
+    run_script('catalog_delta', main)
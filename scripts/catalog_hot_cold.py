@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Hot/Cold Catalog Split for Fresh Keeper
+A slim search index plus an on-demand store for product details
+
+Search, lists and autocomplete only need a product's id, names, aliases,
+category, icon and shelf lives, but nutrition_data, health text and
+storage_tips are most of every record's bytes and were parsed up front.
+`build` splits a catalog into:
+
+  catalog_hot.json   header + HOT_FIELDS of every product, each with
+                     "_cold": [offset, length] into the cold store
+  catalog_cold.bin   the other fields of each product as one compact JSON
+                     object per line, read only when a product is opened
+
+Key order is kept ("_layout" indexes a shared list of key orders when a
+product differs from the most common one), so `join` gives back a
+catalog byte-identical to the original.
+
+Usage:
+  python3 scripts/catalog_hot_cold.py build assets/data/products_sample.json -o assets/data/hot_cold
+  python3 scripts/catalog_hot_cold.py show assets/data/hot_cold apple_01
+  python3 scripts/catalog_hot_cold.py join assets/data/hot_cold -o /tmp/products_sample.json
+  python3 scripts/catalog_hot_cold.py verify assets/data/hot_cold assets/data/products_sample.json
+
+  from catalog_hot_cold import HotIndex, ColdStore
+  index = HotIndex('assets/data/hot_cold')
+  with ColdStore(index) as cold:
+      product = cold.product(index.get('apple_01'))
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from catalog_codec import dump_json, dumps_compact, dumps_json, get_codec, load_json
+from instrumentation import add_count, run_script, stage
+
+HOT_FORMAT = 'fresh_keeper.catalog_hot/1'
+HOT_NAME = 'catalog_hot.json'
+COLD_NAME = 'catalog_cold.bin'
+
+# Fields search / list / autocomplete read; everything else is cold
+HOT_FIELDS = ('id', 'name_vi', 'name_en', 'aliases', 'category', 'iconId',
+              'shelf_life_refrigerated', 'shelf_life_frozen', 'shelf_life_pantry', 'shelf_life_opened')
+
+COLD_KEY = '_cold'
+LAYOUT_KEY = '_layout'
+
+
+def build(data: Dict[str, Any], out_dir: Path) -> Dict[str, Any]:
+    """Write the hot index and cold store for a catalog; returns the hot index"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    products = data['products']
+    if any(key in product for product in products for key in (COLD_KEY, LAYOUT_KEY)):
+        raise ValueError(f"Products may not use the reserved keys {COLD_KEY} / {LAYOUT_KEY}")
+
+    # The most common key order is layout 0 and isn't written per product
+    counts: Dict[tuple, int] = {}
+    for product in products:
+        layout = tuple(product)
+        counts[layout] = counts.get(layout, 0) + 1
+    layouts = sorted(counts, key=lambda layout: -counts[layout])
+    layout_index = {layout: i for i, layout in enumerate(layouts)}
+
+    hot_products = []
+    digest = hashlib.sha256()
+    offset = 0
+    with stage('cold'), open(out_dir / COLD_NAME, 'wb') as cold:
+        for product in products:
+            hot = {key: value for key, value in product.items() if key in HOT_FIELDS}
+            detail = {key: value for key, value in product.items() if key not in HOT_FIELDS}
+            if detail:
+                record = dumps_compact(detail)
+                cold.write(record + b'\n')
+                digest.update(record + b'\n')
+                hot[COLD_KEY] = [offset, len(record)]
+                offset += len(record) + 1
+            layout = layout_index[tuple(product)]
+            if layout:
+                hot[LAYOUT_KEY] = layout
+            hot_products.append(hot)
+
+    index = {
+        'format': HOT_FORMAT,
+        'keys': list(data),
+        'header': {key: value for key, value in data.items() if key != 'products'},
+        'cold_file': COLD_NAME,
+        'cold_bytes': offset,
+        'cold_sha256': digest.hexdigest(),
+        'layouts': [list(layout) for layout in layouts],
+        'products': hot_products,
+    }
+    with stage('hot'):
+        dump_json(index, out_dir / HOT_NAME)
+    add_count('products', len(products))
+    return index
+
+
+class HotIndex:
+    """The hot index: every product's search/list fields, parsed at startup"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        with stage('load_hot'):
+            index = load_json(self.directory / HOT_NAME)
+        if index.get('format') != HOT_FORMAT:
+            raise ValueError(f"{self.directory} has no hot catalog index")
+        self.index = index
+        self.header: Dict[str, Any] = index['header']
+        self.products: List[Dict[str, Any]] = index['products']
+        self.layouts: List[List[str]] = index['layouts']
+        self._by_id: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.products)
+
+    def get(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """Hot record by id (the first one, if an id repeats)"""
+        if self._by_id is None:
+            self._by_id = {}
+            for product in self.products:
+                self._by_id.setdefault(product['id'], product)
+        return self._by_id.get(product_id)
+
+    def layout(self, hot: Dict[str, Any]) -> List[str]:
+        return self.layouts[hot.get(LAYOUT_KEY, 0)]
+
+    @staticmethod
+    def fields(hot: Dict[str, Any]) -> Dict[str, Any]:
+        """The hot record without its cold pointer / layout"""
+        return {key: value for key, value in hot.items() if key not in (COLD_KEY, LAYOUT_KEY)}
+
+
+class ColdStore:
+    """
+    Product details on demand: the cold file is memory-mapped and only
+    the span of a product that's opened is decoded
+    """
+
+    def __init__(self, index: HotIndex):
+        self.index = index
+        self._file = open(index.directory / index.index['cold_file'], 'rb')
+        if index.index['cold_bytes']:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mmap = None
+        self._codec = get_codec()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def detail(self, hot: Dict[str, Any]) -> Dict[str, Any]:
+        """Cold fields of one product"""
+        span = hot.get(COLD_KEY)
+        if span is None:
+            return {}
+        offset, length = span
+        return self._codec.decode(self._mmap[offset:offset + length])
+
+    def product(self, hot: Dict[str, Any]) -> Dict[str, Any]:
+        """The full product, in its original key order"""
+        detail = self.detail(hot)
+        return {key: detail[key] if key in detail else hot[key] for key in self.index.layout(hot)}
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+def join(directory: Path) -> Dict[str, Any]:
+    """The catalog the hot index and cold store were built from"""
+    index = HotIndex(directory)
+    with ColdStore(index) as cold, stage('join'):
+        products = [cold.product(hot) for hot in index.products]
+    header = index.header
+    return {key: products if key == 'products' else header[key] for key in index.index['keys']}
+
+
+def verify(directory: Path, catalog_path: Path) -> List[str]:
+    """Problems found checking the split against the catalog; empty if consistent"""
+    directory = Path(directory)
+    index = load_json(directory / HOT_NAME)
+    cold = (directory / index['cold_file']).read_bytes()
+    problems = []
+    if len(cold) != index['cold_bytes'] or hashlib.sha256(cold).hexdigest() != index['cold_sha256']:
+        problems.append(f"{index['cold_file']}: size or content hash mismatch")
+        return problems
+    if dumps_json(join(directory)) != dumps_json(load_json(catalog_path)):
+        problems.append(f"joined hot + cold differs from {catalog_path}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Split the catalog into a hot index and cold details')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_cmd = commands.add_parser('build', help='Write catalog_hot.json + catalog_cold.bin')
+    build_cmd.add_argument('catalog', type=Path)
+    build_cmd.add_argument('-o', '--output', type=Path, required=True)
+
+    show_cmd = commands.add_parser('show', help='Print one full product')
+    show_cmd.add_argument('directory', type=Path)
+    show_cmd.add_argument('product_id')
+
+    join_cmd = commands.add_parser('join', help='Reassemble the full catalog')
+    join_cmd.add_argument('directory', type=Path)
+    join_cmd.add_argument('-o', '--output', type=Path, required=True)
+
+    verify_cmd = commands.add_parser('verify', help='Check hot + cold == catalog')
+    verify_cmd.add_argument('directory', type=Path)
+    verify_cmd.add_argument('catalog', type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with stage('load'):
+            data = load_json(args.catalog)
+        build(data, args.output)
+        hot_size = (args.output / HOT_NAME).stat().st_size
+        cold_size = (args.output / COLD_NAME).stat().st_size
+        print(f"📦 {len(data['products'])} products → {args.output}")
+        print(f"   🔥 {HOT_NAME}: {hot_size / 1024:.1f} KB")
+        print(f"   🧊 {COLD_NAME}: {cold_size / 1024:.1f} KB")
+        print(f"   Parsed at startup: {hot_size / args.catalog.stat().st_size:.0%} of the catalog bytes")
+
+    elif args.command == 'show':
+        index = HotIndex(args.directory)
+        hot = index.get(args.product_id)
+        if hot is None:
+            print(f"❌ Unknown product: {args.product_id}", file=sys.stderr)
+            sys.exit(1)
+        with ColdStore(index) as cold:
+            print(json.dumps(cold.product(hot), ensure_ascii=False, indent=2))
+
+    elif args.command == 'join':
+        data = join(args.directory)
+        with stage('save'):
+            dump_json(data, args.output)
+        print(f"✅ Wrote {args.output}: {len(data['products'])} products")
+
+    elif args.command == 'verify':
+        with stage('verify'):
+            problems = verify(args.directory, args.catalog)
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+            sys.exit(1)
+        print(f"✅ Hot/cold split OK: {args.directory}")
+
+
+if __name__ == '__main__':
+    run_script('catalog_hot_cold', main)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Catalog Shards for Fresh Keeper
+Splits products_sample.json into one file per category plus a manifest
+
+Browsing one category shouldn't mean decoding the whole catalog. The
+shard directory holds:
+
+  vegetables.json, meat.json, ...   {"category": ..., "products": [...]}
+  catalog.bundle                    every shard back to back, so one asset
+                                    can serve range reads
+  manifest.json                     header, per-shard count / bytes /
+                                    sha256 / offset in the bundle, and the
+                                    category runs that restore the
+                                    original product order
+
+e.g. "fruits": {"file": "fruits.json", "count": 108, "bytes": 98304,
+                "offset": 12288, "sha256": "..."}
+
+load_shards() opens only the categories asked for (optionally with a
+thread pool); load_catalog() reassembles a catalog byte-identical to the
+one that was split. Stages that only touch some categories can
+rewrite_shard() / append_products() without reading the other shards;
+those write only the changed shards and the manifest. The bundle is
+built by a full split (or the bundle command): a shard rewritten since
+has no offset and is read from its own file.
+
+Usage:
+  python3 scripts/catalog_shards.py split assets/data/products_sample.json -o assets/data/shards
+  python3 scripts/catalog_shards.py info assets/data/shards
+  python3 scripts/catalog_shards.py join assets/data/shards -o /tmp/products_sample.json
+  python3 scripts/catalog_shards.py bundle assets/data/shards
+  python3 scripts/catalog_shards.py verify assets/data/shards assets/data/products_sample.json
+"""
+
+import argparse
+import hashlib
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from catalog_codec import dump_json, dumps_json, get_codec, load_json
+from instrumentation import add_count, run_script, stage
+
+SHARDS_FORMAT = 'fresh_keeper.catalog_shards/1'
+MANIFEST_NAME = 'manifest.json'
+BUNDLE_NAME = 'catalog.bundle'
+
+# Category used for products without one, as the pipeline scripts do
+DEFAULT_CATEGORY = 'other'
+
+CATEGORY_RE = re.compile(r'[a-z0-9_-]+')
+
+
+def category_of(product: Dict[str, Any]) -> str:
+    return product.get('category', DEFAULT_CATEGORY)
+
+
+def shard_file(category: str) -> str:
+    if not CATEGORY_RE.fullmatch(category):
+        raise ValueError(f"Category {category!r} can't be used as a shard file name")
+    return f'{category}.json'
+
+
+def category_runs(products: Iterable[Dict[str, Any]]) -> List[list]:
+    """[[category, count], ...] for consecutive products of one category"""
+    runs: List[list] = []
+    for product in products:
+        category = category_of(product)
+        if runs and runs[-1][0] == category:
+            runs[-1][1] += 1
+        else:
+            runs.append([category, 1])
+    return runs
+
+
+def write_shard(out_dir: Path, category: str, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    data = dumps_json({'category': category, 'products': products})
+    (out_dir / shard_file(category)).write_bytes(data)
+    return {'file': shard_file(category), 'count': len(products), 'bytes': len(data),
+            'sha256': hashlib.sha256(data).hexdigest()}
+
+
+def write_bundle(out_dir: Path, manifest: Dict[str, Any]):
+    """Rebuild the bundle from the shard files and set every shard's offset"""
+    with stage('bundle'), open(out_dir / BUNDLE_NAME, 'wb') as bundle:
+        offset = 0
+        for entry in manifest['shards'].values():
+            data = (out_dir / entry['file']).read_bytes()
+            bundle.write(data)
+            entry['offset'] = offset
+            offset += len(data)
+
+
+def write_manifest(out_dir: Path, manifest: Dict[str, Any], recount: bool = True):
+    if recount and 'total_products' in manifest['header']:
+        manifest['header']['total_products'] = sum(e['count'] for e in manifest['shards'].values())
+    dump_json(manifest, out_dir / MANIFEST_NAME)
+
+
+def write_shards(data: Dict[str, Any], out_dir: Path) -> Dict[str, Any]:
+    """Split a catalog into out_dir; returns the manifest"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    shards: Dict[str, List[Dict[str, Any]]] = {}
+    for product in data['products']:
+        shards.setdefault(category_of(product), []).append(product)
+
+    manifest = {
+        'format': SHARDS_FORMAT,
+        'keys': list(data),
+        'header': {key: value for key, value in data.items() if key != 'products'},
+        'runs': category_runs(data['products']),
+        'shards': {},
+    }
+    # Shards of a previous split that no longer exist would be left behind
+    previous = read_manifest(out_dir)['shards'] if (out_dir / MANIFEST_NAME).exists() else {}
+    with stage('write'):
+        for category, products in shards.items():
+            manifest['shards'][category] = write_shard(out_dir, category, products)
+    for category, entry in previous.items():
+        if category not in shards:
+            (out_dir / entry['file']).unlink(missing_ok=True)
+    write_bundle(out_dir, manifest)
+    # The header is kept as it was, so joining gives back the same bytes
+    write_manifest(out_dir, manifest, recount=False)
+    add_count('shards', len(shards))
+    return manifest
+
+
+def read_manifest(shard_dir: Path) -> Dict[str, Any]:
+    manifest = load_json(Path(shard_dir) / MANIFEST_NAME)
+    if manifest.get('format') != SHARDS_FORMAT:
+        raise ValueError(f"{shard_dir} has no catalog shard manifest")
+    return manifest
+
+
+def read_shard_bytes(shard_dir: Path, entry: Dict[str, Any], from_bundle: bool) -> bytes:
+    # Shards rewritten since the bundle was built have no offset in it
+    if from_bundle and 'offset' in entry:
+        with open(shard_dir / BUNDLE_NAME, 'rb') as f:
+            f.seek(entry['offset'])
+            return f.read(entry['bytes'])
+    return (shard_dir / entry['file']).read_bytes()
+
+
+def load_shards(shard_dir: Path, categories: Optional[Iterable[str]] = None,
+                workers: int = 1, from_bundle: bool = False, check_hashes: bool = False,
+                manifest: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Products of the requested categories (all if None), by category;
+    workers > 1 reads and decodes shards on a thread pool
+    """
+    shard_dir = Path(shard_dir)
+    manifest = manifest or read_manifest(shard_dir)
+    wanted = list(manifest['shards']) if categories is None else list(categories)
+    unknown = [c for c in wanted if c not in manifest['shards']]
+    if unknown:
+        raise KeyError(f"No shard for {', '.join(unknown)}")
+    codec = get_codec()
+
+    def load(category: str) -> List[Dict[str, Any]]:
+        entry = manifest['shards'][category]
+        data = read_shard_bytes(shard_dir, entry, from_bundle)
+        if check_hashes and hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise ValueError(f"{entry['file']}: content hash mismatch")
+        return codec.decode(data)['products']
+
+    with stage('load_shards'):
+        if workers > 1 and len(wanted) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                loaded = list(pool.map(load, wanted))
+        else:
+            loaded = [load(category) for category in wanted]
+    add_count('shards_loaded', len(wanted))
+    return dict(zip(wanted, loaded))
+
+
+def load_catalog(shard_dir: Path, workers: int = 1, from_bundle: bool = False) -> Dict[str, Any]:
+    """The catalog the shards were split from, in its original order"""
+    manifest = read_manifest(shard_dir)
+    shards = load_shards(shard_dir, workers=workers, from_bundle=from_bundle, manifest=manifest)
+    positions = dict.fromkeys(shards, 0)
+    products = []
+    for category, count in manifest['runs']:
+        start = positions[category]
+        products.extend(shards[category][start:start + count])
+        positions[category] = start + count
+    header = manifest['header']
+    return {key: products if key == 'products' else header[key] for key in manifest['keys']}
+
+
+def rewrite_shard(shard_dir: Path, category: str, products: List[Dict[str, Any]]):
+    """
+    Replace one category's products; the others are not read and only
+    this shard and the manifest are written. Products gained or lost are
+    added to / taken from the category's last run
+    """
+    shard_dir = Path(shard_dir)
+    manifest = read_manifest(shard_dir)
+    if any(category_of(p) != category for p in products):
+        raise ValueError(f"Products for the {category} shard must all be in that category")
+    old_count = manifest['shards'].get(category, {}).get('count', 0)
+    runs = manifest['runs']
+    change = len(products) - old_count
+    while change < 0:
+        index = max(i for i, run in enumerate(runs) if run[0] == category)
+        taken = min(runs[index][1], -change)
+        runs[index][1] -= taken
+        change += taken
+        if runs[index][1] == 0:
+            del runs[index]
+    if change > 0:
+        own = [i for i, run in enumerate(runs) if run[0] == category]
+        if own:
+            runs[own[-1]][1] += change
+        else:
+            runs.append([category, change])
+    manifest['runs'] = merge_runs(runs)
+
+    with stage('write'):
+        if products:
+            manifest['shards'][category] = write_shard(shard_dir, category, products)
+        elif category in manifest['shards']:
+            (shard_dir / manifest['shards'].pop(category)['file']).unlink()
+    write_manifest(shard_dir, manifest)
+
+
+def append_products(shard_dir: Path, products: List[Dict[str, Any]],
+                    current: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                    header: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Append products to the end of the catalog, rewriting only their
+    categories' shards and the manifest (pass `current` if those shards
+    are already loaded); header values are updated too. Returns the new
+    manifest
+    """
+    shard_dir = Path(shard_dir)
+    manifest = read_manifest(shard_dir)
+    added: Dict[str, List[Dict[str, Any]]] = {}
+    for product in products:
+        added.setdefault(category_of(product), []).append(product)
+    current = dict(current or {})
+    missing = [c for c in added if c in manifest['shards'] and c not in current]
+    if missing:
+        current.update(load_shards(shard_dir, missing, manifest=manifest))
+
+    with stage('write'):
+        for category, new in added.items():
+            manifest['shards'][category] = write_shard(shard_dir, category,
+                                                       current.get(category, []) + new)
+    manifest['runs'] = merge_runs(manifest['runs'] + category_runs(products))
+    manifest['header'].update(header or {})
+    write_manifest(shard_dir, manifest)
+    return manifest
+
+
+def merge_runs(runs: List[list]) -> List[list]:
+    merged: List[list] = []
+    for category, count in runs:
+        if merged and merged[-1][0] == category:
+            merged[-1][1] += count
+        else:
+            merged.append([category, count])
+    return merged
+
+
+def verify_shards(shard_dir: Path, catalog_path: Optional[Path] = None) -> List[str]:
+    """Problems found in the shards (and against catalog_path); empty if consistent"""
+    shard_dir = Path(shard_dir)
+    manifest = read_manifest(shard_dir)
+    problems = []
+    for category, entry in manifest['shards'].items():
+        data = (shard_dir / entry['file']).read_bytes()
+        if hashlib.sha256(data).hexdigest() != entry['sha256']:
+            problems.append(f"{entry['file']}: content hash mismatch")
+        elif 'offset' in entry and read_shard_bytes(shard_dir, entry, from_bundle=True) != data:
+            problems.append(f"{entry['file']}: bundle range out of date")
+    counts: Dict[str, int] = {}
+    for category, count in manifest['runs']:
+        counts[category] = counts.get(category, 0) + count
+    for category, entry in manifest['shards'].items():
+        if counts.get(category, 0) != entry['count']:
+            problems.append(f"{category}: runs give {counts.get(category, 0)} products, "
+                            f"shard has {entry['count']}")
+    if catalog_path and not problems:
+        if dumps_json(load_catalog(shard_dir)) != dumps_json(load_json(catalog_path)):
+            problems.append(f"joined shards differ from {catalog_path}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Split the catalog into per-category shards')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    split_cmd = commands.add_parser('split', help='Write shards + manifest for a catalog')
+    split_cmd.add_argument('catalog', type=Path)
+    split_cmd.add_argument('-o', '--output', type=Path, required=True)
+
+    join_cmd = commands.add_parser('join', help='Reassemble the catalog from its shards')
+    join_cmd.add_argument('shards', type=Path)
+    join_cmd.add_argument('-o', '--output', type=Path, required=True)
+    join_cmd.add_argument('--workers', type=int, default=4)
+
+    bundle_cmd = commands.add_parser('bundle', help='Rebuild catalog.bundle from the shard files')
+    bundle_cmd.add_argument('shards', type=Path)
+
+    info_cmd = commands.add_parser('info', help='Show the manifest')
+    info_cmd.add_argument('shards', type=Path)
+
+    verify_cmd = commands.add_parser('verify', help='Check hashes, bundle ranges and counts')
+    verify_cmd.add_argument('shards', type=Path)
+    verify_cmd.add_argument('catalog', type=Path, nargs='?',
+                            help='Also check the joined shards are byte-identical to this catalog')
+
+    args = parser.parse_args()
+
+    if args.command == 'split':
+        with stage('load'):
+            data = load_json(args.catalog)
+        manifest = write_shards(data, args.output)
+        print(f"📦 {len(data['products'])} products → {len(manifest['shards'])} shards in {args.output}")
+        for category, entry in manifest['shards'].items():
+            print(f"   {category:14} {entry['count']:>7} products  {entry['bytes'] / 1024:9.1f} KB")
+        print(f"   {len(manifest['runs'])} category runs keep the original order")
+
+    elif args.command == 'join':
+        data = load_catalog(args.shards, workers=args.workers)
+        with stage('save'):
+            dump_json(data, args.output)
+        print(f"✅ Wrote {args.output}: {len(data['products'])} products")
+
+    elif args.command == 'bundle':
+        manifest = read_manifest(args.shards)
+        write_bundle(args.shards, manifest)
+        write_manifest(args.shards, manifest, recount=False)
+        print(f"📦 Rebuilt {args.shards / BUNDLE_NAME}: {len(manifest['shards'])} shards")
+
+    elif args.command == 'info':
+        manifest = read_manifest(args.shards)
+        header = manifest['header']
+        print(f"📋 {args.shards}: version {header.get('version')}, "
+              f"{sum(e['count'] for e in manifest['shards'].values())} products")
+        for category, entry in manifest['shards'].items():
+            print(f"   {category:14} {entry['count']:>7} products  {entry['bytes'] / 1024:9.1f} KB"
+                  f"  @{entry.get('offset', '-')}  {entry['sha256'][:12]}")
+
+    elif args.command == 'verify':
+        with stage('verify'):
+            problems = verify_shards(args.shards, args.catalog)
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+            sys.exit(1)
+        print(f"✅ Shards OK: {args.shards}")
+
+
+if __name__ == '__main__':
+    run_script('catalog_shards', main)
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Compressed Catalog Pack for Fresh Keeper
+Per-block zlib compression against a preset dictionary trained on the catalog
+
+The catalog repeats itself: the same storage_tips boilerplate, the same
+nutrition templates per category, the same keys in every record. gzip of
+the whole JSON exploits that but must be inflated from the start to
+reach any product. Here a zlib preset dictionary (up to 32 KB) is
+trained from the most valuable repeated fragments, and products are
+compressed in small blocks against it, with an offset table, so one
+product costs one small inflate.
+
+File layout (little-endian):
+
+  b'FKZP' u16 version  u16 reserved
+  u32 block_size  u32 records  u32 blocks
+  u32 dict length, dictionary
+  u32 meta length, zlib(JSON: header, keys, ids)
+  u64 × (blocks + 1) block offsets, relative to the first block
+  blocks: zlib streams of the block's products as compact JSON lines
+
+Usage:
+  python3 scripts/catalog_zpack.py build assets/data/products_sample.json -o assets/data/catalog.zpack
+  python3 scripts/catalog_zpack.py show assets/data/catalog.zpack beer_18
+  python3 scripts/catalog_zpack.py compare assets/data/products_sample.json
+  python3 scripts/catalog_zpack.py verify assets/data/catalog.zpack assets/data/products_sample.json
+"""
+
+import argparse
+import gzip
+import json
+import mmap
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from catalog_codec import dumps_compact, dumps_json, get_codec, load_json
+from instrumentation import add_count, run_script, stage
+
+MAGIC = b'FKZP'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIII')
+
+# zlib only looks back 32 KB, so a larger dictionary is wasted
+MAX_DICT_BYTES = 32 * 1024
+
+# Fragments longer than this rarely repeat whole
+MAX_FRAGMENT_BYTES = 2048
+
+# Records sampled for dictionary training
+TRAINING_SAMPLE = 20_000
+
+# Products per compressed block: 1 is pure per-record access; a few more
+# share context and compress noticeably better
+DEFAULT_BLOCK_SIZE = 8
+
+LEVEL = 9
+
+
+def fragments(record: Dict[str, Any]) -> Iterator[bytes]:
+    """Pieces of a record's JSON worth matching: each "key":value, each key, each list item"""
+    for key, value in record.items():
+        encoded_key = dumps_compact(key) + b':'
+        yield encoded_key
+        yield encoded_key + dumps_compact(value)
+        if isinstance(value, dict):
+            yield from fragments(value)
+        elif isinstance(value, list):
+            for item in value:
+                yield dumps_compact(item)
+
+
+def train_dictionary(products: List[Dict[str, Any]], size: int = MAX_DICT_BYTES) -> bytes:
+    """
+    Preset dictionary of the fragments that save the most bytes
+    (repeats × length), most valuable last: zlib prefers short distances
+    """
+    step = max(1, len(products) // TRAINING_SAMPLE)
+    counts: Dict[bytes, int] = {}
+    for product in products[::step]:
+        for fragment in set(fragments(product)):
+            if 3 < len(fragment) <= MAX_FRAGMENT_BYTES:
+                counts[fragment] = counts.get(fragment, 0) + 1
+
+    ranked = sorted((f for f, n in counts.items() if n > 1),
+                    key=lambda f: (counts[f] - 1) * len(f), reverse=True)
+    chosen, total = [], 0
+    for fragment in ranked:
+        if total + len(fragment) > size:
+            continue
+        chosen.append(fragment)
+        total += len(fragment)
+    return b''.join(reversed(chosen))
+
+
+def compress_block(records: List[bytes], zdict: bytes) -> bytes:
+    compressor = zlib.compressobj(LEVEL, zdict=zdict) if zdict else zlib.compressobj(LEVEL)
+    return compressor.compress(b'\n'.join(records)) + compressor.flush()
+
+
+def build(data: Dict[str, Any], path: Path, block_size: int = DEFAULT_BLOCK_SIZE,
+          zdict: Optional[bytes] = None) -> Dict[str, Any]:
+    """Write the pack; returns size statistics"""
+    products = data['products']
+    if zdict is None:
+        with stage('train'):
+            zdict = train_dictionary(products)
+    meta = {
+        'keys': list(data),
+        'header': {key: value for key, value in data.items() if key != 'products'},
+        'ids': [product['id'] for product in products],
+    }
+    meta_bytes = zlib.compress(dumps_compact(meta), LEVEL)
+
+    blocks = []
+    with stage('compress'):
+        for start in range(0, len(products), block_size):
+            blocks.append(compress_block([dumps_compact(p) for p in products[start:start + block_size]], zdict))
+    offsets = [0]
+    for block in blocks:
+        offsets.append(offsets[-1] + len(block))
+
+    with stage('write'), open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, block_size, len(products), len(blocks)))
+        f.write(struct.pack('<I', len(zdict)) + zdict)
+        f.write(struct.pack('<I', len(meta_bytes)) + meta_bytes)
+        f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+        for block in blocks:
+            f.write(block)
+    add_count('blocks', len(blocks))
+    return {'dictionary': len(zdict), 'meta': len(meta_bytes), 'blocks': offsets[-1],
+            'total': Path(path).stat().st_size}
+
+
+class ZPack:
+    """Read-only, memory-mapped pack; one block is inflated per lookup"""
+
+    def __init__(self, path: Path):
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.block_size, self.records, blocks = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} catalog pack")
+        position = HEADER.size
+        (dict_length,) = struct.unpack_from('<I', self._mmap, position)
+        self.zdict = bytes(self._mmap[position + 4:position + 4 + dict_length])
+        position += 4 + dict_length
+        (meta_length,) = struct.unpack_from('<I', self._mmap, position)
+        meta = json.loads(zlib.decompress(self._mmap[position + 4:position + 4 + meta_length]))
+        position += 4 + meta_length
+        self.offsets = struct.unpack_from(f'<{blocks + 1}Q', self._mmap, position)
+        self._base = position + 8 * (blocks + 1)
+        self.header: Dict[str, Any] = meta['header']
+        self.keys: List[str] = meta['keys']
+        self.ids: List[str] = meta['ids']
+        self._index: Optional[Dict[str, int]] = None
+        self._codec = get_codec()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.records
+
+    def block(self, number: int) -> List[bytes]:
+        """The compact JSON lines of one block"""
+        start = self._base + self.offsets[number]
+        end = self._base + self.offsets[number + 1]
+        decompressor = zlib.decompressobj(zdict=self.zdict) if self.zdict else zlib.decompressobj()
+        return decompressor.decompress(self._mmap[start:end]).split(b'\n')
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Product by position"""
+        if not 0 <= index < self.records:
+            raise IndexError(index)
+        block, within = divmod(index, self.block_size)
+        return self._codec.decode(self.block(block)[within])
+
+    def get(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """Product by id (the first one, if an id repeats)"""
+        if self._index is None:
+            self._index = {}
+            for index, value in enumerate(self.ids):
+                self._index.setdefault(value, index)
+        index = self._index.get(product_id)
+        return None if index is None else self.record(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        decode = self._codec.decode
+        for number in range(len(self.offsets) - 1):
+            for line in self.block(number):
+                yield decode(line)
+
+    def catalog(self) -> Dict[str, Any]:
+        products = list(self)
+        return {key: products if key == 'products' else self.header[key] for key in self.keys}
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+
+def compare(data: Dict[str, Any], work_dir: Path, block_sizes=(1, DEFAULT_BLOCK_SIZE, 32),
+            lookups: int = 200) -> List[Dict[str, Any]]:
+    """Size, random-access latency and full-scan time: gzip of the JSON vs packs"""
+    raw = dumps_json(data)
+    products = data['products']
+    step = max(1, len(products) // lookups)
+    positions = list(range(0, len(products), step))[:lookups]
+    rows = []
+
+    gz = gzip.compress(raw, LEVEL)
+    start = time.perf_counter()
+    whole = get_codec().decode(gzip.decompress(gz))
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    whole = get_codec().decode(gzip.decompress(gz))
+    # An empty catalog has nothing to look up; the time is just the decode
+    _ = whole['products'][positions[0]] if positions else None
+    lookup = time.perf_counter() - start
+    rows.append({'format': 'gzip -9 (whole JSON)', 'bytes': len(gz), 'ratio': len(raw) / len(gz),
+                 'lookup_ms': lookup * 1000, 'scan_s': scan})
+
+    zdict = train_dictionary(products)
+    for label, dictionary in (('zpack', zdict), ('zpack, no dict', b'')):
+        for block_size in block_sizes:
+            if not dictionary and block_size != DEFAULT_BLOCK_SIZE:
+                continue
+            path = work_dir / f'compare-{block_size}-{len(dictionary)}.zpack'
+            build(data, path, block_size, dictionary)
+            with ZPack(path) as pack:
+                start = time.perf_counter()
+                for position in positions:
+                    pack.record(position)
+                lookup = (time.perf_counter() - start) / max(len(positions), 1)
+                start = time.perf_counter()
+                for _ in pack:
+                    pass
+                scan = time.perf_counter() - start
+            size = path.stat().st_size
+            path.unlink()
+            rows.append({'format': f'{label}, block {block_size}', 'bytes': size,
+                         'ratio': len(raw) / size, 'lookup_ms': lookup * 1000, 'scan_s': scan})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compressed catalog pack with random access')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_cmd = commands.add_parser('build', help='Train a dictionary and write the pack')
+    build_cmd.add_argument('catalog', type=Path)
+    build_cmd.add_argument('-o', '--output', type=Path, required=True)
+    build_cmd.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE)
+
+    show_cmd = commands.add_parser('show', help='Print one product')
+    show_cmd.add_argument('pack', type=Path)
+    show_cmd.add_argument('product_id')
+
+    compare_cmd = commands.add_parser('compare', help='Compare against gzip of the whole JSON')
+    compare_cmd.add_argument('catalog', type=Path)
+    compare_cmd.add_argument('--work-dir', type=Path, default=Path('/tmp'))
+
+    verify_cmd = commands.add_parser('verify', help='Check the pack unpacks to the catalog')
+    verify_cmd.add_argument('pack', type=Path)
+    verify_cmd.add_argument('catalog', type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with stage('load'):
+            data = load_json(args.catalog)
+        sizes = build(data, args.output, args.block_size)
+        source = args.catalog.stat().st_size
+        print(f"📦 {len(data['products'])} products → {args.output}")
+        print(f"   Dictionary {sizes['dictionary'] / 1024:.1f} KB, blocks {sizes['blocks'] / 1024:.1f} KB, "
+              f"total {sizes['total'] / 1024:.1f} KB ({source / sizes['total']:.1f}x smaller)")
+
+    elif args.command == 'show':
+        with ZPack(args.pack) as pack:
+            product = pack.get(args.product_id)
+        if product is None:
+            print(f"❌ Unknown product: {args.product_id}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(product, ensure_ascii=False, indent=2))
+
+    elif args.command == 'compare':
+        with stage('load'):
+            data = load_json(args.catalog)
+        with stage('compare'):
+            rows = compare(data, args.work_dir)
+        print(f"📊 {args.catalog} ({len(dumps_json(data)) / 1024:.1f} KB canonical JSON)")
+        print(f"   {'format':28} {'size':>10} {'ratio':>7} {'lookup':>10} {'full scan':>10}")
+        for row in rows:
+            print(f"   {row['format']:28} {row['bytes'] / 1024:8.1f}KB {row['ratio']:6.1f}x "
+                  f"{row['lookup_ms']:8.3f}ms {row['scan_s']:9.3f}s")
+
+    elif args.command == 'verify':
+        with ZPack(args.pack) as pack, stage('verify'):
+            same = dumps_json(pack.catalog()) == dumps_json(load_json(args.catalog))
+        if not same:
+            print(f"❌ {args.pack} does not unpack to {args.catalog}")
+            sys.exit(1)
+        print(f"✅ {args.pack} unpacks to {args.catalog}")
+
+
+if __name__ == '__main__':
+    run_script('catalog_zpack', main)
@@ -6,25 +6,28 @@ Script to deduplicate products while preserving scientifically accurate shelf li
 - Add appropriate disclaimers for fresh produce
 """
 
-import json
 import sys
 from pathlib import Path
 from collections import defaultdict, Counter
 
+from instrumentation import add_count, run_script, stage
+from product_record import dump_catalog, load_catalog
+
 def deduplicate_products(input_file, output_file):
     """Deduplicate products and clean up data"""
 
     # Read input file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with stage('load'):
+        data = load_catalog(input_file)
 
     products = data['products']
+    add_count('products', len(products))
     print(f"📊 Total products: {len(products)}")
 
     # Group products by name_vi
     grouped = defaultdict(list)
     for product in products:
-        grouped[product['name_vi']].append(product)
+        grouped[product.name_vi].append(product)
 
     print(f"📊 Unique product names: {len(grouped)}")
 
@@ -35,7 +38,8 @@ def deduplicate_products(input_file, output_file):
     for name_vi, product_list in sorted(grouped.items()):
         if len(product_list) > 1:
             # Get all shelf life values for this product
-            shelf_lives = [p.get('shelf_life_refrigerated', 0) for p in product_list]
+            shelf_lives = [p.shelf_life_refrigerated if p.shelf_life_refrigerated is not None else 0
+                           for p in product_list]
             unique_shelf_lives = set(shelf_lives)
 
             # Choose the most common shelf life value
@@ -55,18 +59,19 @@ def deduplicate_products(input_file, output_file):
             })
         else:
             # Only one entry, use its shelf life
-            most_common_shelf_life = product_list[0].get('shelf_life_refrigerated', 7)
+            first = product_list[0].shelf_life_refrigerated
+            most_common_shelf_life = first if first is not None else 7
 
         # Find the product with the simplest ID (no suffix) or first one
         product = None
         for p in product_list:
-            if p['id'] == p['id'].split('_')[0] + '_' + p['id'].split('_')[1] if '_' in p['id'] and len(p['id'].split('_')) == 2 else False:
+            if p.id == p.id.split('_')[0] + '_' + p.id.split('_')[1] if '_' in p.id and len(p.id.split('_')) == 2 else False:
                 product = p
                 break
         if product is None:
             # If no simple ID found, use the one with the chosen shelf life
             for p in product_list:
-                if p.get('shelf_life_refrigerated') == most_common_shelf_life:
+                if p.shelf_life_refrigerated == most_common_shelf_life:
                     product = p
                     break
         if product is None:
@@ -74,10 +79,10 @@ def deduplicate_products(input_file, output_file):
 
         # Use the most common shelf life value
         shelf_life = most_common_shelf_life
-        product['shelf_life_refrigerated'] = shelf_life
+        product.shelf_life_refrigerated = shelf_life
 
         # Update storage tips with proper disclaimer based on category
-        category = product.get('category', '')
+        category = product.category or ''
 
         if category in ['vegetables', 'fruits']:
             storage_tips = (
@@ -109,7 +114,7 @@ def deduplicate_products(input_file, output_file):
                 f"Đề xuất sử dụng trong vòng {shelf_life} ngày."
             )
 
-        product['storage_tips'] = storage_tips
+        product.storage_tips = storage_tips
 
         unique_products.append(product)
 
@@ -118,6 +123,7 @@ def deduplicate_products(input_file, output_file):
     print(f"Before: {len(products)} products")
     print(f"After: {len(unique_products)} products")
     print(f"Removed: {len(products) - len(unique_products)} duplicates")
+    add_count('duplicates_removed', len(products) - len(unique_products))
 
     if stats:
         print(f"\n📋 Products with multiple entries (showing chosen shelf life):")
@@ -136,15 +142,19 @@ def deduplicate_products(input_file, output_file):
     }
 
     # Write output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    with stage('save'):
+        dump_catalog(output_data, output_file)
 
     print(f"\n✅ Deduplicated data saved to: {output_file}")
     print(f"📊 Total unique products: {len(unique_products)}")
 
-if __name__ == '__main__':
+def main():
     input_file = Path(__file__).parent.parent / 'assets' / 'data' / 'products_sample_backup.json'
     output_file = Path(__file__).parent.parent / 'assets' / 'data' / 'products_sample.json'
 
     print("🔧 Deduplicating products with scientific shelf life preservation...")
-    deduplicate_products(input_file, output_file)
+    with stage('deduplicate'):
+        deduplicate_products(input_file, output_file)
+
+if __name__ == '__main__':
+    run_script('deduplicate_products_v2', main)
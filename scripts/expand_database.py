@@ -4,9 +4,11 @@ Script to expand database with more Vietnamese products
 Focus on vegetables, fruits, and meat
 """
 
-import json
 from pathlib import Path
 
+from catalog_codec import dump_json, load_json
+from instrumentation import add_count, run_script, stage
+
 # Additional vegetables (rau củ quả)
 ADDITIONAL_VEGETABLES = [
     {
@@ -890,10 +892,11 @@ def expand_database(input_file, output_file):
     """Expand database with additional products"""
 
     # Read current database
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with stage('load'):
+        data = load_json(input_file)
 
     current_products = data['products']
+    add_count('products', len(current_products))
     print(f"📊 Current products: {len(current_products)}")
 
     # Count by category
@@ -934,6 +937,7 @@ def expand_database(input_file, output_file):
 
     # Merge products
     all_products = current_products + products_to_add
+    add_count('products_added', len(products_to_add))
 
     # Create output data
     output_data = {
@@ -955,16 +959,20 @@ def expand_database(input_file, output_file):
         print(f"  - {cat}: {count} (+{added})")
 
     # Write output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    with stage('save'):
+        dump_json(output_data, output_file)
 
     print(f"\n✅ Expanded database saved to: {output_file}")
     print(f"📊 Total products: {len(current_products)} → {len(all_products)}")
     print(f"📈 Added: {len(products_to_add)} new products")
 
-if __name__ == '__main__':
+def main():
     input_file = Path(__file__).parent.parent / 'assets' / 'data' / 'products_sample.json'
     output_file = Path(__file__).parent.parent / 'assets' / 'data' / 'products_sample.json'
 
     print("🚀 Expanding database with Vietnamese products...")
-    expand_database(input_file, output_file)
+    with stage('expand'):
+        expand_database(input_file, output_file)
+
+if __name__ == '__main__':
+    run_script('expand_database', main)
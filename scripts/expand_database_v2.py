@@ -3,9 +3,11 @@
 Script to expand database with MORE Vietnamese products
 """
 
-import json
 from pathlib import Path
 
+from catalog_codec import dump_json, load_json
+from instrumentation import add_count, run_script, stage
+
 # More vegetables
 MORE_VEGETABLES = [
     {
@@ -550,10 +552,11 @@ MORE_MEAT = [
 def expand_database_v2(input_file, output_file):
     """Expand database with more products"""
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with stage('load'):
+        data = load_json(input_file)
 
     current_products = data['products']
+    add_count('products', len(current_products))
     print(f"📊 Current products: {len(current_products)}")
 
     # Add new products
@@ -579,6 +582,7 @@ def expand_database_v2(input_file, output_file):
         products_to_add.append(product)
 
     all_products = current_products + products_to_add
+    add_count('products_added', len(products_to_add))
 
     # Create output
     output_data = {
@@ -588,16 +592,20 @@ def expand_database_v2(input_file, output_file):
         'products': all_products
     }
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    with stage('save'):
+        dump_json(output_data, output_file)
 
     print(f"\n✅ Expanded database saved")
     print(f"📊 Total: {len(current_products)} → {len(all_products)}")
     print(f"📈 Added: {len(products_to_add)} new products")
 
-if __name__ == '__main__':
+def main():
     input_file = Path(__file__).parent.parent / 'assets' / 'data' / 'products_sample.json'
     output_file = Path(__file__).parent.parent / 'assets' / 'data' / 'products_sample.json'
 
     print("🚀 Expanding database (Round 2)...")
-    expand_database_v2(input_file, output_file)
+    with stage('expand'):
+        expand_database_v2(input_file, output_file)
+
+if __name__ == '__main__':
+    run_script('expand_database_v2', main)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Duplicate Icon Finder for Fresh Keeper
+Finds visually near-identical icons with perceptual hashes
+
+The icon set has near-identical entries under different names
+(blueberry/blueberries, leafy_green/leafy_greens, ...). This script
+computes a 64-bit perceptual hash for every 3D PNG and rasterized flat
+SVG, indexes them in a BK-tree and reports clusters of icons within a
+Hamming distance threshold, so redundant assets can be pruned.
+
+Hashes (vectorized with NumPy over the whole icon set):
+  - dhash: sign of horizontal gradients on a 9x8 grayscale thumbnail
+  - phash: sign of the low-frequency 8x8 DCT block vs its median
+
+BK-tree queries only visit subtrees whose distance band can contain a
+match, so finding all near-duplicates stays well below n² comparisons.
+
+Requires: pip install pillow numpy resvg-py
+
+Usage:
+  python3 scripts/find_duplicate_icons.py
+  python3 scripts/find_duplicate_icons.py --hash dhash --threshold 6
+  python3 scripts/find_duplicate_icons.py --json duplicates.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from build_icon_atlas import rasterize_icon
+from instrumentation import add_count, run_script, stage
+
+ICON_DIRS = {
+    'flat': Path('assets/product_icons/flat'),
+    '3d': Path('assets/product_icons/3d'),
+}
+
+# Size icons are rasterized at before hashing
+RENDER_SIZE = 64
+
+# Default Hamming distance (out of 64 bits) that counts as a near-duplicate
+THRESHOLDS = {'phash': 6, 'dhash': 6}
+
+
+def load_grayscale(paths: List[Path], width: int, height: int):
+    """Rasterize icons over white and stack them as an (N, height, width) float array"""
+    import numpy as np
+    from PIL import Image
+
+    if not paths:
+        # np.stack needs at least one array
+        return np.zeros((0, height, width), dtype=np.float32)
+    images = []
+    for path in paths:
+        rgba = rasterize_icon(path, RENDER_SIZE)
+        background = Image.new('RGBA', rgba.size, (255, 255, 255, 255))
+        gray = Image.alpha_composite(background, rgba).convert('L')
+        images.append(np.asarray(gray.resize((width, height), Image.LANCZOS), dtype=np.float32))
+    return np.stack(images)
+
+
+def pack_bits(bits) -> List[int]:
+    """(N, 64) boolean array → N Python ints"""
+    import numpy as np
+
+    packed = np.packbits(bits.astype(np.uint8), axis=1)
+    return [int.from_bytes(row.tobytes(), 'big') for row in packed]
+
+
+def dhash(paths: List[Path]) -> List[int]:
+    pixels = load_grayscale(paths, 9, 8)
+    return pack_bits((pixels[:, :, 1:] > pixels[:, :, :-1]).reshape(len(paths), 64))
+
+
+def dct_matrix(n: int):
+    """Orthonormal DCT-II basis, so dct(x) = C @ x @ C.T"""
+    import numpy as np
+
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+def phash(paths: List[Path]) -> List[int]:
+    import numpy as np
+
+    pixels = load_grayscale(paths, 32, 32)
+    c = dct_matrix(32)
+    coefficients = np.einsum('ij,njk,lk->nil', c, pixels, c)[:, :8, :8]
+    flat = coefficients.reshape(len(paths), 64)
+    # The DC term only tracks overall brightness; leave it out of the median
+    median = np.median(flat[:, 1:], axis=1, keepdims=True)
+    return pack_bits(flat > median)
+
+
+HASHERS = {'phash': phash, 'dhash': dhash}
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over Hamming distance
+    Children are keyed by their distance to the parent; the triangle
+    inequality lets a query skip every child outside [d - r, d + r]
+    """
+
+    def __init__(self):
+        self.root: Optional[Tuple[int, str, Dict]] = None
+        self.comparisons = 0
+
+    def add(self, value: int, key: str):
+        if self.root is None:
+            self.root = (value, key, {})
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, key, {})
+                return
+            node = child
+
+    def query(self, value: int, radius: int) -> Iterator[Tuple[str, int]]:
+        """Yield (key, distance) for every entry within radius"""
+        if self.root is None:
+            return
+        stack = [self.root]
+        while stack:
+            node_value, node_key, children = stack.pop()
+            distance = hamming(value, node_value)
+            self.comparisons += 1
+            if distance <= radius:
+                yield node_key, distance
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+
+
+def find_clusters(hashes: Dict[str, int], threshold: int) -> Tuple[List[List[str]], Dict, int]:
+    """
+    Group icons whose hashes are within threshold (transitively)
+    Returns (clusters, pair distances, hash comparisons made)
+    """
+    tree = BKTree()
+    for key in sorted(hashes):
+        tree.add(hashes[key], key)
+
+    parent = {key: key for key in hashes}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    pairs = {}
+    for key in sorted(hashes):
+        for other, distance in tree.query(hashes[key], threshold):
+            if other != key:
+                pairs[tuple(sorted((key, other)))] = distance
+                parent[find(key)] = find(other)
+
+    groups: Dict[str, List[str]] = {}
+    for key in hashes:
+        groups.setdefault(find(key), []).append(key)
+    clusters = sorted(sorted(g) for g in groups.values() if len(g) > 1)
+    return clusters, pairs, tree.comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report near-duplicate icons')
+    parser.add_argument('--hash', choices=sorted(HASHERS), default='phash')
+    parser.add_argument('--threshold', type=int, default=None,
+                        help='Max Hamming distance (default depends on --hash)')
+    parser.add_argument('--json', type=Path, default=None, help='Also write clusters as JSON')
+    args = parser.parse_args()
+    threshold = args.threshold if args.threshold is not None else THRESHOLDS[args.hash]
+
+    print("🔍 Fresh Keeper Duplicate Icon Finder")
+    print("=" * 50)
+
+    report = {}
+    for icon_type, icon_dir in ICON_DIRS.items():
+        if not icon_dir.exists():
+            print(f"❌ Directory not found: {icon_dir}")
+            continue
+        paths = sorted(p for p in icon_dir.iterdir() if p.suffix.lower() in ('.png', '.svg'))
+        with stage('hash'):
+            hashes = dict(zip((p.stem for p in paths), HASHERS[args.hash](paths)))
+        with stage('cluster'):
+            clusters, pairs, comparisons = find_clusters(hashes, threshold)
+        add_count('icons', len(hashes))
+        add_count('comparisons', comparisons)
+        brute_force = len(hashes) ** 2
+
+        print(f"\n📦 {icon_type}: {len(hashes)} icons, {len(clusters)} clusters "
+              f"within distance {threshold} ({args.hash})")
+        print(f"   BK-tree comparisons: {comparisons} (brute force: {brute_force})")
+        for cluster in clusters:
+            distances = [f"{a}~{b}={d}" for (a, b), d in sorted(pairs.items())
+                         if a in cluster and b in cluster]
+            print(f"   - {', '.join(cluster)}  [{'; '.join(distances)}]")
+
+        report[icon_type] = {
+            'hash': args.hash,
+            'threshold': threshold,
+            'clusters': clusters,
+            'hashes': {key: f'{value:016x}' for key, value in sorted(hashes.items())},
+        }
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved to: {args.json}")
+
+
+if __name__ == '__main__':
+    run_script('find_duplicate_icons', main)
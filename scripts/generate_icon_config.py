@@ -11,7 +11,12 @@ Usage:
 
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from instrumentation import add_count, run_script, stage
+
+# Sprite sheet coordinate table written by build_icon_atlas.py (optional)
+ATLAS_TABLE_PATH = Path('assets/product_icons/atlas/atlas.json')
 
 # Vietnamese names for common items
 VIETNAMESE_NAMES = {
@@ -207,7 +212,41 @@ def get_emoji(name: str) -> str:
     # Default by category
     return '📦'
 
-def generate_icon_entry(icon_id: str, icon_data: Dict, tier: str, order: int) -> str:
+def load_atlas_table() -> Optional[Dict]:
+    """Load the sprite sheet table if build_icon_atlas.py has been run"""
+    if not ATLAS_TABLE_PATH.exists():
+        return None
+    with open(ATLAS_TABLE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def get_atlas_fields(atlas: Optional[Dict], icon_type: str, icon_id: str) -> str:
+    """Dart atlasPath/atlasRect lines for an icon, empty if it isn't packed"""
+    if not atlas:
+        return ''
+    entry = atlas['icons'].get(icon_type, {}).get(icon_id)
+    if not entry:
+        return ''
+    sheet_path = atlas['sheets'][entry['sheet']]['path']
+    rect = entry['rect'] + entry['offset'] + [atlas['cell_size']]
+    rect_str = ', '.join(str(v) for v in rect)
+    return f"""
+      atlasPath: '{sheet_path}',
+      atlasRect: [{rect_str}],"""
+
+def get_image_fields(icon_data: Dict) -> str:
+    """Dart size/placeholder lines from manifest image metadata, if present"""
+    image = icon_data.get('image')
+    if not image:
+        return ''
+    color = image['dominant_color'].lstrip('#')
+    return f"""
+      intrinsicWidth: {float(image['width'])},
+      intrinsicHeight: {float(image['height'])},
+      placeholderColor: 0xFF{color},
+      placeholder: '{image['placeholder']}',"""
+
+def generate_icon_entry(icon_id: str, icon_data: Dict, tier: str, order: int,
+                        atlas: Optional[Dict] = None) -> str:
     """Generate Dart code for a single icon"""
     english_name = to_title_case(icon_id)
     vietnamese_name = VIETNAMESE_NAMES.get(icon_id, english_name)
@@ -216,10 +255,10 @@ def generate_icon_entry(icon_id: str, icon_data: Dict, tier: str, order: int) ->
     emoji = get_emoji(icon_id)
 
     # Determine asset path based on tier
-    if tier == 'free':
-        asset_path = f'assets/product_icons/flat/{filename}'
-    else:
-        asset_path = f'assets/product_icons/3d/{filename}'
+    icon_type = 'flat' if tier == 'free' else '3d'
+    asset_path = f'assets/product_icons/{icon_type}/{filename}'
+    atlas_fields = get_atlas_fields(atlas, icon_type, icon_id)
+    image_fields = get_image_fields(icon_data)
 
     # Format tags
     tags = [icon_id.replace('_', ' '), vietnamese_name.lower()]
@@ -235,7 +274,7 @@ def generate_icon_entry(icon_id: str, icon_data: Dict, tier: str, order: int) ->
       category: '{category}',
       tier: IconTier.{tier},
       emoji: '{emoji}',
-      assetPath: '{asset_path}',
+      assetPath: '{asset_path}',{atlas_fields}{image_fields}
       displayOrder: {order},
       tags: [{tags_str}],
     ),"""
@@ -250,9 +289,13 @@ def generate_config():
         print("❌ Manifest not found. Run icon_organizer.py first!")
         return
 
-    with open(manifest_path, 'r', encoding='utf-8') as f:
+    with stage('load'), open(manifest_path, 'r', encoding='utf-8') as f:
         manifest = json.load(f)
 
+    atlas = load_atlas_table()
+    if atlas:
+        print(f"🗺️  Using sprite sheets from {ATLAS_TABLE_PATH}")
+
     # Generate code
     output = []
     output.append("import '../data/models/product_icon.dart';")
@@ -269,7 +312,7 @@ def generate_config():
     # Generate free icons
     flat_icons = manifest.get('flat', {})
     for order, (icon_id, icon_data) in enumerate(sorted(flat_icons.items()), start=1):
-        output.append(generate_icon_entry(icon_id, icon_data, 'free', order))
+        output.append(generate_icon_entry(icon_id, icon_data, 'free', order, atlas))
 
     output.append("  ];")
     output.append("")
@@ -282,7 +325,7 @@ def generate_config():
     # Generate premium icons
     premium_icons = manifest.get('3d', {})
     for order, (icon_id, icon_data) in enumerate(sorted(premium_icons.items()), start=1):
-        output.append(generate_icon_entry(icon_id, icon_data, 'premium', order))
+        output.append(generate_icon_entry(icon_id, icon_data, 'premium', order, atlas))
 
     output.append("  ];")
     output.append("")
@@ -344,8 +387,9 @@ def generate_config():
 
     # Write output
     output_path = Path('scripts/generated_icons.dart')
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with stage('save'), open(output_path, 'w', encoding='utf-8') as f:
         f.write('\n'.join(output))
+    add_count('icons', len(flat_icons) + len(premium_icons))
 
     print(f"✅ Generated: {output_path}")
     print(f"   - Free icons: {len(flat_icons)}")
@@ -355,4 +399,4 @@ def generate_config():
     print(f"   Copy content from {output_path} to lib/config/product_icons.dart")
 
 if __name__ == '__main__':
-    generate_config()
+    run_script('generate_icon_config', generate_config)
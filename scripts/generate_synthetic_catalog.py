@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Synthetic Catalog Generator for Fresh Keeper
+Writes large, realistic product catalogs for scale testing the pipeline
+
+The real catalog has a few hundred products, so nothing in scripts/ has
+been run at 100k–1M. This generator learns its vocabulary from the real
+catalogs (base vi/en names, aliases, nutrition shapes, shelf lives,
+health texts per category) and streams any number of products straight
+to disk in the products_sample.json schema:
+
+  - unique names are base names combined with variety / origin / grade
+    qualifiers ("Xoài cát Đà Lạt" / "Dalat Cat Mango"), then lot numbers
+  - duplicates reuse a recent product's name_vi with an `_N` id suffix and
+    a jittered shelf life, like products_sample_backup.json
+  - 1–4 aliases (vi, accent-free vi, en), matching the real distribution
+  - nutrition copies a same-category product's shape (same vitamin and
+    mineral keys) with values jittered ±15%
+
+Output is fully deterministic for a given --seed and seed catalogs, and
+memory stays flat regardless of --count.
+
+Usage:
+  python3 scripts/generate_synthetic_catalog.py --count 100000 --output /tmp/catalog_100k.json
+  python3 scripts/generate_synthetic_catalog.py --count 1000000 --seed 7 --duplicate-rate 0.2 \\
+      --format jsonl --output /tmp/catalog_1m.jsonl
+"""
+
+import argparse
+import json
+import random
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from instrumentation import add_count, run_script, stage
+from text_fold import fold_vietnamese
+
+SEED_CATALOGS = [
+    Path('assets/data/products_sample.json'),
+    Path('assets/data/products_sample_backup.json'),
+]
+
+# Share of emitted products that repeat an earlier product's name
+DUPLICATE_RATE = 0.1
+
+# How far back duplicates may reach; bounds memory
+DUPLICATE_WINDOW = 1000
+
+# Relative jitter applied to nutrition values
+NUTRITION_JITTER = 0.15
+
+# Alias count distribution of products_sample.json
+ALIAS_COUNTS = {1: 1, 2: 166, 3: 83, 4: 1}
+
+# (vi, en) qualifiers; vi goes after the noun, en before it
+VARIETIES = [
+    ('đỏ', 'Red'), ('xanh', 'Green'), ('vàng', 'Yellow'), ('trắng', 'White'),
+    ('tím', 'Purple'), ('đen', 'Black'), ('non', 'Baby'), ('ruột đỏ', 'Red Flesh'),
+]
+ORIGINS = [
+    ('Đà Lạt', 'Dalat'), ('Hưng Yên', 'Hung Yen'), ('Bến Tre', 'Ben Tre'),
+    ('Tiền Giang', 'Tien Giang'), ('Sơn La', 'Son La'), ('Úc', 'Australian'),
+    ('Mỹ', 'American'), ('Nhật', 'Japanese'), ('Hàn Quốc', 'Korean'),
+    ('Thái', 'Thai'), ('New Zealand', 'New Zealand'),
+]
+GRADES = [
+    ('hữu cơ', 'Organic'), ('loại 1', 'Premium'), ('tươi', 'Fresh'),
+    ('nhập khẩu', 'Imported'), ('VietGAP', 'VietGAP'),
+]
+
+
+def slugify(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', fold_vietnamese(text)).strip('_')
+
+
+def with_shelf_life(storage_tips: str, days: int) -> str:
+    """Storage tips mention the shelf life ('... trong 7 ngày'); keep them consistent"""
+    return re.sub(r'\d+ ngày', f'{days} ngày', storage_tips)
+
+
+def load_seed_products(paths: List[Path] = SEED_CATALOGS) -> List[Dict]:
+    """Distinct (by name_vi) products from the real catalogs, in a stable order"""
+    seen = {}
+    for path in paths:
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for product in json.load(f)['products']:
+                seen.setdefault(product['name_vi'], product)
+    if not seen:
+        raise FileNotFoundError(f"No seed catalog found: {', '.join(map(str, paths))}")
+    return [seen[name] for name in sorted(seen)]
+
+
+def decimals(value) -> int:
+    text = repr(value)
+    return len(text.split('.')[1]) if '.' in text else 0
+
+
+def jitter(rng: random.Random, value):
+    """Scale a number by ±NUTRITION_JITTER, keeping its precision"""
+    if not isinstance(value, (int, float)) or value == 0:
+        return value
+    scaled = value * rng.uniform(1 - NUTRITION_JITTER, 1 + NUTRITION_JITTER)
+    places = decimals(value)
+    return round(scaled, places) if places else int(round(scaled))
+
+
+def jitter_nutrition(rng: random.Random, nutrition: Dict) -> Dict:
+    result = {}
+    for key, value in nutrition.items():
+        if isinstance(value, dict):
+            result[key] = {k: jitter(rng, v) for k, v in value.items()}
+        else:
+            result[key] = jitter(rng, value)
+    return result
+
+
+def qualifier_combo(index: int) -> Tuple[Optional[Tuple], Optional[Tuple], Optional[Tuple], int]:
+    """
+    Decode a combo number into (variety, origin, grade, lot)
+    Combo 0 is the bare base name; every combo gives a distinct name
+    """
+    index, variety = divmod(index, len(VARIETIES) + 1)
+    index, origin = divmod(index, len(ORIGINS) + 1)
+    lot, grade = divmod(index, len(GRADES) + 1)
+    return (VARIETIES[variety - 1] if variety else None,
+            ORIGINS[origin - 1] if origin else None,
+            GRADES[grade - 1] if grade else None,
+            lot)
+
+
+def compose_names(base: Dict, combo: int) -> Tuple[str, str, List[str]]:
+    """(name_vi, name_en, English qualifier words for the id)"""
+    variety, origin, grade, lot = qualifier_combo(combo)
+    name_vi = base['name_vi']
+    name_en = base['name_en']
+    tags = []
+    for qualifier in (variety, grade, origin):
+        if qualifier:
+            name_vi = f'{name_vi} {qualifier[0]}'
+            name_en = f'{qualifier[1]} {name_en}'
+            tags.append(qualifier[1])
+    if lot:
+        name_vi = f'{name_vi} lô {lot}'
+        name_en = f'{name_en} Lot {lot}'
+        tags.append(f'lot {lot}')
+    return name_vi, name_en, tags
+
+
+def make_aliases(rng: random.Random, name_vi: str, name_en: str) -> List[str]:
+    candidates = [name_vi.lower(), fold_vietnamese(name_vi), name_en.lower(),
+                  fold_vietnamese(name_en.split()[-1])]
+    unique = list(dict.fromkeys(candidates))
+    count = rng.choices(list(ALIAS_COUNTS), weights=list(ALIAS_COUNTS.values()))[0]
+    if count == 2 and len(unique) > 2:
+        # Two-alias products in the real data are vi + en
+        return [unique[0], name_en.lower()]
+    return unique[:count]
+
+
+class CatalogGenerator:
+    """Deterministic product stream shaped like the seed catalogs"""
+
+    def __init__(self, seed_products: List[Dict], seed: int = 0,
+                 duplicate_rate: float = DUPLICATE_RATE):
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.bases = list(seed_products)
+        random.Random(seed).shuffle(self.bases)
+
+        # Distinct id stem per base; some real products share an English name
+        en_counts: Dict[str, int] = {}
+        for base in self.bases:
+            en_counts[slugify(base['name_en'])] = en_counts.get(slugify(base['name_en']), 0) + 1
+        self.base_slugs = [
+            slugify(base['name_en']) if en_counts[slugify(base['name_en'])] == 1
+            else f"{slugify(base['name_en'])}_{slugify(base['name_vi'])}"
+            for base in self.bases
+        ]
+
+        self.seed_names = {base['name_vi'] for base in self.bases}
+
+        # Per-category pools of real values to sample from
+        self.pools: Dict[str, Dict[str, List]] = {}
+        for product in seed_products:
+            pool = self.pools.setdefault(product['category'], {
+                'nutrition': [], 'shelf_life_refrigerated': [], 'shelf_life_frozen': [],
+                'health_benefits': [], 'health_warnings': [], 'storage_tips': [],
+            })
+            pool['nutrition'].append(product['nutrition_data'])
+            pool['shelf_life_refrigerated'].append(product['shelf_life_refrigerated'])
+            pool['shelf_life_frozen'].append(product['shelf_life_frozen'])
+            pool['health_benefits'].append(product['health_benefits'])
+            pool['health_warnings'].append(product['health_warnings'])
+            pool['storage_tips'].append(product['storage_tips'])
+
+    def shadows_seed(self, unique_index: int) -> bool:
+        """A qualified name that happens to be another real product's name"""
+        base = self.bases[unique_index % len(self.bases)]
+        combo = unique_index // len(self.bases)
+        return combo > 0 and compose_names(base, combo)[0] in self.seed_names
+
+    def make_product(self, rng: random.Random, unique_index: int) -> Dict:
+        base_index, combo = unique_index % len(self.bases), unique_index // len(self.bases)
+        base = self.bases[base_index]
+        name_vi, name_en, tags = compose_names(base, combo)
+        pool = self.pools[base['category']]
+        shelf_life = rng.choice(pool['shelf_life_refrigerated'])
+        storage_tips = with_shelf_life(rng.choice(pool['storage_tips']), shelf_life)
+
+        product = {
+            'id': '_'.join([self.base_slugs[base_index]] + [slugify(tag) for tag in tags]),
+            'name_vi': name_vi,
+            'name_en': name_en,
+            'aliases': make_aliases(rng, name_vi, name_en),
+            'category': base['category'],
+            'shelf_life_refrigerated': shelf_life,
+            'shelf_life_frozen': rng.choice(pool['shelf_life_frozen']),
+            'nutrition_data': jitter_nutrition(rng, rng.choice(pool['nutrition'])),
+            'health_benefits': list(rng.choice(pool['health_benefits'])),
+            'health_warnings': list(rng.choice(pool['health_warnings'])),
+            'storage_tips': storage_tips,
+        }
+        if 'iconId' in base:
+            product['iconId'] = base['iconId']
+        return product
+
+    def make_duplicate(self, rng: random.Random, original: Dict, copy_number: int) -> Dict:
+        duplicate = dict(original)
+        duplicate['id'] = f"{original['id']}_{copy_number}"
+        pool = self.pools[original['category']]
+        duplicate['shelf_life_refrigerated'] = rng.choice(pool['shelf_life_refrigerated'])
+        duplicate['storage_tips'] = with_shelf_life(original['storage_tips'],
+                                                    duplicate['shelf_life_refrigerated'])
+        duplicate['nutrition_data'] = jitter_nutrition(rng, original['nutrition_data'])
+        return duplicate
+
+    def generate(self, count: int) -> Iterator[Dict]:
+        rng = random.Random(self.seed)
+        recent: deque = deque(maxlen=DUPLICATE_WINDOW)
+        copies: Dict[str, int] = {}
+        unique_index = 0
+        for _ in range(count):
+            if recent and rng.random() < self.duplicate_rate:
+                original = rng.choice(recent)
+                copies[original['id']] = copies.get(original['id'], 0) + 1
+                yield self.make_duplicate(rng, original, copies[original['id']])
+            else:
+                # Skip names that would silently duplicate a real product
+                while self.shadows_seed(unique_index):
+                    unique_index += 1
+                product = self.make_product(rng, unique_index)
+                unique_index += 1
+                if len(recent) == recent.maxlen:
+                    copies.pop(recent[0]['id'], None)
+                recent.append(product)
+                yield product
+
+
+def write_catalog(products: Iterator[Dict], count: int, output_path: Path,
+                  output_format: str = 'json', indent: Optional[int] = 2,
+                  version: str = '3.0.0', last_updated: str = '2025-11-11') -> int:
+    """Stream products to disk; returns the number written"""
+    written = 0
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        if output_format == 'jsonl':
+            for product in products:
+                f.write(json.dumps(product, ensure_ascii=False))
+                f.write('\n')
+                written += 1
+            return written
+
+        # Same layout json.dump(..., indent=2) gives the real catalogs
+        pad = ' ' * (indent or 0)
+        newline = '\n' if indent else ''
+        header = {'version': version, 'last_updated': last_updated, 'total_products': count}
+        f.write('{' + newline)
+        for key, value in header.items():
+            f.write(f'{pad}{json.dumps(key)}: {json.dumps(value)},{newline}')
+        f.write(f'{pad}"products": [')
+        for product in products:
+            text = json.dumps(product, ensure_ascii=False, indent=indent)
+            if indent:
+                text = text.replace('\n', '\n' + pad * 2)
+            f.write((',' if written else '') + newline + pad * 2 + text)
+            written += 1
+        f.write(f'{newline}{pad}]{newline}}}{newline}')
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic product catalog')
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--duplicate-rate', type=float, default=DUPLICATE_RATE,
+                        help='Share of products repeating an earlier name (backup catalog: ~0.9)')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json')
+    parser.add_argument('--indent', type=int, default=2, help='0 for compact JSON')
+    parser.add_argument('--output', type=Path, required=True)
+    parser.add_argument('--seed-catalog', type=Path, action='append', default=None,
+                        help='Real catalog(s) to learn from (default: assets/data/products_sample*.json)')
+    args = parser.parse_args()
+
+    with stage('learn'):
+        seed_products = load_seed_products(args.seed_catalog or SEED_CATALOGS)
+        generator = CatalogGenerator(seed_products, args.seed, args.duplicate_rate)
+
+    print("🧪 Fresh Keeper Synthetic Catalog Generator")
+    print("=" * 50)
+    print(f"📚 Learned from {len(seed_products)} real products "
+          f"in {len(generator.pools)} categories")
+
+    with stage('write'):
+        written = write_catalog(generator.generate(args.count), args.count, args.output,
+                                args.format, args.indent or None)
+    add_count('products', written)
+
+    size = args.output.stat().st_size
+    print(f"✅ Wrote {written:,} products to {args.output} ({size / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == '__main__':
+    run_script('generate_synthetic_catalog', main)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Icon Matcher for Fresh Keeper
+Scores every product against every icon with character n-gram TF-IDF
+
+Substring matching takes the first keyword that appears anywhere in the
+name, so "Pineapple" hits `apple_red` and dict order decides ties. Here
+each product name variant (name_en, accent-folded name_vi, aliases) and
+each icon keyword becomes a sparse TF-IDF vector over padded character
+3- and 4-grams. One sparse matrix multiply gives the cosine similarity of
+every variant × keyword; a product's score for an icon is its best
+variant against that icon's best keyword, reduced straight from the
+sparse result.
+
+N-grams alone rate "Mustard Greens" close to `custard` and "Custard
+Apple" closer still, so a pair also has to rest on whole words: the
+name's head word (its last word: greens, apple) must be one of the
+keyword's words, up to plural endings and doubled letters. When the head
+word is in no keyword at all ("Pork Belly", "Yellow Pitaya"), every word
+of the keyword must appear in the name instead (pork, but not yellow
+pepper). Other pairs are scaled by HEAD_MISMATCH_PENALTY, which drops
+them below the confidence threshold.
+
+Work is done in chunks of products so memory stays bounded; 100k
+products take a few seconds.
+
+Requires: pip install numpy scipy
+
+Usage:
+  from icon_matcher import IconMatcher
+  matcher = IconMatcher(ICON_MAPPINGS)
+  matches = matcher.match(products, top_k=3)
+"""
+
+import math
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from text_fold import fold as fold_text
+
+NGRAM_SIZES = (3, 4)
+
+# Product rows scored per sparse multiply
+CHUNK_SIZE = 20000
+
+# Best score below this is reported as low confidence
+CONFIDENCE_THRESHOLD = 0.5
+
+# Scale for keywords that aren't the icon's own name, to break exact ties
+TIE_BREAK = 0.999
+
+# Scale for pairs that don't rest on whole words (see module docstring)
+HEAD_MISMATCH_PENALTY = 0.5
+
+# Plural endings folded away before comparing head words, longest first
+PLURAL_ENDINGS = (('ies', 'y'), ('ches', 'ch'), ('shes', 'sh'), ('oes', 'o'), ('s', ''))
+
+DOUBLED_LETTER_RE = re.compile(r'(.)\1')
+
+
+def word_stem(word: str) -> str:
+    """'strawberries' → 'strawbery', 'chilli' → 'chili': enough to compare head words"""
+    for ending, replacement in PLURAL_ENDINGS:
+        if word.endswith(ending) and len(word) > len(ending) + 2 and not word.endswith('ss'):
+            word = word[:-len(ending)] + replacement
+            break
+    return DOUBLED_LETTER_RE.sub(r'\1', word)
+
+
+def char_ngrams(text: str) -> List[str]:
+    """Character n-grams of each word, padded with spaces at word edges"""
+    grams = []
+    for word in text.split():
+        padded = f' {word} '
+        for n in NGRAM_SIZES:
+            grams.extend(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+    return grams
+
+
+def product_variants(product) -> List[str]:
+    """Distinct folded names a product (dict or ProductRecord) is known by"""
+    if isinstance(product, dict):
+        names = [product.get('name_en', ''), product.get('name_vi', '')]
+        names.extend(product.get('aliases', []))
+    else:
+        names = [product.name_en or '', product.name_vi or '']
+        names.extend(product.aliases or ())
+    variants = []
+    for name in names:
+        folded = fold_text(name)
+        if folded and folded not in variants:
+            variants.append(folded)
+    return variants
+
+
+def is_own_name(product, icon_id: str) -> bool:
+    """The product is called exactly what the icon is named after ('Milk' → milk)"""
+    return fold_text(icon_id.replace('_', ' ')) in product_variants(product)
+
+
+class IconMatcher:
+    """
+    TF-IDF index over icon keywords
+    IDF is fitted on the keywords; n-grams no keyword contains are kept in
+    the product vectors' norms so rare junk lowers the score instead of
+    being ignored
+    """
+
+    def __init__(self, icon_keywords: Dict[str, List[str]]):
+        import numpy as np
+        from scipy.sparse import diags
+
+        self.icon_ids = sorted(icon_keywords)
+        rows = []
+        owners = []
+        weights = []
+        for index, icon_id in enumerate(self.icon_ids):
+            own_name = fold_text(icon_id.replace('_', ' '))
+            texts = {own_name}
+            texts.update(fold_text(k) for k in icon_keywords[icon_id])
+            for text in sorted(texts):
+                rows.append(text)
+                owners.append(index)
+                # Shared keywords ('milk' for milk and baby_bottle) tie; the
+                # icon named after the keyword wins
+                weights.append(1.0 if text == own_name else TIE_BREAK)
+        self.keywords = rows
+        # Keyword columns → owning icon, for the per-icon max
+        self.keyword_icon = np.array(owners)
+        # Stemmed words per keyword and stemmed word → keyword columns, for the head-word check
+        self.keyword_words = [{word_stem(word) for word in text.split()} for text in rows]
+        self.word_keywords: Dict[str, List[int]] = {}
+        for column, words in enumerate(self.keyword_words):
+            for word in sorted(words):
+                self.word_keywords.setdefault(word, []).append(column)
+
+        self.vocabulary: Dict[str, int] = {}
+        for text in rows:
+            for gram in char_ngrams(text):
+                self.vocabulary.setdefault(gram, len(self.vocabulary))
+
+        counts = self._counts(rows)
+        document_frequency = np.asarray((counts > 0).sum(axis=0)).ravel()
+        # Smoothed IDF; unseen n-grams get the weight of a one-off gram
+        self.idf = np.log((1 + len(rows)) / (1 + document_frequency)) + 1
+        self.unseen_idf = math.log((1 + len(rows)) / 1) + 1
+        keyword_vectors = self._normalize(counts.multiply(self.idf).tocsr(), np.zeros(len(rows)))
+        self.keyword_matrix = (diags(weights) @ keyword_vectors).T.tocsc()
+
+    def _counts(self, texts: List[str], unseen: List[float] = None):
+        """Sparse term counts; per-text counts of out-of-vocabulary grams go to unseen"""
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        indices = []
+        indptr = [0]
+        for text in texts:
+            extra = 0.0
+            for gram in char_ngrams(text):
+                column = self.vocabulary.get(gram)
+                if column is None:
+                    extra += 1
+                else:
+                    indices.append(column)
+            if unseen is not None:
+                unseen.append(extra)
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float32)
+        matrix = csr_matrix((data, np.array(indices, dtype=np.int64), np.array(indptr)),
+                            shape=(len(texts), len(self.vocabulary)))
+        matrix.sum_duplicates()
+        return matrix
+
+    @staticmethod
+    def _normalize(matrix, extra_norm_squared):
+        """L2-normalize rows, counting out-of-vocabulary weight in the norm"""
+        import numpy as np
+        from scipy.sparse import diags
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel() + extra_norm_squared)
+        norms[norms == 0] = 1
+        return diags(1 / norms) @ matrix
+
+    def head_matches(self, texts: List[str]):
+        """Sparse (len(texts), n_keywords) 0/1: the pair rests on whole words, not n-grams alone"""
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        indices = []
+        indptr = [0]
+        for text in texts:
+            words = [word_stem(word) for word in text.split()]
+            if words and words[-1] in self.word_keywords:
+                indices.extend(self.word_keywords[words[-1]])
+            else:
+                # Head word unknown to every icon: keywords spelled out in full
+                candidates = {column for word in words for column in self.word_keywords.get(word, ())}
+                indices.extend(sorted(column for column in candidates
+                                      if self.keyword_words[column] <= set(words)))
+            indptr.append(len(indices))
+        return csr_matrix((np.ones(len(indices)), np.array(indices, dtype=np.int64), np.array(indptr)),
+                          shape=(len(texts), len(self.keywords)))
+
+    def keyword_scores(self, texts: List[str]):
+        """Sparse (len(texts), n_keywords) cosine similarities, head-word mismatches penalised"""
+        import numpy as np
+
+        unseen: List[float] = []
+        counts = self._counts(texts, unseen)
+        # Treat each unseen gram as a distinct term weighted like the rarest gram
+        extra = np.array(unseen) * self.unseen_idf ** 2
+        vectors = self._normalize(counts.multiply(self.idf).tocsr(), extra)
+        similarity = (vectors @ self.keyword_matrix).tocsr()
+        # penalty * s where the heads differ, s where they agree
+        return (similarity * HEAD_MISMATCH_PENALTY
+                + similarity.multiply(self.head_matches(texts)) * (1 - HEAD_MISMATCH_PENALTY))
+
+    def match(self, products: Iterable[Dict], top_k: int = 3,
+              chunk_size: int = CHUNK_SIZE) -> List[List[Tuple[str, float]]]:
+        """Top-k (icon_id, score) per product, best first"""
+        import numpy as np
+
+        results = []
+        products = list(products)
+        for start in range(0, len(products), chunk_size):
+            chunk = products[start:start + chunk_size]
+
+            # Score each distinct name once; catalogs repeat names and aliases a lot
+            texts: Dict[str, int] = {}
+            text_rows = []
+            owners = []
+            for index, product in enumerate(chunk):
+                for name in product_variants(product):
+                    text_rows.append(texts.setdefault(name, len(texts)))
+                    owners.append(index)
+            similarity = self.keyword_scores(list(texts)).tocsr()
+
+            # Expand to (variant, keyword) pairs, then keep the max per
+            # (product, icon): best name against the icon's best keyword
+            variant_matrix = similarity[np.array(text_rows, dtype=np.int64)].tocoo()
+            scores = np.zeros((len(chunk), len(self.icon_ids)))
+            np.maximum.at(scores,
+                          (np.array(owners)[variant_matrix.row], self.keyword_icon[variant_matrix.col]),
+                          variant_matrix.data)
+
+            k = min(top_k, scores.shape[1])
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            for icons, values in zip(top.tolist(), top_scores.tolist()):
+                results.append([(self.icon_ids[i], round(v, 4)) for i, v in zip(icons, values)])
+        return results
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Icon Metadata for Fresh Keeper
+Precomputes per-icon image metadata for icon_manifest.json
+
+For every icon this records what the app would otherwise only know after
+decoding the image:
+  - width/height: intrinsic size (SVG width/height or viewBox, PNG pixels)
+  - bytes: file size
+  - average_color / dominant_color: '#RRGGBB', alpha-weighted, computed
+    with NumPy over all pixels
+  - placeholder: base64 8x8 PNG thumbnail to paint before the real decode
+
+Results are computed over a process pool and cached by content hash, so
+re-running the manifest only touches icons that changed.
+
+Requires: pip install pillow numpy resvg-py
+
+Usage:
+  python3 scripts/icon_metadata.py assets/product_icons/3d/apple_red.png
+  (normally called from icon_organizer.generate_manifest)
+"""
+
+import base64
+import io
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from asset_cache import file_sha256, load_cache, save_cache
+from build_icon_atlas import rasterize_icon
+from instrumentation import add_count, run_script, stage
+
+CACHE_PATH = Path('scripts/icon_metadata_cache.json')
+
+# Bump when the metadata format changes so stale cache entries are ignored
+METADATA_VERSION = 1
+
+# Raster size used for color statistics of SVGs
+SAMPLE_SIZE = 64
+
+PLACEHOLDER_SIZE = 8
+
+# Bits kept per channel when bucketing colors for the dominant color
+DOMINANT_BITS = 4
+
+SVG_SIZE_RE = re.compile(r'<svg\b[^>]*>', re.S)
+
+
+def svg_intrinsic_size(text: str) -> Optional[List[float]]:
+    """Width/height of the root <svg>, falling back to the viewBox"""
+    match = SVG_SIZE_RE.search(text)
+    if not match:
+        return None
+    tag = match.group(0)
+    width = re.search(r'\swidth="([\d.]+)(?:px)?"', tag)
+    height = re.search(r'\sheight="([\d.]+)(?:px)?"', tag)
+    if width and height:
+        return [float(width.group(1)), float(height.group(1))]
+    view_box = re.search(r'viewBox="([^"]+)"', tag)
+    if view_box:
+        values = [float(v) for v in re.split(r'[\s,]+', view_box.group(1).strip())]
+        if len(values) == 4:
+            return values[2:]
+    return None
+
+
+def to_hex(rgb) -> str:
+    return '#{:02X}{:02X}{:02X}'.format(*(int(round(c)) for c in rgb))
+
+
+def color_stats(pixels) -> Dict[str, str]:
+    """Alpha-weighted average color and most common color bucket"""
+    import numpy as np
+
+    rgba = pixels.reshape(-1, 4).astype(np.float64)
+    alpha = rgba[:, 3] / 255.0
+    if alpha.sum() == 0:
+        return {'average_color': '#000000', 'dominant_color': '#000000'}
+
+    average = (rgba[:, :3] * alpha[:, None]).sum(axis=0) / alpha.sum()
+
+    # Bucket mostly-opaque pixels, take the fullest bucket, average inside it
+    opaque = rgba[alpha >= 0.5, :3].astype(np.int64)
+    if len(opaque) == 0:
+        dominant = average
+    else:
+        shift = 8 - DOMINANT_BITS
+        buckets = ((opaque[:, 0] >> shift) << (2 * DOMINANT_BITS)) \
+            | ((opaque[:, 1] >> shift) << DOMINANT_BITS) | (opaque[:, 2] >> shift)
+        top = np.bincount(buckets).argmax()
+        dominant = opaque[buckets == top].mean(axis=0)
+
+    return {'average_color': to_hex(average), 'dominant_color': to_hex(dominant)}
+
+
+def compute_icon_metadata(path: str) -> Dict:
+    """Metadata for one icon (runs in a worker process)"""
+    import numpy as np
+    from PIL import Image
+
+    file_path = Path(path)
+    data = file_path.read_bytes()
+
+    if file_path.suffix.lower() == '.svg':
+        size = svg_intrinsic_size(data.decode('utf-8')) or [SAMPLE_SIZE, SAMPLE_SIZE]
+        image = rasterize_icon(file_path, SAMPLE_SIZE)
+    else:
+        with Image.open(file_path) as source:
+            size = list(source.size)
+            image = source.convert('RGBA')
+
+    thumbnail = image.resize((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BOX)
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format='PNG', optimize=True)
+
+    metadata = {
+        'width': size[0],
+        'height': size[1],
+        'bytes': len(data),
+        'placeholder': base64.b64encode(buffer.getvalue()).decode('ascii'),
+    }
+    metadata.update(color_stats(np.asarray(image)))
+    return metadata
+
+
+def collect_metadata(paths: List[Path], cache_path: Path = CACHE_PATH,
+                     workers: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Metadata for every path (keyed by str(path)), reusing cached results
+    Icons whose metadata can't be computed are reported and left out
+    """
+    cache = load_cache(cache_path, {'version': METADATA_VERSION})
+    entries = cache.setdefault('entries', {})
+
+    hashes = {path: file_sha256(path) for path in paths}
+    # Icons sharing content are computed once, so count cached icons rather than hashes
+    cached = sum(1 for h in hashes.values() if h in entries)
+    pending = sorted({h: p for p, h in hashes.items() if h not in entries}.items())
+
+    add_count('metadata_computed', len(pending))
+    failed = []
+    if pending:
+        with stage('compute'), ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [(h, p, pool.submit(compute_icon_metadata, str(p))) for h, p in pending]
+            for content_hash, path, future in futures:
+                try:
+                    entries[content_hash] = future.result()
+                except ImportError:
+                    raise
+                except Exception as e:
+                    # One unreadable icon shouldn't lose the rest; it just gets no metadata
+                    print(f"❌ Error reading {path}: {e}")
+                    failed.append(path)
+    add_count('metadata_failed', len(failed))
+
+    # Keep only entries still in use so the cache doesn't grow forever
+    used = set(hashes.values())
+    cache['entries'] = {h: m for h, m in entries.items() if h in used}
+    save_cache(cache_path, cache)
+
+    print(f"🧮 Image metadata: {cached} cached, {len(pending) - len(failed)} computed, "
+          f"{len(failed)} failed")
+    return {str(path): cache['entries'][h] for path, h in hashes.items() if h in cache['entries']}
+
+
+def main():
+    for arg in sys.argv[1:]:
+        print(json.dumps(compute_icon_metadata(arg), indent=2))
+
+
+if __name__ == '__main__':
+    run_script('icon_metadata', main)
@@ -9,11 +9,17 @@ Usage:
   3. Icons will be organized in: assets/product_icons/
 """
 
+import argparse
+import ast
 import os
 import shutil
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from icon_metadata import collect_metadata
+from icon_sync import STATE_PATH, apply_plan, load_state, plan_tree, print_plan, save_state
+from instrumentation import add_count, run_script, stage
 
 # Category mapping (Vietnamese -> English ID)
 CATEGORIES = {
@@ -148,6 +154,31 @@ def ensure_directories():
     for dir_path in dirs:
         Path(dir_path).mkdir(parents=True, exist_ok=True)
 
+def target_filename(file_path: Path, icon_type: str) -> Optional[str]:
+    """
+    Asset file name for a downloaded icon, or None if it isn't an image
+    icon_type: 'flat' or '3d'
+    """
+    # Get all image files
+    image_extensions = ['.svg', '.png', '.jpg', '.jpeg'] if icon_type == 'flat' else ['.png', '.jpg', '.jpeg']
+    if file_path.suffix.lower() not in image_extensions:
+        return None
+
+    # Convert filename to standard format
+    original_name = file_path.stem
+    clean_name = original_name.lower().replace(' ', '_').replace('-', '_')
+
+    # Map Vietnamese names to English if found
+    english_name = FOOD_NAME_MAPPING.get(clean_name, clean_name)
+
+    # Determine extension
+    if icon_type == 'flat':
+        new_ext = '.svg' if file_path.suffix.lower() == '.svg' else '.png'
+    else:
+        new_ext = '.png'
+
+    return f"{english_name}{new_ext}"
+
 def organize_icons(icon_type: str):
     """
     Organize icons from downloads to assets
@@ -162,25 +193,9 @@ def organize_icons(icon_type: str):
 
     organized_count = 0
 
-    # Get all image files
-    image_extensions = ['.svg', '.png', '.jpg', '.jpeg'] if icon_type == 'flat' else ['.png', '.jpg', '.jpeg']
-
     for file_path in source_dir.rglob('*'):
-        if file_path.suffix.lower() in image_extensions:
-            # Convert filename to standard format
-            original_name = file_path.stem
-            clean_name = original_name.lower().replace(' ', '_').replace('-', '_')
-
-            # Map Vietnamese names to English if found
-            english_name = FOOD_NAME_MAPPING.get(clean_name, clean_name)
-
-            # Determine extension
-            if icon_type == 'flat':
-                new_ext = '.svg' if file_path.suffix.lower() == '.svg' else '.png'
-            else:
-                new_ext = '.png'
-
-            new_filename = f"{english_name}{new_ext}"
+        new_filename = target_filename(file_path, icon_type)
+        if new_filename:
             dest_path = dest_dir / new_filename
 
             # Copy file
@@ -188,29 +203,100 @@ def organize_icons(icon_type: str):
                 shutil.copy2(file_path, dest_path)
                 print(f"✅ Copied: {file_path.name} -> {new_filename}")
                 organized_count += 1
+                add_count('copies')
             except Exception as e:
                 print(f"❌ Error copying {file_path.name}: {e}")
 
     print(f"\n📦 Organized {organized_count} {icon_type} icons")
 
-def generate_manifest():
-    """Generate a manifest of all icons for easy config generation"""
+def find_mapping_conflicts() -> Dict[str, List[str]]:
+    """
+    Keys written more than once in FOOD_NAME_MAPPING with different values
+    A dict literal keeps only the last one, so the others are dead entries
+    """
+    tree = ast.parse(Path(__file__).read_text(encoding='utf-8'))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', None) == 'FOOD_NAME_MAPPING':
+            values: Dict[str, List[str]] = {}
+            for key, value in zip(node.value.keys, node.value.values):
+                targets = values.setdefault(ast.literal_eval(key), [])
+                if ast.literal_eval(value) not in targets:
+                    targets.append(ast.literal_eval(value))
+            return {k: v for k, v in values.items() if len(v) > 1}
+    return {}
+
+def sync_icons(dry_run: bool = False, refuse_collisions: bool = False,
+               workers: int = 8) -> bool:
+    """
+    Incremental alternative to organize_icons: copy only new or changed
+    downloads and report names that collide on the same asset
+    Returns False if any collision was found
+    """
+    for key, values in sorted(find_mapping_conflicts().items()):
+        print(f"⚠️  FOOD_NAME_MAPPING['{key}'] is defined as {', '.join(values)}; "
+              f"only '{values[-1]}' is used")
+
+    state = load_state()
+    plans = {
+        icon_type: plan_tree(Path(f'scripts/downloads/{icon_type}'),
+                             Path(f'assets/product_icons/{icon_type}'),
+                             lambda path, t=icon_type: target_filename(path, t),
+                             state, workers=workers)
+        for icon_type in ['flat', '3d']
+    }
+    clean = not any(plan['collisions'] for plan in plans.values())
+    if not clean and refuse_collisions:
+        dry_run = True
+    if not dry_run:
+        for plan in plans.values():
+            apply_plan(plan, state, workers=workers)
+
+    for icon_type, plan in plans.items():
+        print_plan(icon_type, plan, dry_run)
+    if not clean and refuse_collisions:
+        print("⛔ Refusing to sync because of name collisions; nothing was copied")
+
+    if not dry_run:
+        save_state(state)
+        print(f"\n💾 Sync state: {STATE_PATH}")
+    return clean
+
+def generate_manifest(with_metadata: bool = True):
+    """
+    Generate a manifest of all icons for easy config generation
+    with_metadata: also record size, colors and a tiny placeholder per icon
+    """
     manifest = {
         'flat': {},
         '3d': {}
     }
 
+    icon_files = []
     for icon_type in ['flat', '3d']:
         icon_dir = Path(f'assets/product_icons/{icon_type}')
         if icon_dir.exists():
             for file_path in sorted(icon_dir.iterdir()):
                 if file_path.is_file():
-                    name = file_path.stem
-                    manifest[icon_type][name] = {
-                        'filename': file_path.name,
-                        'path': str(file_path),
-                        'category': guess_category(name)
-                    }
+                    icon_files.append((icon_type, file_path))
+
+    add_count('icons', len(icon_files))
+    metadata = {}
+    if with_metadata:
+        try:
+            with stage('metadata'):
+                metadata = collect_metadata([file_path for _, file_path in icon_files])
+        except ImportError as e:
+            print(f"⚠️  Skipping image metadata: {e}")
+
+    for icon_type, file_path in icon_files:
+        name = file_path.stem
+        manifest[icon_type][name] = {
+            'filename': file_path.name,
+            'path': str(file_path),
+            'category': guess_category(name)
+        }
+        if str(file_path) in metadata:
+            manifest[icon_type][name]['image'] = metadata[str(file_path)]
 
     # Save manifest
     manifest_path = Path('scripts/icon_manifest.json')
@@ -270,17 +356,38 @@ def guess_category(name: str) -> str:
     return 'other'
 
 def main():
+    parser = argparse.ArgumentParser(description='Organize icons and generate the manifest')
+    parser.add_argument('--no-metadata', action='store_true',
+                        help='Skip image metadata (no Pillow/NumPy needed)')
+    parser.add_argument('--sync', action='store_true',
+                        help='Copy only new/changed icons and report name collisions')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the sync plan without copying (implies --sync)')
+    parser.add_argument('--refuse-collisions', action='store_true',
+                        help='With --sync, copy nothing if any name collision exists')
+    args = parser.parse_args()
+
     print("🎨 Fresh Keeper Icon Organizer")
     print("=" * 50)
 
     ensure_directories()
 
     print("\n📥 Step 1: Organizing icons...")
-    organize_icons('flat')
-    organize_icons('3d')
+    if args.sync or args.dry_run:
+        with stage('sync'):
+            clean = sync_icons(dry_run=args.dry_run, refuse_collisions=args.refuse_collisions)
+        if args.dry_run:
+            return
+        if not clean and args.refuse_collisions:
+            raise SystemExit(1)
+    else:
+        with stage('organize'):
+            organize_icons('flat')
+            organize_icons('3d')
 
     print("\n📋 Step 2: Generating manifest...")
-    generate_manifest()
+    with stage('manifest'):
+        generate_manifest(with_metadata=not args.no_metadata)
 
     print("\n✅ Done!")
     print("\nNext steps:")
@@ -289,4 +396,4 @@ def main():
     print("3. Copy generated code to: lib/config/product_icons.dart")
 
 if __name__ == '__main__':
-    main()
+    run_script('icon_organizer', main)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Icon Pack for Fresh Keeper
+Concatenates every icon file into one aligned blob plus an offset index
+
+Shipping ~460 small icon files costs one asset-bundle lookup per file,
+and every CI copy step touches each of them. The pack stores all icon
+bytes back to back (each entry aligned to ALIGNMENT bytes) and a JSON
+index mapping id → offset/length/format, e.g.
+
+  "flat/apple_red": {"offset": 4096, "length": 1873, "format": "svg", ...}
+
+The index is plain JSON so a Dart reader can use it as-is: load the blob
+as ByteData once and view `buffer.asUint8List(offset, length)` per icon.
+
+Usage:
+  python3 scripts/icon_pack.py pack              # build the pack
+  python3 scripts/icon_pack.py verify            # check pack against sources
+  python3 scripts/icon_pack.py cat flat/apple_red > apple_red.svg
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from instrumentation import add_count, run_script, stage
+
+ICON_ROOT = Path('assets/product_icons')
+ICON_TYPES = ['flat', '3d']
+PACK_PATH = Path('assets/product_icons/icons.pack')
+INDEX_SUFFIX = '.json'
+
+PACK_VERSION = 1
+
+# Every entry starts on a multiple of this many bytes
+ALIGNMENT = 16
+
+FORMATS = {'.svg': 'svg', '.png': 'png', '.jpg': 'jpeg', '.jpeg': 'jpeg'}
+
+
+def index_path_for(pack_path: Path) -> Path:
+    return pack_path.with_name(pack_path.name + INDEX_SUFFIX)
+
+
+def collect_icons(icon_root: Path = ICON_ROOT) -> List[Tuple[str, Path]]:
+    """All (id, path) pairs to pack, id is '<type>/<stem>', sorted by id"""
+    icons = []
+    for icon_type in ICON_TYPES:
+        icon_dir = icon_root / icon_type
+        if not icon_dir.exists():
+            continue
+        for file_path in icon_dir.iterdir():
+            if file_path.is_file() and file_path.suffix.lower() in FORMATS:
+                icons.append((f'{icon_type}/{file_path.stem}', file_path))
+    return sorted(icons)
+
+
+def build_pack(icons: List[Tuple[str, Path]], pack_path: Path = PACK_PATH,
+               alignment: int = ALIGNMENT) -> Dict:
+    """Write the blob and its index, return the index"""
+    entries = {}
+    offset = 0
+    pack_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(pack_path, 'wb') as blob:
+        for icon_id, file_path in icons:
+            data = file_path.read_bytes()
+            padding = -offset % alignment
+            if padding:
+                blob.write(b'\0' * padding)
+                offset += padding
+
+            blob.write(data)
+            entries[icon_id] = {
+                'offset': offset,
+                'length': len(data),
+                'format': FORMATS[file_path.suffix.lower()],
+                'source': str(file_path),
+                'sha256': hashlib.sha256(data).hexdigest(),
+            }
+            offset += len(data)
+
+    index = {
+        'version': PACK_VERSION,
+        'alignment': alignment,
+        'size': offset,
+        'entries': entries,
+    }
+    with open(index_path_for(pack_path), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return index
+
+
+class IconPack:
+    """
+    Read-only view over a built pack
+    The blob is memory-mapped; get() returns memoryview slices of the
+    mapping, so no icon bytes are copied until the caller asks for them
+    """
+
+    def __init__(self, pack_path: Path = PACK_PATH):
+        with open(index_path_for(pack_path), 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        if self.index.get('version') != PACK_VERSION:
+            raise ValueError(f"Unsupported pack version: {self.index.get('version')}")
+
+        self.entries: Dict[str, Dict] = self.index['entries']
+        self._file = open(pack_path, 'rb')
+        if self.index['size']:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        else:
+            self._mmap = None
+            self._view = memoryview(b'')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, icon_id: str) -> bool:
+        return icon_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def ids(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def get(self, icon_id: str) -> memoryview:
+        """Zero-copy view of one icon's bytes"""
+        entry = self.entries[icon_id]
+        return self._view[entry['offset']:entry['offset'] + entry['length']]
+
+    def format(self, icon_id: str) -> str:
+        return self.entries[icon_id]['format']
+
+    def close(self):
+        # All slices handed out must be released before the mapping can close
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+def verify_pack(pack_path: Path = PACK_PATH, check_sources: bool = True) -> List[str]:
+    """Return a list of problems; empty means the pack is consistent"""
+    problems = []
+    with IconPack(pack_path) as pack:
+        blob_size = len(pack._view)
+        if blob_size != pack.index['size']:
+            problems.append(f"blob is {blob_size} bytes, index says {pack.index['size']}")
+
+        previous_end = 0
+        for icon_id, entry in sorted(pack.entries.items(), key=lambda e: e[1]['offset']):
+            offset, length = entry['offset'], entry['length']
+            if offset % pack.index['alignment']:
+                problems.append(f"{icon_id}: offset {offset} not aligned")
+            if offset < previous_end:
+                problems.append(f"{icon_id}: overlaps previous entry")
+            if offset + length > blob_size:
+                problems.append(f"{icon_id}: runs past end of blob")
+                continue
+            previous_end = offset + length
+
+            view = pack.get(icon_id)
+            digest = hashlib.sha256(view).hexdigest()
+            if digest != entry['sha256']:
+                problems.append(f"{icon_id}: content hash mismatch")
+            if check_sources:
+                source = Path(entry['source'])
+                if not source.exists():
+                    problems.append(f"{icon_id}: source {source} missing")
+                elif source.read_bytes() != view:
+                    problems.append(f"{icon_id}: source {source} changed since packing")
+            view.release()
+
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or read the single-blob icon pack')
+    parser.add_argument('--pack', type=Path, default=PACK_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    pack_cmd = commands.add_parser('pack', help='Pack all icons into one blob')
+    pack_cmd.add_argument('--icons', type=Path, default=ICON_ROOT)
+
+    verify_cmd = commands.add_parser('verify', help='Check the pack against its index and sources')
+    verify_cmd.add_argument('--no-sources', action='store_true',
+                            help='Only check the blob against the index hashes')
+
+    cat_cmd = commands.add_parser('cat', help='Write one icon to stdout')
+    cat_cmd.add_argument('icon_id')
+
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        with stage('collect'):
+            icons = collect_icons(args.icons)
+        with stage('pack'):
+            index = build_pack(icons, args.pack)
+        add_count('icons', len(icons))
+        source_bytes = sum(e['length'] for e in index['entries'].values())
+        print(f"📦 Packed {len(icons)} icons into {args.pack}")
+        print(f"   Blob: {index['size'] / 1024:.1f} KB "
+              f"({(index['size'] - source_bytes) / 1024:.1f} KB alignment padding)")
+        print(f"   Index: {index_path_for(args.pack)}")
+
+    elif args.command == 'verify':
+        with stage('verify'):
+            problems = verify_pack(args.pack, check_sources=not args.no_sources)
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+            sys.exit(1)
+        print(f"✅ Pack OK: {args.pack}")
+
+    elif args.command == 'cat':
+        with IconPack(args.pack) as pack:
+            if args.icon_id not in pack:
+                print(f"❌ Unknown icon: {args.icon_id}", file=sys.stderr)
+                sys.exit(1)
+            view = pack.get(args.icon_id)
+            sys.stdout.buffer.write(view)
+            view.release()
+
+
+if __name__ == '__main__':
+    run_script('icon_pack', main)
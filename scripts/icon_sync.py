@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Icon Sync for Fresh Keeper
+Incremental, collision-aware copy of one icon tree into another
+
+Used by `icon_organizer.py --sync`. Both trees are described by a
+Merkle-style hash tree that is saved between runs:
+
+  file node:      size, mtime_ns, sha256 of the content
+  directory node: sha256 over its sorted children's names and hashes
+
+A file is only re-hashed when its size or mtime changed, and a directory
+whose hash matches the previous run is skipped when diffing. The state
+also records which sources map to each target name, so planning only
+revisits targets touched by a changed source or destination file plus
+the collisions recorded last time: hashing, diffing, planning and
+copying all scale with what changed rather than the tree size (listing
+still stats every entry, which is cheap). The mapping from source path
+to target name is assumed fixed; delete the state file after changing it.
+
+When two sources with different content land on the same target (e.g.
+two Vietnamese names that translate to the same English id), the target
+is a collision: it is reported and never overwritten silently.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from asset_cache import file_sha256
+from instrumentation import add_count, stage
+
+STATE_PATH = Path('scripts/icon_sync_state.json')
+
+# Bump when the state format changes so old state is ignored
+STATE_VERSION = 2
+
+EMPTY_NODE = {'hash': '', 'files': {}, 'dirs': {}}
+
+
+def scan_tree(root: Path, previous: Optional[Dict] = None,
+              workers: int = 8) -> Tuple[Dict, int]:
+    """
+    Build the hash tree of root, reusing hashes from previous where the
+    file's size and mtime are unchanged
+    Returns (tree, number of files hashed)
+    """
+    stale: List[Tuple[Dict, str, Path]] = []
+    with stage('list'):
+        tree = _list_tree(root, previous or EMPTY_NODE, stale)
+
+    add_count('files_hashed', len(stale))
+    if stale:
+        with stage('hash'), ThreadPoolExecutor(max_workers=workers) as pool:
+            digests = list(pool.map(file_sha256, [path for _, _, path in stale]))
+        for (node, name, _), digest in zip(stale, digests):
+            node['files'][name]['sha256'] = digest
+
+    _hash_dirs(tree)
+    return tree, len(stale)
+
+
+def _list_tree(directory: Path, previous: Dict, stale: List) -> Dict:
+    node = {'hash': '', 'files': {}, 'dirs': {}}
+    if not directory.is_dir():
+        return node
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                child_previous = previous['dirs'].get(entry.name, EMPTY_NODE)
+                node['dirs'][entry.name] = _list_tree(Path(entry.path), child_previous, stale)
+            elif entry.is_file():
+                stat = entry.stat()
+                known = previous['files'].get(entry.name)
+                if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+                    node['files'][entry.name] = dict(known)
+                else:
+                    node['files'][entry.name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+                    stale.append((node, entry.name, Path(entry.path)))
+    return node
+
+
+def _hash_dirs(node: Dict) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(node['dirs']):
+        digest.update(f"d {name} {_hash_dirs(node['dirs'][name])}\n".encode('utf-8'))
+    for name in sorted(node['files']):
+        digest.update(f"f {name} {node['files'][name]['sha256']}\n".encode('utf-8'))
+    node['hash'] = digest.hexdigest()
+    return node['hash']
+
+
+def find_file(node: Dict, path: Path) -> Optional[Dict]:
+    """File node at a relative path, or None"""
+    for name in path.parts[:-1]:
+        node = node['dirs'].get(name)
+        if node is None:
+            return None
+    return node['files'].get(path.name)
+
+
+def changed_files(old: Dict, new: Dict, prefix: Path = Path()) -> List[Path]:
+    """Relative paths added, removed or modified between two trees"""
+    if old['hash'] == new['hash']:
+        return []
+    changed = []
+    for name in sorted(set(old['dirs']) | set(new['dirs'])):
+        changed += changed_files(old['dirs'].get(name, EMPTY_NODE),
+                                 new['dirs'].get(name, EMPTY_NODE), prefix / name)
+    for name in sorted(set(old['files']) | set(new['files'])):
+        before = old['files'].get(name, {}).get('sha256')
+        after = new['files'].get(name, {}).get('sha256')
+        if before != after:
+            changed.append(prefix / name)
+    return changed
+
+
+def load_state(state_path: Path = STATE_PATH) -> Dict:
+    if state_path.exists():
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+    return {'version': STATE_VERSION, 'pairs': {}}
+
+
+def save_state(state: Dict, state_path: Path = STATE_PATH):
+    with open(state_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, sort_keys=True)
+
+
+def update_targets(targets: Dict[str, List[str]], changed: List[Path], source_tree: Dict,
+                   target_for: Callable[[Path], Optional[str]]) -> Tuple[Dict, set]:
+    """
+    Re-map only the changed source paths
+    targets is the recorded target name → sorted source paths; returns the
+    updated copy (unchanged entries are shared) and the targets touched
+    """
+    targets = dict(targets)
+    touched = set()
+    for path in changed:
+        target = target_for(path)
+        if target is None:
+            continue
+        touched.add(target)
+        sources = [source for source in targets.get(target, []) if source != str(path)]
+        if find_file(source_tree, path) is not None:
+            sources = sorted(sources + [str(path)])
+        if sources:
+            targets[target] = sources
+        else:
+            targets.pop(target, None)
+    return targets, touched
+
+
+def plan_sync(source_tree: Dict, dest_tree: Dict, targets: Dict[str, List[str]],
+              affected) -> Dict:
+    """
+    Decide what to copy for the affected target names
+    targets maps a target name to the source paths landing on it. Returns
+    a plan with 'copy' ([(source, target, action)]), 'unchanged',
+    'collisions' ({target: [sources]}) and 'duplicates' (identical
+    sources merged onto one target)
+    """
+    plan = {'copy': [], 'unchanged': [], 'collisions': {}, 'duplicates': {}}
+    for target in sorted(affected):
+        sources = [(Path(source), find_file(source_tree, Path(source))['sha256'])
+                   for source in targets.get(target, [])]
+        if not sources:
+            continue
+        if len({digest for _, digest in sources}) > 1:
+            plan['collisions'][target] = [str(path) for path, _ in sources]
+            continue
+        if len(sources) > 1:
+            plan['duplicates'][target] = [str(path) for path, _ in sources]
+
+        source, digest = sources[0]
+        existing = dest_tree['files'].get(target)
+        if existing is None:
+            plan['copy'].append((source, target, 'add'))
+        elif existing['sha256'] != digest:
+            plan['copy'].append((source, target, 'update'))
+        else:
+            plan['unchanged'].append(target)
+    return plan
+
+
+def copy_file(source: Path, destination: Path):
+    """Copy through a temp file so a crash never leaves a half-written icon"""
+    temp_path = destination.with_name(destination.name + '.tmp')
+    shutil.copy2(source, temp_path)
+    os.replace(temp_path, destination)
+
+
+def plan_tree(source_dir: Path, dest_dir: Path,
+              target_for: Callable[[Path], Optional[str]],
+              state: Dict, workers: int = 8) -> Dict:
+    """
+    Scan both trees against the recorded state and plan the sync of
+    source_dir into dest_dir (flat destination); nothing is written
+    Only targets fed by a changed source, changed in the destination or
+    colliding last time are planned. Returns the plan plus 'hashed',
+    'changed_sources' and 'checked' counts; when nothing needs checking
+    the plan is empty and 'skipped' is set
+    """
+    key = f'{source_dir} -> {dest_dir}'
+    previous = state['pairs'].get(key, {'source': EMPTY_NODE, 'dest': EMPTY_NODE})
+
+    source_tree, source_hashed = scan_tree(source_dir, previous['source'], workers)
+    dest_tree, dest_hashed = scan_tree(dest_dir, previous['dest'], workers)
+    changed_sources = changed_files(previous['source'], source_tree)
+
+    targets, affected = update_targets(previous.get('targets', {}), changed_sources,
+                                       source_tree, target_for)
+    # The destination is flat, so a changed top-level file is a target name
+    affected.update(str(path) for path in changed_files(previous['dest'], dest_tree)
+                    if len(path.parts) == 1)
+    affected.update(previous.get('collisions', []))
+
+    plan = plan_sync(source_tree, dest_tree, targets, affected)
+    plan.update({
+        'skipped': not affected,
+        'targets': targets,
+        'checked': len(affected),
+        'key': key,
+        'source_dir': source_dir,
+        'dest_dir': dest_dir,
+        'source_tree': source_tree,
+        'dest_tree': dest_tree,
+        'hashed': source_hashed + dest_hashed,
+        'changed_sources': len(changed_sources),
+    })
+    return plan
+
+
+def apply_plan(plan: Dict, state: Dict, workers: int = 8):
+    """Copy the planned files on a bounded thread pool and record the new state"""
+    source_dir, dest_dir = plan['source_dir'], plan['dest_dir']
+    dest_tree = plan['dest_tree']
+
+    if plan['copy']:
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        add_count('copies', len(plan['copy']))
+        with stage('copy'), ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda item: copy_file(source_dir / item[0], dest_dir / item[1]),
+                          plan['copy']))
+        # Copied files carry new hashes; only they get re-hashed here
+        dest_tree, _ = scan_tree(dest_dir, dest_tree, workers)
+
+    state['pairs'][plan['key']] = {
+        'source': plan['source_tree'],
+        'dest': dest_tree,
+        'targets': plan['targets'],
+        # Every collision is among the affected targets, so this is complete
+        'collisions': sorted(plan['collisions']),
+    }
+
+
+def print_plan(label: str, plan: Dict, dry_run: bool):
+    """Print one tree's sync plan"""
+    if plan['skipped']:
+        print(f"✅ {label}: unchanged since last sync ({plan['hashed']} files hashed)")
+        return
+
+    verb = 'Would copy' if dry_run else 'Copied'
+    print(f"📦 {label}: {len(plan['copy'])} to copy, {len(plan['unchanged'])} unchanged, "
+          f"{plan['checked']} of {len(plan['targets'])} targets checked, "
+          f"{plan['changed_sources']} sources changed, {plan['hashed']} files hashed")
+    for source, target, action in plan['copy']:
+        print(f"   {verb} ({action}): {source} -> {target}")
+    for target, sources in sorted(plan['duplicates'].items()):
+        print(f"   ℹ️  Identical sources merged into {target}: {', '.join(sources)}")
+    for target, sources in sorted(plan['collisions'].items()):
+        print(f"   ❌ Collision on {target}: {', '.join(sources)} (not copied)")
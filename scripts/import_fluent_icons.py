@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Fluent Emoji Importer for Fresh Keeper
+Copies our icon set out of a local fluentui-emoji mirror
+
+Replaces the old download_*.sh scripts, which re-cloned the whole
+fluentui-emoji repo into /tmp on every run and copied icons one `cp` at a
+time. This importer:
+  1. Walks the mirror's assets/ folder once and indexes every emoji by
+     folder name and CLDR name (from metadata.json) → Flat SVG / 3D PNG
+  2. Resolves ICON_SOURCES with dict lookups against that index
+  3. Copies only files that are missing or differ, on a thread pool
+
+Running it twice in a row copies nothing the second time. It never
+touches the network unless --clone is given and the mirror is missing,
+so it can be pointed at a small fixture tree laid out like the mirror:
+
+  <mirror>/assets/Red apple/metadata.json
+  <mirror>/assets/Red apple/Flat/red_apple_flat.svg
+  <mirror>/assets/Red apple/3D/red_apple_3d.png
+
+Usage:
+  git clone --depth 1 https://github.com/microsoft/fluentui-emoji.git /tmp/fluent-emoji-download
+  python3 scripts/import_fluent_icons.py
+  python3 scripts/import_fluent_icons.py --mirror ~/src/fluentui-emoji --dry-run
+  python3 scripts/import_fluent_icons.py --clone      # clone the mirror if missing
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from instrumentation import add_count, run_script, stage
+
+FLUENT_REPO = 'https://github.com/microsoft/fluentui-emoji.git'
+MIRROR_DIR = Path(os.environ.get('FLUENT_EMOJI_MIRROR', '/tmp/fluent-emoji-download'))
+OUTPUT_DIR = Path('scripts/downloads')
+
+# Icon style → (mirror style folder, file suffix, output extension)
+STYLES = {
+    'flat': ('Flat', '_flat.svg', '.svg'),
+    '3d': ('3D', '_3d.png', '.png'),
+}
+
+# Emoji with skin tones keep their styles one level down
+DEFAULT_TONE = 'Default'
+
+# Our icon name → Fluent Emoji folder name
+ICON_SOURCES = {
+    # Fruits
+    'apple_red': 'Red apple',
+    'apple_green': 'Green apple',
+    'banana': 'Banana',
+    'orange': 'Tangerine',
+    'tangerine': 'Tangerine',
+    'lemon': 'Lemon',
+    'watermelon': 'Watermelon',
+    'melon': 'Melon',
+    'grapes': 'Grapes',
+    'strawberry': 'Strawberry',
+    'blueberries': 'Blueberries',
+    'cherries': 'Cherries',
+    'peach': 'Peach',
+    'pear': 'Pear',
+    'pineapple': 'Pineapple',
+    'mango': 'Mango',
+    'kiwi': 'Kiwi fruit',
+    'avocado': 'Avocado',
+    'coconut': 'Coconut',
+    'papaya': 'Melon',
+
+    # Vegetables
+    'tomato': 'Tomato',
+    'carrot': 'Carrot',
+    'broccoli': 'Broccoli',
+    'cauliflower': 'Broccoli',
+    'corn': 'Ear of corn',
+    'potato': 'Potato',
+    'sweet_potato': 'Sweet potato',
+    'cucumber': 'Cucumber',
+    'lettuce': 'Leafy green',
+    'cabbage': 'Leafy green',
+    'bell_pepper': 'Bell pepper',
+    'hot_pepper': 'Hot pepper',
+    'eggplant': 'Eggplant',
+    'onion': 'Onion',
+    'garlic': 'Garlic',
+    'mushroom': 'Mushroom',
+    'pumpkin': 'Jack-o-lantern',
+    'ginger': 'Garlic',
+    'pepper_hot': 'Hot pepper',
+    'leafy_green': 'Leafy green',
+
+    # Meat & seafood
+    'beef': 'Cut of meat',
+    'pork': 'Bacon',
+    'chicken': 'Poultry leg',
+    'turkey': 'Poultry leg',
+    'bacon': 'Bacon',
+    'sausage': 'Hot dog',
+    'ham': 'Meat on bone',
+    'fish': 'Fish',
+    'shrimp': 'Shrimp',
+    'crab': 'Crab',
+    'lobster': 'Lobster',
+    'squid': 'Squid',
+    'oyster': 'Oyster',
+    'meat': 'Cut of meat',
+    'poultry_leg': 'Poultry leg',
+
+    # Eggs
+    'egg': 'Egg',
+    'fried_egg': 'Cooking',
+
+    # Dairy
+    'milk': 'Glass of milk',
+    'cheese': 'Cheese wedge',
+    'butter': 'Butter',
+    'yogurt': 'Glass of milk',
+    'ice_cream': 'Ice cream',
+    'cream': 'Glass of milk',
+
+    # Dry food
+    'bread': 'Bread',
+    'baguette': 'Baguette bread',
+    'croissant': 'Croissant',
+    'bagel': 'Bagel',
+    'pretzel': 'Pretzel',
+    'rice': 'Cooked rice',
+    'rice_ball': 'Rice ball',
+    'rice_cracker': 'Rice cracker',
+    'noodles': 'Steaming bowl',
+    'spaghetti': 'Spaghetti',
+    'cookie': 'Cookie',
+    'cracker': 'Pretzel',
+    'peanuts': 'Peanuts',
+    'chestnut': 'Chestnut',
+    'beans': 'Beans',
+    'cereal': 'Bowl with spoon',
+    'popcorn': 'Popcorn',
+    'chocolate': 'Chocolate bar',
+    'candy': 'Candy',
+    'honey': 'Honey pot',
+
+    # Condiments
+    'salt': 'Salt',
+    'olive': 'Olive',
+    'bottle': 'Bottle with popping cork',
+
+    # Prepared foods
+    'pizza': 'Pizza',
+    'hamburger': 'Hamburger',
+    'hot_dog': 'Hot dog',
+    'sandwich': 'Sandwich',
+    'taco': 'Taco',
+    'burrito': 'Burrito',
+    'stuffed_flatbread': 'Stuffed flatbread',
+    'falafel': 'Falafel',
+    'shallow_pan_of_food': 'Shallow pan of food',
+    'pot_of_food': 'Pot of food',
+
+    # Asian foods
+    'sushi': 'Sushi',
+    'fried_shrimp': 'Fried shrimp',
+    'ramen': 'Steaming bowl',
+    'curry': 'Curry rice',
+    'dumpling': 'Dumpling',
+    'dango': 'Dango',
+    'fish_cake': 'Fish cake with swirl',
+    'moon_cake': 'Moon cake',
+    'oden': 'Oden',
+    'tempura': 'Fried shrimp',
+    'bento': 'Bento box',
+
+    # Desserts & sweets
+    'cake': 'Shortcake',
+    'birthday_cake': 'Birthday cake',
+    'cupcake': 'Cupcake',
+    'pie': 'Pie',
+    'donut': 'Doughnut',
+    'birthday_cake_lit': 'Birthday cake',
+    'lollipop': 'Lollipop',
+    'custard': 'Custard',
+    'fortune_cookie': 'Fortune cookie',
+    'pancakes': 'Pancakes',
+    'waffle': 'Waffle',
+
+    # Beverages
+    'coffee': 'Hot beverage',
+    'tea': 'Teacup without handle',
+    'teapot': 'Teapot',
+    'bubble_tea': 'Bubble tea',
+    'beverage_box': 'Beverage box',
+    'cup_with_straw': 'Cup with straw',
+    'beer': 'Beer mug',
+    'clinking_beer_mugs': 'Clinking beer mugs',
+    'wine_glass': 'Wine glass',
+    'cocktail': 'Cocktail glass',
+    'tropical_drink': 'Tropical drink',
+    'champagne': 'Bottle with popping cork',
+    'sake': 'Sake',
+    'glass_of_milk': 'Glass of milk',
+    'baby_bottle': 'Baby bottle',
+
+    # More fruits
+    'berries': 'Berries',
+    'olive_oil': 'Olive',
+    'bell_pepper_green': 'Bell pepper',
+    'grapefruit': 'Citrus',
+    'pomegranate': 'Pomegranate',
+    'apricot': 'Apricot',
+    'plum': 'Plum',
+    'fig': 'Fig',
+    'date': 'Date',
+    'persimmon': 'Persimmon',
+    'blueberry': 'Blueberries',
+
+    # More vegetables
+    'green_salad': 'Green salad',
+    'leafy_greens': 'Leafy green',
+    'celery': 'Celery',
+    'radish_white': 'Radish',
+    'turnip': 'Turnip',
+    'beet': 'Beet',
+    'leek': 'Leek',
+    'asparagus': 'Asparagus',
+    'bean_sprouts': 'Seedling',
+    'artichoke': 'Artichoke',
+    'fennel': 'Fennel',
+    'pickle': 'Cucumber',
+    'zucchini': 'Cucumber',
+    'squash': 'Pumpkin',
+
+    # Nuts & seeds
+    'almond': 'Almond',
+    'walnut': 'Walnut',
+    'hazelnut': 'Hazelnut',
+    'cashew': 'Cashew',
+    'pistachio': 'Pistachio',
+    'sunflower_seeds': 'Sunflower',
+    'pumpkin_seeds': 'Pumpkin',
+    'pine_nut': 'Pine nut',
+    'sesame': 'Sesame',
+
+    # Grains & cereals
+    'wheat': 'Sheaf of rice',
+    'rice_white': 'Rice',
+    'rice_brown': 'Cooked rice',
+    'quinoa': 'Grain',
+    'oats': 'Grain',
+    'barley': 'Sheaf of rice',
+    'millet': 'Grain',
+    'cornflakes': 'Corn',
+
+    # Canned & packaged
+    'canned_food': 'Canned food',
+    'jar': 'Honey pot',
+    'oil_bottle': 'Bottle with popping cork',
+    'vinegar_bottle': 'Bottle with popping cork',
+
+    # Utensils & kitchenware
+    'fork_and_knife': 'Fork and knife',
+    'fork_and_knife_with_plate': 'Fork and knife with plate',
+    'spoon': 'Spoon',
+    'kitchen_knife': 'Kitchen knife',
+    'chopsticks': 'Chopsticks',
+    'bowl_with_spoon': 'Bowl with spoon',
+    'teacup_without_handle': 'Teacup without handle',
+    'amphora': 'Amphora',
+
+    # More dairy
+    'whipped_cream': 'Custard',
+    'condensed_milk': 'Bottle with popping cork',
+    'sour_cream': 'Custard',
+    'cottage_cheese': 'Cheese wedge',
+
+    # More meat
+    'steak': 'Cut of meat',
+    'ribs': 'Meat on bone',
+    'duck_meat': 'Poultry leg',
+    'lamb_chop': 'Cut of meat',
+    'meatball': 'Meat on bone',
+
+    # More seafood
+    'salmon': 'Fish',
+    'tuna': 'Fish',
+    'sardine': 'Fish',
+    'octopus': 'Octopus',
+    'oyster_raw': 'Oyster',
+    'mussel': 'Oyster',
+    'scallop': 'Oyster',
+
+    # Herbs & spices
+    'basil': 'Herb',
+    'parsley': 'Herb',
+    'cilantro': 'Herb',
+    'mint': 'Herb',
+    'rosemary': 'Herb',
+    'thyme': 'Herb',
+    'oregano': 'Herb',
+    'chili_powder': 'Hot pepper',
+    'black_pepper': 'Pepper',
+    'paprika': 'Bell pepper',
+    'cinnamon_stick': 'Cinnamon',
+    'vanilla': 'Ice cream',
+    'bay_leaf': 'Herb',
+
+    # Legumes
+    'green_beans': 'Peas',
+    'lima_beans': 'Beans',
+    'black_beans': 'Beans',
+    'kidney_beans': 'Beans',
+    'chickpeas': 'Beans',
+    'lentils': 'Beans',
+    'soybeans': 'Beans',
+    'pinto_beans': 'Beans',
+
+    # More root vegetables
+    'sweet_potato_purple': 'Sweet potato',
+    'yam': 'Sweet potato',
+    'taro': 'Potato',
+    'cassava': 'Potato',
+    'parsnip': 'Carrot',
+    'rutabaga': 'Turnip',
+
+    # Mushroom varieties
+    'shiitake': 'Mushroom',
+    'oyster_mushroom': 'Mushroom',
+    'portobello': 'Mushroom',
+    'enoki': 'Mushroom',
+    'button_mushroom': 'Mushroom',
+
+    # Pepper varieties
+    'jalapeno': 'Hot pepper',
+    'habanero': 'Hot pepper',
+    'serrano': 'Hot pepper',
+    'poblano': 'Bell pepper',
+    'cayenne': 'Hot pepper',
+
+    # More desserts & snacks
+    'ice_cream_cone': 'Ice cream',
+    'soft_ice_cream': 'Soft ice cream',
+    'shaved_ice': 'Shaved ice',
+    'doughnut_chocolate': 'Doughnut',
+    'chocolate_bar': 'Chocolate bar',
+    'pudding': 'Custard',
+
+    # More beverages
+    'mate': 'Mate',
+    'juice_box': 'Beverage box',
+    'soft_drink': 'Cup with straw',
+
+    # Cooking & prepared
+    'cooking': 'Cooking',
+    'fried_egg_full': 'Cooking',
+    'french_fries': 'French fries',
+    'popcorn_bowl': 'Popcorn',
+
+    # More international food
+    'flatbread': 'Flatbread',
+    'pita': 'Flatbread',
+    'naan': 'Flatbread',
+    'tortilla': 'Flatbread',
+
+    # Packaged foods
+    'takeout_box': 'Takeout box',
+    'chopsticks_food': 'Chopsticks',
+
+    # Condiments & extras
+    'jam': 'Honey pot',
+    'maple_syrup': 'Honey pot',
+    'peanut_butter': 'Honey pot',
+
+    # Street food
+    'tamale': 'Tamale',
+    'empanada': 'Pie',
+    'samosa': 'Dumpling',
+}
+
+
+def normalize(name: str) -> str:
+    return ' '.join(name.lower().replace('_', ' ').split())
+
+
+def pick_style_file(style_dir: Path, suffix: str) -> Optional[Path]:
+    """The style's main file: one ending in suffix if present, else the first file"""
+    if not style_dir.is_dir():
+        return None
+    files = sorted(p for p in style_dir.iterdir() if p.is_file())
+    for path in files:
+        if path.name.lower().endswith(suffix):
+            return path
+    return files[0] if files else None
+
+
+def index_mirror(mirror: Path) -> Dict[str, Dict[str, Path]]:
+    """
+    One pass over <mirror>/assets
+    Returns normalized name → {'flat': Path, '3d': Path}; every emoji is
+    reachable by its folder name and by its metadata.json CLDR name
+    """
+    index: Dict[str, Dict[str, Path]] = {}
+    assets_dir = mirror / 'assets'
+    for emoji_dir in sorted(p for p in assets_dir.iterdir() if p.is_dir()):
+        base = emoji_dir / DEFAULT_TONE if (emoji_dir / DEFAULT_TONE).is_dir() else emoji_dir
+        files = {}
+        for style, (folder, suffix, _) in STYLES.items():
+            path = pick_style_file(base / folder, suffix)
+            if path is not None:
+                files[style] = path
+        if not files:
+            continue
+
+        names = [emoji_dir.name]
+        metadata_path = emoji_dir / 'metadata.json'
+        if metadata_path.exists():
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                cldr = json.load(f).get('cldr')
+            if cldr:
+                names.append(cldr)
+        for name in names:
+            index.setdefault(normalize(name), files)
+    return index
+
+
+def resolve_icons(index: Dict[str, Dict[str, Path]], sources: Dict[str, str],
+                  output_dir: Path) -> Tuple[List[Tuple[Path, Path]], List[str]]:
+    """
+    Map every wanted icon to (source, destination) copy pairs
+    Returns (pairs, '<icon> (<style>)' entries missing from the mirror)
+    """
+    pairs = []
+    missing = []
+    for name, fluent_name in sorted(sources.items()):
+        files = index.get(normalize(fluent_name), {})
+        for style, (_, _, extension) in STYLES.items():
+            if style in files:
+                pairs.append((files[style], output_dir / style / f'{name}{extension}'))
+            else:
+                missing.append(f'{name} ({style}: {fluent_name})')
+    return pairs, missing
+
+
+def is_current(source: Path, destination: Path) -> bool:
+    """Destination already holds the same bytes as source"""
+    if not destination.exists() or destination.stat().st_size != source.stat().st_size:
+        return False
+    return destination.read_bytes() == source.read_bytes()
+
+
+def copy_if_changed(source: Path, destination: Path) -> bool:
+    """Copy atomically unless the destination is current; True if copied"""
+    if is_current(source, destination):
+        return False
+    temp_path = destination.with_name(destination.name + '.tmp')
+    shutil.copyfile(source, temp_path)
+    os.replace(temp_path, destination)
+    return True
+
+
+def import_icons(mirror: Path = MIRROR_DIR, output_dir: Path = OUTPUT_DIR,
+                 sources: Dict[str, str] = ICON_SOURCES, workers: int = 8,
+                 dry_run: bool = False) -> Dict[str, List]:
+    """Sync the wanted icons from the mirror, return copied/unchanged/missing lists"""
+    index = index_mirror(mirror)
+    pairs, missing = resolve_icons(index, sources, output_dir)
+
+    if dry_run:
+        pending = [(s, d) for s, d in pairs if not is_current(s, d)]
+        copied = [d for _, d in pending]
+    else:
+        for style in STYLES:
+            (output_dir / style).mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda pair: copy_if_changed(*pair), pairs))
+        copied = [d for (_, d), changed in zip(pairs, results) if changed]
+
+    copied_set = set(copied)
+    unchanged = [d for _, d in pairs if d not in copied_set]
+    return {'indexed': len(index), 'copied': copied, 'unchanged': unchanged, 'missing': missing}
+
+
+def clone_mirror(mirror: Path):
+    print(f"📥 Cloning Fluent Emoji repository into {mirror}...")
+    subprocess.run(['git', 'clone', '--depth', '1', FLUENT_REPO, str(mirror)], check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import icons from a local fluentui-emoji mirror')
+    parser.add_argument('--mirror', type=Path, default=MIRROR_DIR,
+                        help='fluentui-emoji checkout (default: $FLUENT_EMOJI_MIRROR or /tmp)')
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--dry-run', action='store_true', help='Only show what would be copied')
+    parser.add_argument('--clone', action='store_true', help='Clone the mirror if it is missing')
+    args = parser.parse_args()
+
+    print("🎨 Fresh Keeper - Fluent Icon Importer")
+    print("=" * 50)
+
+    if not (args.mirror / 'assets').is_dir():
+        if not args.clone:
+            print(f"❌ Mirror not found: {args.mirror}")
+            print(f"   git clone --depth 1 {FLUENT_REPO} {args.mirror}")
+            print("   or re-run with --clone")
+            sys.exit(1)
+        clone_mirror(args.mirror)
+
+    with stage('import'):
+        result = import_icons(args.mirror, args.output, workers=args.workers, dry_run=args.dry_run)
+    add_count('copies', len(result['copied']))
+    add_count('missing', len(result['missing']))
+
+    verb = 'Would copy' if args.dry_run else 'Copied'
+    print(f"\n🗂️  Indexed {result['indexed']} emoji names in {args.mirror}")
+    for destination in result['copied']:
+        print(f"  ✓ {destination}")
+    for entry in result['missing']:
+        print(f"  ⚠️  Not in mirror: {entry}")
+
+    print("\n📊 Summary:")
+    print(f"   - {verb}: {len(result['copied'])}")
+    print(f"   - Unchanged: {len(result['unchanged'])}")
+    print(f"   - Missing: {len(result['missing'])}")
+
+    if not args.dry_run:
+        print("\n📋 Next steps:")
+        print("   1. Run: python3 scripts/icon_organizer.py")
+        print("   2. Run: python3 scripts/generate_icon_config.py")
+
+
+if __name__ == '__main__':
+    run_script('import_fluent_icons', main)
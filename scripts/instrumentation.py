@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for Fresh Keeper scripts
+Stage timers, counters, cProfile and tracemalloc behind shared flags
+
+Every script's entry point runs through run_script(), which understands
+these flags on top of the script's own:
+
+  --profile        wrap the run in cProfile and write <report>.prof
+                   (pstats format: snakeviz, flameprof, gprof2dot)
+  --trace-memory   record the tracemalloc peak of every stage
+  --run-report P   write the JSON run report to P
+                   (default scripts/reports/<script>-<timestamp>.json)
+
+Any of them turns on the JSON report: wall time, per-stage time / calls /
+peak memory, counters and the top profiled functions, so two runs can be
+compared without adding prints. Inside scripts and library code:
+
+  with stage('score'):
+      ...
+  add_count('products', len(products))
+
+Both are near-free when no run is being instrumented. Stages nest
+('map/score'); a stage entered several times accumulates. Work done in
+worker processes is not profiled or traced, only timed by its stage.
+
+Usage:
+  python3 scripts/map_product_icons.py --profile
+  python3 scripts/icon_organizer.py --trace-memory --run-report /tmp/organize.json
+  python3 -m pstats scripts/reports/map_product_icons-20251111-101500.prof
+"""
+
+import argparse
+import cProfile
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPORT_DIR = Path('scripts/reports')
+
+# Functions listed in the report, by cumulative time
+TOP_FUNCTIONS = 25
+
+MB = 1024 * 1024
+
+
+class Run:
+    """Stages and counters collected during one script run"""
+
+    def __init__(self, script: str, trace_memory: bool = False):
+        self.script = script
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.started = time.perf_counter()
+        # Highest traced memory seen across all stage boundaries
+        self.peak = 0
+        self.stages: Dict[str, Dict] = {}
+        self.counters: Dict[str, int] = {}
+        # [path, start time, peak bytes seen] for each open stage
+        self.stack: List[list] = []
+
+    def enter(self, name: str):
+        path = '/'.join([frame[0] for frame in self.stack[-1:]] + [name])
+        # Listed in the order stages start
+        self.stages.setdefault(path, {'calls': 0, 'seconds': 0.0})
+        peak = 0
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # reset_peak() is global, so bank the enclosing stage's peak first
+            self.peak = max(self.peak, peak)
+            if self.stack:
+                self.stack[-1][2] = max(self.stack[-1][2], peak)
+            tracemalloc.reset_peak()
+            peak = current
+        self.stack.append([path, time.perf_counter(), peak])
+
+    def exit(self):
+        path, start, peak = self.stack.pop()
+        entry = self.stages[path]
+        entry['calls'] += 1
+        entry['seconds'] += time.perf_counter() - start
+        if self.trace_memory:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            entry['peak_mb'] = max(entry.get('peak_mb', 0.0), round(peak / MB, 2))
+            self.peak = max(self.peak, peak)
+            if self.stack:
+                self.stack[-1][2] = max(self.stack[-1][2], peak)
+
+    def report(self) -> Dict:
+        report = {
+            'script': self.script,
+            'argv': sys.argv[1:],
+            'started_at': self.started_at,
+            'seconds': round(time.perf_counter() - self.started, 4),
+            'stages': {path: dict(entry, seconds=round(entry['seconds'], 4))
+                       for path, entry in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+        if self.trace_memory:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            report['peak_mb'] = round(peak / MB, 2)
+        return report
+
+
+_run: Optional[Run] = None
+
+
+@contextmanager
+def stage(name: str):
+    """Time (and with --trace-memory, memory-trace) a block"""
+    run = _run
+    if run is None:
+        yield
+        return
+    run.enter(name)
+    try:
+        yield
+    finally:
+        run.exit()
+
+
+def add_count(name: str, amount: int = 1):
+    """Add to a run counter (products processed, matches, copies, ...)"""
+    if _run is not None:
+        _run.counters[name] = _run.counters.get(name, 0) + amount
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--profile', action='store_true',
+                       help='Run under cProfile and write a .prof next to the run report')
+    group.add_argument('--trace-memory', action='store_true',
+                       help='Record the tracemalloc peak of every stage')
+    group.add_argument('--run-report', type=Path, default=None,
+                       help='Write the JSON run report here')
+
+
+def default_report_path(script: str) -> Path:
+    return REPORT_DIR / f"{script}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+
+
+def top_functions(profiler: cProfile.Profile, limit: int = TOP_FUNCTIONS) -> List[Dict]:
+    """Hottest functions by cumulative time"""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f'{Path(filename).name}:{line}({function})',
+            'calls': calls,
+            'total_seconds': round(total, 4),
+            'cumulative_seconds': round(cumulative, 4),
+        })
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:limit]
+
+
+def print_summary(report: Dict, report_path: Path):
+    print(f"\n⏱️  {report['script']}: {report['seconds']:.2f}s")
+    for path, entry in report['stages'].items():
+        memory = f", peak {entry['peak_mb']:.1f}MB" if 'peak_mb' in entry else ''
+        calls = f" ×{entry['calls']}" if entry['calls'] > 1 else ''
+        print(f"   {path:32} {entry['seconds']:8.3f}s{calls}{memory}")
+    for name, value in sorted(report['counters'].items()):
+        print(f"   # {name}: {value}")
+    print(f"📝 Run report: {report_path}")
+
+
+@contextmanager
+def instrumented(script: str, profile: bool = False, trace_memory: bool = False,
+                 report_path: Optional[Path] = None):
+    """Collect stages/counters for the enclosed run and write the report"""
+    global _run
+    enabled = profile or trace_memory or report_path is not None
+    if not enabled:
+        yield
+        return
+
+    report_path = report_path or default_report_path(script)
+    profiler = cProfile.Profile() if profile else None
+    if trace_memory:
+        tracemalloc.start()
+    _run = Run(script, trace_memory)
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        report = _run.report()
+        _run = None
+        if trace_memory:
+            tracemalloc.stop()
+
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        if profiler:
+            profile_path = report_path.with_suffix('.prof')
+            profiler.dump_stats(str(profile_path))
+            report['profile'] = {'path': str(profile_path), 'top': top_functions(profiler)}
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print_summary(report, report_path)
+
+
+def run_script(script: str, main: Callable[[], None]):
+    """
+    Run a script's main() with the instrumentation flags stripped from
+    sys.argv, so main's own parser never sees them
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    args, remaining = parser.parse_known_args(sys.argv[1:])
+    if '-h' in remaining or '--help' in remaining:
+        print("Instrumentation flags (all scripts): --profile, --trace-memory, --run-report PATH\n")
+    sys.argv[1:] = remaining
+
+    with instrumented(script, args.profile, args.trace_memory, args.run_report):
+        main()
@@ -2,12 +2,23 @@
 """
 Map Product Icons
 Maps product templates to flat icons based on name matching
+
+Names are scored against ICON_MAPPINGS keywords with icon_matcher's
+TF-IDF character n-grams; matches below the confidence threshold fall
+back to the category default and are listed for review.
+
+Requires: pip install numpy scipy
 """
 
+import argparse
 import json
+import time
 from pathlib import Path
 from typing import Dict, List, Optional
-import re
+
+from icon_matcher import CONFIDENCE_THRESHOLD, IconMatcher, is_own_name
+from instrumentation import add_count, run_script, stage
+from product_record import dump_catalog, load_catalog
 
 # Icon name to product name mapping (English)
 ICON_MAPPINGS = {
@@ -189,101 +200,141 @@ CATEGORY_ICONS = {
 }
 
 
-def normalize_text(text: str) -> str:
-    """Normalize text for comparison"""
-    return re.sub(r'[^a-z0-9\s]', '', text.lower().strip())
+# Top-2 scores closer than this (different icons) are flagged as ambiguous,
+# unless the product is named exactly after the best icon: "Milk" beats
+# baby_bottle only by TIE_BREAK, which is well inside this margin
+AMBIGUITY_MARGIN = 0.05
 
+_matcher = None
 
-def find_matching_icon(product_name: str, category: str) -> Optional[str]:
-    """Find matching icon ID for a product"""
-    normalized_name = normalize_text(product_name)
 
-    # Try exact matches first
-    for icon_id, keywords in ICON_MAPPINGS.items():
-        for keyword in keywords:
-            if normalize_text(keyword) == normalized_name:
-                return icon_id
+def get_matcher() -> IconMatcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = IconMatcher(ICON_MAPPINGS)
+    return _matcher
 
-    # Try partial matches
-    for icon_id, keywords in ICON_MAPPINGS.items():
-        for keyword in keywords:
-            normalized_keyword = normalize_text(keyword)
-            if normalized_keyword in normalized_name or normalized_name in normalized_keyword:
-                return icon_id
 
-    # Fallback to category default
+def find_matching_icon(product_name: str, category: str,
+                       threshold: float = CONFIDENCE_THRESHOLD) -> Optional[str]:
+    """Find matching icon ID for a single product name"""
+    icon_id, score = get_matcher().match([{'name_en': product_name}], top_k=1)[0][0]
+    if score >= threshold:
+        return icon_id
     return CATEGORY_ICONS.get(category, 'amphora')
 
 
-def map_product_icons():
+def map_product_icons(input_path: Path = Path('assets/data/products_sample.json'),
+                      output_path: Optional[Path] = None,
+                      threshold: float = CONFIDENCE_THRESHOLD,
+                      top_k: int = 3,
+                      report_path: Optional[Path] = None):
     """Map all products to their matching icons"""
+    output_path = output_path or input_path
 
     # Load products
-    products_path = Path('assets/data/products_sample.json')
-    with open(products_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with stage('load'):
+        data = load_catalog(input_path)
 
     products = data.get('products', [])
+    add_count('products', len(products))
 
     # Statistics
     stats = {
         'total': len(products),
-        'exact_match': 0,
-        'partial_match': 0,
+        'confident': 0,
+        'ambiguous': 0,
         'category_default': 0,
         'updated': 0,
     }
-
-    # Map icons
-    for product in products:
-        name_en = product.get('name_en', '')
-        name_vi = product.get('name_vi', '')
-        category = product.get('category', 'other')
-
-        # Try English name first
-        icon_id = find_matching_icon(name_en, category)
-
-        # If not found, try Vietnamese name
-        if icon_id == CATEGORY_ICONS.get(category, 'amphora'):
-            icon_id_vi = find_matching_icon(name_vi, category)
-            if icon_id_vi != CATEGORY_ICONS.get(category, 'amphora'):
-                icon_id = icon_id_vi
+    review = []
+
+    # Score every product against every icon in one batch
+    start = time.perf_counter()
+    with stage('score'):
+        matches = get_matcher().match(products, top_k=top_k)
+    elapsed = time.perf_counter() - start
+
+    for product, candidates in zip(products, matches):
+        category = product.category or 'other'
+        best_icon, best_score = candidates[0]
+        runner_up = next(((i, s) for i, s in candidates[1:] if s > 0), None)
+
+        if best_score >= threshold:
+            icon_id = best_icon
+            stats['confident'] += 1
+            if (runner_up and best_score - runner_up[1] < AMBIGUITY_MARGIN
+                    and not is_own_name(product, best_icon)):
+                stats['ambiguous'] += 1
+                review.append({'reason': 'ambiguous', 'product': product, 'candidates': candidates})
+        else:
+            icon_id = CATEGORY_ICONS.get(category, 'amphora')
+            stats['category_default'] += 1
+            review.append({'reason': 'low_confidence', 'product': product, 'candidates': candidates})
 
         # Add iconId to product
-        product['iconId'] = icon_id
+        product.icon_id = icon_id
         stats['updated'] += 1
 
-        # Track match type
-        if icon_id in [icon for icon, keywords in ICON_MAPPINGS.items()
-                       if any(normalize_text(kw) == normalize_text(name_en) for kw in keywords)]:
-            stats['exact_match'] += 1
-        elif icon_id in [icon for icon, keywords in ICON_MAPPINGS.items()
-                         if any(normalize_text(kw) in normalize_text(name_en) or
-                               normalize_text(name_en) in normalize_text(kw) for kw in keywords)]:
-            stats['partial_match'] += 1
-        else:
-            stats['category_default'] += 1
+    add_count('matches', stats['confident'])
+    add_count('category_defaults', stats['category_default'])
 
     # Save updated data
-    output_path = Path('assets/data/products_sample.json')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with stage('save'):
+        dump_catalog(data, output_path)
 
     # Print statistics
     print("✅ Product icons mapped successfully!")
     print(f"\n📊 Statistics:")
     print(f"   Total products: {stats['total']}")
-    print(f"   Exact matches: {stats['exact_match']}")
-    print(f"   Partial matches: {stats['partial_match']}")
+    print(f"   Confident matches (≥ {threshold}): {stats['confident']}")
+    print(f"   Ambiguous (top-2 within {AMBIGUITY_MARGIN}): {stats['ambiguous']}")
     print(f"   Category defaults: {stats['category_default']}")
     print(f"   Updated: {stats['updated']}")
+    print(f"   Scoring time: {elapsed:.2f}s")
     print(f"\n💾 Saved to: {output_path}")
 
+    # Show matches that need a human look
+    print(f"\n🔎 Needs review ({len(review)}):")
+    for item in review[:20]:
+        product = item['product']
+        candidates = ', '.join(f"{icon} {score:.2f}" for icon, score in item['candidates'])
+        print(f"   [{item['reason']}] {product.name_en or '':24} → {product.icon_id:16} ({candidates})")
+    if len(review) > 20:
+        print(f"   ... {len(review) - 20} more")
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump([{
+                'id': item['product'].id,
+                'name_en': item['product'].name_en,
+                'name_vi': item['product'].name_vi,
+                'category': item['product'].category,
+                'iconId': item['product'].icon_id,
+                'reason': item['reason'],
+                'candidates': item['candidates'],
+            } for item in review], f, ensure_ascii=False, indent=2)
+        print(f"\n📝 Review report: {report_path}")
+
     # Show some examples
     print(f"\n📝 Sample mappings:")
     for i, product in enumerate(products[:10]):
-        print(f"   {product['name_en']:20} → {product['iconId']}")
+        print(f"   {product.name_en:20} → {product.icon_id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Map products to icons with TF-IDF n-gram scoring')
+    parser.add_argument('--input', type=Path, default=Path('assets/data/products_sample.json'))
+    parser.add_argument('--output', type=Path, default=None, help='Defaults to --input')
+    parser.add_argument('--threshold', type=float, default=CONFIDENCE_THRESHOLD,
+                        help='Min similarity to use a match instead of the category default')
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--report', type=Path, default=None,
+                        help='Write low-confidence and ambiguous matches as JSON')
+    args = parser.parse_args()
+
+    map_product_icons(args.input, args.output, args.threshold, args.top_k, args.report)
 
 
 if __name__ == '__main__':
-    map_product_icons()
+    run_script('map_product_icons', main)
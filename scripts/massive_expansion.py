@@ -3,11 +3,26 @@
 Massive database expansion:
 - Fruits: 100+ products
 - Meat: Complete Vietnamese meat cuts
+
+Usage:
+  python3 scripts/massive_expansion.py
+  python3 scripts/massive_expansion.py --shards assets/data/shards   (rewrites only fruits/meat)
 """
 
-import json
+import argparse
 from pathlib import Path
 
+from catalog_codec import dump_json, load_json
+from catalog_shards import append_products, load_shards, read_manifest
+from instrumentation import add_count, run_script, stage
+
+# Header written with the expanded catalog
+OUTPUT_VERSION = '3.0.0'
+OUTPUT_DATE = '2025-11-11'
+
+# Categories the generated products belong to
+EXPANDED_CATEGORIES = ('fruits', 'meat')
+
 # This will be a HUGE list - 78+ fruits
 MASSIVE_FRUITS = [
     # Vietnamese citrus varieties
@@ -241,16 +256,8 @@ def generate_product(base_data, category):
         "storage_tips": storage_tip
     }
 
-def massive_expand(input_file, output_file):
-    """Massive expansion"""
-
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    current_products = data['products']
-    print(f"📊 Current: {len(current_products)} products")
-
-    # Generate all new products
+def new_products(current_products):
+    """Generated fruits and meats that aren't in current_products yet"""
     new_fruits = [generate_product(f, "fruits") for f in MASSIVE_FRUITS]
     new_meats = [generate_product(m, "meat") for m in COMPLETE_MEAT]
 
@@ -268,7 +275,29 @@ def massive_expand(input_file, output_file):
             to_add.append(product)
         else:
             print(f"  ⚠️  Skipping: {product['name_vi']}")
+    add_count('products_added', len(to_add))
+    return to_add
+
+
+def print_totals(by_category):
+    print(f"\n📊 New totals:")
+    for cat in sorted(by_category.keys()):
+        print(f"  - {cat}: {by_category[cat]}")
+    print(f"\n🎯 Fruits total: {by_category.get('fruits', 0)}")
+
+
+def massive_expand(input_file, output_file):
+    """Massive expansion"""
+
+    with stage('load'):
+        data = load_json(input_file)
 
+    current_products = data['products']
+    add_count('products', len(current_products))
+    print(f"📊 Current: {len(current_products)} products")
+
+    # Generate all new products
+    to_add = new_products(current_products)
     all_products = current_products + to_add
 
     # Stats by category
@@ -276,28 +305,64 @@ def massive_expand(input_file, output_file):
     for p in all_products:
         cat = p.get('category', 'other')
         by_category[cat] = by_category.get(cat, 0) + 1
-
-    print(f"\n📊 New totals:")
-    for cat in sorted(by_category.keys()):
-        print(f"  - {cat}: {by_category[cat]}")
-    print(f"\n🎯 Fruits total: {by_category.get('fruits', 0)}")
+    print_totals(by_category)
 
     output_data = {
-        'version': '3.0.0',
-        'last_updated': '2025-11-11',
+        'version': OUTPUT_VERSION,
+        'last_updated': OUTPUT_DATE,
         'total_products': len(all_products),
         'products': all_products
     }
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    with stage('save'):
+        dump_json(output_data, output_file)
 
     print(f"\n✅ Done: {len(current_products)} → {len(all_products)}")
     print(f"📈 Added: {len(to_add)} products")
 
-if __name__ == '__main__':
+
+def massive_expand_shards(shard_dir):
+    """
+    Massive expansion of a sharded catalog (catalog_shards.py): only the
+    fruits and meat shards are read and rewritten, so duplicates are
+    checked against those two categories
+    """
+    manifest = read_manifest(shard_dir)
+    categories = [c for c in EXPANDED_CATEGORIES if c in manifest['shards']]
+    with stage('load'):
+        current = load_shards(shard_dir, categories, manifest=manifest)
+    total = sum(entry['count'] for entry in manifest['shards'].values())
+    add_count('products', total)
+    print(f"📊 Current: {total} products ({', '.join(categories)} shards loaded)")
+
+    to_add = new_products([p for products in current.values() for p in products])
+
+    with stage('save'):
+        manifest = append_products(shard_dir, to_add, current,
+                                   header={'version': OUTPUT_VERSION, 'last_updated': OUTPUT_DATE})
+    print_totals({category: entry['count'] for category, entry in manifest['shards'].items()})
+
+    print(f"\n✅ Done: {total} → {total + len(to_add)}")
+    print(f"📈 Added: {len(to_add)} products ({', '.join(categories)} shards rewritten)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add 100+ fruits and Vietnamese meat cuts')
+    parser.add_argument('--shards', type=Path, default=None,
+                        help='Expand a catalog_shards.py directory instead of products_sample.json')
+    args = parser.parse_args()
+
+    print("🚀 MASSIVE EXPANSION...")
+    if args.shards:
+        with stage('expand'):
+            massive_expand_shards(args.shards)
+        return
+
     input_file = Path(__file__).parent.parent / 'assets' / 'data' / 'products_sample.json'
     output_file = Path(__file__).parent.parent / 'assets' / 'data' / 'products_sample.json'
 
-    print("🚀 MASSIVE EXPANSION...")
-    massive_expand(input_file, output_file)
+    with stage('expand'):
+        massive_expand(input_file, output_file)
+
+if __name__ == '__main__':
+    run_script('massive_expansion', main)
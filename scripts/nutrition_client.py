@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Async Nutrition Client for Fresh Keeper
+Enriches many products from the Open Food Facts / USDA FoodData Central
+HTTP APIs NutritionApiService uses, without taking hours
+
+One request at a time, 100k products is most of a day of waiting on the
+network. NutritionClient runs the requests on asyncio with:
+
+  - a keep-alive connection pool per host (--pool-size)
+  - bounded concurrency: at most --concurrency requests in flight
+  - a token bucket: on average --rate requests per second, --burst at once
+  - retries with exponential backoff and jitter on connection errors,
+    timeouts, 429 and 5xx (Retry-After is honoured)
+  - an on-disk response cache keyed by query, so re-runs and resumed runs
+    only ask for what they haven't seen
+
+HTTP/1.1 is spoken over asyncio streams, so there is nothing to install.
+USDA foods are mapped with usda_enrich's nutrient table and Open Food
+Facts products with off_barcode_index's, like the offline enrichers.
+nutrition_replay_server.py serves fixture responses on the same paths for
+tests and dry runs.
+
+Usage:
+  python3 scripts/nutrition_client.py enrich assets/data/products_sample.json -o /tmp/enriched.json
+  python3 scripts/nutrition_client.py enrich assets/data/products_sample.json --source off --rate 1
+  python3 scripts/nutrition_client.py search watermelon
+  python3 scripts/nutrition_client.py barcode 8934563138165
+
+  # Against the local replay server instead of the real APIs
+  python3 scripts/nutrition_replay_server.py --port 8765 &
+  python3 scripts/nutrition_client.py --usda-url http://127.0.0.1:8765/fdc/v1 \\
+      --off-url http://127.0.0.1:8765 enrich assets/data/products_sample.json --dry-run
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import random
+import ssl
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+from catalog_codec import dump_json, load_json
+from instrumentation import add_count, run_script, stage
+from off_barcode_index import nutrition_data as off_nutrition
+from usda_enrich import NUTRIENTS, REQUIRED_UNITS, template_positions, usda_nutrition
+
+OFF_URL = 'https://world.openfoodfacts.net'
+USDA_URL = 'https://api.nal.usda.gov/fdc/v1'
+USER_AGENT = 'FreshKeeper/1.0.0 (fresh.keeper@example.com)'
+
+# USDA's shared demo key is heavily rate limited; set FDC_API_KEY for real runs
+USDA_API_KEY = os.environ.get('FDC_API_KEY', 'DEMO_KEY')
+
+CACHE_DIR = Path('scripts/.nutrition_cache')
+
+CONCURRENCY = 16
+RATE = 10.0
+RETRIES = 4
+BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+TIMEOUT = 10.0
+
+# Statuses worth retrying; anything else is the answer
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Query parameters left out of cache keys
+UNCACHED_PARAMS = {'api_key'}
+
+# FDC nutrient name → (group, key, preference), as in usda_enrich
+NUTRIENT_NAMES = {name: (group, key, rank) for group, key, names in NUTRIENTS
+                  for rank, name in enumerate(names)}
+
+
+class HttpError(Exception):
+    """A response with a status that isn't worth retrying (or retries ran out)"""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average and `burst` at once"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated: Optional[float] = None
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self.updated is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ResponseCache:
+    """JSON responses on disk, one file per key under a two-character fan-out"""
+
+    def __init__(self, directory: Path = CACHE_DIR):
+        self.directory = Path(directory)
+
+    def path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, status: int, body: Any):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + f'.{os.getpid()}.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'status': status, 'body': body}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+def cache_key(url: str) -> str:
+    """The URL without credentials, with query parameters in a fixed order"""
+    parts = urlsplit(url)
+    params = sorted((key, value) for key, value in parse_qsl(parts.query) if key not in UNCACHED_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(params), ''))
+
+
+class ConnectionPool:
+    """Up to `size` keep-alive HTTP/1.1 connections to one host"""
+
+    def __init__(self, scheme: str, host: str, port: int, size: int, timeout: float = TIMEOUT):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.opened = 0
+
+    async def _open(self):
+        context = ssl.create_default_context() if self.scheme == 'https' else None
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=context), self.timeout)
+        self.opened += 1
+        return connection
+
+    async def request(self, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """GET target; a pooled connection the server dropped is replaced once"""
+        async with self._slots:
+            while self._idle:
+                connection = self._idle.pop()
+                if not connection[1].is_closing():
+                    break
+            else:
+                connection = None
+
+            if connection is not None:
+                try:
+                    return await self._exchange(connection, target, headers)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection[1].close()
+            return await self._exchange(await self._open(), target, headers)
+
+    async def _exchange(self, connection, target: str, headers: Dict[str, str]):
+        reader, writer = connection
+        try:
+            status, response_headers, body, keep_alive = await asyncio.wait_for(
+                self._roundtrip(reader, writer, target, headers), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.append(connection)
+        else:
+            writer.close()
+        return status, response_headers, body
+
+    async def _roundtrip(self, reader, writer, target, headers):
+        lines = [f"GET {target} HTTP/1.1", f"Host: {self.host}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('connection closed before the response')
+        status = int(status_line.split()[1])
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n'):
+                break
+            if not line:
+                raise asyncio.IncompleteReadError(b'', None)
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        keep_alive = response_headers.get('connection', '').lower() != 'close'
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    # Trailers, then the blank line
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            body = await reader.readexactly(int(response_headers['content-length']))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        if response_headers.get('content-encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+        return status, response_headers, body, keep_alive
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class NutritionClient:
+    """
+    Cached, rate-limited, retrying JSON GETs against the nutrition APIs;
+    use with `async with`
+    """
+
+    def __init__(self, usda_url: str = USDA_URL, off_url: str = OFF_URL, api_key: str = USDA_API_KEY,
+                 concurrency: int = CONCURRENCY, rate: float = RATE, burst: Optional[float] = None,
+                 retries: int = RETRIES, backoff: float = BACKOFF, timeout: float = TIMEOUT,
+                 pool_size: Optional[int] = None, cache: Optional[ResponseCache] = None):
+        self.usda_url = usda_url.rstrip('/')
+        self.off_url = off_url.rstrip('/')
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.pool_size = pool_size or concurrency
+        self.cache = cache
+        self.bucket = TokenBucket(rate, burst)
+        self._in_flight = asyncio.Semaphore(concurrency)
+        self._pools: Dict[Tuple[str, str, int], ConnectionPool] = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'retries': 0, 'failures': 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for pool in self._pools.values():
+            await pool.close()
+
+    @property
+    def connections(self) -> int:
+        return sum(pool.opened for pool in self._pools.values())
+
+    def _pool(self, url: str) -> Tuple[ConnectionPool, str]:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        if key not in self._pools:
+            self._pools[key] = ConnectionPool(parts.scheme, parts.hostname, port, self.pool_size, self.timeout)
+        target = parts.path + (f"?{parts.query}" if parts.query else '')
+        return self._pools[key], target
+
+    async def get_json(self, url: str) -> Tuple[int, Any]:
+        """
+        (status, decoded body) of a GET; 200 and 404 answers are cached.
+        Raises HttpError for other statuses once retries are used up
+        """
+        key = cache_key(url)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return cached['status'], cached['body']
+
+        pool, target = self._pool(url)
+        headers = {'User-Agent': USER_AGENT, 'Accept': 'application/json',
+                   'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'}
+        attempt = 0
+        while True:
+            retry_after = None
+            await self.bucket.acquire()
+            async with self._in_flight:
+                self.stats['requests'] += 1
+                try:
+                    status, response_headers, body = await pool.request(target, headers)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                    status, error = None, e
+                else:
+                    error = None
+                    if status in RETRY_STATUSES:
+                        retry_after = response_headers.get('retry-after')
+
+            if status is not None and status not in RETRY_STATUSES:
+                decoded = json.loads(body) if body else None
+                if status in (200, 404):
+                    if self.cache is not None:
+                        self.cache.put(key, status, decoded)
+                    return status, decoded
+                self.stats['failures'] += 1
+                raise HttpError(status, key)
+
+            if attempt >= self.retries:
+                self.stats['failures'] += 1
+                if error is not None:
+                    raise error
+                raise HttpError(status, key)
+            attempt += 1
+            self.stats['retries'] += 1
+            delay = min(MAX_BACKOFF, self.backoff * 2 ** (attempt - 1)) * (0.5 + random.random() / 2)
+            if retry_after is not None and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+
+    async def search_usda(self, query: str, page_size: int = 5) -> List[Dict[str, Any]]:
+        """USDA foods for a query, Foundation / SR Legacy like _searchUSDA"""
+        params = urlencode({'api_key': self.api_key, 'query': query, 'pageSize': page_size,
+                            'dataType': 'Foundation,SR Legacy'}, quote_via=quote)
+        status, body = await self.get_json(f"{self.usda_url}/foods/search?{params}")
+        return (body or {}).get('foods', []) if status == 200 else []
+
+    async def search_off(self, query: str, page_size: int = 5) -> List[Dict[str, Any]]:
+        """Open Food Facts products for a query, like _searchOpenFoodFacts"""
+        params = urlencode({'search_terms': query, 'page_size': page_size, 'json': 1}, quote_via=quote)
+        status, body = await self.get_json(f"{self.off_url}/cgi/search.pl?{params}")
+        return (body or {}).get('products', []) if status == 200 else []
+
+    async def product_by_barcode(self, barcode: str) -> Optional[Dict[str, Any]]:
+        """Open Food Facts product for a barcode, None if unknown"""
+        status, body = await self.get_json(f"{self.off_url}/api/v2/product/{quote(barcode)}.json")
+        if status != 200 or not body or body.get('status') != 1:
+            return None
+        return body.get('product')
+
+
+def usda_values(food: Dict[str, Any]) -> Dict[Tuple[Optional[str], str], float]:
+    """(group, key) → amount from a USDA search result's foodNutrients"""
+    found: Dict[Tuple[Optional[str], str], Tuple[int, float]] = {}
+    for nutrient in food.get('foodNutrients') or []:
+        name = str(nutrient.get('nutrientName') or '').strip().lower()
+        value = nutrient.get('value')
+        if name not in NUTRIENT_NAMES or not isinstance(value, (int, float)):
+            continue
+        group, key, preference = NUTRIENT_NAMES[name]
+        if key in REQUIRED_UNITS and str(nutrient.get('unitName', '')).upper() != REQUIRED_UNITS[key]:
+            continue
+        if (group, key) not in found or preference < found[(group, key)][0]:
+            found[(group, key)] = (preference, float(value))
+    return {field: value for field, (_, value) in found.items()}
+
+
+async def lookup_nutrition(client: NutritionClient, product: Dict[str, Any], source: str) -> Optional[Dict[str, Any]]:
+    """Nutrition for a product from the first search result that has any"""
+    query = product.get('name_en') or product.get('name_vi') or ''
+    if not query:
+        return None
+    if source == 'usda':
+        for food in await client.search_usda(query):
+            values = usda_values(food)
+            if values:
+                return usda_nutrition(values, product.get('nutrition_data'))
+    else:
+        for result in await client.search_off(query):
+            nutrition = off_nutrition(result.get('nutriments') or {})
+            if nutrition and nutrition.get('calories') is not None:
+                return nutrition
+    return None
+
+
+async def enrich_catalog(data: Dict[str, Any], client: NutritionClient, source: str = 'usda',
+                         overwrite_all: bool = False, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Fill nutrition of template products in place; returns counts"""
+    products = data['products']
+    targets = list(range(len(products))) if overwrite_all else sorted(template_positions(products))
+    counts = {'products': len(products), 'targets': len(targets), 'enriched': 0, 'not_found': 0, 'failed': 0}
+    failed: List[str] = []
+    queue = iter(targets)
+
+    async def worker():
+        # Workers share one iterator, so only `workers` lookups are pending at once
+        for i in queue:
+            try:
+                nutrition = await lookup_nutrition(client, products[i], source)
+            except (HttpError, OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                counts['failed'] += 1
+                failed.append(products[i].get('id'))
+                continue
+            if nutrition is None:
+                counts['not_found'] += 1
+            else:
+                products[i]['nutrition_data'] = nutrition
+                counts['enriched'] += 1
+
+    workers = workers or client.concurrency
+    await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(targets))))))
+    counts['failed_ids'] = failed
+    for name in ('enriched', 'not_found', 'failed'):
+        add_count(name, counts[name])
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Async, pooled, cached nutrition API client')
+    parser.add_argument('--usda-url', default=USDA_URL)
+    parser.add_argument('--off-url', default=OFF_URL)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help='Requests in flight at most')
+    parser.add_argument('--pool-size', type=int, default=None, help='Connections per host (default: concurrency)')
+    parser.add_argument('--rate', type=float, default=RATE, help='Requests per second (0: unlimited)')
+    parser.add_argument('--burst', type=float, default=None, help='Requests allowed at once (default: rate)')
+    parser.add_argument('--retries', type=int, default=RETRIES)
+    parser.add_argument('--cache-dir', type=Path, default=CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enrich_cmd = commands.add_parser('enrich', help='Fill template nutrition of a catalog')
+    enrich_cmd.add_argument('catalog', type=Path)
+    enrich_cmd.add_argument('-o', '--output', type=Path, default=None, help='Default: overwrite the catalog')
+    enrich_cmd.add_argument('--source', choices=('usda', 'off'), default='usda')
+    enrich_cmd.add_argument('--overwrite-all', action='store_true',
+                            help='Also replace nutrition that is not a shared template')
+    enrich_cmd.add_argument('--dry-run', action='store_true', help='Report only, write no catalog')
+
+    search_cmd = commands.add_parser('search', help='Search both APIs')
+    search_cmd.add_argument('query')
+
+    barcode_cmd = commands.add_parser('barcode', help='Look barcodes up on Open Food Facts')
+    barcode_cmd.add_argument('barcodes', nargs='+')
+
+    args = parser.parse_args()
+
+    def client():
+        return NutritionClient(args.usda_url, args.off_url, concurrency=args.concurrency, rate=args.rate,
+                               burst=args.burst, retries=args.retries, pool_size=args.pool_size,
+                               cache=None if args.no_cache else ResponseCache(args.cache_dir))
+
+    async def run():
+        async with client() as api:
+            if args.command == 'enrich':
+                with stage('load'):
+                    data = load_json(args.catalog)
+                with stage('enrich'):
+                    counts = await enrich_catalog(data, api, args.source, args.overwrite_all)
+                print(f"🥗 {args.source.upper()} enrichment: {args.catalog}")
+                print(f"   Template / missing nutrition: {counts['targets']} of {counts['products']}")
+                print(f"   ✅ enriched: {counts['enriched']}   🔍 not found: {counts['not_found']}"
+                      f"   ❌ failed: {counts['failed']}")
+                print(f"   🌐 {api.stats['requests']} requests on {api.connections} connections, "
+                      f"{api.stats['cache_hits']} cache hits, {api.stats['retries']} retries")
+                if counts['failed_ids']:
+                    print(f"   Failed (re-run to retry): {', '.join(counts['failed_ids'][:10])}")
+                if not args.dry_run:
+                    output = args.output or args.catalog
+                    with stage('save'):
+                        dump_json(data, output)
+                    print(f"✅ Wrote {output}")
+
+            elif args.command == 'search':
+                usda, off = await asyncio.gather(api.search_usda(args.query), api.search_off(args.query))
+                print(f"🔍 {args.query}: USDA {len(usda)}, Open Food Facts {len(off)}")
+                for food in usda:
+                    print(f"   [USDA {food.get('fdcId')}] {food.get('description')}")
+                for product in off:
+                    print(f"   [OFF {product.get('code')}] {product.get('product_name')}")
+
+            elif args.command == 'barcode':
+                products = await asyncio.gather(*(api.product_by_barcode(code) for code in args.barcodes))
+                missing = False
+                for code, product in zip(args.barcodes, products):
+                    if product is None:
+                        print(f"❌ {code}: not found")
+                        missing = True
+                    else:
+                        print(f"✅ {code}: {product.get('product_name')}")
+                if missing:
+                    sys.exit(1)
+
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    run_script('nutrition_client', main)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Nutrition API Replay Server for Fresh Keeper
+A local stand-in for the Open Food Facts and USDA FoodData Central
+endpoints NutritionApiService calls, serving fixture responses
+
+Routes (the same paths as the real APIs):
+
+  /fdc/v1/foods/search?query=...          USDA search
+  /cgi/search.pl?search_terms=...         Open Food Facts search
+  /api/v2/product/<barcode>.json          Open Food Facts barcode lookup
+
+Responses come from a fixture JSON file with "usda_search", "off_search"
+and "off_product" maps keyed by lowercase query / barcode. Searches for
+other queries get the "default_*" response with "{query}" filled in, so a
+catalog of any size can be enriched against it; unknown barcodes get
+404 like the real API.
+
+Latency and failures can be injected (--latency, --fail-every) to
+exercise a client's concurrency, retries and backoff. The server speaks
+HTTP/1.1 with keep-alive, and counts requests, connections and the peak
+number of requests in flight.
+
+Usage:
+  python3 scripts/nutrition_replay_server.py --port 8765
+  python3 scripts/nutrition_replay_server.py --port 8765 --latency 0.05 --fail-every 10
+
+  from nutrition_replay_server import ReplayServer
+  with ReplayServer(fixtures).running() as server:
+      client = NutritionClient(usda_url=server.usda_url, off_url=server.url)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import json
+import threading
+from pathlib import Path
+from typing import Any, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from instrumentation import run_script
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / 'benchmarks' / 'fixtures' / 'nutrition_api.json'
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           429: 'Too Many Requests', 503: 'Service Unavailable'}
+
+
+def fill_query(value: Any, query: str) -> Any:
+    """The default response with "{query}" replaced in every string"""
+    if isinstance(value, str):
+        return value.replace('{query}', query)
+    if isinstance(value, list):
+        return [fill_query(item, query) for item in value]
+    if isinstance(value, dict):
+        return {key: fill_query(item, query) for key, item in value.items()}
+    return value
+
+
+class ReplayServer:
+    """Serves fixture responses on the real APIs' paths"""
+
+    def __init__(self, fixtures: Path = DEFAULT_FIXTURES, latency: float = 0.0, fail_every: int = 0):
+        with open(fixtures, 'r', encoding='utf-8') as f:
+            self.fixtures = json.load(f)
+        self.latency = latency
+        self.fail_every = fail_every
+        self.host = '127.0.0.1'
+        self.port: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def usda_url(self) -> str:
+        return f"{self.url}/fdc/v1"
+
+    def route(self, target: str) -> Tuple[int, Any]:
+        parts = urlsplit(target)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if parts.path == '/fdc/v1/foods/search':
+            return self.search('usda_search', params.get('query', ''))
+        if parts.path == '/cgi/search.pl':
+            return self.search('off_search', params.get('search_terms', ''))
+        if parts.path.startswith('/api/v2/product/') and parts.path.endswith('.json'):
+            barcode = parts.path[len('/api/v2/product/'):-len('.json')]
+            product = self.fixtures.get('off_product', {}).get(barcode)
+            if product is None:
+                return 404, {'code': barcode, 'status': 0, 'status_verbose': 'product not found'}
+            return 200, {'code': barcode, 'status': 1, 'product': product}
+        return 404, {'error': f"no route for {parts.path}"}
+
+    def search(self, kind: str, query: str) -> Tuple[int, Any]:
+        if not query:
+            return 400, {'error': 'missing query'}
+        response = self.fixtures.get(kind, {}).get(query.lower())
+        if response is None:
+            response = fill_query(self.fixtures.get(f'default_{kind}', {}), query)
+        return 200, copy.deepcopy(response)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+
+                self.requests += 1
+                number = self.requests
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    if method != 'GET':
+                        status, body = 405, {'error': 'GET only'}
+                    elif self.fail_every and number % self.fail_every == 0:
+                        status, body = 503, {'error': 'injected failure'}
+                    else:
+                        status, body = self.route(target)
+                finally:
+                    self.in_flight -= 1
+
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                close = headers.get('connection', '').lower() == 'close'
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}",
+                        'Content-Type: application/json; charset=utf-8',
+                        f"Content-Length: {len(payload)}",
+                        f"Connection: {'close' if close else 'keep-alive'}"]
+                if status == 503:
+                    head.append('Retry-After: 0')
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, port: int = 0):
+        self._server = await asyncio.start_server(self.handle, self.host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    @contextlib.contextmanager
+    def running(self, port: int = 0):
+        """Serve from a background thread with its own event loop"""
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+        errors = []
+
+        def serve():
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start(port))
+            except OSError as e:
+                errors.append(e)
+                return
+            finally:
+                started.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=serve, name='nutrition-replay-server', daemon=True)
+        thread.start()
+        started.wait()
+        if errors:
+            thread.join()
+            loop.close()
+            raise errors[0]
+        try:
+            yield self
+        finally:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay fixture nutrition API responses locally')
+    parser.add_argument('--fixtures', type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--fail-every', type=int, default=0, help='Answer every Nth request with 503')
+    args = parser.parse_args()
+
+    server = ReplayServer(args.fixtures, args.latency, args.fail_every)
+
+    async def serve():
+        await server.start(args.port)
+        print(f"🛰️  Replaying {args.fixtures.name} on {server.url}")
+        print(f"   USDA: {server.usda_url}   Open Food Facts: {server.url}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"\n👋 Served {server.requests} requests on {server.connections} connections")
+
+
+if __name__ == '__main__':
+    run_script('nutrition_replay_server', main)
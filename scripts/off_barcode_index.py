@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Offline Barcode Index for Fresh Keeper
+Builds a sorted, memory-mappable barcode → product table from a local
+Open Food Facts dump
+
+NutritionApiService.getProductByBarcode asks world.openfoodfacts.net for
+every scan. This builder streams a local dump instead:
+
+  - JSONL (openfoodfacts-products.jsonl[.gz]) or the TSV export
+    (en.openfoodfacts.org.products.csv[.gz]), read line by line
+  - keeps Vietnamese-market products (countries_tags has en:vietnam, or
+    a GS1 Vietnam 893 prefix) unless --all-countries
+  - maps each onto the template schema of products_sample.json with the
+    same category / shelf-life / nutriment rules as the Dart service
+  - sorts with bounded memory: runs of --run-size records are sorted and
+    spilled to temp files, then merged
+
+Table layout (little-endian, 8-byte aligned):
+
+  b'FKBC' u16 version u16 reserved  u32 count  u32 reserved
+  u64 × count        barcodes as GTIN-14 integers, ascending
+  u64 × (count + 1)  record offsets, relative to the records area
+  records            compact JSON, one product each
+
+Lookups binary-search the barcode array straight from the mapping.
+
+Usage:
+  python3 scripts/off_barcode_index.py build openfoodfacts-products.jsonl.gz -o assets/data/off_barcodes.bin
+  python3 scripts/off_barcode_index.py lookup assets/data/off_barcodes.bin 8934563138165
+  python3 scripts/off_barcode_index.py stats assets/data/off_barcodes.bin
+"""
+
+import argparse
+import bisect
+import csv
+import gzip
+import heapq
+import json
+import mmap
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from catalog_codec import dumps_compact, get_codec
+from instrumentation import add_count, run_script, stage
+
+MAGIC = b'FKBC'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+
+DEFAULT_OUTPUT = Path('assets/data/off_barcodes.bin')
+
+# Records sorted in memory before a run is spilled to disk
+RUN_SIZE = 200_000
+
+VIETNAM_TAG = 'en:vietnam'
+VIETNAM_PREFIX = '893'
+
+# (category, keywords) checked in order, as NutritionApiService._mapCategory
+CATEGORY_KEYWORDS = [
+    ('vegetables', ('vegetable', 'rau')),
+    ('fruits', ('fruit', 'trái cây')),
+    ('meat', ('meat', 'thịt')),
+    ('dairy', ('dairy', 'milk', 'sữa')),
+    ('eggs', ('egg', 'trứng')),
+    ('frozen', ('frozen', 'đông lạnh')),
+    ('condiments', ('condiment', 'gia vị')),
+    ('dry_food', ('bread', 'cereal', 'bánh')),
+]
+
+# Days in the fridge by category, as NutritionApiService._getDefaultShelfLife
+DEFAULT_SHELF_LIFE = {
+    'vegetables': 7, 'fruits': 7, 'meat': 3, 'eggs': 21, 'dairy': 7,
+    'frozen': 90, 'dry_food': 30, 'condiments': 180,
+}
+FALLBACK_SHELF_LIFE = 7
+
+# nutrition_data key → OFF nutriment (per 100 g)
+NUTRIENTS = {
+    'calories': 'energy-kcal_100g',
+    'protein': 'proteins_100g',
+    'carbohydrates': 'carbohydrates_100g',
+    'fat': 'fat_100g',
+    'fiber': 'fiber_100g',
+    'sugar': 'sugars_100g',
+}
+VITAMINS = {'vitamin_a': 'vitamin-a_100g', 'vitamin_c': 'vitamin-c_100g', 'vitamin_d': 'vitamin-d_100g'}
+MINERALS = {'calcium': 'calcium_100g', 'iron': 'iron_100g',
+            'potassium': 'potassium_100g', 'sodium': 'sodium_100g'}
+NUTRIMENT_COLUMNS = set(NUTRIENTS.values()) | set(VITAMINS.values()) | set(MINERALS.values())
+
+
+def gtin(barcode: str) -> Optional[int]:
+    """Barcode as a GTIN-14 integer (EAN-8/UPC/EAN-13 zero-padded), None if not one"""
+    digits = barcode.strip()
+    if not digits.isdigit() or not 8 <= len(digits) <= 14:
+        return None
+    return int(digits)
+
+
+def open_text(path: Path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace', newline='')
+    return open(path, 'r', encoding='utf-8', errors='replace', newline='')
+
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    decode = get_codec().decode
+    with open_text(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield decode(line.encode('utf-8'))
+            except ValueError:
+                add_count('bad_lines')
+
+
+def split_tags(value: str) -> List[str]:
+    return [tag for tag in value.split(',') if tag] if value else []
+
+
+def read_tsv(path: Path) -> Iterator[Dict[str, Any]]:
+    """Rows of the TSV export, shaped like JSONL products"""
+    csv.field_size_limit(sys.maxsize)
+    with open_text(path) as f:
+        for row in csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+            yield {
+                'code': row.get('code') or '',
+                'product_name': row.get('product_name') or None,
+                'product_name_en': row.get('product_name_en') or None,
+                'product_name_vi': row.get('product_name_vi') or None,
+                'categories': row.get('categories') or '',
+                'countries_tags': split_tags(row.get('countries_tags', '')),
+                'allergens_tags': split_tags(row.get('allergens_tags') or row.get('allergens', '')),
+                'image_url': row.get('image_url') or None,
+                'nutriments': {key: row[key] for key in NUTRIMENT_COLUMNS if row.get(key)},
+            }
+
+
+def read_dump(path: Path) -> Iterator[Dict[str, Any]]:
+    name = path.name.lower()
+    if name.endswith(('.csv', '.csv.gz', '.tsv', '.tsv.gz')):
+        return read_tsv(path)
+    return read_jsonl(path)
+
+
+def is_vietnamese(product: Dict[str, Any]) -> bool:
+    tags = product.get('countries_tags') or []
+    return VIETNAM_TAG in tags or str(product.get('code', '')).startswith(VIETNAM_PREFIX)
+
+
+def map_category(categories: str) -> str:
+    lower = categories.lower()
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in lower for keyword in keywords):
+            return category
+    return 'other'
+
+
+def number(value) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def nutrition_data(nutriments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not nutriments:
+        return None
+    nutrition: Dict[str, Any] = {'serving_size': '100g'}
+    for key, source in NUTRIENTS.items():
+        nutrition[key] = number(nutriments.get(source))
+    for group, sources in (('vitamins', VITAMINS), ('minerals', MINERALS)):
+        values = {key: number(nutriments.get(source)) for key, source in sources.items()}
+        nutrition[group] = {key: value for key, value in values.items() if value is not None}
+    return nutrition
+
+
+def to_template(product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The product in products_sample.json's schema, None without a name"""
+    name = product.get('product_name') or product.get('product_name_en')
+    if not isinstance(name, str) or not name.strip():
+        return None
+    name = name.strip()
+    name_vi = product.get('product_name_vi') or name
+    name_en = product.get('product_name_en') or name
+    categories = product.get('categories')
+    category = map_category(categories if isinstance(categories, str) else '')
+    allergens = product.get('allergens_tags')
+    template = {
+        'id': f"off_{product['code']}",
+        'barcode': product['code'],
+        'name_vi': name_vi,
+        'name_en': name_en,
+        'aliases': sorted({name.lower(), name_vi.lower(), name_en.lower()}),
+        'category': category,
+        'shelf_life_refrigerated': DEFAULT_SHELF_LIFE.get(category, FALLBACK_SHELF_LIFE),
+        'nutrition_data': nutrition_data(product.get('nutriments') or {}),
+        'health_warnings': [str(tag) for tag in allergens] if isinstance(allergens, list) else [],
+        'image_url': product.get('image_url'),
+    }
+    return template
+
+
+def spill(run: List[Tuple[int, bytes]], directory: Path, run_number: int) -> Path:
+    """Sort a run and write it as 'barcode\\tjson' lines"""
+    run.sort(key=lambda item: item[0])
+    path = directory / f'run-{run_number:05d}.tsv'
+    with open(path, 'wb') as f:
+        for code, record in run:
+            f.write(b'%d\t%s\n' % (code, record))
+    return path
+
+
+def read_run(path: Path) -> Iterator[Tuple[int, bytes]]:
+    with open(path, 'rb') as f:
+        for line in f:
+            code, record = line.rstrip(b'\n').split(b'\t', 1)
+            yield int(code), record
+
+
+def build(dump: Path, output: Path, all_countries: bool = False, run_size: int = RUN_SIZE) -> Dict[str, int]:
+    """Stream the dump into a sorted barcode table; returns counts"""
+    counts = {'read': 0, 'kept': 0, 'duplicates': 0, 'skipped': 0}
+    with tempfile.TemporaryDirectory(prefix='off-index-') as tmp:
+        runs: List[Path] = []
+        run: List[Tuple[int, bytes]] = []
+        with stage('scan'):
+            for product in read_dump(dump):
+                counts['read'] += 1
+                code = gtin(str(product.get('code') or ''))
+                if code is None or not (all_countries or is_vietnamese(product)):
+                    counts['skipped'] += 1
+                    continue
+                template = to_template(product)
+                if template is None:
+                    counts['skipped'] += 1
+                    continue
+                run.append((code, dumps_compact(template)))
+                if len(run) >= run_size:
+                    runs.append(spill(run, Path(tmp), len(runs)))
+                    run = []
+            if run:
+                runs.append(spill(run, Path(tmp), len(runs)))
+            del run
+
+        with stage('merge'):
+            counts.update(write_table(heapq.merge(*(read_run(path) for path in runs),
+                                                  key=lambda item: item[0]),
+                                      output, Path(tmp)))
+    for name, value in counts.items():
+        add_count(name, value)
+    return counts
+
+
+def write_table(items: Iterator[Tuple[int, bytes]], output: Path, tmp: Path) -> Dict[str, int]:
+    """
+    Write the table from (barcode, record) in barcode order. Keys and
+    offsets go to side files first so only the merge buffers are in memory
+    """
+    kept = duplicates = 0
+    previous = None
+    offset = 0
+    keys_path, offsets_path, records_path = tmp / 'keys', tmp / 'offsets', tmp / 'records'
+    with open(keys_path, 'wb') as keys, open(offsets_path, 'wb') as offsets, \
+            open(records_path, 'wb') as records:
+        for code, record in items:
+            if code == previous:
+                # First record per barcode wins
+                duplicates += 1
+                continue
+            previous = code
+            keys.write(struct.pack('<Q', code))
+            offsets.write(struct.pack('<Q', offset))
+            records.write(record)
+            offset += len(record)
+            kept += 1
+        offsets.write(struct.pack('<Q', offset))
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, kept, 0))
+        for part in (keys_path, offsets_path, records_path):
+            with open(part, 'rb') as source:
+                while chunk := source.read(1 << 20):
+                    f.write(chunk)
+    return {'kept': kept, 'duplicates': duplicates}
+
+
+class BarcodeIndex:
+    """Memory-mapped barcode table; lookup() is a binary search over the mapping"""
+
+    def __init__(self, path: Path = DEFAULT_OUTPUT):
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} barcode table")
+        view = memoryview(self._mmap)
+        keys_start = HEADER.size
+        offsets_start = keys_start + 8 * self.count
+        self._records_start = offsets_start + 8 * (self.count + 1)
+        self._view = view
+        self._keys = view[keys_start:offsets_start].cast('Q')
+        self._offsets = view[offsets_start:self._records_start].cast('Q')
+        self._codec = get_codec()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, barcode: str) -> bool:
+        return self.position(barcode) is not None
+
+    def position(self, barcode: str) -> Optional[int]:
+        code = gtin(barcode)
+        if code is None:
+            return None
+        index = bisect.bisect_left(self._keys, code)
+        if index < self.count and self._keys[index] == code:
+            return index
+        return None
+
+    def lookup(self, barcode: str) -> Optional[Dict[str, Any]]:
+        """Product template for a scanned barcode, None if unknown"""
+        index = self.position(barcode)
+        if index is None:
+            return None
+        start = self._records_start + self._offsets[index]
+        end = self._records_start + self._offsets[index + 1]
+        return self._codec.decode(self._mmap[start:end])
+
+    def close(self):
+        # Views must be released before the mapping can close
+        for name in ('_keys', '_offsets', '_view'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline barcode index from an Open Food Facts dump')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_cmd = commands.add_parser('build', help='Stream a dump into a barcode table')
+    build_cmd.add_argument('dump', type=Path, help='JSONL or TSV export, optionally .gz')
+    build_cmd.add_argument('-o', '--output', type=Path, default=DEFAULT_OUTPUT)
+    build_cmd.add_argument('--all-countries', action='store_true',
+                           help='Keep every product, not only the Vietnamese market')
+    build_cmd.add_argument('--run-size', type=int, default=RUN_SIZE,
+                           help='Records sorted in memory per run (bounds memory)')
+
+    lookup_cmd = commands.add_parser('lookup', help='Look barcodes up')
+    lookup_cmd.add_argument('table', type=Path)
+    lookup_cmd.add_argument('barcodes', nargs='+')
+
+    stats_cmd = commands.add_parser('stats', help='Show table size')
+    stats_cmd.add_argument('table', type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        counts = build(args.dump, args.output, args.all_countries, args.run_size)
+        print(f"📦 {counts['read']} products read from {args.dump}")
+        print(f"   ✅ kept: {counts['kept']}")
+        print(f"   ⏭️  skipped (market / no barcode / no name): {counts['skipped']}")
+        print(f"   🔁 duplicate barcodes: {counts['duplicates']}")
+        print(f"💾 {args.output} ({args.output.stat().st_size / 1024:.1f} KB)")
+
+    elif args.command == 'lookup':
+        with BarcodeIndex(args.table) as index:
+            missing = False
+            for barcode in args.barcodes:
+                product = index.lookup(barcode)
+                if product is None:
+                    print(f"❌ {barcode}: not found")
+                    missing = True
+                else:
+                    print(json.dumps(product, ensure_ascii=False, indent=2))
+        if missing:
+            sys.exit(1)
+
+    elif args.command == 'stats':
+        with BarcodeIndex(args.table) as index:
+            size = args.table.stat().st_size
+            print(f"📊 {args.table}: {len(index)} barcodes, {size / 1024:.1f} KB "
+                  f"({size / max(1, len(index)):.0f} bytes per product)")
+
+
+if __name__ == '__main__':
+    run_script('off_barcode_index', main)
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Icon Asset Optimizer for Fresh Keeper
+Lossless PNG recompression and SVG minification for the icon library
+
+The 3D PNGs and flat SVGs ship exactly as downloaded from Fluent Emoji.
+This stage:
+  - PNG: re-encodes the pixels with every PNG row filter (plus a
+    per-row adaptive choice) and several zlib settings, keeps the
+    smallest encoding and checks it decodes to identical pixels
+    (PNGs that aren't 8 bits per channel are left as they are)
+  - SVG: strips metadata/comments/editor attributes, collapses
+    whitespace and rounds coordinates, then rasterizes before/after and
+    checks the pixels still match (falls back to more precision if not)
+
+Files are processed over a process pool. Results are cached by content
+hash so already-optimized files are skipped on the next run. A file
+whose new encoding is bigger is left untouched and fails the run, as
+do worker errors and failed pixel-equivalence checks.
+
+Requires: pip install pillow numpy resvg-py
+
+Usage:
+  python3 scripts/optimize_icon_assets.py                 # optimize in place
+  python3 scripts/optimize_icon_assets.py --dry-run       # report only
+  python3 scripts/optimize_icon_assets.py --output /tmp/optimized
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import re
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from asset_cache import file_sha256, load_cache, save_cache
+from instrumentation import add_count, run_script, stage
+
+ICON_DIRS = [Path('assets/product_icons/flat'), Path('assets/product_icons/3d')]
+CACHE_PATH = Path('scripts/asset_optimize_cache.json')
+
+# zlib settings tried for every PNG filter choice
+ZLIB_LEVELS = (8, 9)
+ZLIB_STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED)
+
+# Ancillary chunks that change how pixels are displayed; everything else
+# (text, timestamps, pHYs) is dropped
+KEPT_PNG_CHUNKS = {b'gAMA', b'sRGB', b'cHRM', b'iCCP'}
+
+# Decimal places tried for SVG coordinates, smallest output first
+SVG_PRECISIONS = (2, 3, None)
+
+# Pixel-equivalence check for SVGs: both versions are rendered at
+# SVG_CHECK_SIZE; a pixel "differs" if any channel moves by more than
+# SVG_PIXEL_TOLERANCE, and at most SVG_MAX_DIFF_RATIO of pixels may
+# differ (anti-aliasing on hairline edges flips a handful of pixels)
+SVG_CHECK_SIZE = 128
+SVG_PIXEL_TOLERANCE = 16
+SVG_MAX_DIFF_RATIO = 0.0005
+
+SETTINGS_KEY = (f"png:{ZLIB_LEVELS}:{ZLIB_STRATEGIES};"
+                f"svg:{SVG_PRECISIONS}:{SVG_CHECK_SIZE}:{SVG_PIXEL_TOLERANCE}:{SVG_MAX_DIFF_RATIO}")
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Signature (8) + IHDR length/type (8) + width/height (8)
+PNG_BIT_DEPTH_OFFSET = 24
+
+# Pillow mode → (PNG color type, channels)
+PNG_COLOR_TYPES = {'L': (0, 1), 'RGB': (2, 3), 'LA': (4, 2), 'RGBA': (6, 4)}
+
+
+# ---------------------------------------------------------------------------
+# PNG
+# ---------------------------------------------------------------------------
+
+def read_png_chunks(data: bytes) -> List[tuple]:
+    """Split a PNG into (type, payload) chunks"""
+    chunks = []
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        length, = struct.unpack('>I', data[pos:pos + 4])
+        chunk_type = data[pos + 4:pos + 8]
+        chunks.append((chunk_type, data[pos + 8:pos + 8 + length]))
+        pos += 12 + length
+    return chunks
+
+
+def png_chunk(chunk_type: bytes, payload: bytes) -> bytes:
+    crc = zlib.crc32(chunk_type + payload) & 0xffffffff
+    return struct.pack('>I', len(payload)) + chunk_type + payload + struct.pack('>I', crc)
+
+
+def filter_rows(pixels, bpp: int) -> Dict[str, object]:
+    """
+    Apply every PNG filter to all rows at once (vectorized)
+    Returns filter name → uint8 array of shape (height, 1 + row_bytes)
+    with the filter type byte in column 0
+    """
+    import numpy as np
+
+    raw = pixels.reshape(pixels.shape[0], -1).astype(np.int16)
+    height = raw.shape[0]
+    left = np.zeros_like(raw)
+    left[:, bpp:] = raw[:, :-bpp]
+    up = np.zeros_like(raw)
+    up[1:] = raw[:-1]
+    up_left = np.zeros_like(raw)
+    up_left[1:, bpp:] = raw[:-1, :-bpp]
+
+    # Paeth predictor
+    p = left + up - up_left
+    pa = np.abs(p - left)
+    pb = np.abs(p - up)
+    pc = np.abs(p - up_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+
+    filtered = {
+        'none': raw,
+        'sub': raw - left,
+        'up': raw - up,
+        'average': raw - (left + up) // 2,
+        'paeth': raw - paeth,
+    }
+    rows = {}
+    for filter_type, (name, values) in enumerate(filtered.items()):
+        out = np.empty((height, raw.shape[1] + 1), dtype=np.uint8)
+        out[:, 0] = filter_type
+        out[:, 1:] = (values & 0xff).astype(np.uint8)
+        rows[name] = out
+
+    # Adaptive: per row, the filter with the smallest sum of |signed byte|
+    stacked = np.stack([rows[name] for name in filtered])
+    cost = np.abs(stacked[:, :, 1:].astype(np.int8).astype(np.int16)).sum(axis=2)
+    best = cost.argmin(axis=0)
+    rows['adaptive'] = stacked[best, np.arange(height)]
+    return rows
+
+
+def optimize_png(data: bytes) -> bytes:
+    """Smallest pixel-identical PNG encoding we can find"""
+    import numpy as np
+    from PIL import Image
+
+    # IHDR bit depth: Pillow decodes 16-bit RGB(A) as 8-bit, so re-encoding
+    # (and checking against) its pixels would silently drop precision
+    if data[PNG_BIT_DEPTH_OFFSET] != 8:
+        return data
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        mode = image.mode
+        reference = np.asarray(image.convert('RGBA'))
+        if mode not in PNG_COLOR_TYPES or image.info.get('transparency') is not None:
+            # Palette and tRNS images: let Pillow try, we don't re-filter them
+            out = io.BytesIO()
+            image.save(out, format='PNG', optimize=True)
+            check_png_pixels(out.getvalue(), reference)
+            return out.getvalue()
+        pixels = np.asarray(image)
+
+    # Lossless color reductions
+    if mode == 'RGBA' and (pixels[:, :, 3] == 255).all():
+        pixels, mode = pixels[:, :, :3], 'RGB'
+    if mode == 'RGB' and (pixels[:, :, 0] == pixels[:, :, 1]).all() \
+            and (pixels[:, :, 1] == pixels[:, :, 2]).all():
+        pixels, mode = pixels[:, :, 0], 'L'
+
+    color_type, channels = PNG_COLOR_TYPES[mode]
+    height, width = pixels.shape[:2]
+    kept = b''.join(png_chunk(t, p) for t, p in read_png_chunks(data) if t in KEPT_PNG_CHUNKS)
+    header = png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+
+    best = None
+    for rows in filter_rows(pixels.reshape(height, width, channels), channels).values():
+        raw = rows.tobytes()
+        for level in ZLIB_LEVELS:
+            for strategy in ZLIB_STRATEGIES:
+                compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+                idat = compressor.compress(raw) + compressor.flush()
+                if best is None or len(idat) < len(best):
+                    best = idat
+
+    encoded = (PNG_SIGNATURE + header + kept + png_chunk(b'IDAT', best)
+               + png_chunk(b'IEND', b''))
+
+    check_png_pixels(encoded, reference)
+    return encoded
+
+
+def check_png_pixels(encoded: bytes, reference):
+    """Pixel-equivalence check before we trust a new encoding"""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(io.BytesIO(encoded)) as check:
+        if not np.array_equal(np.asarray(check.convert('RGBA')), reference):
+            raise ValueError('re-encoded PNG does not match source pixels')
+
+
+# ---------------------------------------------------------------------------
+# SVG
+# ---------------------------------------------------------------------------
+
+# Attributes holding coordinates/lengths we may round
+GEOMETRY_ATTRS = {
+    'd', 'points', 'x', 'y', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'rx', 'ry',
+    'fx', 'fy', 'width', 'height', 'transform', 'gradientTransform',
+    'patternTransform', 'stroke-width', 'offset',
+}
+
+NUMBER_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+PATH_TOKEN_RE = re.compile(r'[MmZzLlHhVvCcSsQqTtAa]|-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+ATTR_RE = re.compile(r'([\w:-]+)="([^"]*)"')
+EDITOR_ATTR_RE = re.compile(r'\s(?:inkscape|sodipodi|sketch|xmlns:(?:inkscape|sodipodi|sketch))[\w:-]*="[^"]*"')
+STRIP_BLOCKS = [
+    re.compile(r'<\?xml.*?\?>', re.S),
+    re.compile(r'<!DOCTYPE.*?>', re.S),
+    re.compile(r'<!--.*?-->', re.S),
+    re.compile(r'<metadata\b.*?</metadata>', re.S),
+    re.compile(r'<(?:sodipodi|inkscape):[^>]*/>', re.S),
+]
+
+
+def format_number(value: float, precision: Optional[int]) -> str:
+    """Shortest text for a number: no trailing zeros, no leading zero"""
+    text = f'{value:.{precision}f}' if precision is not None else repr(value)
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    if text in ('-0', ''):
+        text = '0'
+    if text.startswith('0.'):
+        text = text[1:]
+    elif text.startswith('-0.'):
+        text = '-' + text[2:]
+    return text
+
+
+def minify_path(d: str, precision: Optional[int]) -> str:
+    """Re-serialize path data with minimal separators"""
+    out = []
+    previous = None
+    for token in PATH_TOKEN_RE.findall(d):
+        if token.isalpha():
+            out.append(token)
+            previous = None
+            continue
+        number = format_number(float(token), precision) if precision is not None else token
+        if previous is not None:
+            # A separator is only needed when the next number could be
+            # read as part of the previous one
+            needs_space = not (number.startswith('-')
+                               or (number.startswith('.') and '.' in previous))
+            if needs_space:
+                out.append(' ')
+        out.append(number)
+        previous = number
+    return ''.join(out)
+
+
+def minify_svg(text: str, precision: Optional[int]) -> str:
+    for pattern in STRIP_BLOCKS:
+        text = pattern.sub('', text)
+    text = EDITOR_ATTR_RE.sub('', text)
+
+    def shorten_attr(match):
+        name, value = match.group(1), match.group(2)
+        value = ' '.join(value.split())
+        if name == 'd':
+            # Arc flags may be written without separators ("011"), which
+            # the tokenizer can't split safely; leave those paths alone
+            if not re.search(r'[Aa]', value):
+                value = minify_path(value, precision)
+        elif name in GEOMETRY_ATTRS and precision is not None:
+            value = NUMBER_RE.sub(lambda m: format_number(float(m.group(0)), precision), value)
+        return f'{name}="{value}"'
+
+    text = ATTR_RE.sub(shorten_attr, text)
+    text = re.sub(r'>\s+<', '><', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*(/?>)', r'\1', text)
+    return text.strip()
+
+
+def render_svg(text: str, size: int):
+    import numpy as np
+    import resvg_py
+    from PIL import Image
+
+    png = resvg_py.svg_to_bytes(svg_string=text, width=size, height=size)
+    with Image.open(io.BytesIO(bytes(png))) as image:
+        return np.asarray(image.convert('RGBA')).astype(np.int16)
+
+
+def pixels_equivalent(a, b) -> bool:
+    differing = (abs(a - b).max(axis=2) > SVG_PIXEL_TOLERANCE).sum()
+    return differing <= SVG_MAX_DIFF_RATIO * a.shape[0] * a.shape[1]
+
+
+def optimize_svg(data: bytes) -> bytes:
+    """Smallest minified SVG that still renders the same pixels"""
+    original = data.decode('utf-8')
+    reference = render_svg(original, SVG_CHECK_SIZE)
+    for precision in SVG_PRECISIONS:
+        candidate = minify_svg(original, precision)
+        if pixels_equivalent(render_svg(candidate, SVG_CHECK_SIZE), reference):
+            return candidate.encode('utf-8')
+    raise ValueError('minified SVG does not render the same pixels at any precision')
+
+
+# ---------------------------------------------------------------------------
+# Stage
+# ---------------------------------------------------------------------------
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def optimize_file(path: str) -> Dict:
+    """Worker: optimize one file; 'after' is the new encoding's size, even if it grew"""
+    data = Path(path).read_bytes()
+    suffix = Path(path).suffix.lower()
+    if suffix == '.png':
+        optimized = optimize_png(data)
+    elif suffix == '.svg':
+        optimized = optimize_svg(data)
+    else:
+        optimized = data
+    return {'before': len(data), 'after': len(optimized), 'data': optimized}
+
+
+def optimize_assets(icon_dirs: List[Path] = ICON_DIRS,
+                    output_dir: Optional[Path] = None,
+                    cache_path: Path = CACHE_PATH,
+                    workers: Optional[int] = None,
+                    dry_run: bool = False) -> List[Dict]:
+    """Optimize every PNG/SVG; returns per-file results for the report"""
+    cache = load_cache(cache_path, {'settings': SETTINGS_KEY})
+    known = cache.setdefault('files', {})
+
+    jobs = []
+    results = []
+    for icon_dir in icon_dirs:
+        if not icon_dir.exists():
+            print(f"❌ Directory not found: {icon_dir}")
+            continue
+        for path in sorted(icon_dir.iterdir()):
+            if path.suffix.lower() not in ('.png', '.svg'):
+                continue
+            dest = output_dir / icon_dir.name / path.name if output_dir else path
+            source_hash = file_sha256(path)
+            entry = known.get(source_hash)
+            if entry and dest.exists() and sha256(dest.read_bytes()) == entry['output']:
+                results.append({'path': str(path), 'before': entry['before'],
+                                'after': entry['after'], 'cached': True})
+            else:
+                jobs.append((path, dest, source_hash))
+
+    print(f"🗜️  {len(results) + len(jobs)} assets, {len(results)} cached, {len(jobs)} to optimize")
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [(job, pool.submit(optimize_file, str(job[0]))) for job in jobs]
+            for (path, dest, source_hash), future in futures:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ Error optimizing {path}: {e}")
+                    results.append({'path': str(path), 'before': 0, 'after': 0, 'cached': False,
+                                    'error': str(e)})
+                    continue
+
+                output_hash = sha256(result['data'])
+                # A grown file is reported and fails the run; the source stays as it is
+                if not dry_run and result['after'] <= result['before']:
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    dest.write_bytes(result['data'])
+                    known[source_hash] = {'output': output_hash,
+                                          'before': result['before'], 'after': result['after']}
+                    # The optimized file is its own fixed point
+                    known[output_hash] = {'output': output_hash,
+                                          'before': result['before'], 'after': result['after']}
+                results.append({'path': str(path), 'before': result['before'],
+                                'after': result['after'], 'cached': False})
+
+    if not dry_run:
+        save_cache(cache_path, cache)
+    return sorted(results, key=lambda r: r['path'])
+
+
+def print_report(results: List[Dict], verbose: bool = False) -> bool:
+    """Print per-file and total savings; returns False if anything grew or failed"""
+    failed = [r for r in results if r.get('error')]
+    results = [r for r in results if not r.get('error')]
+    grown = [r for r in results if r['after'] > r['before']]
+    if verbose:
+        for r in results:
+            saved = r['before'] - r['after']
+            flag = ' (cached)' if r['cached'] else ''
+            print(f"   {r['path']:50} {r['before']:>7} → {r['after']:>7} "
+                  f"({saved:+d} B saved){flag}")
+
+    for kind in ('.png', '.svg'):
+        subset = [r for r in results if r['path'].endswith(kind)]
+        if not subset:
+            continue
+        before = sum(r['before'] for r in subset)
+        after = sum(r['after'] for r in subset)
+        print(f"   {kind[1:].upper()}: {len(subset)} files, {before / 1024:.1f} KB → "
+              f"{after / 1024:.1f} KB (saved {(before - after) / 1024:.1f} KB, "
+              f"{(before - after) / max(before, 1):.1%})")
+
+    before = sum(r['before'] for r in results)
+    after = sum(r['after'] for r in results)
+    print(f"   Total saved: {(before - after) / 1024:.1f} KB")
+
+    for r in grown:
+        print(f"❌ Asset grew: {r['path']} ({r['before']} → {r['after']} bytes)")
+    for r in failed:
+        print(f"❌ Failed: {r['path']} ({r['error']})")
+    return not grown and not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Losslessly optimize icon PNGs and SVGs')
+    parser.add_argument('--output', type=Path, default=None,
+                        help='Write optimized files here instead of in place')
+    parser.add_argument('--cache', type=Path, default=CACHE_PATH)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true', help='Report savings, write nothing')
+    parser.add_argument('--verbose', action='store_true', help='Print every file')
+    args = parser.parse_args()
+
+    print("🎨 Fresh Keeper Icon Asset Optimizer")
+    print("=" * 50)
+
+    with stage('optimize'):
+        results = optimize_assets(ICON_DIRS, args.output, args.cache, args.workers, args.dry_run)
+    add_count('files', len(results))
+    print("\n📊 Optimization report:")
+    if not print_report(results, args.verbose):
+        sys.exit(1)
+    print("\n✅ Done!")
+
+
+if __name__ == '__main__':
+    run_script('optimize_icon_assets', main)
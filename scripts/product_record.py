@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Compact Product Record for Fresh Keeper
+A __slots__ replacement for the product dicts of products_sample.json
+
+A product dict carries ~12 keys, a nutrition dict with 6 boxed numbers
+and several lists, most of them holding the same strings as thousands of
+other products. ProductRecord keeps:
+
+  - the top-level fields as slots (no per-instance __dict__)
+  - calories / protein / carbohydrates / fat / fiber / sugar in one
+    array('d'), plus a bitmask of which ones were JSON ints
+  - vitamins, minerals and any other nutrition keys in a sparse extras map
+  - aliases / health_benefits / health_warnings as tuples; repeated
+    strings are interned and repeated health-text tuples shared
+  - the original key order (one tuple shared by every record with the
+    same layout), so to_json() gives back exactly the dict it came from
+
+Keys it doesn't know, or values of an unexpected type, are carried in
+`extras` untouched, so from_json/to_json round-trips any product.
+
+Catalogs are read and written through catalog_codec, so msgspec/orjson
+are used when installed.
+
+Usage:
+  python3 scripts/product_record.py assets/data/products_sample.json   (round-trip check)
+  from product_record import load_catalog, dump_catalog
+  data = load_catalog('assets/data/products_sample.json')  # data['products']: [ProductRecord]
+  dump_catalog(data, 'out.json')                            # same bytes json.dump would write
+"""
+
+import json
+import math
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from catalog_codec import dump_json, load_json
+
+# Numeric nutrition values held in ProductRecord.nutrients, in this order
+NUTRIENT_FIELDS = ('calories', 'protein', 'carbohydrates', 'fat', 'fiber', 'sugar')
+
+# JSON key → slot for fields stored as-is (strings and ints)
+SCALAR_FIELDS = {
+    'id': ('id', str),
+    'name_vi': ('name_vi', str),
+    'name_en': ('name_en', str),
+    'category': ('category', str),
+    'shelf_life_refrigerated': ('shelf_life_refrigerated', int),
+    'shelf_life_frozen': ('shelf_life_frozen', int),
+    'storage_tips': ('storage_tips', str),
+    'iconId': ('icon_id', str),
+}
+
+# JSON key → slot for lists of strings, stored as tuples
+LIST_FIELDS = {
+    'aliases': 'aliases',
+    'health_benefits': 'health_benefits',
+    'health_warnings': 'health_warnings',
+}
+
+# Key order of the real catalogs; fields set later are emitted in this order
+STANDARD_LAYOUT = ('id', 'name_vi', 'name_en', 'aliases', 'category',
+                   'shelf_life_refrigerated', 'shelf_life_frozen', 'nutrition_data',
+                   'health_benefits', 'health_warnings', 'storage_tips', 'iconId')
+
+# Fields whose tuples repeat across products and are worth sharing
+SHARED_LIST_FIELDS = {'health_benefits', 'health_warnings'}
+
+# Shared immutable values: layouts, health text tuples. Aliases are mostly
+# unique per product and stay out, so the cache stays small
+_shared: Dict[Any, Any] = {}
+
+
+def share(value):
+    """One instance per distinct tuple, so equal tuples cost one object"""
+    return _shared.setdefault(value, value)
+
+
+def intern_strings(values: list, shared: bool = True) -> Optional[Tuple[str, ...]]:
+    """Tuple of interned strings (shared if asked), or None if values isn't a list of strings"""
+    if not all(type(v) is str for v in values):
+        return None
+    strings = tuple(sys.intern(v) for v in values)
+    return share(strings) if shared else strings
+
+
+def is_number(value) -> bool:
+    # NaN marks an absent value in the array, so non-finite floats stay verbatim
+    return type(value) is int or (type(value) is float and math.isfinite(value))
+
+
+@dataclass(slots=True)
+class ProductRecord:
+    """One catalog product; see the module docstring for the layout"""
+    id: Optional[str] = None
+    name_vi: Optional[str] = None
+    name_en: Optional[str] = None
+    category: Optional[str] = None
+    aliases: Optional[Tuple[str, ...]] = None
+    shelf_life_refrigerated: Optional[int] = None
+    shelf_life_frozen: Optional[int] = None
+    serving_size: Optional[str] = None
+    # NUTRIENT_FIELDS as floats, NaN where absent; None without nutrition_data
+    nutrients: Optional[array] = None
+    # Bit i set: NUTRIENT_FIELDS[i] was written as a JSON int
+    int_nutrients: int = 0
+    # Remaining nutrition_data keys (vitamins, minerals, ...)
+    nutrition_extras: Optional[Dict[str, Any]] = None
+    nutrition_layout: Optional[Tuple[str, ...]] = None
+    health_benefits: Optional[Tuple[str, ...]] = None
+    health_warnings: Optional[Tuple[str, ...]] = None
+    storage_tips: Optional[str] = None
+    icon_id: Optional[str] = None
+    # Unknown keys and values of unexpected types, kept verbatim
+    extras: Optional[Dict[str, Any]] = None
+    layout: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_json(cls, product: Dict[str, Any]) -> 'ProductRecord':
+        record = cls(layout=share(tuple(product)))
+        extras = {}
+        for key, value in product.items():
+            if key in SCALAR_FIELDS:
+                slot, kind = SCALAR_FIELDS[key]
+                if type(value) is kind:
+                    setattr(record, slot, sys.intern(value) if kind is str else value)
+                    continue
+            elif key in LIST_FIELDS:
+                if type(value) is list:
+                    strings = intern_strings(value, key in SHARED_LIST_FIELDS)
+                    if strings is not None:
+                        setattr(record, LIST_FIELDS[key], strings)
+                        continue
+            elif key == 'nutrition_data' and type(value) is dict:
+                record._set_nutrition(value)
+                continue
+            extras[key] = value
+        record.extras = extras or None
+        return record
+
+    def _set_nutrition(self, nutrition: Dict[str, Any]):
+        values = array('d', [math.nan] * len(NUTRIENT_FIELDS))
+        int_mask = 0
+        extras = {}
+        for key, value in nutrition.items():
+            if key in NUTRIENT_FIELDS and is_number(value):
+                index = NUTRIENT_FIELDS.index(key)
+                # Ints beyond 2**53 don't survive a float; keep them verbatim
+                if type(value) is int and abs(value) > 2 ** 53:
+                    extras[key] = value
+                    continue
+                values[index] = value
+                if type(value) is int:
+                    int_mask |= 1 << index
+            elif key == 'serving_size' and type(value) is str:
+                self.serving_size = sys.intern(value)
+            else:
+                extras[key] = value
+        self.nutrients = values
+        self.int_nutrients = int_mask
+        self.nutrition_extras = extras or None
+        self.nutrition_layout = share(tuple(nutrition))
+
+    def nutrient(self, name: str) -> Optional[float]:
+        """Numeric nutrition value by name, None if absent"""
+        if self.nutrients is None:
+            return None
+        index = NUTRIENT_FIELDS.index(name)
+        value = self.nutrients[index]
+        if math.isnan(value):
+            return None
+        return int(value) if self.int_nutrients >> index & 1 else value
+
+    def nutrition_json(self) -> Optional[Dict[str, Any]]:
+        if self.nutrients is None:
+            return None
+        nutrition = {}
+        for key in self.nutrition_layout:
+            if self.nutrition_extras and key in self.nutrition_extras:
+                nutrition[key] = self.nutrition_extras[key]
+            elif key == 'serving_size':
+                nutrition[key] = self.serving_size
+            else:
+                nutrition[key] = self.nutrient(key)
+        return nutrition
+
+    def _field(self, key: str):
+        if key in SCALAR_FIELDS:
+            return getattr(self, SCALAR_FIELDS[key][0])
+        if key in LIST_FIELDS:
+            value = getattr(self, LIST_FIELDS[key])
+            return None if value is None else list(value)
+        if key == 'nutrition_data':
+            return self.nutrition_json()
+        return None
+
+    def to_json(self) -> Dict[str, Any]:
+        """The product dict, in its original key order"""
+        product = {}
+        for key in self.layout:
+            value = self._field(key)
+            if value is None and self.extras and key in self.extras:
+                value = self.extras[key]
+            product[key] = value
+        # Fields set after loading (e.g. iconId from the mapper)
+        for key in STANDARD_LAYOUT:
+            if key not in product:
+                value = self._field(key)
+                if value is not None:
+                    product[key] = value
+        if self.extras:
+            for key, value in self.extras.items():
+                product.setdefault(key, value)
+        return product
+
+
+def is_product(obj: Dict[str, Any]) -> bool:
+    return 'id' in obj and 'name_vi' in obj and 'category' in obj
+
+
+def load_catalog(path, backend: Optional[str] = None) -> Dict[str, Any]:
+    """Like json.load, with data['products'] as ProductRecords"""
+    data = load_json(path, backend)
+    products = data.get('products') if type(data) is dict else None
+    if type(products) is list:
+        # In place, so each dict is freed as soon as its record exists
+        for index, product in enumerate(products):
+            if type(product) is dict and is_product(product):
+                products[index] = ProductRecord.from_json(product)
+    return data
+
+
+def encode_record(value):
+    if isinstance(value, ProductRecord):
+        return value.to_json()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dump_catalog(data: Dict[str, Any], path, backend: Optional[str] = None):
+    """
+    Same bytes as json.dump(..., ensure_ascii=False, indent=2); records are
+    turned back into dicts a chunk at a time while writing
+    """
+    dump_json(data, path, backend, default=encode_record)
+
+
+def main():
+    """Check that catalogs round-trip through ProductRecord byte for byte"""
+    for arg in sys.argv[1:]:
+        path = Path(arg)
+        with open(path, 'r', encoding='utf-8') as f:
+            expected = json.dumps(json.load(f), ensure_ascii=False, indent=2)
+        data = load_catalog(path)
+        actual = json.dumps(data, ensure_ascii=False, indent=2, default=encode_record)
+        same = actual == expected
+        print(f"{'✅' if same else '❌'} {path}: {len(data['products'])} products round-trip "
+              f"{'losslessly' if same else 'with differences'}")
+
+
+if __name__ == '__main__':
+    main()
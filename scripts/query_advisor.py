@@ -0,0 +1,730 @@
+#!/usr/bin/env python3
+"""
+SQLite Query Advisor for Fresh Keeper
+Extracts the sqflite calls in lib/, turns them into SQL and proposes
+indexes from EXPLAIN QUERY PLAN on the reconstructed schema
+
+Extraction reads every db.query / rawQuery / update / delete call (and
+batch.* inside loops) from the Dart sources. Table names and limits are
+resolved through AppConstants, adjacent string literals are joined, and
+the enclosing Class.method is recorded for each call site.
+
+The advisor loads each call's SQL into the sqlite_harness database
+(schema version 16, synthetic inventory) and flags:
+
+  - full scans of tables with at least --min-rows rows
+  - temp B-tree sorts for ORDER BY / GROUP BY
+  - partial index use, where the chosen index covers fewer WHERE columns
+    than the query filters on
+
+For flagged queries it proposes one composite index each: equality
+columns first, then ORDER BY / GROUP BY columns, then one range column.
+Aggregates that read few columns get the rest appended so the index
+covers them. Proposals that are a prefix of another are merged. It then
+creates the indexes and times every call site before and after, along
+with index build time, database growth and the cost of inserting
+INSERT_ROWS rows.
+
+Usage:
+  python3 scripts/query_advisor.py extract
+  python3 scripts/query_advisor.py advise --rows 100000
+  python3 scripts/query_advisor.py advise --rows 1000000 --json /tmp/advice.json --sql /tmp/indexes.sql
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from catalog_codec import load_json
+from instrumentation import add_count, run_script, stage
+from sqlite_harness import (APP_QUERIES, DEFAULT_CATALOG, REPEAT, SEED, build_database, explain, time_batch,
+                            time_query)
+
+DEFAULT_LIB = Path('lib')
+CONSTANTS_FILE = Path('config') / 'constants.dart'
+
+# sqflite calls that take a table or SQL first
+CALL_RE = re.compile(r'\b(\w+)\s*\??\.\s*(query|rawQuery|update|rawUpdate|delete|rawDelete)\s*\(')
+CLASS_RE = re.compile(r'^(?:abstract\s+)?class\s+(\w+)', re.MULTILINE)
+METHOD_RE = re.compile(r'^  (?:static\s+)?(?:Future<.*?>|[A-Za-z_][\w<>?,. ]*?)\s+(_?[A-Za-z]\w*)\s*\([^;]*?$',
+                       re.MULTILINE)
+CONSTANT_RE = re.compile(r'static\s+const\s+(?:String|int|double)\s+(\w+)\s*=\s*(.+?);', re.DOTALL)
+KEYWORDS = {'if', 'for', 'while', 'switch', 'return', 'await', 'catch', 'final', 'var', 'const', 'else'}
+
+SQL_RE = {
+    'select': re.compile(r'^SELECT\s+(?P<distinct>DISTINCT\s+)?(?P<columns>.+?)\s+FROM\s+(?P<table>\w+)'
+                         r'(?:\s+WHERE\s+(?P<where>.+?))?(?:\s+GROUP\s+BY\s+(?P<group_by>.+?))?'
+                         r'(?:\s+HAVING\s+(?P<having>.+?))?(?:\s+ORDER\s+BY\s+(?P<order_by>.+?))?'
+                         r'(?:\s+LIMIT\s+(?P<limit>\S+))?(?:\s+OFFSET\s+\S+)?$', re.IGNORECASE | re.DOTALL),
+    'update': re.compile(r'^UPDATE\s+(?P<table>\w+)\s+SET\s+(?P<set>.+?)(?:\s+WHERE\s+(?P<where>.+))?$',
+                         re.IGNORECASE | re.DOTALL),
+    'delete': re.compile(r'^DELETE\s+FROM\s+(?P<table>\w+)(?:\s+WHERE\s+(?P<where>.+))?$',
+                         re.IGNORECASE | re.DOTALL),
+}
+PREDICATE_RE = re.compile(r'^(\w+)\s*(=|==|>=|<=|>|<|IS)\s*(\?|\'[^\']*\'|-?\d+(?:\.\d+)?)$', re.IGNORECASE)
+PLAN_COLUMNS_RE = re.compile(r'(\w+)\s*(?:=|>|<|>=|<=)\s*\?')
+IDENTIFIER_RE = re.compile(r'[A-Za-z_]\w*')
+
+# Tables smaller than this scan faster than an index pays for itself
+MIN_ROWS = 1_000
+
+# Columns at most in a proposed covering index
+MAX_INDEX_COLUMNS = 5
+
+# Rows inserted to measure the write cost of the proposed indexes
+INSERT_ROWS = 1_000
+
+
+class Unresolved:
+    """A Dart expression whose value isn't known statically"""
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def __repr__(self):
+        return f"<{self.source}>"
+
+
+# ==================== DART PARSING ====================
+
+def skip_string(text: str, i: int) -> int:
+    """Index just past the Dart string literal starting at i (r prefix, ', ", ''' or \"\"\")"""
+    raw = text[i] == 'r'
+    if raw:
+        i += 1
+    quote = text[i:i + 3] if text[i:i + 3] in ("'''", '"""') else text[i]
+    i += len(quote)
+    while i < len(text):
+        if not raw and text[i] == '\\':
+            i += 2
+            continue
+        if not raw and text.startswith('${', i):
+            i = skip_balanced(text, i + 1)
+            continue
+        if text.startswith(quote, i):
+            return i + len(quote)
+        i += 1
+    return i
+
+
+def skip_balanced(text: str, i: int) -> int:
+    """Index just past the bracket group opening at i, skipping strings and comments"""
+    closing = {'(': ')', '[': ']', '{': '}'}
+    stack = [closing[text[i]]]
+    i += 1
+    while i < len(text) and stack:
+        char = text[i]
+        if char in "'\"" or (char == 'r' and text[i + 1:i + 2] in ("'", '"') and not text[i - 1].isalnum()):
+            i = skip_string(text, i)
+            continue
+        if text.startswith('//', i):
+            i = text.find('\n', i)
+            i = len(text) if i < 0 else i
+            continue
+        if char in closing:
+            stack.append(closing[char])
+        elif char == stack[-1]:
+            stack.pop()
+        i += 1
+    return i
+
+
+def split_arguments(text: str) -> List[str]:
+    """Top-level comma-separated parts of an argument list (without the parentheses)"""
+    parts, start, i = [], 0, 0
+    while i < len(text):
+        char = text[i]
+        if char in "'\"" or (char == 'r' and text[i + 1:i + 2] in ("'", '"') and (i == 0 or not text[i - 1].isalnum())):
+            i = skip_string(text, i)
+            continue
+        if char in '([{':
+            i = skip_balanced(text, i)
+            continue
+        if text.startswith('//', i):
+            end = text.find('\n', i)
+            text = text[:i] + text[end if end >= 0 else len(text):]
+            continue
+        if char == ',':
+            parts.append(text[start:i].strip())
+            start = i + 1
+        i += 1
+    parts.append(text[start:].strip())
+    return [part for part in parts if part]
+
+
+def string_value(literal: str, constants: Dict[str, Any]) -> Any:
+    """The value of one Dart string literal, resolving ${AppConstants.x} interpolation"""
+    raw = literal.startswith('r')
+    body = literal[1:] if raw else literal
+    quote = body[:3] if body[:3] in ("'''", '"""') else body[0]
+    body = body[len(quote):-len(quote)]
+    if raw:
+        return body
+
+    out, i = [], 0
+    while i < len(body):
+        char = body[i]
+        if char == '\\' and i + 1 < len(body):
+            out.append({'n': '\n', 't': '\t'}.get(body[i + 1], body[i + 1]))
+            i += 2
+        elif body.startswith('${', i):
+            end = skip_balanced(body, i + 1)
+            value = expression_value(body[i + 2:end - 1].strip(), constants)
+            if isinstance(value, Unresolved):
+                return Unresolved(literal)
+            out.append(str(value))
+            i = end
+        elif char == '$' and i + 1 < len(body) and (body[i + 1].isalpha() or body[i + 1] == '_'):
+            return Unresolved(literal)
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out)
+
+
+def expression_value(expression: str, constants: Dict[str, Any]) -> Any:
+    """Statically evaluate the Dart expressions sqflite calls use; Unresolved otherwise"""
+    expression = expression.strip()
+    if not expression:
+        return Unresolved(expression)
+
+    # Adjacent string literals concatenate
+    if expression[0] in "'\"" or (expression[0] == 'r' and expression[1:2] in ("'", '"')):
+        pieces, i = [], 0
+        while i < len(expression):
+            if expression[i].isspace():
+                i += 1
+                continue
+            if expression[i] not in "'\"r":
+                return Unresolved(expression)
+            end = skip_string(expression, i)
+            pieces.append(string_value(expression[i:end], constants))
+            i = end
+        if any(isinstance(piece, Unresolved) for piece in pieces):
+            return Unresolved(expression)
+        return ''.join(pieces)
+
+    if expression[0] == '[' and expression.endswith(']'):
+        return [expression_value(item, constants) for item in split_arguments(expression[1:-1])]
+    if expression[0] == '{' and expression.endswith('}'):
+        entries = {}
+        for entry in split_arguments(expression[1:-1]):
+            key = expression_value(split_arguments(entry.replace(':', ',', 1))[0], constants)
+            entries[key if not isinstance(key, Unresolved) else key.source] = Unresolved(entry)
+        return entries
+    if re.fullmatch(r'-?\d+', expression):
+        return int(expression)
+    if re.fullmatch(r'-?\d+\.\d+', expression):
+        return float(expression)
+    if expression in ('true', 'false'):
+        return expression == 'true'
+    match = re.fullmatch(r'AppConstants\.(\w+)', expression)
+    if match and match.group(1) in constants:
+        return constants[match.group(1)]
+    return Unresolved(expression)
+
+
+def load_constants(lib: Path) -> Dict[str, Any]:
+    """AppConstants string / number constants"""
+    path = lib / CONSTANTS_FILE
+    if not path.exists():
+        return {}
+    constants: Dict[str, Any] = {}
+    for name, expression in CONSTANT_RE.findall(path.read_text(encoding='utf-8')):
+        value = expression_value(expression, constants)
+        if not isinstance(value, Unresolved):
+            constants[name] = value
+    return constants
+
+
+@dataclass
+class CallSite:
+    """One sqflite call, with the SQL it runs"""
+    owner: str
+    file: str
+    line: int
+    call: str
+    batch: bool
+    table: Optional[str] = None
+    kind: str = 'select'
+    columns: Optional[str] = None
+    where: Optional[str] = None
+    group_by: Optional[str] = None
+    order_by: Optional[str] = None
+    limit: Optional[int] = None
+    set_columns: Optional[List[str]] = None
+    args: List[Any] = field(default_factory=list)
+    sql: Optional[str] = None
+    unresolved: Optional[str] = None
+
+
+def enclosing(pattern: re.Pattern, text: str, offset: int) -> Optional[str]:
+    name = None
+    for match in pattern.finditer(text, 0, offset):
+        if match.group(1) not in KEYWORDS:
+            name = match.group(1)
+    return name
+
+
+def build_sql(site: CallSite):
+    """Render the SQL sqflite builds for query / update / delete"""
+    where = f" WHERE {site.where}" if site.where else ''
+    if site.kind == 'select':
+        site.sql = (f"SELECT {site.columns or '*'} FROM {site.table}{where}"
+                    + (f" GROUP BY {site.group_by}" if site.group_by else '')
+                    + (f" ORDER BY {site.order_by}" if site.order_by else '')
+                    + (f" LIMIT {site.limit}" if site.limit is not None else ''))
+    elif site.kind == 'update':
+        # Whole-row updates get the table's columns from complete_sql()
+        assignments = ', '.join(f"{column} = ?" for column in site.set_columns) \
+            if site.set_columns is not None else '<every column> = ?'
+        site.sql = f"UPDATE {site.table} SET {assignments}{where}"
+    else:
+        site.sql = f"DELETE FROM {site.table}{where}"
+
+
+def parse_raw_sql(site: CallSite, sql: str):
+    """Fill a call site's clauses from a rawQuery / rawUpdate / rawDelete string"""
+    sql = ' '.join(sql.split())
+    site.sql = sql
+    for kind, pattern in SQL_RE.items():
+        match = pattern.match(sql)
+        if match:
+            site.kind = kind
+            parts = match.groupdict()
+            site.table = parts['table']
+            site.where = parts.get('where')
+            site.columns = parts.get('columns')
+            site.group_by = parts.get('group_by')
+            site.order_by = parts.get('order_by')
+            limit = parts.get('limit')
+            site.limit = int(limit) if limit and limit.isdigit() else None
+            if kind == 'update':
+                site.set_columns = [part.split('=')[0].strip() for part in split_arguments(parts['set'])]
+            return
+    site.unresolved = 'unsupported SQL'
+
+
+def extract_calls(text: str, path: str, constants: Dict[str, Any]) -> List[CallSite]:
+    sites = []
+    for match in CALL_RE.finditer(text):
+        receiver, method = match.groups()
+        open_paren = match.end() - 1
+        close_paren = skip_balanced(text, open_paren)
+        arguments = split_arguments(text[open_paren + 1:close_paren - 1])
+        if not arguments:
+            continue
+        positional = [arg for arg in arguments if not re.match(r'^\w+\s*:', arg)]
+        named = {m.group(1): m.group(2) for m in (re.match(r'^(\w+)\s*:\s*(.*)$', arg, re.DOTALL)
+                                                  for arg in arguments) if m}
+        first = expression_value(positional[0], constants) if positional else Unresolved('')
+        if isinstance(first, Unresolved) and not method.startswith('raw'):
+            # Not a sqflite table call (e.g. currentUser?.delete())
+            continue
+
+        cls = enclosing(CLASS_RE, text, match.start())
+        function = enclosing(METHOD_RE, text, match.start())
+        site = CallSite(owner=f"{cls}.{function}" if cls else str(function), file=path,
+                        line=text.count('\n', 0, match.start()) + 1, call=f"{receiver}.{method}",
+                        batch=receiver == 'batch')
+
+        if method.startswith('raw'):
+            args = expression_value(positional[1], constants) if len(positional) > 1 else []
+            site.args = args if isinstance(args, list) else []
+            if isinstance(first, Unresolved):
+                site.unresolved = f"SQL built at runtime: {first.source[:60]}"
+            else:
+                parse_raw_sql(site, first)
+        else:
+            site.table = first
+            site.kind = {'query': 'select', 'update': 'update', 'delete': 'delete'}[method]
+            values = {key: expression_value(value, constants) for key, value in named.items()}
+            resolved = {key: value for key, value in values.items() if not isinstance(value, Unresolved)}
+            for clause in ('where', 'groupBy', 'orderBy'):
+                if clause in named and clause not in resolved:
+                    site.unresolved = f"{clause} built at runtime: {named[clause][:60]}"
+            site.where = resolved.get('where')
+            site.group_by = resolved.get('groupBy')
+            site.order_by = resolved.get('orderBy')
+            site.limit = resolved.get('limit')
+            if isinstance(values.get('columns'), list):
+                site.columns = ', '.join(str(column) for column in values['columns'])
+            where_args = values.get('whereArgs', [])
+            site.args = where_args if isinstance(where_args, list) else []
+            if site.kind == 'update':
+                assignments = expression_value(positional[1], constants) if len(positional) > 1 else None
+                # A literal map names its columns; toMap() / toJson() rewrite the whole row
+                site.set_columns = list(assignments) if isinstance(assignments, dict) else None
+                if isinstance(assignments, dict):
+                    site.args = [Unresolved(key) for key in assignments] + site.args
+            if not site.unresolved:
+                build_sql(site)
+        sites.append(site)
+    return sites
+
+
+def extract(lib: Path = DEFAULT_LIB) -> List[CallSite]:
+    """Every sqflite call site under lib"""
+    constants = load_constants(lib)
+    sites = []
+    for path in sorted(lib.rglob('*.dart')):
+        text = path.read_text(encoding='utf-8')
+        if not CALL_RE.search(text):
+            continue
+        sites.extend(extract_calls(text, str(path), constants))
+    add_count('call_sites', len(sites))
+    return sites
+
+
+# ==================== ADVISOR ====================
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def existing_indexes(conn: sqlite3.Connection, table: str) -> Dict[str, List[str]]:
+    indexes = {}
+    for row in conn.execute(f"PRAGMA index_list({table})"):
+        indexes[row[1]] = [info[2] for info in conn.execute(f"PRAGMA index_info({row[1]})")]
+    return indexes
+
+
+def complete_sql(site: CallSite, conn: sqlite3.Connection) -> Optional[str]:
+    """The call's SQL, with whole-row updates expanded to the table's columns"""
+    if site.sql and site.kind == 'update' and site.set_columns is None:
+        columns = [column for column in table_columns(conn, site.table) if column != 'id']
+        site.set_columns = columns
+        site.args = [Unresolved(column) for column in columns] + list(site.args)
+        build_sql(site)
+    return site.sql
+
+
+def split_conjuncts(where: Optional[str]) -> List[str]:
+    """Top-level AND terms of a WHERE clause"""
+    if not where:
+        return []
+    terms, depth, start = [], 0, 0
+    upper = where.upper()
+    i = 0
+    while i < len(where):
+        char = where[i]
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == "'":
+            i = where.find("'", i + 1)
+        elif depth == 0 and upper.startswith(' AND ', i):
+            terms.append(where[start:i].strip())
+            start = i + 5
+            i += 4
+        i += 1
+    terms.append(where[start:].strip())
+    return terms
+
+
+def classify_where(where: Optional[str]) -> Tuple[List[str], List[str], List[str]]:
+    """(equality columns, range columns, other terms) of a WHERE clause"""
+    equality, ranges, other = [], [], []
+    for term in split_conjuncts(where):
+        match = PREDICATE_RE.match(term)
+        if not match:
+            other.append(term)
+        elif match.group(2) in ('=', '==', 'IS', 'is'):
+            equality.append(match.group(1))
+        else:
+            ranges.append(match.group(1))
+    return equality, ranges, other
+
+
+def order_columns(clause: Optional[str]) -> List[Tuple[str, str]]:
+    columns = []
+    for item in split_arguments(clause or ''):
+        parts = item.split()
+        columns.append((parts[0], parts[1].upper() if len(parts) > 1 else 'ASC'))
+    return columns
+
+
+def plan_columns(plan: List[str]) -> List[str]:
+    """Columns the chosen indexes constrain, from 'USING INDEX x (a=? AND b>?)'"""
+    columns = []
+    for step in plan:
+        if ' USING ' in step and '(' in step and 'rowid' not in step:
+            columns += PLAN_COLUMNS_RE.findall(step[step.rindex('('):])
+    return columns
+
+
+def candidate_index(site: CallSite, table_cols: List[str], distinct: Dict[str, int]) -> List[str]:
+    """Equality, then sort / group, then one range column; covering for narrow selects"""
+    equality, ranges, other = classify_where(site.where)
+    # Low-cardinality columns first, so related queries share a prefix
+    columns = sorted(dict.fromkeys(equality), key=lambda column: (distinct.get(column, 0), column))
+    ordering = order_columns(site.group_by) or order_columns(site.order_by)
+    directions = {direction for _, direction in ordering}
+    for column, direction in ordering:
+        if column in table_cols and column not in columns:
+            columns.append(f"{column} {direction}" if len(directions) > 1 else column)
+    for column in ranges:
+        if column not in columns:
+            columns.append(column)
+            break
+
+    if site.kind == 'select' and site.columns and site.columns.strip() != '*':
+        referenced = IDENTIFIER_RE.findall(' '.join([site.columns, *other]))
+        missing = [column for column in dict.fromkeys(referenced) if column in table_cols and column not in columns]
+        if missing and len(columns) + len(missing) <= MAX_INDEX_COLUMNS:
+            columns += missing
+    return columns
+
+
+def index_name(table: str, columns: List[str]) -> str:
+    return f"idx_{table}_{'_'.join(column.split()[0] for column in columns)}"
+
+
+def is_prefix(short: List[str], long: List[str]) -> bool:
+    return len(short) <= len(long) and long[:len(short)] == short
+
+
+def sample_params(site: CallSite, conn: sqlite3.Connection, today: date) -> List[Any]:
+    """Arguments for one run: the harness's for the same method, else literals and sampled values"""
+    placeholders = site.sql.count('?')
+    for query in APP_QUERIES:
+        if query.source == site.owner and query.sql.count('?') == placeholders:
+            params = query.params(today, conn)
+            return list(params[0]) if query.batch and params else list(params)
+
+    params = []
+    columns = re.findall(r'(\w+)\s*(?:=|==|>=|<=|>|<|LIKE)\s*\?', site.sql, re.IGNORECASE)
+    args = list(site.args) + [Unresolved('')] * (placeholders - len(site.args))
+    for column, arg in zip(columns, args):
+        if not isinstance(arg, Unresolved):
+            params.append(arg)
+            continue
+        count = conn.execute(f"SELECT COUNT(*) FROM {site.table}").fetchone()[0]
+        row = conn.execute(f"SELECT {column} FROM {site.table} WHERE {column} IS NOT NULL LIMIT 1 OFFSET ?",
+                           [count // 2]).fetchone()
+        value = row[0] if row else None
+        if re.search(rf'{column}\s+LIKE\s+\?', site.sql, re.IGNORECASE) and isinstance(value, str):
+            value = f"%{value[:3]}%"
+        params.append(value)
+    return params + [None] * (placeholders - len(params))
+
+
+def measure(conn: sqlite3.Connection, site: CallSite, params: List[Any], repeat: int) -> Dict[str, Any]:
+    if site.kind == 'select':
+        seconds, rows = time_query(conn, site.sql, params, repeat)
+    else:
+        seconds, rows = time_batch(conn, site.sql, [params], repeat)
+    return {'seconds': seconds, 'rows': rows, **explain(conn, site.sql, params)}
+
+
+def insert_cost(conn: sqlite3.Connection, repeat: int) -> float:
+    """Seconds to insert INSERT_ROWS user products (rolled back)"""
+    columns = table_columns(conn, 'user_products')
+    copied = ', '.join("lower(hex(randomblob(16)))" if column == 'id' else column for column in columns)
+    sql = f"INSERT INTO user_products SELECT {copied} FROM user_products LIMIT {INSERT_ROWS}"
+    return time_batch(conn, sql, [()], repeat)[0]
+
+
+def database_bytes(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA page_count').fetchone()[0] * conn.execute('PRAGMA page_size').fetchone()[0]
+
+
+def advise(conn: sqlite3.Connection, sites: List[CallSite], today: date, repeat: int = REPEAT,
+           min_rows: int = MIN_ROWS, apply: bool = True) -> Dict[str, Any]:
+    """Flag each call site's plan, propose indexes, and time before / after creating them"""
+    analyzed, skipped = [], []
+    with stage('before'):
+        for site in sites:
+            if site.unresolved or not complete_sql(site, conn):
+                skipped.append({'owner': site.owner, 'file': site.file, 'line': site.line,
+                                'reason': site.unresolved or 'no SQL'})
+                continue
+            params = sample_params(site, conn, today)
+            result = measure(conn, site, params, repeat)
+            equality, ranges, _ = classify_where(site.where)
+            used = plan_columns(result['plan'])
+            result['partial_index'] = bool(result['index_used']) and bool(
+                [column for column in equality + ranges[:1] if column not in used])
+            analyzed.append((site, params, result))
+
+    proposals: List[Dict[str, Any]] = []
+    notes = {}
+    cache: Dict[str, Tuple[int, List[str], Dict[str, int], Dict[str, List[str]]]] = {}
+    for site, _, result in analyzed:
+        if not (result['full_scan'] or result['temp_sort'] or result['partial_index']):
+            continue
+        if site.table not in cache:
+            cols = table_columns(conn, site.table)
+            rows = conn.execute(f"SELECT COUNT(*) FROM {site.table}").fetchone()[0]
+            distinct = {column: conn.execute(f"SELECT COUNT(DISTINCT {column}) FROM {site.table}").fetchone()[0]
+                        for column in cols}
+            cache[site.table] = (rows, cols, distinct, existing_indexes(conn, site.table))
+        rows, cols, distinct, indexes = cache[site.table]
+        if rows < min_rows:
+            notes[site.owner] = f"{site.table} has {rows} rows: a scan is cheaper than an index"
+            continue
+        columns = candidate_index(site, cols, distinct)
+        if not columns:
+            if any('LIKE' in term.upper() for term in classify_where(site.where)[2]):
+                notes[site.owner] = "leading-wildcard LIKE can't use a B-tree index (needs FTS)"
+            else:
+                notes[site.owner] = 'nothing indexable in WHERE / ORDER BY'
+            continue
+        if any(is_prefix(columns, existing) for existing in indexes.values()):
+            notes[site.owner] = 'an existing index already matches; the planner prefers another'
+            continue
+        proposals.append({'table': site.table, 'columns': columns, 'serves': [site.owner]})
+
+    # Longest first; a proposal that is a prefix of a longer one is served by it
+    merged: List[Dict[str, Any]] = []
+    for proposal in sorted(proposals, key=lambda p: -len(p['columns'])):
+        for kept in merged:
+            if kept['table'] == proposal['table'] and is_prefix(proposal['columns'], kept['columns']):
+                kept['serves'] += [owner for owner in proposal['serves'] if owner not in kept['serves']]
+                break
+        else:
+            merged.append(dict(proposal))
+    superseded = set()
+    for proposal in merged:
+        proposal['name'] = index_name(proposal['table'], proposal['columns'])
+        proposal['ddl'] = (f"CREATE INDEX IF NOT EXISTS {proposal['name']} "
+                           f"ON {proposal['table']}({', '.join(proposal['columns'])})")
+        # Existing indexes that are a prefix of the proposal, reported once
+        proposal['redundant'] = sorted(name for name, existing in existing_indexes(conn, proposal['table']).items()
+                                       if not name.startswith('sqlite_autoindex') and name not in superseded
+                                       and is_prefix(existing, proposal['columns']))
+        superseded.update(proposal['redundant'])
+
+    report: Dict[str, Any] = {'proposals': merged, 'notes': notes, 'skipped': skipped,
+                              'size_before': database_bytes(conn), 'insert_before': insert_cost(conn, repeat)}
+    add_count('proposals', len(merged))
+
+    if apply and merged:
+        with stage('create_indexes'):
+            for proposal in merged:
+                start = time.perf_counter()
+                with conn:
+                    conn.execute(proposal['ddl'])
+                proposal['build_seconds'] = time.perf_counter() - start
+        report['size_after'] = database_bytes(conn)
+        report['insert_after'] = insert_cost(conn, repeat)
+
+    report['sites'] = []
+    with stage('after'):
+        for site, params, before in analyzed:
+            entry = {'owner': site.owner, 'file': site.file, 'line': site.line, 'call': site.call,
+                     'batch': site.batch, 'sql': site.sql, 'before': before}
+            if apply and merged:
+                entry['after'] = measure(conn, site, params, repeat)
+            report['sites'].append(entry)
+    return report
+
+
+# ==================== OUTPUT ====================
+
+def flags(result: Dict[str, Any]) -> str:
+    marks = [name for key, name in (('full_scan', 'scan'), ('temp_sort', 'sort'), ('partial_index', 'partial'))
+             if result.get(key)]
+    return ','.join(marks) or '-'
+
+
+def print_report(report: Dict[str, Any], rows: int):
+    print(f"\n📊 {len(report['sites'])} call sites on {rows:,} user products")
+    print(f"   {'call site':<48} {'before':>9} {'after':>9}  flags before → after")
+    for entry in report['sites']:
+        before, after = entry['before'], entry.get('after')
+        after_ms = f"{after['seconds'] * 1000:>9.2f}" if after else f"{'':>9}"
+        print(f"   {entry['owner'][:48]:<48} {before['seconds'] * 1000:>9.2f} {after_ms}"
+              f"  {flags(before)} → {flags(after) if after else '?'}")
+
+    if report['proposals']:
+        print('\n💡 Proposed indexes:')
+        for proposal in report['proposals']:
+            built = f" ({proposal['build_seconds'] * 1000:.0f} ms)" if 'build_seconds' in proposal else ''
+            print(f"   {proposal['ddl']};{built}")
+            print(f"      serves: {', '.join(proposal['serves'])}")
+            if proposal['redundant']:
+                print(f"      makes redundant: {', '.join(proposal['redundant'])}")
+    else:
+        print('\n✅ No index proposals')
+
+    for owner, note in report['notes'].items():
+        print(f"   ℹ️  {owner}: {note}")
+    for entry in report['skipped']:
+        print(f"   ⏭️  {entry['owner']} ({entry['file']}:{entry['line']}): {entry['reason']}")
+
+    if 'size_after' in report:
+        growth = (report['size_after'] - report['size_before']) / 1024 / 1024
+        print(f"\n💾 Database +{growth:.1f} MB; inserting {INSERT_ROWS} rows "
+              f"{report['insert_before'] * 1000:.1f} ms → {report['insert_after'] * 1000:.1f} ms")
+
+
+def write_sql(report: Dict[str, Any], path: Path):
+    lines = ['-- Proposed by scripts/query_advisor.py']
+    for proposal in report['proposals']:
+        lines.append(f"-- serves {', '.join(proposal['serves'])}")
+        lines.append(f"{proposal['ddl']};")
+        lines += [f"-- DROP INDEX IF EXISTS {name};  -- prefix of {proposal['name']}" for name in proposal['redundant']]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the app's SQLite queries and propose indexes")
+    parser.add_argument('--lib', type=Path, default=DEFAULT_LIB, help='Dart sources to scan')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    extract_cmd = commands.add_parser('extract', help='List every sqflite call site and its SQL')
+    extract_cmd.add_argument('--json', type=Path, default=None)
+
+    advise_cmd = commands.add_parser('advise', help='EXPLAIN every call site and measure proposed indexes')
+    advise_cmd.add_argument('--rows', type=int, default=100_000, help='Synthetic user products')
+    advise_cmd.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG)
+    advise_cmd.add_argument('--seed', type=int, default=SEED)
+    advise_cmd.add_argument('--today', type=date.fromisoformat, default=date.today())
+    advise_cmd.add_argument('--repeat', type=int, default=REPEAT)
+    advise_cmd.add_argument('--min-rows', type=int, default=MIN_ROWS,
+                            help=f'Ignore scans of tables smaller than this (default: {MIN_ROWS})')
+    advise_cmd.add_argument('--no-apply', action='store_true', help="Only propose; don't create and re-time")
+    advise_cmd.add_argument('--json', type=Path, default=None, help='Write the report as JSON')
+    advise_cmd.add_argument('--sql', type=Path, default=None, help='Write the proposed DDL')
+
+    args = parser.parse_args()
+
+    with stage('extract'):
+        sites = extract(args.lib)
+
+    if args.command == 'extract':
+        for site in sites:
+            marker = '⏭️ ' if site.unresolved else ('📦' if site.batch else '🔎')
+            print(f"{marker} {site.owner}  ({site.file}:{site.line}, {site.call})")
+            print(f"   {site.sql or site.unresolved}")
+        print(f"\n✅ {len(sites)} call sites, {sum(1 for site in sites if site.unresolved)} unresolved")
+        if args.json:
+            args.json.write_text(json.dumps([asdict(site) for site in sites], ensure_ascii=False, indent=2,
+                                            default=repr), encoding='utf-8')
+        return
+
+    with stage('build'):
+        conn = build_database(':memory:', load_json(args.catalog)['products'], args.rows, args.today, args.seed)
+    report = advise(conn, sites, args.today, args.repeat, args.min_rows, apply=not args.no_apply)
+    conn.close()
+    print_report(report, args.rows)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2, default=repr), encoding='utf-8')
+        print(f"📝 Report: {args.json}")
+    if args.sql:
+        write_sql(report, args.sql)
+        print(f"📝 DDL: {args.sql}")
+
+
+if __name__ == '__main__':
+    run_script('query_advisor', main)
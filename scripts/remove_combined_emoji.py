@@ -5,6 +5,8 @@ Converts '💎🍓💎' to '🍓', '✨🥑✨' to '🥑', etc.
 """
 import re
 
+from instrumentation import run_script
+
 def extract_base_emoji(emoji_str):
     """Extract the base emoji from combined decorations"""
     # Decoration characters to remove
@@ -60,4 +62,4 @@ def process_file():
     print("\n✅ Removed combined emoji decorations!")
 
 if __name__ == '__main__':
-    process_file()
+    run_script('remove_combined_emoji', process_file)
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Template Search Benchmark for Fresh Keeper
+Compares ways to search product_templates for the add-product and
+shopping-list suggestions, at 1k-1M templates
+
+The v4 migration replaced the FTS5 product_search table with LIKE and
+B-tree indexes. A leading-wildcard LIKE can't use those indexes, so every
+keystroke scans the table. Strategies compared (all return the first
+SEARCH_LIMIT matches, like searchTemplates):
+
+  like            the app today: name_vi / name_en / aliases LIKE '%q%'
+  fts5_unicode61  external-content FTS5, unicode61 remove_diacritics 2 with
+                  1- and 2-character prefix indexes, every query word as a
+                  prefix ("thit"* "bo"*)
+  fts5_trigram    FTS5 trigram tokenizer, substring MATCH ("remove_diacritics
+                  1" when the SQLite build supports it); queries under 3
+                  characters fall back to LIKE
+  folded_like     a search_key column (lowercase, no diacritics, đ → d)
+                  scanned with LIKE '%q%'
+  folded_prefix   the folded words in a WITHOUT ROWID (word, template)
+                  B-tree: a range scan for the longest query word, the
+                  others checked through a (template, word) index
+
+Queries mix what users type: accented and unaccented Vietnamese,
+English, a word from inside the name, the first keystrokes, and
+misses. For each strategy it reports build time, index size (pages
+added to the database), latency percentiles and "found": the share
+of queries with a folded-substring match where the strategy returned
+anything.
+
+Usage:
+  python3 scripts/search_benchmark.py --rows 1000,10000,100000
+  python3 scripts/search_benchmark.py --rows 1000000 --strategies like,fts5_unicode61,folded_prefix
+  python3 scripts/search_benchmark.py --catalog assets/data/products_sample.json --json /tmp/search.json
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from catalog_codec import load_json
+from generate_synthetic_catalog import CatalogGenerator, load_seed_products
+from instrumentation import add_count, run_script, stage
+from sqlite_harness import create_schema, template_row
+from text_fold import fold
+
+DEFAULT_ROWS = '1000,10000,100000'
+QUERIES = 200
+REPEAT = 3
+SEED = 0
+
+# AppConstants.searchSuggestionLimit
+SEARCH_LIMIT = 10
+
+# FTS5 prefix indexes: "c"* and "ca"* would otherwise merge every term's doclist
+FTS_PREFIXES = '1 2'
+
+# Share of each kind in the query mix
+QUERY_MIX = [
+    ('vi_prefix', 0.3),     # "xoài c" while typing
+    ('vi_unaccented', 0.2),  # "xoai cat" without a Vietnamese keyboard
+    ('en_word', 0.15),      # "mango"
+    ('inner_word', 0.15),   # "cát", a later word of the name
+    ('short', 0.1),         # "x", "xo": the first keystrokes
+    ('miss', 0.1),          # nothing matches
+]
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_text(product: Dict[str, Any]) -> str:
+    return ' '.join([product['name_vi'], product['name_en'], *(product.get('aliases') or [])])
+
+
+def load_templates(conn: sqlite3.Connection, products: List[Dict[str, Any]]):
+    """The app schema with product_templates filled the way _loadProductTemplates does"""
+    create_schema(conn)
+    with conn:
+        conn.executemany(f"INSERT OR REPLACE INTO product_templates VALUES ({', '.join('?' * 15)})",
+                         (template_row(product) for product in products))
+
+
+def trigram_diacritics(conn: sqlite3.Connection) -> bool:
+    """Whether this SQLite's trigram tokenizer takes remove_diacritics (3.45+)"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.probe USING fts5(x, tokenize='trigram remove_diacritics 1')")
+        conn.execute('DROP TABLE temp.probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+# ==================== STRATEGIES ====================
+
+LIKE_SQL = (f"SELECT * FROM product_templates WHERE name_vi LIKE ? OR name_en LIKE ? OR aliases LIKE ? "
+            f"LIMIT {SEARCH_LIMIT}")
+
+
+def like_build(conn: sqlite3.Connection):
+    """Nothing to build: the name indexes already exist"""
+
+
+def like_search(conn: sqlite3.Connection, query: str) -> List[Tuple]:
+    pattern = f"%{query}%"
+    return conn.execute(LIKE_SQL, [pattern] * 3).fetchall()
+
+
+def unicode61_build(conn: sqlite3.Connection):
+    with conn:
+        conn.execute("CREATE VIRTUAL TABLE product_search USING fts5(name_vi, name_en, aliases, "
+                     "content='product_templates', content_rowid='rowid', "
+                     f"tokenize='unicode61 remove_diacritics 2', prefix='{FTS_PREFIXES}')")
+        conn.execute("INSERT INTO product_search(product_search) VALUES ('rebuild')")
+
+
+def unicode61_search(conn: sqlite3.Connection, query: str) -> List[Tuple]:
+    words = WORD_RE.findall(query.lower())
+    if not words:
+        return []
+    expression = ' '.join(f'"{word}"*' for word in words)
+    return conn.execute(
+        f"SELECT t.* FROM product_search s JOIN product_templates t ON t.rowid = s.rowid "
+        f"WHERE product_search MATCH ? LIMIT {SEARCH_LIMIT}", [expression]).fetchall()
+
+
+def trigram_build(conn: sqlite3.Connection):
+    tokenizer = 'trigram remove_diacritics 1' if trigram_diacritics(conn) else 'trigram'
+    with conn:
+        conn.execute(f"CREATE VIRTUAL TABLE product_trigram USING fts5(name_vi, name_en, aliases, "
+                     f"content='product_templates', content_rowid='rowid', tokenize='{tokenizer}')")
+        conn.execute("INSERT INTO product_trigram(product_trigram) VALUES ('rebuild')")
+
+
+def trigram_search(conn: sqlite3.Connection, query: str) -> List[Tuple]:
+    query = query.strip()
+    if len(query) < 3:
+        # Too short for a trigram; the index can't help
+        return like_search(conn, query)
+    expression = '"' + query.replace('"', '""') + '"'
+    return conn.execute(
+        f"SELECT t.* FROM product_trigram s JOIN product_templates t ON t.rowid = s.rowid "
+        f"WHERE product_trigram MATCH ? LIMIT {SEARCH_LIMIT}", [expression]).fetchall()
+
+
+def folded_like_build(conn: sqlite3.Connection):
+    rows = conn.execute('SELECT rowid, name_vi, name_en, aliases FROM product_templates').fetchall()
+    with conn:
+        conn.execute('ALTER TABLE product_templates ADD COLUMN search_key TEXT')
+        conn.executemany('UPDATE product_templates SET search_key = ? WHERE rowid = ?',
+                         ((fold(' '.join([name_vi, name_en, ' '.join(json.loads(aliases) or [])])), rowid)
+                          for rowid, name_vi, name_en, aliases in rows))
+
+
+def folded_like_search(conn: sqlite3.Connection, query: str) -> List[Tuple]:
+    folded = fold(query)
+    if not folded:
+        return []
+    return conn.execute(f"SELECT * FROM product_templates WHERE search_key LIKE ? LIMIT {SEARCH_LIMIT}",
+                        [f"%{folded}%"]).fetchall()
+
+
+def folded_prefix_build(conn: sqlite3.Connection):
+    rows = conn.execute('SELECT rowid, name_vi, name_en, aliases FROM product_templates').fetchall()
+    with conn:
+        conn.execute('CREATE TABLE template_words (word TEXT NOT NULL, template INTEGER NOT NULL, '
+                     'PRIMARY KEY (word, template)) WITHOUT ROWID')
+        # Checks the other words of a multi-word query for one template
+        conn.execute('CREATE INDEX idx_template_words_template ON template_words(template, word)')
+        conn.executemany('INSERT OR IGNORE INTO template_words VALUES (?, ?)',
+                         ((word, rowid) for rowid, name_vi, name_en, aliases in rows
+                          for word in set(fold(' '.join([name_vi, name_en,
+                                                         ' '.join(json.loads(aliases) or [])])).split())))
+
+
+def folded_prefix_search(conn: sqlite3.Connection, query: str) -> List[Tuple]:
+    words = fold(query).split()
+    if not words:
+        return []
+    # The longest word matches fewest keys, so it drives; the rest are checked per template
+    words = sorted(set(words), key=len, reverse=True)
+    others = ''.join(' AND EXISTS (SELECT 1 FROM template_words o WHERE o.template = w.template '
+                     'AND o.word >= ? AND o.word < ?)' for _ in words[1:])
+    # '{' sorts right after 'z', so [word, word + '{') is every key starting with word
+    params = [bound for word in words for bound in (word, word + '{')]
+    return conn.execute(
+        f"SELECT * FROM product_templates WHERE rowid IN (SELECT DISTINCT w.template FROM template_words w "
+        f"WHERE w.word >= ? AND w.word < ?{others} LIMIT {SEARCH_LIMIT})", params).fetchall()
+
+
+@dataclass
+class Strategy:
+    """One way to answer searchTemplates"""
+    name: str
+    build: Callable[[sqlite3.Connection], None]
+    search: Callable[[sqlite3.Connection, str], List[Tuple]]
+
+
+STRATEGIES = [
+    Strategy('like', like_build, like_search),
+    Strategy('fts5_unicode61', unicode61_build, unicode61_search),
+    Strategy('fts5_trigram', trigram_build, trigram_search),
+    Strategy('folded_like', folded_like_build, folded_like_search),
+    Strategy('folded_prefix', folded_prefix_build, folded_prefix_search),
+]
+
+STRATEGIES_BY_NAME = {strategy.name: strategy for strategy in STRATEGIES}
+
+
+# ==================== QUERIES ====================
+
+def make_query(rng: random.Random, kind: str, product: Dict[str, Any]) -> str:
+    words = product['name_vi'].split()
+    if kind == 'vi_prefix':
+        typed = product['name_vi'].lower()
+        return typed[:rng.randint(min(3, len(typed)), len(typed))].strip()
+    if kind == 'vi_unaccented':
+        return fold(' '.join(words[:2]))
+    if kind == 'en_word':
+        return rng.choice(product['name_en'].split()).lower()
+    if kind == 'inner_word':
+        return (words[-1] if len(words) > 1 else words[0]).lower()
+    if kind == 'short':
+        return product['name_vi'].lower()[:rng.randint(1, 2)]
+    return f"zq{rng.randint(100, 999)}x"
+
+
+def query_mix(products: Sequence[Dict[str, Any]], count: int = QUERIES, seed: int = SEED) -> List[Tuple[str, str]]:
+    """(kind, query) pairs drawn from the catalog in QUERY_MIX proportions"""
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in QUERY_MIX]
+    weights = [share for _, share in QUERY_MIX]
+    queries = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        queries.append((kind, make_query(rng, kind, rng.choice(products))))
+    return queries
+
+
+# ==================== BENCHMARK ====================
+
+def database_pages(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA page_count').fetchone()[0]
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))]
+
+
+def expected_matches(products: Sequence[Dict[str, Any]], queries: List[Tuple[str, str]]) -> List[bool]:
+    """Whether some template contains the folded query: what a user expects to find"""
+    keys = [fold(search_text(product)) for product in products]
+    expected = []
+    for _, query in queries:
+        folded = fold(query)
+        expected.append(bool(folded) and any(folded in key for key in keys))
+    return expected
+
+
+def benchmark(products: List[Dict[str, Any]], queries: List[Tuple[str, str]],
+              strategies: Optional[List[Strategy]] = None, repeat: int = REPEAT,
+              expected: Optional[List[bool]] = None) -> Dict[str, Dict[str, Any]]:
+    """Build every strategy on one templates database and time the query mix"""
+    conn = sqlite3.connect(':memory:')
+    with stage('load'):
+        load_templates(conn, products)
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    if expected is None:
+        with stage('expected'):
+            expected = expected_matches(products, queries)
+    wanted = sum(expected) or 1
+
+    results = {}
+    for strategy in strategies or STRATEGIES:
+        pages = database_pages(conn)
+        start = time.perf_counter()
+        with stage(f'build_{strategy.name}'):
+            strategy.build(conn)
+        build_seconds = time.perf_counter() - start
+        index_bytes = (database_pages(conn) - pages) * page_size
+
+        # One untimed pass warms the page cache
+        found = [bool(strategy.search(conn, query)) for _, query in queries]
+        samples, by_kind = [], {}
+        with stage(f'search_{strategy.name}'):
+            for _ in range(repeat):
+                for kind, query in queries:
+                    start = time.perf_counter()
+                    strategy.search(conn, query)
+                    elapsed = time.perf_counter() - start
+                    samples.append(elapsed)
+                    by_kind.setdefault(kind, []).append(elapsed)
+        add_count(f'{strategy.name}_queries', len(samples))
+
+        results[strategy.name] = {
+            'build_seconds': build_seconds,
+            'index_bytes': index_bytes,
+            'p50_ms': percentile(samples, 0.5) * 1000,
+            'p95_ms': percentile(samples, 0.95) * 1000,
+            'p99_ms': percentile(samples, 0.99) * 1000,
+            'max_ms': max(samples) * 1000,
+            'p50_ms_by_kind': {kind: statistics.median(values) * 1000 for kind, values in by_kind.items()},
+            'found': sum(1 for hit, want in zip(found, expected) if hit and want) / wanted,
+            'false_hits': sum(1 for hit, want in zip(found, expected) if hit and not want),
+        }
+    results['_sqlite'] = {'version': sqlite3.sqlite_version, 'trigram_remove_diacritics': trigram_diacritics(conn)}
+    conn.close()
+    return results
+
+
+def print_results(rows: int, results: Dict[str, Dict[str, Any]]):
+    print(f"\n📊 {rows:,} templates (SQLite {results['_sqlite']['version']})")
+    print(f"   {'strategy':<16} {'build s':>8} {'index MB':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'found':>6}")
+    for name, result in results.items():
+        if name.startswith('_'):
+            continue
+        print(f"   {name:<16} {result['build_seconds']:>8.2f} {result['index_bytes'] / 1024 / 1024:>9.1f} "
+              f"{result['p50_ms']:>8.3f} {result['p95_ms']:>8.3f} {result['p99_ms']:>8.3f} "
+              f"{result['max_ms']:>8.2f} {result['found']:>6.0%}")
+    slowest = max((name for name in results if not name.startswith('_')),
+                  key=lambda name: results[name]['p95_ms'])
+    kinds = results[slowest]['p50_ms_by_kind']
+    print(f"   p50 by query kind for {slowest}: " + ', '.join(f"{kind} {ms:.2f}" for kind, ms in kinds.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare LIKE, FTS5 and folded-key template search')
+    parser.add_argument('--rows', default=DEFAULT_ROWS,
+                        help=f'Comma-separated synthetic catalog sizes (default: {DEFAULT_ROWS})')
+    parser.add_argument('--catalog', type=Path, default=None, help='Benchmark this catalog instead')
+    parser.add_argument('--strategies', default=','.join(STRATEGIES_BY_NAME),
+                        help=f"Comma-separated from {', '.join(STRATEGIES_BY_NAME)}")
+    parser.add_argument('--queries', type=int, default=QUERIES)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--json', type=Path, default=None, help='Write results as JSON')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.strategies.split(',') if name not in STRATEGIES_BY_NAME]
+    if unknown:
+        parser.error(f"unknown strategies {unknown}")
+    strategies = [STRATEGIES_BY_NAME[name] for name in args.strategies.split(',')]
+
+    if args.catalog:
+        catalogs = [(str(args.catalog), lambda: load_json(args.catalog)['products'])]
+    else:
+        generator = CatalogGenerator(load_seed_products(), seed=args.seed)
+        catalogs = [(size, lambda count=int(size.replace('_', '')): list(islice(generator.generate(count), count)))
+                    for size in args.rows.split(',') if size.strip()]
+
+    report = {}
+    for label, products_for in catalogs:
+        with stage(f'catalog_{label}'):
+            products = products_for()
+        queries = query_mix(products, args.queries, args.seed)
+        results = benchmark(products, queries, strategies, args.repeat)
+        print_results(len(products), results)
+        report[label] = {'templates': len(products), 'queries': queries, 'results': results}
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📝 Results: {args.json}")
+
+
+if __name__ == '__main__':
+    run_script('search_benchmark', main)
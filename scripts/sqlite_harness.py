@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+SQLite Query Harness for Fresh Keeper
+Recreates the app database in sqlite3, fills it with a synthetic heavy-user
+inventory and times the queries the app runs
+
+SCHEMA is DatabaseService._onCreate at database version 16 (tables and
+indexes). APP_QUERIES are the statements ProductLocalDataSource and
+ShoppingListProvider issue, with the screens that trigger them (batched
+writes run in a savepoint that is rolled back). For each one the harness
+records:
+
+  - median latency, fetching every row like sqflite does
+  - EXPLAIN QUERY PLAN output
+  - whether an index was used, and whether SQLite had to scan a table or
+    sort with a temp B-tree
+
+product_templates is loaded from a catalog the way _loadProductTemplates
+does it. user_products gets --rows synthetic items: mostly used / expired
+history plus an active inventory, with expiry dates spread around today,
+so range and status filters select realistic fractions.
+
+Usage:
+  python3 scripts/sqlite_harness.py run --rows 10000,100000
+  python3 scripts/sqlite_harness.py run --rows 1000000 --catalog scripts/benchmarks/.catalogs/catalog_10k_seed0.json
+  python3 scripts/sqlite_harness.py plan --rows 10000
+  python3 scripts/sqlite_harness.py build --rows 100000 --db /tmp/fresh_keeper.db
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from catalog_codec import load_json
+from instrumentation import add_count, run_script, stage
+
+DEFAULT_CATALOG = Path('assets/data/products_sample.json')
+DEFAULT_ROWS = '10000,100000'
+REPEAT = 5
+SEED = 0
+
+# AppConstants limits
+SEARCH_SUGGESTION_LIMIT = 10
+RECENT_PRODUCTS_LIMIT = 5
+
+# DatabaseService._onCreate, database version 16
+SCHEMA = [
+    """CREATE TABLE user_products (
+        id TEXT PRIMARY KEY,
+        product_template_id TEXT,
+        name TEXT NOT NULL,
+        name_en TEXT,
+        category TEXT NOT NULL,
+        quantity REAL NOT NULL,
+        unit TEXT NOT NULL,
+        purchase_date TEXT NOT NULL,
+        expiry_date TEXT NOT NULL,
+        notes TEXT,
+        location TEXT,
+        image_path TEXT,
+        status TEXT NOT NULL DEFAULT 'active',
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        custom_icon_id TEXT
+    )""",
+    'CREATE INDEX idx_user_products_expiry ON user_products(expiry_date)',
+    'CREATE INDEX idx_user_products_category ON user_products(category)',
+    'CREATE INDEX idx_user_products_status ON user_products(status)',
+    """CREATE TABLE product_templates (
+        id TEXT PRIMARY KEY,
+        name_vi TEXT NOT NULL,
+        name_en TEXT NOT NULL,
+        aliases TEXT,
+        category TEXT NOT NULL,
+        shelf_life_refrigerated INTEGER,
+        shelf_life_frozen INTEGER,
+        shelf_life_pantry INTEGER,
+        shelf_life_opened INTEGER,
+        nutrition_data TEXT,
+        health_benefits TEXT,
+        health_warnings TEXT,
+        storage_tips TEXT,
+        image_url TEXT,
+        iconId TEXT
+    )""",
+    'CREATE INDEX idx_product_templates_name_vi ON product_templates(name_vi)',
+    'CREATE INDEX idx_product_templates_name_en ON product_templates(name_en)',
+    'CREATE INDEX idx_product_templates_category ON product_templates(category)',
+    """CREATE TABLE custom_product_templates (
+        id TEXT PRIMARY KEY,
+        name_vi TEXT NOT NULL,
+        name_en TEXT NOT NULL,
+        aliases TEXT,
+        category TEXT NOT NULL,
+        shelf_life_refrigerated INTEGER,
+        shelf_life_frozen INTEGER,
+        shelf_life_pantry INTEGER,
+        shelf_life_opened INTEGER,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )""",
+    'CREATE INDEX idx_custom_templates_name_vi ON custom_product_templates(name_vi)',
+    'CREATE INDEX idx_custom_templates_name_en ON custom_product_templates(name_en)',
+    """CREATE TABLE categories (
+        id TEXT PRIMARY KEY,
+        name_vi TEXT NOT NULL,
+        name_en TEXT NOT NULL,
+        icon TEXT NOT NULL,
+        color TEXT NOT NULL,
+        sort_order INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_id TEXT NOT NULL,
+        notification_id INTEGER NOT NULL,
+        scheduled_date TEXT NOT NULL,
+        days_before INTEGER NOT NULL,
+        is_sent INTEGER NOT NULL DEFAULT 0,
+        sent_at TEXT,
+        created_at TEXT NOT NULL
+    )""",
+    """CREATE TABLE settings (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )""",
+    """CREATE TABLE shopping_list (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        quantity INTEGER NOT NULL DEFAULT 1,
+        unit TEXT NOT NULL DEFAULT 'cái',
+        category TEXT NOT NULL DEFAULT 'other',
+        is_purchased INTEGER NOT NULL DEFAULT 0,
+        sort_order INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        product_template_id TEXT,
+        name_en TEXT,
+        nutrition_data TEXT,
+        health_benefits TEXT,
+        health_warnings TEXT,
+        storage_tips TEXT,
+        custom_icon_id TEXT
+    )""",
+    'CREATE INDEX idx_shopping_list_sort_order ON shopping_list(sort_order)',
+]
+
+# DatabaseService._insertDefaultCategories
+CATEGORIES = [
+    ('vegetables', 'Rau củ quả', 'Vegetables', '🥬', '#4CAF50', 1),
+    ('fruits', 'Trái cây', 'Fruits', '🍎', '#FF9800', 2),
+    ('meat', 'Thịt', 'Meat', '🥩', '#F44336', 3),
+    ('eggs', 'Trứng', 'Eggs', '🥚', '#FFE082', 4),
+    ('dairy', 'Sữa & chế phẩm', 'Dairy', '🥛', '#2196F3', 5),
+    ('dry_food', 'Đồ khô', 'Dry Food', '🍞', '#795548', 6),
+    ('frozen', 'Đồ đông lạnh', 'Frozen', '🧊', '#00BCD4', 7),
+    ('condiments', 'Gia vị', 'Condiments', '🧂', '#9E9E9E', 8),
+    ('other', 'Khác', 'Other', '📦', '#607D8B', 9),
+]
+
+# AppConstants.quantityUnits
+UNITS = ['cái', 'quả', 'bó', 'gói', 'kg', 'g', 'lít', 'ml', 'hộp', 'chai', 'lon', 'túi']
+LOCATIONS = ['fridge', 'freezer', 'pantry']
+
+# A heavy user's table is mostly history: (status, share)
+STATUS_MIX = [('active', 0.25), ('used', 0.6), ('expired', 0.15)]
+
+# Days of purchase history the inventory spans
+HISTORY_DAYS = 720
+
+
+def iso(moment: datetime) -> str:
+    """DateTime.toIso8601String() for a local time with millisecond precision"""
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}"
+
+
+def day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+def create_schema(conn: sqlite3.Connection):
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.executemany('INSERT INTO categories VALUES (?, ?, ?, ?, ?, ?)', CATEGORIES)
+
+
+def template_row(product: Dict[str, Any]) -> Tuple:
+    """A product_templates row as _loadProductTemplates builds it"""
+    def encoded(key):
+        value = product.get(key)
+        return json.dumps(value, ensure_ascii=False) if value is not None else None
+
+    return (product['id'], product['name_vi'], product['name_en'], json.dumps(product.get('aliases'), ensure_ascii=False),
+            product['category'], product.get('shelf_life_refrigerated'), product.get('shelf_life_frozen'),
+            product.get('shelf_life_pantry'), product.get('shelf_life_opened'), encoded('nutrition_data'),
+            encoded('health_benefits'), encoded('health_warnings'), product.get('storage_tips'),
+            product.get('image_url'), product.get('iconId'))
+
+
+def populate(conn: sqlite3.Connection, products: List[Dict[str, Any]], rows: int,
+             today: date, seed: int = SEED) -> Dict[str, int]:
+    """Templates from the catalog plus a synthetic inventory of `rows` user products"""
+    rng = random.Random(seed)
+    now = day_start(today) + timedelta(hours=20)
+    with conn:
+        with stage('templates'):
+            conn.executemany(f"INSERT OR REPLACE INTO product_templates VALUES ({', '.join('?' * 15)})",
+                             (template_row(product) for product in products))
+
+        statuses = [status for status, _ in STATUS_MIX]
+        weights = [share for _, share in STATUS_MIX]
+
+        def user_products():
+            for i in range(rows):
+                template = rng.choice(products)
+                status = rng.choices(statuses, weights)[0]
+                shelf_life = template.get('shelf_life_refrigerated') or 7
+                if status == 'active':
+                    # Bought recently; some already past their date
+                    purchased = today - timedelta(days=rng.randint(0, max(1, shelf_life + 3)))
+                else:
+                    purchased = today - timedelta(days=rng.randint(0, HISTORY_DAYS))
+                expiry = purchased + timedelta(days=max(1, shelf_life + rng.randint(-2, 2)))
+                created = min(now, day_start(purchased) + timedelta(seconds=rng.randint(8 * 3600, 22 * 3600),
+                                                                    microseconds=rng.randint(0, 999) * 1000))
+                updated = created if status == 'active' else min(now, day_start(expiry) + timedelta(hours=9))
+                yield (f"{rng.getrandbits(128):032x}", template['id'], template['name_vi'], template['name_en'],
+                       template['category'], float(rng.randint(1, 5)), rng.choice(UNITS),
+                       iso(day_start(purchased)), iso(day_start(expiry)), None, rng.choice(LOCATIONS), None,
+                       status, iso(created), iso(updated), None)
+
+        with stage('user_products'):
+            conn.executemany(f"INSERT INTO user_products VALUES ({', '.join('?' * 16)})", user_products())
+
+        custom = max(10, rows // 100)
+        with stage('custom_templates'):
+            conn.executemany(
+                'INSERT INTO custom_product_templates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((f"custom_{i}", f"{rng.choice(products)['name_vi']} nhà làm {i}", f"Homemade {i}", '[]',
+                  rng.choice(CATEGORIES)[0], 5, 30, None, None, iso(now), iso(now)) for i in range(custom)))
+
+        shopping = max(20, min(500, rows // 200))
+        with stage('shopping_list'):
+            conn.executemany(
+                'INSERT INTO shopping_list (id, name, quantity, unit, category, is_purchased, sort_order, '
+                'created_at, product_template_id, name_en) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((f"item_{i}", template['name_vi'], 1, rng.choice(UNITS), template['category'],
+                  int(rng.random() < 0.3), i, iso(now), template['id'], template['name_en'])
+                 for i, template in enumerate(rng.choice(products) for _ in range(shopping))))
+
+    counts = {'templates': len(products), 'user_products': rows, 'custom_templates': custom, 'shopping_list': shopping}
+    for name, value in counts.items():
+        add_count(name, value)
+    return counts
+
+
+@dataclass
+class AppQuery:
+    """One statement the app issues, with the Dart method and screens behind it"""
+    name: str
+    source: str
+    screens: str
+    sql: str
+    params: Callable[[date, sqlite3.Connection], Sequence[Any]]
+    # A sqflite batch: params is a list of argument tuples, rolled back after timing
+    batch: bool = False
+
+
+def expiry_range(today: date, days: int) -> Tuple[str, str]:
+    """getExpiryDateRange: [today, today + days + 1) at midnight"""
+    return iso(day_start(today)), iso(day_start(today + timedelta(days=days + 1)))
+
+
+def any_row(conn: sqlite3.Connection, sql: str) -> Any:
+    row = conn.execute(sql).fetchone()
+    return row[0] if row else None
+
+
+APP_QUERIES = [
+    AppQuery('all_products', 'ProductLocalDataSource.getAllProducts', 'home, category (all)',
+             'SELECT * FROM user_products WHERE status = ? ORDER BY expiry_date ASC',
+             lambda today, conn: ['active']),
+    AppQuery('products_by_category', 'ProductLocalDataSource.getProductsByCategory', 'category',
+             'SELECT * FROM user_products WHERE category = ? AND status = ? ORDER BY expiry_date ASC',
+             lambda today, conn: ['fruits', 'active']),
+    AppQuery('products_by_status', 'ProductLocalDataSource.getProductsByStatus', 'history',
+             'SELECT * FROM user_products WHERE status = ? ORDER BY expiry_date ASC',
+             lambda today, conn: ['used']),
+    AppQuery('expiring_soon', 'ProductLocalDataSource.getExpiringSoon', 'home, expiring soon',
+             'SELECT * FROM user_products WHERE expiry_date >= ? AND expiry_date < ? AND status = ? '
+             'ORDER BY expiry_date ASC',
+             lambda today, conn: [*expiry_range(today, 7), 'active']),
+    AppQuery('recent_products', 'ProductLocalDataSource.getRecentProducts', 'home',
+             f'SELECT * FROM user_products WHERE created_at >= ? AND status = ? '
+             f'ORDER BY created_at DESC LIMIT {RECENT_PRODUCTS_LIMIT}',
+             lambda today, conn: [iso(datetime.combine(today, datetime.min.time()) - timedelta(days=7)), 'active']),
+    AppQuery('search_products', 'ProductLocalDataSource.searchProducts', 'home, all items',
+             'SELECT * FROM user_products WHERE (name LIKE ? OR name_en LIKE ?) AND status = ? '
+             'ORDER BY expiry_date ASC',
+             lambda today, conn: ['%cá%', '%cá%', 'active']),
+    AppQuery('product_by_id', 'ProductLocalDataSource.getProductById', 'product detail',
+             'SELECT * FROM user_products WHERE id = ? LIMIT 1',
+             lambda today, conn: [any_row(conn, 'SELECT id FROM user_products ORDER BY rowid DESC LIMIT 1')]),
+    AppQuery('total_count', 'ProductLocalDataSource.getTotalCount', 'home statistics',
+             'SELECT COUNT(*) as count FROM user_products WHERE status = ?',
+             lambda today, conn: ['active']),
+    AppQuery('expiring_soon_count', 'ProductLocalDataSource.getExpiringSoonCount', 'home statistics',
+             'SELECT COUNT(*) as count FROM user_products WHERE expiry_date >= ? AND expiry_date < ? AND status = ?',
+             lambda today, conn: [*expiry_range(today, 7), 'active']),
+    AppQuery('count_by_category', 'ProductLocalDataSource.getCountByCategory', 'home statistics',
+             'SELECT category, COUNT(*) as count FROM user_products WHERE status = ? GROUP BY category',
+             lambda today, conn: ['active']),
+    AppQuery('search_templates', 'ProductLocalDataSource.searchTemplates', 'add product, shopping list',
+             f'SELECT * FROM product_templates WHERE name_vi LIKE ? OR name_en LIKE ? OR aliases LIKE ? '
+             f'LIMIT {SEARCH_SUGGESTION_LIMIT}',
+             lambda today, conn: ['%xoài%', '%xoài%', '%xoài%']),
+    AppQuery('all_templates', 'ProductLocalDataSource.getAllTemplates', 'category',
+             'SELECT * FROM product_templates ORDER BY name_vi ASC',
+             lambda today, conn: []),
+    AppQuery('templates_by_category', 'ProductLocalDataSource.getTemplatesByCategory', 'category',
+             'SELECT * FROM product_templates WHERE category = ?',
+             lambda today, conn: ['meat']),
+    AppQuery('search_custom_templates', 'ProductLocalDataSource.searchCustomTemplates', 'add product',
+             f'SELECT * FROM custom_product_templates WHERE name_vi LIKE ? OR name_en LIKE ? OR aliases LIKE ? '
+             f'LIMIT {SEARCH_SUGGESTION_LIMIT}',
+             lambda today, conn: ['%nhà làm%', '%nhà làm%', '%nhà làm%']),
+    AppQuery('all_categories', 'ProductLocalDataSource.getAllCategories', 'home, category',
+             'SELECT * FROM categories ORDER BY sort_order ASC',
+             lambda today, conn: []),
+    AppQuery('shopping_list', 'ShoppingListProvider.loadItems', 'shopping list',
+             'SELECT * FROM shopping_list ORDER BY sort_order ASC',
+             lambda today, conn: []),
+    AppQuery('reorder_shopping_list', 'ShoppingListProvider._reorderItems', 'shopping list',
+             'UPDATE shopping_list SET sort_order = ? WHERE id = ?',
+             lambda today, conn: [(i, row[0]) for i, row in enumerate(
+                 conn.execute('SELECT id FROM shopping_list ORDER BY sort_order ASC'))],
+             batch=True),
+]
+
+QUERIES_BY_NAME = {query.name: query for query in APP_QUERIES}
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Sequence[Any]) -> Dict[str, Any]:
+    """EXPLAIN QUERY PLAN details and what they say about index use"""
+    plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", list(params))]
+    uses_index = any(' USING ' in step and ('INDEX' in step or 'PRIMARY KEY' in step) for step in plan)
+    return {
+        'plan': plan,
+        'index_used': uses_index,
+        'full_scan': any(step.startswith('SCAN ') and ' USING ' not in step for step in plan),
+        'temp_sort': any('USE TEMP B-TREE' in step for step in plan),
+    }
+
+
+def time_query(conn: sqlite3.Connection, sql: str, params: Sequence[Any], repeat: int = REPEAT) -> Tuple[float, int]:
+    """Median seconds to fetch every row, and the row count"""
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(conn.execute(sql, list(params)).fetchall())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), rows
+
+
+def time_batch(conn: sqlite3.Connection, sql: str, batch: Sequence[Sequence[Any]],
+               repeat: int = REPEAT) -> Tuple[float, int]:
+    """Median seconds to run a write batch in one transaction; every run is rolled back"""
+    timings = []
+    for _ in range(repeat):
+        conn.execute('SAVEPOINT harness')
+        try:
+            start = time.perf_counter()
+            conn.executemany(sql, batch)
+            timings.append(time.perf_counter() - start)
+        finally:
+            conn.execute('ROLLBACK TO harness')
+            conn.execute('RELEASE harness')
+    return statistics.median(timings), len(batch)
+
+
+def run_query(conn: sqlite3.Connection, query: AppQuery, today: date, repeat: int = REPEAT) -> Dict[str, Any]:
+    params = query.params(today, conn)
+    if query.batch:
+        seconds, rows = time_batch(conn, query.sql, params, repeat)
+        plan = explain(conn, query.sql, params[0] if params else [None] * query.sql.count('?'))
+        params = params[:1]
+    else:
+        seconds, rows = time_query(conn, query.sql, params, repeat)
+        plan = explain(conn, query.sql, params)
+    return {'name': query.name, 'source': query.source, 'screens': query.screens, 'sql': query.sql,
+            'params': list(params), 'seconds': seconds, 'rows': rows, **plan}
+
+
+def run_queries(conn: sqlite3.Connection, today: date, repeat: int = REPEAT,
+                queries: Optional[List[AppQuery]] = None) -> List[Dict[str, Any]]:
+    return [run_query(conn, query, today, repeat) for query in queries or APP_QUERIES]
+
+
+def build_database(path, products: List[Dict[str, Any]], rows: int, today: date,
+                   seed: int = SEED) -> sqlite3.Connection:
+    """A fresh database at path (':memory:' for none) with the schema and data"""
+    if path != ':memory:':
+        Path(path).unlink(missing_ok=True)
+    conn = sqlite3.connect(str(path))
+    create_schema(conn)
+    populate(conn, products, rows, today, seed)
+    # sqflite doesn't ANALYZE, so neither do we: plans are the app's
+    return conn
+
+
+def print_results(rows: int, results: List[Dict[str, Any]]):
+    print(f"\n📊 {rows:,} user products")
+    print(f"   {'query':<24} {'ms':>9} {'rows':>8}  index  scan  sort  screens")
+    for result in results:
+        flags = ('✅' if result['index_used'] else '❌',
+                 '⚠️ ' if result['full_scan'] else '  ',
+                 '⚠️ ' if result['temp_sort'] else '  ')
+        print(f"   {result['name']:<24} {result['seconds'] * 1000:>9.2f} {result['rows']:>8}"
+              f"   {flags[0]}    {flags[1]}   {flags[2]}  {result['screens']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay the app schema in sqlite3 and time its queries')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def common(command):
+        command.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG,
+                             help='Catalog loaded into product_templates')
+        command.add_argument('--seed', type=int, default=SEED)
+        command.add_argument('--today', type=date.fromisoformat, default=date.today(),
+                             help='Date the inventory is generated around (YYYY-MM-DD)')
+
+    run_cmd = commands.add_parser('run', help='Time every app query at each size')
+    run_cmd.add_argument('--rows', default=DEFAULT_ROWS, help=f'Comma-separated user_products sizes (default: {DEFAULT_ROWS})')
+    run_cmd.add_argument('--repeat', type=int, default=REPEAT)
+    run_cmd.add_argument('--json', type=Path, default=None, help='Write results as JSON')
+    run_cmd.add_argument('--db', type=Path, default=None, help='Database file per size (default: in memory)')
+    common(run_cmd)
+
+    plan_cmd = commands.add_parser('plan', help='Print EXPLAIN QUERY PLAN for every app query')
+    plan_cmd.add_argument('--rows', type=int, default=10_000)
+    common(plan_cmd)
+
+    build_cmd = commands.add_parser('build', help='Write a populated database file')
+    build_cmd.add_argument('--rows', type=int, required=True)
+    build_cmd.add_argument('--db', type=Path, required=True)
+    common(build_cmd)
+
+    args = parser.parse_args()
+
+    with stage('load'):
+        products = load_json(args.catalog)['products']
+
+    if args.command == 'run':
+        report = {'catalog': str(args.catalog), 'today': args.today.isoformat(), 'sizes': {}}
+        for rows in [int(size.replace('_', '')) for size in args.rows.split(',') if size.strip()]:
+            path = args.db.with_name(f"{args.db.stem}_{rows}{args.db.suffix}") if args.db else ':memory:'
+            with stage(f'build_{rows}'):
+                conn = build_database(path, products, rows, args.today, args.seed)
+            with stage(f'queries_{rows}'):
+                results = run_queries(conn, args.today, args.repeat)
+            conn.close()
+            print_results(rows, results)
+            report['sizes'][str(rows)] = results
+        if args.json:
+            args.json.parent.mkdir(parents=True, exist_ok=True)
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"\n📝 Results: {args.json}")
+
+    elif args.command == 'plan':
+        conn = build_database(':memory:', products, args.rows, args.today, args.seed)
+        for query in APP_QUERIES:
+            params = query.params(args.today, conn)
+            result = explain(conn, query.sql, params[0] if query.batch else params)
+            print(f"\n🔎 {query.name} ({query.source})")
+            print(f"   {query.sql}")
+            for step in result['plan']:
+                print(f"   → {step}")
+
+    elif args.command == 'build':
+        conn = build_database(args.db, products, args.rows, args.today, args.seed)
+        conn.close()
+        print(f"✅ Wrote {args.db}: {args.rows:,} user products, {len(products)} templates "
+              f"({args.db.stat().st_size / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == '__main__':
+    run_script('sqlite_harness', main)
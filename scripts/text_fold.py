@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Text Folding for Fresh Keeper
+Accent-free, lowercase forms of product names
+
+The icon matcher, the search benchmark and the synthetic catalog all
+compare Vietnamese names without diacritics (đ → d), the way a user
+without a Vietnamese keyboard types them. The folding lives here so
+they agree on it.
+
+Usage:
+  from text_fold import fold, fold_vietnamese
+  fold('Thịt bò (Đà Lạt)')  # 'thit bo da lat'
+"""
+
+import re
+import unicodedata
+
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def fold_vietnamese(text: str) -> str:
+    """'Xoài cát' → 'xoai cat'"""
+    text = unicodedata.normalize('NFD', text.lower().replace('đ', 'd'))
+    # Combining marks are non-ASCII, so dropping non-ASCII drops the accents
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+
+def fold(text: str) -> str:
+    """'Thịt bò Đà Lạt' → 'thit bo da lat': also drops punctuation"""
+    return ' '.join(NON_ALNUM_RE.sub(' ', fold_vietnamese(text)).split())
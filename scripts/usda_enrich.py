@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+USDA Nutrition Enrichment for Fresh Keeper
+Replaces template nutrition with USDA FoodData Central values from a
+local CSV export
+
+Generated products share placeholder nutrition per category (every fruit
+from massive_expansion.generate_product has 50 kcal), and
+NutritionApiService._searchUSDA looks foods up one at a time at runtime.
+This joins the whole catalog against the FDC export offline:
+
+  1. index   every product's name_en and aliases, as hashes of their
+             normalized token sets (the only thing held in memory)
+  2. food.csv            streamed once; each description's head-food
+                         token subsets are hashed and looked up, and the
+                         best match per product is kept
+  3. food_nutrient.csv   streamed once; only rows of the chosen foods
+                         are kept
+
+A match's confidence is the share of the description's content tokens
+the product name covers ("Watermelon, raw" → watermelon: 1.0). Products
+with a confident match get the USDA values, per 100 g; by default only
+products whose nutrition is a shared template (or missing) are touched.
+
+The export is the "Full Download" CSV zip from
+fdc.nal.usda.gov/download-datasets, either as the .zip or unpacked
+(plain or gzipped CSVs).
+
+Usage:
+  python3 scripts/usda_enrich.py FoodData_Central_csv_2024-04-18.zip assets/data/products_sample.json
+  python3 scripts/usda_enrich.py fdc/ assets/data/products_sample.json -o /tmp/enriched.json --report /tmp/usda.json
+  python3 scripts/usda_enrich.py fdc/ assets/data/products_sample.json --dry-run --min-confidence 0.3
+"""
+
+import argparse
+import csv
+import functools
+import gzip
+import hashlib
+import io
+import json
+import re
+import unicodedata
+import zipfile
+from collections import Counter, defaultdict
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from catalog_codec import dump_json, load_json
+from instrumentation import add_count, run_script, stage
+
+# Match SR Legacy / Foundation like _searchUSDA, plus FNDDS survey foods
+DATA_TYPES = ('foundation_food', 'sr_legacy_food', 'survey_fndds_food')
+
+MIN_CONFIDENCE = 0.5
+
+# Nutrition shared by at least this many products is a category template
+TEMPLATE_MIN_SHARED = 3
+
+# Description tokens considered when generating match keys
+MAX_KEY_TOKENS = 8
+MAX_SUBSET = 3
+
+# Words that describe a food's state, not which food it is
+QUALIFIERS = {
+    'raw', 'fresh', 'whole', 'all', 'varieties', 'variety', 'commercial', 'commercially',
+    'prepared', 'nfs', 'ns', 'unprepared', 'plain', 'regular', 'with', 'without', 'and',
+    'or', 'of', 'in', 'the', 'a', 'an', 'as', 'to', 'from', 'for', 'type', 'includes',
+}
+
+# (group, key, nutrient names in order of preference); None group = top level
+NUTRIENTS = [
+    (None, 'calories', ['energy', 'energy (atwater general factors)', 'energy (atwater specific factors)']),
+    (None, 'protein', ['protein']),
+    (None, 'carbohydrates', ['carbohydrate, by difference', 'carbohydrate, by summation']),
+    (None, 'fat', ['total lipid (fat)']),
+    (None, 'fiber', ['fiber, total dietary']),
+    (None, 'sugar', ['sugars, total including nlea', 'sugars, total']),
+    ('vitamins', 'vitamin_a', ['vitamin a, iu']),
+    ('vitamins', 'vitamin_c', ['vitamin c, total ascorbic acid']),
+    ('vitamins', 'vitamin_d', ['vitamin d (d2 + d3)']),
+    ('vitamins', 'vitamin_e', ['vitamin e (alpha-tocopherol)']),
+    ('vitamins', 'vitamin_k', ['vitamin k (phylloquinone)']),
+    ('vitamins', 'vitamin_b6', ['vitamin b-6']),
+    ('vitamins', 'vitamin_b12', ['vitamin b-12']),
+    ('minerals', 'calcium', ['calcium, ca']),
+    ('minerals', 'iron', ['iron, fe']),
+    ('minerals', 'magnesium', ['magnesium, mg']),
+    ('minerals', 'potassium', ['potassium, k']),
+    ('minerals', 'sodium', ['sodium, na']),
+    ('minerals', 'zinc', ['zinc, zn']),
+]
+# Energy also comes in kJ under the same name
+ENERGY_UNIT = 'KCAL'
+
+# Nutrients whose FDC unit must match the catalog's: the app labels
+# vitamin_a as IU (carrots ~16700), FDC's "Vitamin A, RAE" is µg
+REQUIRED_UNITS = {'calories': ENERGY_UNIT, 'vitamin_a': 'IU'}
+
+MACROS = ('calories', 'protein', 'carbohydrates', 'fat', 'fiber', 'sugar')
+
+PARENTHESES_RE = re.compile(r'\([^)]*\)')
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def singular(token: str) -> str:
+    if len(token) <= 3 or token.endswith(('ss', 'us', 'is')):
+        return token
+    if token.endswith('ies'):
+        return token[:-3] + 'y'
+    if token.endswith(('ches', 'shes', 'xes', 'oes')):
+        return token[:-2]
+    if token.endswith('s'):
+        return token[:-1]
+    return token
+
+
+def tokens(text: str) -> List[str]:
+    """Lowercase ASCII word stems, without qualifiers"""
+    text = unicodedata.normalize('NFKD', text.lower()).encode('ascii', 'ignore').decode('ascii')
+    return [singular(token) for token in TOKEN_RE.findall(text) if token not in QUALIFIERS]
+
+
+def key_hash(token_set) -> int:
+    joined = ' '.join(sorted(token_set)).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(joined, digest_size=8).digest(), 'little')
+
+
+def build_index(products: List[Dict[str, Any]]) -> Dict[int, List[int]]:
+    """Hash of a name's token set → indices of products with that name or alias"""
+    index: Dict[int, List[int]] = defaultdict(list)
+    for i, product in enumerate(products):
+        keys = set()
+        for name in [product.get('name_en') or ''] + list(product.get('aliases') or []):
+            name_tokens = set(tokens(str(name)))
+            if name_tokens:
+                keys.add(key_hash(name_tokens))
+        for key in keys:
+            index[key].append(i)
+    return index
+
+
+def description_keys(description: str) -> Tuple[int, Iterator[Tuple[int, int]]]:
+    """
+    Content-token count of an FDC description and (hash, size) of every
+    token subset that includes a word of the first two segments, which
+    name the food ("Apples" in "Apples, raw, with skin", "almonds" in
+    "Nuts, almonds, oil roasted")
+    """
+    description = PARENTHESES_RE.sub(' ', description)
+    head = set(tokens(' '.join(description.split(',')[:2])))
+    content = [token for token in dict.fromkeys(tokens(description)) if not token.isdigit()]
+    candidates = content[:MAX_KEY_TOKENS]
+
+    def keys():
+        for size in range(1, min(MAX_SUBSET, len(candidates)) + 1):
+            for subset in combinations(candidates, size):
+                if head.intersection(subset):
+                    yield key_hash(subset), size
+        if len(content) > MAX_SUBSET:
+            yield key_hash(content), len(content)
+
+    return len(content), keys()
+
+
+class FdcExport:
+    """CSV tables of an FDC download: a .zip, or a directory of .csv / .csv.gz"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path) if self.path.suffix == '.zip' else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._zip is not None:
+            self._zip.close()
+
+    def open(self, name: str):
+        if self._zip is not None:
+            for member in self._zip.namelist():
+                if member == name or member.endswith('/' + name):
+                    return io.TextIOWrapper(self._zip.open(member), encoding='utf-8', newline='')
+        else:
+            for candidate in (self.path / name, self.path / (name + '.gz')):
+                if candidate.exists():
+                    if candidate.suffix == '.gz':
+                        return gzip.open(candidate, 'rt', encoding='utf-8', newline='')
+                    return open(candidate, 'r', encoding='utf-8', newline='')
+        raise FileNotFoundError(f"{name} not found in {self.path}")
+
+    def rows(self, name: str) -> Iterator[Dict[str, str]]:
+        with self.open(name) as f:
+            yield from csv.DictReader(f)
+
+
+def nutrient_ids(export: FdcExport) -> Dict[str, Tuple[Optional[str], str, int]]:
+    """nutrient.csv id → (group, key, preference) for the nutrients we keep"""
+    wanted = {name: (group, key, rank) for group, key, names in NUTRIENTS
+              for rank, name in enumerate(names)}
+    ids = {}
+    for row in export.rows('nutrient.csv'):
+        name = row['name'].strip().lower()
+        if name in wanted:
+            group, key, rank = wanted[name]
+            if key in REQUIRED_UNITS and row.get('unit_name', '').upper() != REQUIRED_UNITS[key]:
+                continue
+            ids[row['id']] = (group, key, rank)
+    return ids
+
+
+def is_raw(description: str) -> bool:
+    """'raw' as a word, so 'Strawberries, frozen' and 'Crawfish, cooked' aren't raw"""
+    return 'raw' in TOKEN_RE.findall(description.lower())
+
+
+def match_foods(export: FdcExport, products: List[Dict[str, Any]],
+                data_types=DATA_TYPES) -> Dict[int, Dict[str, Any]]:
+    """Best FDC food per product index, with its confidence"""
+    index = build_index(products)
+    rank = {data_type: len(data_types) - i for i, data_type in enumerate(data_types)}
+    best: Dict[int, Tuple] = {}
+    scanned = 0
+    for row in export.rows('food.csv'):
+        scanned += 1
+        data_type = row.get('data_type', '')
+        if data_types and data_type not in rank:
+            continue
+        description = row.get('description') or ''
+        content_size, keys = description_keys(description)
+        if not content_size:
+            continue
+        raw = is_raw(description)
+        for key, size in keys:
+            for i in index.get(key, ()):
+                score = (size / content_size, rank.get(data_type, 0), raw, -int(row['fdc_id']))
+                if i not in best or score > best[i][0]:
+                    best[i] = (score, row['fdc_id'], description, data_type)
+    add_count('foods_scanned', scanned)
+    return {i: {'fdc_id': fdc_id, 'description': description, 'data_type': data_type,
+                'confidence': round(score[0], 3)}
+            for i, (score, fdc_id, description, data_type) in best.items()}
+
+
+def collect_nutrients(export: FdcExport, fdc_ids) -> Dict[str, Dict[Tuple[Optional[str], str], float]]:
+    """(group, key) → amount per chosen food, from one pass over food_nutrient.csv"""
+    ids = nutrient_ids(export)
+    found: Dict[str, Dict[Tuple[Optional[str], str], Tuple[int, float]]] = {fdc_id: {} for fdc_id in fdc_ids}
+    rows = 0
+    with export.open('food_nutrient.csv') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        fdc_col, nutrient_col, amount_col = (header.index(name) for name in ('fdc_id', 'nutrient_id', 'amount'))
+        for row in reader:
+            rows += 1
+            values = found.get(row[fdc_col])
+            if values is None:
+                continue
+            nutrient = ids.get(row[nutrient_col])
+            if nutrient is None or not row[amount_col]:
+                continue
+            group, key, preference = nutrient
+            current = values.get((group, key))
+            if current is None or preference < current[0]:
+                values[(group, key)] = (preference, float(row[amount_col]))
+    add_count('nutrient_rows_scanned', rows)
+    return {fdc_id: {field: amount for field, (_, amount) in values.items()}
+            for fdc_id, values in found.items()}
+
+
+def amount(value: float):
+    value = round(value, 3)
+    return int(value) if value == int(value) else value
+
+
+def usda_nutrition(values: Dict[Tuple[Optional[str], str], float],
+                   current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Nutrition per 100 g from USDA values; macros USDA lacks keep the
+    current value, and vitamins / minerals are replaced when USDA has any
+    """
+    current = current or {}
+    nutrition: Dict[str, Any] = {'serving_size': '100g'}
+    for key in MACROS:
+        value = values.get((None, key))
+        nutrition[key] = amount(value) if value is not None else current.get(key)
+    for group in ('vitamins', 'minerals'):
+        usda = {key: amount(values[(g, key)]) for g, key, _ in NUTRIENTS if g == group and (g, key) in values}
+        nutrition[group] = usda or current.get(group) or {}
+    return nutrition
+
+
+def template_positions(products: List[Dict[str, Any]]) -> set:
+    """Indices of products whose nutrition is missing or shared with others"""
+    shared = Counter(json.dumps(product.get('nutrition_data'), sort_keys=True) for product in products)
+    return {i for i, product in enumerate(products)
+            if not product.get('nutrition_data')
+            or shared[json.dumps(product['nutrition_data'], sort_keys=True)] >= TEMPLATE_MIN_SHARED}
+
+
+def enrich(data: Dict[str, Any], export: FdcExport, min_confidence: float = MIN_CONFIDENCE,
+           data_types=DATA_TYPES, overwrite_all: bool = False) -> Dict[str, Any]:
+    """Overwrite nutrition of confidently matched products in place; returns a coverage report"""
+    products = data['products']
+    with stage('templates'):
+        targets = set(range(len(products))) if overwrite_all else template_positions(products)
+    with stage('match_foods'):
+        matches = match_foods(export, products, data_types)
+    confident = {i: match for i, match in matches.items()
+                 if match['confidence'] >= min_confidence and i in targets}
+    with stage('collect_nutrients'):
+        nutrients = collect_nutrients(export, {match['fdc_id'] for match in confident.values()})
+
+    enriched = []
+    with stage('apply'):
+        for i, match in sorted(confident.items()):
+            values = nutrients.get(match['fdc_id'])
+            if not values:
+                continue
+            product = products[i]
+            product['nutrition_data'] = usda_nutrition(values, product.get('nutrition_data'))
+            enriched.append(i)
+
+    by_category: Dict[str, Dict[str, int]] = defaultdict(lambda: {'products': 0, 'targets': 0, 'enriched': 0})
+    for i, product in enumerate(products):
+        counts = by_category[product.get('category', 'other')]
+        counts['products'] += 1
+        counts['targets'] += i in targets
+    for i in enriched:
+        by_category[products[i].get('category', 'other')]['enriched'] += 1
+
+    add_count('products', len(products))
+    add_count('enriched', len(enriched))
+    return {
+        'products': len(products),
+        'targets': len(targets),
+        'matched': sum(1 for i in matches if i in targets),
+        'enriched': len(enriched),
+        'min_confidence': min_confidence,
+        'by_category': dict(sorted(by_category.items())),
+        'low_confidence': [{'id': products[i]['id'], **match} for i, match in sorted(matches.items())
+                           if i in targets and match['confidence'] < min_confidence],
+        'unmatched': [products[i]['id'] for i in sorted(targets) if i not in matches],
+        'enriched_products': [{'id': products[i]['id'], **confident[i]} for i in enriched],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill template nutrition from a USDA FoodData Central export')
+    parser.add_argument('export', type=Path, help='FDC CSV download (.zip or unpacked directory)')
+    parser.add_argument('catalog', type=Path)
+    parser.add_argument('-o', '--output', type=Path, default=None, help='Default: overwrite the catalog')
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE)
+    parser.add_argument('--data-types', default=','.join(DATA_TYPES),
+                        help='Comma-separated FDC data types to match (empty for all, incl. branded)')
+    parser.add_argument('--overwrite-all', action='store_true',
+                        help='Also replace nutrition that is not a shared template')
+    parser.add_argument('--report', type=Path, default=None, help='Write the coverage report as JSON')
+    parser.add_argument('--dry-run', action='store_true', help='Report only, write no catalog')
+    args = parser.parse_args()
+
+    data_types = tuple(t.strip() for t in args.data_types.split(',') if t.strip())
+    with stage('load'):
+        data = load_json(args.catalog)
+    with FdcExport(args.export) as export:
+        report = enrich(data, export, args.min_confidence, data_types, args.overwrite_all)
+
+    print(f"🥗 USDA enrichment: {args.catalog}")
+    print(f"   Products: {report['products']}, template / missing nutrition: {report['targets']}")
+    print(f"   Matched: {report['matched']}, enriched (confidence ≥ {args.min_confidence}): {report['enriched']}"
+          f" ({report['enriched'] / max(1, report['targets']):.0%} of targets)")
+    print(f"\n📊 By category (enriched / targets / products):")
+    for category, counts in report['by_category'].items():
+        print(f"   {category:<15} {counts['enriched']:>5} / {counts['targets']:>5} / {counts['products']:>5}")
+    if report['low_confidence']:
+        print(f"\n⚠️  {len(report['low_confidence'])} matches below the confidence threshold, e.g.:")
+        for entry in report['low_confidence'][:5]:
+            print(f"   {entry['id']} → {entry['description']} ({entry['confidence']})")
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📝 Report: {args.report}")
+
+    if args.dry_run:
+        print("\n🔍 Dry run, catalog not written")
+        return
+    output = args.output or args.catalog
+    with stage('save'):
+        dump_json(data, output)
+    print(f"\n✅ Wrote {output}")
+
+
+if __name__ == '__main__':
+    run_script('usda_enrich', main)